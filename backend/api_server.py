@@ -1,6 +1,5 @@
 """FastAPI server for webhook endpoints and API."""
 
-import json
 import logging
 import os
 import signal
@@ -10,7 +9,7 @@ from contextlib import asynccontextmanager
 import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from src.oncall_agent.api import webhooks
 from src.oncall_agent.api.routers import (
@@ -39,7 +38,10 @@ from src.oncall_agent.api.routers import (
     settings_router,
     user_integrations,
 )
+from src.oncall_agent.api.webhook_guard import WebhookGuardMiddleware, get_webhook_guard
 from src.oncall_agent.config import get_config
+from src.oncall_agent.services.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from src.oncall_agent.services.metrics import REGISTRY
 from src.oncall_agent.utils import get_logger, setup_logging
 
 # Setup logging FIRST before creating any loggers
@@ -62,12 +64,45 @@ async def lifespan(app: FastAPI):
     logger.info(f"PagerDuty webhook secret configured: {bool(config.pagerduty_webhook_secret)}")
     logger.info(f"Log level: {config.log_level}")
 
+    # Open the pooled dashboard client used for incident/AI-action notifications
+    from src.oncall_agent.frontend_integration import frontend_integration
+    await frontend_integration.start()
+
+    # Shared asyncpg pool used by every router that talks to Postgres
+    from src.oncall_agent.api.dependencies import init_db_pool
+    db_pool = None
+    try:
+        db_pool = await init_db_pool()
+    except Exception as e:
+        logger.error(f"Failed to create database pool: {e}")
+
+    from src.oncall_agent.services.incident_store import init_incident_repository
+    try:
+        await init_incident_repository(db_pool)
+    except Exception as e:
+        logger.error(f"Failed to open incident store, keeping incidents in memory: {e}")
+
+    from src.oncall_agent.services.quota_service import init_quota_service
+    try:
+        await init_quota_service()
+    except Exception as e:
+        logger.error(f"Failed to open quota store, keeping alert usage in memory: {e}")
+
     # Initialize webhook handler
     if config.pagerduty_enabled:
         from src.oncall_agent.api.webhooks import get_agent_trigger
         trigger = await get_agent_trigger()
         logger.info("OncallAgent initialized for webhook handling")
 
+    # Durable webhook inbox, drained in the background
+    if config.webhook_inbox_enabled:
+        from src.oncall_agent.api.webhooks import start_webhook_inbox
+        try:
+            await start_webhook_inbox()
+            logger.info(f"Webhook inbox opened at {config.webhook_inbox_path}")
+        except Exception as e:
+            logger.error(f"Failed to open webhook inbox, processing webhooks inline: {e}")
+
     # Start Kubernetes MCP server if enabled
     if config.k8s_enabled and config.k8s_use_mcp_server:
         logger.info("Starting Kubernetes MCP server...")
@@ -104,11 +139,26 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down Oncall Agent API Server")
+    from src.oncall_agent.api.webhooks import stop_webhook_inbox
+    await stop_webhook_inbox()
+
     if config.pagerduty_enabled:
         from src.oncall_agent.api.webhooks import agent_trigger
         if agent_trigger:
             await agent_trigger.shutdown()
 
+    from src.oncall_agent.frontend_integration import close_frontend_integration
+    await close_frontend_integration()
+
+    from src.oncall_agent.services.incident_store import close_incident_repository
+    await close_incident_repository()
+
+    from src.oncall_agent.services.quota_service import close_quota_service
+    await close_quota_service()
+
+    from src.oncall_agent.api.dependencies import close_db_pool
+    await close_db_pool()
+
     # Stop MCP server if running
     if hasattr(app.state, 'mcp_process') and app.state.mcp_process:
         logger.info("Stopping Kubernetes MCP server...")
@@ -137,6 +187,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Shed webhook floods and unknown senders before the body is read
+app.add_middleware(WebhookGuardMiddleware, guard=get_webhook_guard())
+
 
 # Add request logging middleware - MUST be added BEFORE CORS to ensure proper order
 async def log_requests(request: Request, call_next):
@@ -157,26 +210,9 @@ async def log_requests(request: Request, call_next):
         if auth_header:
             logger.info(f"Authorization header format: {auth_header[:20]}...")
 
-    # Log webhook requests in detail
-    if request.url.path == "/webhook/pagerduty":
-        body = await request.body()
-        logger.info(f"PagerDuty webhook headers: {dict(request.headers)}")
-        try:
-            payload = json.loads(body) if body else {}
-            # logger.info(f"PagerDuty webhook payload: {json.dumps(payload, indent=2)}")
-        except:
-            logger.info(f"PagerDuty webhook raw body: {body}")
-
-        # Important: Create a new request with the body we read
-        from starlette.requests import Request as StarletteRequest
-
-        async def receive():
-            return {"type": "http.request", "body": body}
-
-        request = StarletteRequest(
-            scope=request.scope,
-            receive=receive
-        )
+    # Log webhook headers only; the body is left for the route to read once
+    if request.url.path.startswith("/webhook/") and logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Webhook headers: {dict(request.headers)}")
 
     response = await call_next(request)
     return response
@@ -223,6 +259,9 @@ async def health_check():
         }
     }
 
+    from src.oncall_agent.api.dependencies import get_db_pool_stats
+    health_status["checks"]["database_pool"] = get_db_pool_stats()
+
     # Check agent if initialized
     if config.pagerduty_enabled:
         try:
@@ -240,6 +279,12 @@ async def health_check():
     return health_status
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Agent metrics in the Prometheus text exposition format."""
+    return PlainTextResponse(REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.get("/integrations")
 async def get_mcp_integrations():
     """Get MCP integration status for frontend."""
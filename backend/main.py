@@ -7,6 +7,7 @@ from datetime import UTC, datetime
 
 from src.oncall_agent.agent import OncallAgent, PagerAlert
 from src.oncall_agent.config import get_config
+from src.oncall_agent.frontend_integration import close_frontend_integration
 from src.oncall_agent.mcp_integrations.notion_direct import NotionDirectIntegration
 from src.oncall_agent.utils import setup_logging
 
@@ -139,6 +140,7 @@ async def main():
 
         # Shutdown the agent
         await agent.shutdown()
+        await close_frontend_integration()
 
     except KeyboardInterrupt:
         logger.info("Received interrupt signal, shutting down...")
@@ -1,14 +1,17 @@
 """Main agent logic using AGNO framework for oncall incident response."""
 
 import asyncio
+import inspect
 import logging
 import re
+import time
 from datetime import datetime
 from typing import Any
 
-from anthropic import AsyncAnthropic
+from anthropic import RateLimitError
 from pydantic import BaseModel
 
+from .analysis_stream import AnalysisStreamer
 from .config import get_config
 from .frontend_integration import (
     send_ai_action_to_dashboard,
@@ -17,10 +20,39 @@ from .frontend_integration import (
 from .mcp_integrations.base import MCPIntegration
 from .mcp_integrations.github_mcp import GitHubMCPIntegration
 from .mcp_integrations.grafana_mcp import GrafanaMCPIntegration
+from .mcp_integrations.incident_cache import incident_read_cache, scoped
 from .mcp_integrations.kubernetes_manusa_mcp import KubernetesManusaMCPIntegration
 from .mcp_integrations.notion_direct import NotionDirectIntegration
 from .models.api_key import LLMProvider
+from .services.analysis_cache import get_analysis_cache, prompt_fingerprint
 from .services.api_key_service import APIKeyService
+from .services.llm_dispatcher import LLMDispatcher, estimate_tokens
+from .services.metrics import (
+    CONTEXT_FETCH_SECONDS,
+    LLM_REQUESTS,
+    observe_llm_usage,
+    track_stage,
+)
+
+# Kubernetes alert types, checked in order against the alert description
+K8S_ALERT_PATTERNS = {
+    "pod_crash": re.compile(r"(Pod|pod).*(?:CrashLoopBackOff|crash|restarting)", re.IGNORECASE),
+    "image_pull": re.compile(r"(ImagePullBackOff|ErrImagePull|Failed to pull image)", re.IGNORECASE),
+    "high_memory": re.compile(r"(memory|Memory).*(?:high|above threshold|exceeded)", re.IGNORECASE),
+    "high_cpu": re.compile(r"(cpu|CPU).*(?:high|above threshold|exceeded)", re.IGNORECASE),
+    "oom_kill": re.compile(r"(OOMKill|OOM Kill|Out of Memory)", re.IGNORECASE),
+    "service_down": re.compile(r"(Service|service).*(?:down|unavailable|not responding)", re.IGNORECASE),
+    "deployment_failed": re.compile(r"(Deployment|deployment).*(?:failed|failing|error)", re.IGNORECASE),
+    "node_issue": re.compile(r"(Node|node).*(?:NotReady|unreachable|down)", re.IGNORECASE),
+}
+
+
+def detect_k8s_alert_type(description: str, patterns: dict[str, re.Pattern] = K8S_ALERT_PATTERNS) -> str | None:
+    """Return the first Kubernetes alert type whose pattern matches, if any."""
+    for alert_type, pattern in patterns.items():
+        if pattern.search(description):
+            return alert_type
+    return None
 
 
 class PagerAlert(BaseModel):
@@ -36,6 +68,9 @@ class PagerAlert(BaseModel):
 class OncallAgent:
     """AI agent for handling oncall incidents using AGNO framework."""
 
+    # Integrations that contribute context to the analysis prompt
+    CONTEXT_GATHERERS = ("github", "kubernetes", "grafana", "notion")
+
     def __init__(self):
         """Initialize the oncall agent with configuration."""
         self.config = get_config()
@@ -59,17 +94,15 @@ class OncallAgent:
             )
             self.api_key_service.create_key(initial_key)
 
+        # One pooled client per key; calls are spread over all healthy keys
+        self.llm_dispatcher = LLMDispatcher(
+            self.api_key_service,
+            requests_per_minute=self.config.llm_key_requests_per_minute,
+            tokens_per_minute=self.config.llm_key_tokens_per_minute
+        )
+
         # Define Kubernetes alert patterns
-        self.k8s_alert_patterns = {
-            "pod_crash": re.compile(r"(Pod|pod).*(?:CrashLoopBackOff|crash|restarting)", re.IGNORECASE),
-            "image_pull": re.compile(r"(ImagePullBackOff|ErrImagePull|Failed to pull image)", re.IGNORECASE),
-            "high_memory": re.compile(r"(memory|Memory).*(?:high|above threshold|exceeded)", re.IGNORECASE),
-            "high_cpu": re.compile(r"(cpu|CPU).*(?:high|above threshold|exceeded)", re.IGNORECASE),
-            "oom_kill": re.compile(r"(OOMKill|OOM Kill|Out of Memory)", re.IGNORECASE),
-            "service_down": re.compile(r"(Service|service).*(?:down|unavailable|not responding)", re.IGNORECASE),
-            "deployment_failed": re.compile(r"(Deployment|deployment).*(?:failed|failing|error)", re.IGNORECASE),
-            "node_issue": re.compile(r"(Node|node).*(?:NotReady|unreachable|down)", re.IGNORECASE),
-        }
+        self.k8s_alert_patterns = K8S_ALERT_PATTERNS
 
         # Initialize Kubernetes integration if enabled
         if self.config.k8s_enabled:
@@ -142,7 +175,7 @@ class OncallAgent:
         self.mcp_integrations[name] = integration
 
     async def _get_llm_client(self):
-        """Get the appropriate LLM client based on active API key."""
+        """Get the pooled LLM client for the active API key."""
         active_key = self.api_key_service.get_active_key()
         if not active_key:
             raise ValueError("No active API key configured")
@@ -150,64 +183,83 @@ class OncallAgent:
         key_id, api_key, provider = active_key
 
         if provider == LLMProvider.ANTHROPIC:
-            return AsyncAnthropic(api_key=api_key)
+            return self.llm_dispatcher.client_for(key_id, api_key, provider)
         elif provider == LLMProvider.OPENAI:
             # For future OpenAI support
             raise NotImplementedError("OpenAI provider not yet implemented")
         else:
             raise ValueError(f"Unsupported provider: {provider}")
 
-    async def _call_llm_with_fallback(self, prompt: str, max_retries: int = 3):
-        """Call LLM with automatic fallback to next available key on failure."""
+    async def _call_llm_with_fallback(self, prompt: str, max_retries: int = 3,
+                                      streamer: AnalysisStreamer | None = None):
+        """Call LLM with automatic fallback to next available key on failure.
+
+        With a ``streamer`` the response is consumed as an event stream and
+        each text delta is fed to it as it arrives; the final message is
+        returned either way.
+        """
         last_error = None
+        request = {
+            "model": self.config.claude_model,
+            "max_tokens": 2000,
+            "messages": [{"role": "user", "content": prompt}]
+        }
 
         for attempt in range(max_retries):
+            lease = None
             try:
-                # Get current active key info
-                active_key = self.api_key_service.get_active_key()
-                if not active_key:
-                    raise ValueError("No active API key available")
-
-                key_id, _, provider = active_key
-
-                # Get the client
-                client = await self._get_llm_client()
-
-                # Make the API call
-                if provider == LLMProvider.ANTHROPIC:
-                    response = await client.messages.create(
-                        model=self.config.claude_model,
-                        max_tokens=2000,
-                        messages=[{"role": "user", "content": prompt}]
-                    )
+                # Reserve capacity on whichever healthy key has the most headroom
+                lease = await self.llm_dispatcher.acquire(estimate_tokens(prompt))
+                client = lease.client
+
+                if streamer:
+                    # A retry starts the answer over
+                    await streamer.reset()
+                    async with client.messages.stream(**request) as stream:
+                        async for text in stream.text_stream:
+                            await streamer.feed(text)
+                        response = await stream.get_final_message()
+                        headers = stream.response.headers
+                    await streamer.finish()
+                else:
+                    raw = await client.messages.with_raw_response.create(**request)
+                    response = raw.parse()
+                    # parse() is sync on anthropic 0.x and a coroutine on 1.x
+                    if inspect.isawaitable(response):
+                        response = await response
+                    headers = raw.headers
 
-                    # Record successful usage
-                    self.api_key_service.record_key_usage(key_id, success=True)
+                self.llm_dispatcher.release(lease, headers=headers, input_tokens=response.usage.input_tokens)
+                observe_llm_usage(self.config.claude_model, response.usage)
 
-                    return response
-                else:
-                    raise NotImplementedError(f"Provider {provider} not implemented")
+                # Record successful usage
+                self.api_key_service.record_key_usage(lease.key_id, success=True)
+
+                return response
 
             except Exception as e:
                 last_error = e
                 error_msg = str(e)
                 self.logger.error(f"LLM API call failed: {error_msg}")
-
-                # Record failure
-                if active_key:
-                    self.api_key_service.record_key_usage(key_id, success=False, error=error_msg)
-
-                # Try to switch to fallback key
-                if "rate" in error_msg.lower() or "limit" in error_msg.lower():
-                    self.logger.info("Rate limit detected, switching to fallback key")
-                    next_key = self.api_key_service.get_next_fallback_key()
-                    if next_key:
-                        self.logger.info(f"Switched to fallback key: {next_key[0]}")
+                LLM_REQUESTS.labels(
+                    model=self.config.claude_model,
+                    outcome="rate_limited" if isinstance(e, RateLimitError) else "error"
+                ).inc()
+
+                if lease:
+                    self.llm_dispatcher.release(lease, error=e)
+                    # A 429 only rests the key in the dispatcher; the next
+                    # attempt goes to another key straight away
+                    if isinstance(e, RateLimitError):
+                        self.logger.info(f"Rate limit on key {lease.key_id}, dispatching to another key")
                         continue
+                    self.api_key_service.record_key_usage(lease.key_id, success=False, error=error_msg)
+                elif isinstance(e, ValueError):
+                    # No usable key at all; retrying cannot help
+                    break
 
-                # If not rate limit or no fallback, retry with same key
                 if attempt < max_retries - 1:
-                    self.logger.info(f"Retrying with same key (attempt {attempt + 2}/{max_retries})")
+                    self.logger.info(f"Retrying LLM call (attempt {attempt + 2}/{max_retries})")
                     await asyncio.sleep(2 ** attempt)  # Exponential backoff
 
         # All attempts failed
@@ -223,7 +275,61 @@ class OncallAgent:
                 self.logger.error(f"Failed to connect to {name}: {e}")
 
     async def handle_pager_alert(self, alert: PagerAlert) -> dict[str, Any]:
-        """Handle an incoming pager alert."""
+        """Handle an incoming pager alert.
+
+        Integration reads made while handling the alert go through an
+        incident-scoped cache, so repeated reads of the same pods and events
+        hit the cluster once. In YOLO mode the remediation diagnostics start
+        right away, alongside context gathering and the LLM call.
+        """
+        with incident_read_cache(
+            alert.alert_id,
+            enabled=self.config.mcp_read_cache_enabled,
+            ttl=self.config.mcp_read_cache_ttl
+        ) as read_cache:
+            speculative = self._start_speculative_diagnostics(alert)
+            try:
+                result = await self._handle_pager_alert(alert, speculative)
+            finally:
+                if speculative:
+                    speculative.cancel()
+        if read_cache is not None:
+            result["mcp_read_cache"] = read_cache.get_stats()
+        return result
+
+    def _start_speculative_diagnostics(self, alert: PagerAlert):
+        """Start the remediation pipeline's diagnostics for this alert type.
+
+        Only done when the pipeline will run: a Kubernetes alert type with
+        diagnostics, and YOLO mode with auto-execution enabled.
+        """
+        if not self.config.speculative_diagnostics_enabled:
+            return None
+        if not callable(getattr(getattr(self, 'k8s_integration', None), 'execute_kubectl_command', None)):
+            return None
+        k8s_alert_type = self._detect_k8s_alert_type(alert.description)
+        if not k8s_alert_type:
+            return None
+        try:
+            # Import here to avoid circular dependency
+            from .api.routers.agent import AGENT_CONFIG
+            from .api.schemas import AIMode
+            from .remediation_pipeline import (
+                SpeculativeDiagnostics,
+                diagnostic_commands,
+            )
+        except ImportError:
+            return None
+        if AGENT_CONFIG.mode != AIMode.YOLO or not AGENT_CONFIG.auto_execute_enabled:
+            return None
+        # Same namespace the Kubernetes context (and so the pipeline) uses
+        context = {"namespace": alert.metadata.get("namespace", "default")}
+        if not diagnostic_commands(k8s_alert_type, context):
+            return None
+        self.logger.info(f"📊 Starting {k8s_alert_type} diagnostics alongside the analysis")
+        return SpeculativeDiagnostics(scoped(self.k8s_integration), k8s_alert_type, context)
+
+    async def _handle_pager_alert(self, alert: PagerAlert, speculative=None) -> dict[str, Any]:
         self.logger.info(f"Handling pager alert: {alert.alert_id} for service: {alert.service_name}")
 
         import time
@@ -256,7 +362,8 @@ class OncallAgent:
                     "severity": alert.severity,
                     "metadata": alert.metadata
                 }
-                dashboard_incident = await send_incident_to_dashboard(alert_data)
+                with track_stage("dashboard_notify"):
+                    dashboard_incident = await send_incident_to_dashboard(alert_data)
                 incident_id = dashboard_incident.get("id") if dashboard_incident else None
                 self.logger.info(f"✅ Incident sent to dashboard with ID: {incident_id}")
             except Exception as e:
@@ -290,79 +397,14 @@ class OncallAgent:
             k8s_alert_type = self._detect_k8s_alert_type(alert.description)
             k8s_context = {}
 
-            # Gather GitHub context if available
-            github_context = {}
-            if "github" in self.mcp_integrations:
-                github_context = await self._gather_github_context(alert)
-
-            # Gather Kubernetes context if available
-            if "kubernetes" in self.mcp_integrations:
-                self.logger.info("📊 Fetching Kubernetes context...")
-                if has_log_streaming:
-                    await log_stream_manager.log_info(
-                        "🔍 Gathering context from Kubernetes integration",
-                        incident_id=alert.alert_id,
-                        integration="kubernetes",
-                        stage="gathering_context",
-                        progress=0.35
-                    )
-                try:
-                    if k8s_alert_type:
-                        k8s_context = await self._gather_k8s_context(alert, k8s_alert_type)
-                        all_context["kubernetes"] = k8s_context
-                    else:
-                        # Even for non-K8s specific alerts, get general cluster status
-                        k8s = self.mcp_integrations["kubernetes"]
-                        namespace = alert.metadata.get("namespace", "default")
-                        pods = await k8s.list_pods(namespace)
-                        all_context["kubernetes"] = {
-                            "cluster_status": "connected",
-                            "namespace": namespace,
-                            "pod_count": len(pods.get("pods", [])),
-                            "unhealthy_pods": [p for p in pods.get("pods", [])
-                                             if p.get("status") not in ["Running", "Completed"]]
-                        }
-                except Exception as e:
-                    self.logger.error(f"Error fetching Kubernetes context: {e}")
-                    all_context["kubernetes"] = {"error": str(e)}
-
-            # Gather Grafana context if available
-            if "grafana" in self.mcp_integrations:
-                self.logger.info("📈 Fetching Grafana metrics...")
-                if has_log_streaming:
-                    await log_stream_manager.log_info(
-                        "🔍 Gathering context from Grafana integration",
-                        incident_id=alert.alert_id,
-                        integration="grafana",
-                        stage="gathering_context",
-                        progress=0.4
-                    )
-                try:
-                    grafana = self.mcp_integrations["grafana"]
-                    # Try to find relevant dashboards based on service name
-                    dashboards = await grafana.fetch_context("search", query=alert.service_name)
-                    all_context["grafana"] = {
-                        "dashboards": dashboards,
-                        "service": alert.service_name
-                    }
-                except Exception as e:
-                    self.logger.error(f"Error fetching Grafana context: {e}")
-                    all_context["grafana"] = {"error": str(e)}
-
-            # Gather Notion context if available (for runbooks, etc.)
-            if "notion" in self.mcp_integrations:
-                self.logger.info("📚 Fetching Notion documentation...")
-                try:
-                    notion = self.mcp_integrations["notion"]
-                    # Search for relevant runbooks or documentation
-                    docs = await notion.fetch_context(
-                        "search",
-                        query=f"{alert.service_name} {alert.description[:50]}"
-                    )
-                    all_context["notion"] = docs
-                except Exception as e:
-                    self.logger.error(f"Error fetching Notion context: {e}")
-                    all_context["notion"] = {"error": str(e)}
+            # Gather context from every integration concurrently so one slow
+            # backend cannot hold up the analysis
+            with track_stage("context"):
+                gathered = await self._gather_all_context(alert, k8s_alert_type)
+            github_context = gathered.pop("github", {})
+            all_context.update(gathered)
+            if k8s_alert_type and "kubernetes" in all_context:
+                k8s_context = all_context["kubernetes"]
 
             # STEP 2: Create a comprehensive prompt for Claude
             prompt = f"""
@@ -399,32 +441,69 @@ class OncallAgent:
             {"For this Kubernetes issue, also suggest specific kubectl commands or automated fixes." if k8s_alert_type else ""}
             """
 
-            # STEP 3: Call Claude for analysis
-            self.logger.info("🤖 Calling Claude for comprehensive analysis...")
-            if has_log_streaming:
-                await log_stream_manager.log_info(
-                    "🤖 Starting Claude analysis...",
-                    incident_id=alert.alert_id,
-                    stage="claude_analysis",
-                    progress=0.5
-                )
-            # Use the new method with automatic fallback
-            response = await self._call_llm_with_fallback(prompt)
+            # STEP 3: Call Claude for analysis, unless an identical incident
+            # signature was analysed recently
+            analysis_cache = get_analysis_cache()
+            cache_key = prompt_fingerprint(
+                prompt, self.config.claude_model, volatile=(alert.alert_id, alert.timestamp)
+            )
+            cached = analysis_cache.get(cache_key) if analysis_cache else None
 
-            # Extract the response
-            analysis = response.content[0].text if response.content else "No analysis available"
+            if cached:
+                self.logger.info(f"♻️ Reusing cached analysis ({cached.hits} hits)")
+                if has_log_streaming:
+                    await log_stream_manager.log_info(
+                        "♻️ Reusing analysis of an identical recent incident",
+                        incident_id=alert.alert_id,
+                        stage="claude_analysis",
+                        progress=0.7,
+                        metadata={"cache_hits": cached.hits}
+                    )
+                analysis = cached.analysis
+                parsed_analysis = cached.parsed_analysis
+            else:
+                self.logger.info("🤖 Calling Claude for comprehensive analysis...")
+                if has_log_streaming:
+                    await log_stream_manager.log_info(
+                        "🤖 Starting Claude analysis...",
+                        incident_id=alert.alert_id,
+                        stage="claude_analysis",
+                        progress=0.5
+                    )
+                # Use the new method with automatic fallback, streaming sections
+                # to the dashboard as they are written
+                streamer = None
+                if self.config.llm_streaming_enabled:
+                    async def on_section(section: str, items: list[str]) -> None:
+                        await self._on_analysis_section(alert, incident_id, section, items)
+
+                    streamer = AnalysisStreamer(
+                        alert.alert_id,
+                        log_manager=log_stream_manager if has_log_streaming else None,
+                        on_section=on_section
+                    )
+                with track_stage("llm"):
+                    response = await self._call_llm_with_fallback(prompt, streamer=streamer)
+                if streamer and streamer.first_token_at:
+                    self.logger.info(f"⚡ First analysis tokens after {streamer.first_token_at - streamer.started_at:.2f}s")
 
-            # Create response structure
-            if has_log_streaming:
-                await log_stream_manager.log_info(
-                    "📊 Claude is analyzing the incident context",
-                    incident_id=alert.alert_id,
-                    stage="claude_analysis",
-                    progress=0.7
-                )
+                # Extract the response
+                analysis = response.content[0].text if response.content else "No analysis available"
 
-            # Parse the analysis into structured sections
-            parsed_analysis = self._parse_claude_analysis(analysis)
+                # Create response structure
+                if has_log_streaming:
+                    await log_stream_manager.log_info(
+                        "📊 Claude is analyzing the incident context",
+                        incident_id=alert.alert_id,
+                        stage="claude_analysis",
+                        progress=0.7
+                    )
+
+                # Parse the analysis into structured sections
+                with track_stage("parse"):
+                    parsed_analysis = self._parse_claude_analysis(analysis)
+                if analysis_cache and response.content:
+                    await analysis_cache.put(cache_key, analysis, parsed_analysis, self.config.claude_model)
 
             # Stream the complete analysis to the frontend
             if has_log_streaming:
@@ -468,6 +547,7 @@ class OncallAgent:
                 "status": "analyzed",
                 "analysis": analysis,
                 "parsed_analysis": parsed_analysis,
+                "analysis_cached": cached is not None,
                 "timestamp": alert.timestamp,
                 "severity": alert.severity,
                 "service": alert.service_name,
@@ -522,13 +602,13 @@ class OncallAgent:
                                 if hasattr(self, 'k8s_integration'):
                                     # Check if this is a kubectl command
                                     if action['action'] == 'execute_kubectl_command':
-                                        exec_result = await self.k8s_integration.execute_kubectl_command(
+                                        exec_result = await scoped(self.k8s_integration).execute_kubectl_command(
                                             action['params']['command'],
                                             dry_run=False,
                                             auto_approve=True
                                         )
                                     elif hasattr(self.k8s_integration, 'execute_action'):
-                                        exec_result = await self.k8s_integration.execute_action(
+                                        exec_result = await scoped(self.k8s_integration).execute_action(
                                             action['action'],
                                             {**action.get('params', {}), 'auto_approve': True}
                                         )
@@ -569,7 +649,7 @@ class OncallAgent:
                             from .remediation_pipeline import RemediationPipeline
 
                             # Create pipeline instance
-                            pipeline = RemediationPipeline(self.k8s_integration)
+                            pipeline = RemediationPipeline(scoped(self.k8s_integration))
 
                             # Extract kubectl commands from Claude's analysis
                             # Prioritize remediation commands over general commands
@@ -587,11 +667,13 @@ class OncallAgent:
 
                             try:
                                 # Execute the full remediation pipeline
-                                pipeline_result = await pipeline.execute_pipeline(
-                                    alert_type=k8s_alert_type,
-                                    context=k8s_context,
-                                    commands_from_claude=kubectl_commands
-                                )
+                                with track_stage("remediation"):
+                                    pipeline_result = await pipeline.execute_pipeline(
+                                        alert_type=k8s_alert_type,
+                                        context=k8s_context,
+                                        commands_from_claude=kubectl_commands,
+                                        speculative=speculative
+                                    )
 
                                 result["remediation_pipeline_result"] = pipeline_result
 
@@ -667,7 +749,7 @@ class OncallAgent:
                                     )
 
                                     # Execute command
-                                    exec_result = await self.k8s_integration.execute_kubectl_command(
+                                    exec_result = await scoped(self.k8s_integration).execute_kubectl_command(
                                         cmd_parts,
                                         dry_run=False,
                                         auto_approve=True
@@ -821,7 +903,8 @@ class OncallAgent:
                             })
 
                     # Create the page
-                    notion_result = await self.notion_integration.execute_action("create_page", notion_content)
+                    with track_stage("notion"):
+                        notion_result = await self.notion_integration.execute_action("create_page", notion_content)
 
                     if notion_result.get("success"):
                         page_url = notion_result.get("url", "")
@@ -889,36 +972,142 @@ class OncallAgent:
 
     def _detect_k8s_alert_type(self, description: str) -> str | None:
         """Detect if an alert is Kubernetes-related and return the type."""
-        for alert_type, pattern in self.k8s_alert_patterns.items():
-            if pattern.search(description):
-                return alert_type
-        return None
+        return detect_k8s_alert_type(description, self.k8s_alert_patterns)
+
+    async def _gather_all_context(self, alert: PagerAlert, k8s_alert_type: str | None) -> dict[str, dict[str, Any]]:
+        """Gather context from all registered integrations concurrently.
+
+        Each integration gets its own deadline (``context_integration_timeout``)
+        and the whole stage is capped by ``context_gather_budget``. Results are
+        streamed to the dashboard as soon as each integration finishes;
+        integrations still running when the budget expires are cancelled and
+        reported as timed out.
+        """
+        try:
+            from .api.log_streaming import log_stream_manager
+        except ImportError:
+            log_stream_manager = None
+
+        integration_timeout = self.config.context_integration_timeout
+        budget = self.config.context_gather_budget
+
+        async def run(name: str) -> tuple[str, dict[str, Any], float]:
+            started = time.monotonic()
+            try:
+                result = await asyncio.wait_for(
+                    self._gather_integration_context(name, alert, k8s_alert_type),
+                    timeout=integration_timeout
+                )
+            except TimeoutError:
+                self.logger.warning(f"⏱️ {name} context timed out after {integration_timeout}s")
+                result = {"error": f"Timed out after {integration_timeout}s"}
+            except Exception as e:
+                self.logger.error(f"Error fetching {name} context: {e}")
+                result = {"error": str(e)}
+            elapsed = time.monotonic() - started
+            CONTEXT_FETCH_SECONDS.labels(
+                integration=name, outcome="error" if "error" in result else "success"
+            ).observe(elapsed)
+            return name, result, elapsed
+
+        tasks = {
+            asyncio.create_task(run(name)): name
+            for name in self.mcp_integrations
+            if name in self.CONTEXT_GATHERERS
+        }
+        results: dict[str, dict[str, Any]] = {}
+        if not tasks:
+            return results
+
+        self.logger.info(f"🔍 Fetching context from {', '.join(tasks.values())} concurrently...")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + budget
+        pending = set(tasks)
+
+        while pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name, result, elapsed = task.result()
+                results[name] = result
+                self.logger.info(f"📥 {name} context ready in {elapsed:.2f}s")
+                if log_stream_manager:
+                    succeeded = bool(result) and "error" not in result
+                    log = log_stream_manager.log_info if succeeded else log_stream_manager.log_warning
+                    await log(
+                        f"{'✅' if succeeded else '⚠️'} {name.capitalize()} context "
+                        f"{'gathered' if succeeded else 'unavailable'} ({elapsed:.2f}s)",
+                        incident_id=alert.alert_id,
+                        integration=name,
+                        stage="gathering_context",
+                        progress=0.3 + 0.15 * len(results) / len(tasks),
+                        metadata={"duration": f"{elapsed:.2f}s", "error": result.get("error")}
+                    )
+
+        for task in pending:
+            task.cancel()
+            name = tasks[task]
+            self.logger.warning(f"⏱️ {name} context dropped: gather budget of {budget}s exhausted")
+            results[name] = {"error": f"Context gather budget of {budget}s exhausted"}
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        return results
+
+    async def _gather_integration_context(self, name: str, alert: PagerAlert, k8s_alert_type: str | None) -> dict[str, Any]:
+        """Gather the context for a single integration."""
+        if name == "github":
+            return await self._gather_github_context(alert)
+
+        if name == "kubernetes":
+            if k8s_alert_type:
+                return await self._gather_k8s_context(alert, k8s_alert_type)
+            # Even for non-K8s specific alerts, get general cluster status
+            k8s = scoped(self.mcp_integrations["kubernetes"])
+            namespace = alert.metadata.get("namespace", "default")
+            pods = await k8s.list_pods(namespace)
+            return {
+                "cluster_status": "connected",
+                "namespace": namespace,
+                "pod_count": len(pods.get("pods", [])),
+                "unhealthy_pods": [p for p in pods.get("pods", [])
+                                   if p.get("status") not in ["Running", "Completed"]]
+            }
+
+        if name == "grafana":
+            # Try to find relevant dashboards based on service name
+            dashboards = await scoped(self.mcp_integrations["grafana"]).fetch_context("search", query=alert.service_name)
+            return {
+                "dashboards": dashboards,
+                "service": alert.service_name
+            }
+
+        if name == "notion":
+            # Search for relevant runbooks or documentation
+            return await scoped(self.mcp_integrations["notion"]).fetch_context(
+                "search",
+                query=f"{alert.service_name} {alert.description[:50]}"
+            )
+
+        return {}
 
     async def _gather_k8s_context(self, alert: PagerAlert, alert_type: str) -> dict[str, Any]:
         """Gather Kubernetes-specific context based on alert type."""
-        k8s = self.mcp_integrations.get("kubernetes")
+        k8s = scoped(self.mcp_integrations.get("kubernetes"))
         if not k8s:
             return {}
 
-        context = {"alert_type": alert_type}
         metadata = alert.metadata
         namespace = metadata.get("namespace", "default")
+        context = {"alert_type": alert_type, "namespace": namespace}
 
         try:
             if alert_type == "pod_crash":
                 pod_name = metadata.get("pod_name")
                 if pod_name:
                     # Get pod logs
-                    logs = await k8s.get_pod_logs(pod_name, namespace, tail_lines=100)
-                    context["pod_logs"] = logs
-
-                    # Get pod events
-                    events = await k8s.get_pod_events(pod_name, namespace)
-                    context["pod_events"] = events
-
-                    # Get pod description
-                    description = await k8s.describe_pod(pod_name, namespace)
-                    context["pod_description"] = description
                     logs_result = await k8s.get_pod_logs(pod_name, namespace, tail_lines=100)
                     if logs_result.get("success"):
                         context["pod_logs"] = logs_result.get("logs", "")
@@ -1160,6 +1349,23 @@ class OncallAgent:
                 self.logger.info(f"Disconnected from {name}")
             except Exception as e:
                 self.logger.error(f"Error disconnecting from {name}: {e}")
+        await self.llm_dispatcher.close()
+        await asyncio.to_thread(self.api_key_service.flush)
+
+    async def _on_analysis_section(self, alert: PagerAlert, incident_id: str | None,
+                                   section: str, items: list[str]) -> None:
+        """Act on an analysis section as soon as it has been streamed."""
+        if section != "immediate_actions" or not items:
+            return
+        self.logger.info(f"🎯 Immediate actions ready for {alert.alert_id}: {len(items)} steps")
+        try:
+            await send_ai_action_to_dashboard(
+                action="immediate_actions_ready",
+                description=f"Immediate actions for {alert.service_name}: " + "; ".join(items[:3]),
+                incident_id=incident_id
+            )
+        except Exception as e:
+            self.logger.error(f"❌ Failed to send immediate actions to dashboard: {e}")
 
     def _parse_claude_analysis(self, analysis: str) -> dict[str, Any]:
         """Parse Claude's analysis into structured sections."""
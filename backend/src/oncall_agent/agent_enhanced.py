@@ -24,6 +24,7 @@ from .pagerduty_client import (
     acknowledge_pagerduty_incident,
     resolve_pagerduty_incident,
 )
+from .services.metrics import observe_llm_usage, track_stage
 from .strategies.deterministic_k8s_resolver import DeterministicK8sResolver
 from .strategies.kubernetes_resolver import KubernetesResolver
 
@@ -513,11 +514,13 @@ class EnhancedOncallAgent:
         Current AI Mode: {self.ai_mode.value}
         """
 
-        response = await self.anthropic_client.messages.create(
-            model=self.config.claude_model,
-            max_tokens=2000,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        with track_stage("llm"):
+            response = await self.anthropic_client.messages.create(
+                model=self.config.claude_model,
+                max_tokens=2000,
+                messages=[{"role": "user", "content": prompt}]
+            )
+        observe_llm_usage(self.config.claude_model, response.usage)
 
         return response.content[0].text if response.content else "No analysis available"
 
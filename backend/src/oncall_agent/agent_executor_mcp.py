@@ -1,15 +1,26 @@
 """Agent executor that uses MCP server exclusively for Kubernetes operations."""
 
+import asyncio
 import logging
 from collections.abc import Callable
 from datetime import datetime
+from functools import partial
 from typing import Any
 
 from src.oncall_agent.api.log_streaming import log_stream_manager
 from src.oncall_agent.api.schemas import AIMode
+from src.oncall_agent.config import get_config
 from src.oncall_agent.mcp_integrations.kubernetes_manusa_mcp import (
     KubernetesManusaMCPIntegration,
 )
+from src.oncall_agent.remediation_scheduler import (
+    MAX_PLAN_FAILURES,
+    SKIPPED,
+    RemediationScheduler,
+    action_failed,
+    action_resource,
+)
+from src.oncall_agent.services.audit_store import get_audit_store
 from src.oncall_agent.strategies.kubernetes_resolver import ResolutionAction
 
 
@@ -20,8 +31,11 @@ class AgentExecutorMCP:
         """Initialize the agent executor with MCP-only integration."""
         self.logger = logging.getLogger(__name__)
         self.k8s_integration = k8s_integration
-        self.execution_history = []
+        self.audit_store = get_audit_store()
         self.circuit_breaker = CircuitBreaker()
+        config = get_config()
+        self.max_concurrency = config.remediation_max_concurrency
+        self.namespace_concurrency = config.remediation_namespace_concurrency
 
     async def execute_mcp_action(self, action: str, params: dict[str, Any]) -> dict[str, Any]:
         """Execute an action via MCP server."""
@@ -125,29 +139,20 @@ class AgentExecutorMCP:
                 results["error"] = "Circuit breaker open - automatic execution disabled"
                 return results
 
-        for action in actions:
-            # Prepare execution context
-            execution_context = {
-                "action": {
-                    "action_type": action.action_type,
-                    "description": action.description,
-                    "params": action.params,
-                    "confidence": action.confidence,
-                    "risk_level": action.risk_level,
-                    "estimated_time": action.estimated_time,
-                    "rollback_possible": action.rollback_possible
-                },
-                "incident_id": incident_id,
-                "timestamp": datetime.utcnow().isoformat(),
-                "mode": ai_mode.value,
-                "mcp_execution": True
-            }
+        scheduler = RemediationScheduler(
+            self.max_concurrency, self.namespace_concurrency,
+            max_failures=MAX_PLAN_FAILURES, is_failure=action_failed
+        )
+        # Actions run in parallel, but approval prompts are asked one at a time
+        approval_lock = asyncio.Lock()
 
+        async def run_action(action: ResolutionAction, execution_context: dict[str, Any]) -> dict[str, Any]:
             try:
                 # Determine if we should execute
-                should_execute, reason = await self._should_execute_action(
-                    action, ai_mode, confidence_threshold, approval_callback
-                )
+                async with approval_lock:
+                    should_execute, reason = await self._should_execute_action(
+                        action, ai_mode, confidence_threshold, approval_callback
+                    )
 
                 if should_execute:
                     # Execute the action via MCP
@@ -165,11 +170,6 @@ class AgentExecutorMCP:
                             progress=(results["actions_executed"] + 1) / len(actions),
                             metadata={"action_type": action.action_type, "mcp": True}
                         )
-
-                        # Verify the action worked
-                        if action.action_type in ["restart_pod", "scale_deployment", "rollback_deployment"]:
-                            verify_result = await self._verify_action(action)
-                            execution_context["verification"] = verify_result
                     else:
                         results["actions_failed"] += 1
                         self.circuit_breaker.record_failure()
@@ -201,18 +201,74 @@ class AgentExecutorMCP:
                 results["actions_failed"] += 1
                 self.circuit_breaker.record_failure()
 
-            results["execution_details"].append(execution_context)
-            self.execution_history.append(execution_context)
+            return execution_context
+
+        async def verify_action(action: ResolutionAction, execution_context: dict[str, Any]) -> dict[str, Any]:
+            # Verify the action worked
+            if execution_context.get("executed") and execution_context["result"]["success"]:
+                try:
+                    execution_context["verification"] = await self._verify_action(action)
+                except Exception as e:
+                    self.logger.error(f"Error verifying MCP action {action.action_type}: {e}")
+                    execution_context["error"] = str(e)
+                    results["actions_failed"] += 1
+                    self.circuit_breaker.record_failure()
+            return execution_context
+
+        # Independent resources run in parallel, actions on the same resource
+        # in plan order, and verification after its action
+        contexts = []
+        for index, action in enumerate(actions):
+            # Prepare execution context
+            execution_context = {
+                "action": {
+                    "action_type": action.action_type,
+                    "description": action.description,
+                    "params": action.params,
+                    "confidence": action.confidence,
+                    "risk_level": action.risk_level,
+                    "estimated_time": action.estimated_time,
+                    "rollback_possible": action.rollback_possible
+                },
+                "incident_id": incident_id,
+                "timestamp": datetime.utcnow().isoformat(),
+                "mode": ai_mode.value,
+                "mcp_execution": True
+            }
+            contexts.append(execution_context)
 
-            # Stop if we've had too many failures
-            if results["actions_failed"] >= 3:
-                self.logger.warning("Too many failures - stopping execution")
-                await log_stream_manager.log_error(
-                    "🛑 Stopping MCP execution due to too many failures",
-                    incident_id=incident_id,
-                    metadata={"failed_count": results["actions_failed"]}
+            resource, namespace = action_resource(action.params)
+            scheduler.add(
+                str(index), partial(run_action, action, execution_context),
+                resource=resource, namespace=namespace
+            )
+            if action.action_type in ["restart_pod", "scale_deployment", "rollback_deployment"]:
+                scheduler.add(
+                    f"{index}:verify", partial(verify_action, action, execution_context),
+                    resource=resource, namespace=namespace, after=[str(index)]
                 )
-                break
+
+        await scheduler.run()
+
+        for index, (action, execution_context) in enumerate(zip(actions, contexts, strict=True)):
+            if scheduler.steps[str(index)].status == SKIPPED:
+                continue
+            results["execution_details"].append(execution_context)
+            self.audit_store.append(
+                "execution",
+                tool=action.action_type,
+                incident_id=incident_id,
+                **{k: v for k, v in execution_context.items() if k not in ("incident_id", "timestamp")}
+            )
+
+        # Actions left unstarted once too many had failed
+        if scheduler.stopped:
+            self.logger.warning("Too many failures - stopping execution")
+            await log_stream_manager.log_error(
+                "🛑 Stopping MCP execution due to too many failures",
+                incident_id=incident_id,
+                metadata={"failed_count": results["actions_failed"]}
+            )
 
         # Log remediation completion
         await log_stream_manager.log_info(
@@ -424,9 +480,9 @@ class AgentExecutorMCP:
 
         return {"verified": True, "reason": "Verification not implemented for this action type"}
 
-    def get_execution_history(self) -> list[dict[str, Any]]:
-        """Get the history of executed actions."""
-        return self.execution_history
+    async def get_execution_history(self, limit: int = 100, incident_id: str | None = None) -> list[dict[str, Any]]:
+        """Get the most recent executed actions, oldest first."""
+        return await self.audit_store.aquery(category="execution", incident_id=incident_id, limit=limit)
 
 
 class CircuitBreaker:
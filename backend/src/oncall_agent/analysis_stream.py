@@ -0,0 +1,193 @@
+"""Incremental delivery of a streamed LLM analysis to the dashboard."""
+
+import logging
+import re
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Section keys match those produced by OncallAgent._parse_claude_analysis
+SECTION_KEYWORDS = {
+    "immediate_actions": "IMMEDIATE ACTIONS?",
+    "root_cause": "ROOT CAUSE",
+    "impact": "IMPACT",
+    "remediation": "REMEDIATION",
+    "monitoring": "MONITORING",
+    "automation": "AUTOMATION",
+    "follow_up": "FOLLOW-?UP",
+}
+SECTION_TITLES = {
+    "immediate_actions": "🎯 Immediate actions",
+    "root_cause": "🔍 Root cause analysis",
+    "impact": "💥 Impact assessment",
+    "remediation": "🛠️ Remediation steps",
+    "monitoring": "📊 Monitoring",
+    "automation": "🚀 Automation opportunities",
+    "follow_up": "📝 Follow-up actions",
+}
+
+# A heading is a short line that opens with markdown/numbering/emoji and a
+# section keyword, e.g. "## 1. 🎯 IMMEDIATE ACTIONS" or "**ROOT CAUSE ANALYSIS**"
+_HEADER = re.compile(
+    r"^\s*(?:#+\s*)?(?:\*\*)?\s*(?:\d+[.)]\s*)?(?:\*\*)?\s*(?:[^\w\s]+\s*)?(?:\*\*)?\s*(?P<keyword>"
+    + "|".join(f"(?P<{key}>{pattern})" for key, pattern in SECTION_KEYWORDS.items())
+    + r")\b",
+    re.IGNORECASE
+)
+_EMPHASIS = re.compile(r"^\s*(?:#|\*\*|(?:\d+[.)]\s*)?(?:\*\*)?\s*[^\x00-\x7f])")
+_BULLET = re.compile(r"^(?:[-*•]|\d+[.)])\s*")
+
+SectionCallback = Callable[[str, list[str]], Awaitable[None]]
+
+
+def match_section_header(line: str) -> str | None:
+    """Section key if ``line`` is a section heading, else None."""
+    if len(line) > 100:
+        return None
+    match = _HEADER.match(line)
+    if not match:
+        return None
+    keyword = match.group("keyword")
+    # Body text such as "Impact is limited to..." or "- Monitoring shows..."
+    # must not open a section: mixed case needs markdown or emoji emphasis
+    if keyword != keyword.upper() and not _EMPHASIS.match(line):
+        return None
+    return next(key for key in SECTION_KEYWORDS if match.group(key))
+
+
+def section_items(lines: list[str]) -> list[str]:
+    """Non-empty lines of a section with bullets and numbering removed."""
+    items = []
+    for line in lines:
+        cleaned = _BULLET.sub("", line.strip()).strip()
+        if cleaned and not cleaned.startswith("```"):
+            items.append(cleaned)
+    return items
+
+
+class AnalysisStreamer:
+    """Splits a streamed analysis into sections as the text arrives.
+
+    Text deltas are forwarded to the log stream at most every
+    ``flush_interval`` seconds. Each section is published, and handed to
+    ``on_section``, as soon as the next heading starts. That happens long
+    before the full answer is generated, so the first section is usable
+    early.
+    """
+
+    def __init__(
+        self,
+        incident_id: str,
+        log_manager: Any | None = None,
+        on_section: SectionCallback | None = None,
+        flush_interval: float = 0.3
+    ):
+        self.incident_id = incident_id
+        self.log_manager = log_manager
+        self.on_section = on_section
+        self.flush_interval = flush_interval
+        self._reset_state()
+
+    def _reset_state(self) -> None:
+        self._parts: list[str] = []
+        self._partial_line = ""
+        self._unsent: list[str] = []
+        self._current: str | None = None
+        self._section_lines: list[str] = []
+        self._last_flush = time.monotonic()
+        self.sections: dict[str, list[str]] = {}
+        self.started_at = time.monotonic()
+        self.first_token_at: float | None = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    async def reset(self) -> None:
+        """Discard partial output before the request is retried."""
+        if self._parts and self.log_manager:
+            await self.log_manager.log_warning(
+                "⚠️ Analysis interrupted, restarting",
+                incident_id=self.incident_id,
+                stage="claude_streaming",
+                metadata={"discarded_chars": len(self.text)}
+            )
+        self._reset_state()
+
+    async def feed(self, delta: str) -> None:
+        """Consume one text delta from the model."""
+        if not delta:
+            return
+        if self.first_token_at is None:
+            self.first_token_at = time.monotonic()
+        self._parts.append(delta)
+        self._unsent.append(delta)
+
+        *lines, self._partial_line = (self._partial_line + delta).split("\n")
+        for line in lines:
+            await self._handle_line(line)
+
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            await self._flush()
+
+    async def finish(self) -> str:
+        """Publish whatever is left and return the complete text."""
+        if self._partial_line:
+            await self._handle_line(self._partial_line)
+            self._partial_line = ""
+        await self._close_section()
+        await self._flush()
+        return self.text
+
+    async def _handle_line(self, line: str) -> None:
+        key = match_section_header(line)
+        if key:
+            await self._close_section()
+            self._current = key
+            self._section_lines = []
+        elif self._current:
+            self._section_lines.append(line)
+
+    async def _close_section(self) -> None:
+        if not self._current:
+            return
+        key, lines = self._current, self._section_lines
+        self._current, self._section_lines = None, []
+        items = section_items(lines)
+        self.sections[key] = items
+
+        # Send the text that led up to this point first so the order matches
+        await self._flush()
+        if self.log_manager:
+            await self.log_manager.log_info(
+                f"{SECTION_TITLES[key]} ready",
+                incident_id=self.incident_id,
+                stage="analysis_section",
+                metadata={
+                    "section": key,
+                    "items": items,
+                    "content": "\n".join(lines).strip(),
+                    "elapsed": round(time.monotonic() - self.started_at, 2)
+                }
+            )
+        if self.on_section:
+            try:
+                await self.on_section(key, items)
+            except Exception as e:
+                logger.error(f"Section handler failed for {key}: {e}")
+
+    async def _flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._unsent:
+            return
+        delta = "".join(self._unsent)
+        self._unsent = []
+        if self.log_manager:
+            await self.log_manager.log_info(
+                "✍️ Claude is writing the analysis",
+                incident_id=self.incident_id,
+                stage="claude_streaming",
+                metadata={"delta": delta, "chars": len(self.text)}
+            )
@@ -0,0 +1,127 @@
+"""Fold alert storms for the same failure into a single agent analysis."""
+
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from src.oncall_agent.agent import detect_k8s_alert_type
+from src.oncall_agent.api.models import PagerDutyIncidentData
+
+# ReplicaSet pod names look like "<deployment>-<pod-template-hash>-<suffix>",
+# both generated from Kubernetes' vowel-free alphabet
+POD_NAME_SUFFIX = re.compile(r"-[bcdfghjklmnpqrstvwxz2456789]{6,10}-[bcdfghjklmnpqrstvwxz2456789]{5}$")
+# Counts, ids and timestamps that change between firings of the same alert
+TITLE_VOLATILE = re.compile(r"\b\d+(?:[.,:]\d+)*(?:ms|s|m|h|[kmg]b)?\b|\b[0-9a-f]{8,}\b")
+
+
+def deployment_from_pod(pod_name: str) -> str:
+    """Strip the ReplicaSet hash and random suffix from a pod name."""
+    return POD_NAME_SUFFIX.sub("", pod_name)
+
+
+def normalize_title(title: str) -> str:
+    """Alert title with the values that vary between firings blanked out."""
+    return " ".join(TITLE_VOLATILE.sub("#", title.lower()).split())
+
+
+def alert_fingerprint(incident: PagerDutyIncidentData, namespace: str | None = None,
+                      deployment: str | None = None) -> str:
+    """Fingerprint of the failure an incident reports.
+
+    Built from the service, the Kubernetes alert type and the affected
+    namespace/deployment, so pods of one crash-looping deployment share a
+    fingerprint while unrelated failures of the same service do not. An
+    alert with none of these is only known by its title, so the normalized
+    title is added to keep a DB timeout and a disk-full alert apart.
+    """
+    service = incident.service.name if incident.service else "unknown"
+    alert_type = detect_k8s_alert_type(f"{incident.title} {incident.description or ''}")
+    parts = [
+        service.lower(),
+        alert_type or "general",
+        (namespace or "-").lower(),
+        (deployment or "-").lower(),
+    ]
+    if not (alert_type or namespace or deployment):
+        parts.append(normalize_title(incident.title))
+    return "|".join(parts)
+
+
+@dataclass
+class CoalescedGroup:
+    """Alerts folded into the analysis of ``primary_id``."""
+    fingerprint: str
+    primary_id: str
+    opened_at: float
+    followers: list[str] = field(default_factory=list)
+
+    @property
+    def size(self) -> int:
+        return 1 + len(self.followers)
+
+
+class AlertCoalescer:
+    """Tracks open coalescing windows keyed by alert fingerprint.
+
+    The first alert for a fingerprint opens a window of ``window`` seconds;
+    alerts with the same fingerprint that arrive before it closes are
+    attached to that first alert instead of being analysed on their own.
+    A window of 0 disables coalescing.
+    """
+
+    def __init__(self, window: float = 300.0):
+        self.window = window
+        # Insertion order equals opening order, so expired groups sit at the front
+        self._groups: OrderedDict[str, CoalescedGroup] = OrderedDict()
+        self._by_primary: dict[str, CoalescedGroup] = {}
+        self.coalesced = 0
+
+    def admit(self, fingerprint: str, alert_id: str) -> tuple[CoalescedGroup | None, bool]:
+        """Place an alert in a window.
+
+        Returns:
+            (group, opened): ``opened`` is True when the alert starts a new
+            window and should be analysed, False when it was folded into an
+            existing group. ``group`` is None when coalescing is disabled.
+        """
+        if self.window <= 0:
+            return None, True
+
+        now = time.monotonic()
+        self._expire(now)
+        group = self._groups.get(fingerprint)
+        if group is not None:
+            group.followers.append(alert_id)
+            self.coalesced += 1
+            return group, False
+
+        group = CoalescedGroup(fingerprint=fingerprint, primary_id=alert_id, opened_at=now)
+        self._groups[fingerprint] = group
+        self._by_primary[alert_id] = group
+        return group, True
+
+    def discard(self, group: CoalescedGroup) -> None:
+        """Close a window early, e.g. when its primary alert was not accepted."""
+        if self._groups.get(group.fingerprint) is group:
+            del self._groups[group.fingerprint]
+        self._by_primary.pop(group.primary_id, None)
+
+    def group_for(self, primary_id: str) -> CoalescedGroup | None:
+        return self._by_primary.get(primary_id)
+
+    def get_status(self) -> dict[str, int | float]:
+        self._expire(time.monotonic())
+        return {
+            "window_seconds": self.window,
+            "open_windows": len(self._groups),
+            "coalesced_alerts": self.coalesced,
+        }
+
+    def _expire(self, now: float) -> None:
+        while self._groups:
+            fingerprint, group = next(iter(self._groups.items()))
+            if now - group.opened_at < self.window:
+                break
+            del self._groups[fingerprint]
+            self._by_primary.pop(group.primary_id, None)
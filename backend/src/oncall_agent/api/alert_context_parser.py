@@ -5,6 +5,7 @@ from datetime import datetime
 from typing import Any
 
 from src.oncall_agent.agent import PagerAlert
+from src.oncall_agent.api.alert_coalescer import deployment_from_pod
 from src.oncall_agent.api.models import PagerDutyIncidentData
 from src.oncall_agent.utils import get_logger
 
@@ -81,6 +82,34 @@ class ContextExtractor:
 
         return pager_alert, context
 
+    def extract_k8s_target(self, incident: PagerDutyIncidentData) -> tuple[str | None, str | None]:
+        """
+        Find the namespace and deployment an incident is about.
+
+        custom_details keys win over text matches; a pod name is reduced to
+        its deployment when no deployment is given.
+
+        Returns:
+            Tuple of (namespace, deployment), either of which may be None
+        """
+        details = incident.custom_details or {}
+        text = f"{incident.title} {incident.description or ''} {str(details)}"
+
+        def first_match(key: str) -> str | None:
+            match = self.patterns[key].search(text)
+            if not match:
+                return None
+            value = next((g for g in match.groups() if g), None)
+            return value.strip("'\",}") if value else None
+
+        namespace = details.get('namespace') or first_match('namespace')
+        deployment = details.get('deployment') or first_match('deployment')
+        if not deployment:
+            pod_name = details.get('pod') or details.get('pod_name') or first_match('pod_name')
+            if pod_name:
+                deployment = deployment_from_pod(pod_name)
+        return namespace, deployment
+
     def _classify_alert(self, incident: PagerDutyIncidentData) -> str:
         """Classify the alert type based on incident details."""
         text = f"{incident.title} {incident.description or ''} {str(incident.custom_details or '')}".lower()
@@ -0,0 +1,218 @@
+"""Bounded, priority-ordered worker pool for incoming alerts."""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.oncall_agent.utils import get_logger
+
+
+class QueueFullError(Exception):
+    """Raised when the scheduler cannot accept more alerts."""
+
+    def __init__(self, message: str, retry_after: int = 30):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass(order=True)
+class ScheduledAlert:
+    """An alert waiting for, or being processed by, a worker."""
+    priority: int
+    seq: int
+    alert_id: str = field(compare=False)
+    service: str = field(compare=False)
+    payload: Any = field(compare=False)
+    enqueued_at: float = field(compare=False, default_factory=time.monotonic)
+    future: asyncio.Future = field(compare=False, default=None)
+
+
+class AlertScheduler:
+    """Runs alerts on N workers in priority order with per-service caps.
+
+    Lower ``priority`` values run first; alerts with equal priority run in
+    arrival order. Workers skip over alerts whose service already has
+    ``per_service_limit`` alerts running, so one noisy service cannot occupy
+    every worker. ``submit`` raises QueueFullError instead of waiting when
+    ``max_queue`` alerts are already queued.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Any], Awaitable[Any]],
+        workers: int = 4,
+        max_queue: int = 100,
+        per_service_limit: int = 2,
+        name: str = "alerts"
+    ):
+        self.handler = handler
+        self.workers = workers
+        self.max_queue = max_queue
+        self.per_service_limit = per_service_limit
+        self.name = name
+        self.logger = get_logger(__name__)
+
+        self._heap: list[ScheduledAlert] = []
+        self._running: Counter[str] = Counter()
+        self._in_flight: dict[str, ScheduledAlert] = {}
+        self._seq = itertools.count()
+        self._cond = asyncio.Condition()
+        self._tasks: list[asyncio.Task] = []
+        self._closed = False
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @property
+    def queue_size(self) -> int:
+        return len(self._heap)
+
+    @property
+    def running(self) -> int:
+        return len(self._in_flight)
+
+    @property
+    def is_saturated(self) -> bool:
+        return len(self._heap) >= self.max_queue
+
+    def start(self) -> None:
+        """Start the worker tasks (idempotent)."""
+        if self._tasks:
+            return
+        self._closed = False
+        self._tasks = [
+            asyncio.create_task(self._worker(n), name=f"{self.name}-worker-{n}")
+            for n in range(self.workers)
+        ]
+        self.logger.info(f"Started {self.workers} {self.name} workers (queue={self.max_queue}, per service={self.per_service_limit})")
+
+    async def submit(self, alert_id: str, service: str, priority: int, payload: Any) -> ScheduledAlert:
+        """Queue an alert; await ``.future`` for the handler's result.
+
+        Raises:
+            QueueFullError: If the scheduler is shutting down or the queue is full
+        """
+        if self._closed:
+            self.rejected += 1
+            raise QueueFullError(f"{self.name} scheduler is shutting down")
+        if self.is_saturated:
+            self.rejected += 1
+            raise QueueFullError(f"{self.name} queue is full ({self.max_queue} waiting)")
+
+        self.start()
+        job = ScheduledAlert(
+            priority=priority,
+            seq=next(self._seq),
+            alert_id=alert_id,
+            service=service,
+            payload=payload,
+            future=asyncio.get_running_loop().create_future()
+        )
+        # Callers may never await the result; don't warn about unretrieved errors
+        job.future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        async with self._cond:
+            heapq.heappush(self._heap, job)
+            self._cond.notify()
+        return job
+
+    def position(self, job: ScheduledAlert) -> int:
+        """Number of queued alerts that will be considered before ``job``."""
+        return sum(1 for other in self._heap if other < job)
+
+    async def drain(self, timeout: float | None = None) -> None:
+        """Stop accepting alerts, let queued and running ones finish, stop workers.
+
+        Alerts still queued after ``timeout`` seconds are cancelled.
+        """
+        self._closed = True
+        async with self._cond:
+            self._cond.notify_all()
+
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+            if pending:
+                self.logger.warning(f"{self.name} drain timed out, cancelling {len(self._heap)} queued and {self.running} running alerts")
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        for job in self._heap:
+            if not job.future.done():
+                job.future.cancel()
+        self._heap.clear()
+        self._tasks = []
+
+    def get_status(self) -> dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "workers": self.workers,
+            "queue_size": len(self._heap),
+            "queue_capacity": self.max_queue,
+            "running": self.running,
+            "running_by_service": dict(self._running),
+            "per_service_limit": self.per_service_limit,
+            "oldest_wait_seconds": round(max((now - j.enqueued_at for j in self._heap), default=0.0), 3),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "accepting": not self._closed,
+        }
+
+    def _pop_eligible(self) -> ScheduledAlert | None:
+        """Pop the highest-priority alert whose service has a free slot."""
+        skipped = []
+        job = None
+        while self._heap:
+            candidate = heapq.heappop(self._heap)
+            if self._running[candidate.service] < self.per_service_limit:
+                job = candidate
+                break
+            skipped.append(candidate)
+        for candidate in skipped:
+            heapq.heappush(self._heap, candidate)
+        return job
+
+    async def _next_job(self) -> ScheduledAlert | None:
+        async with self._cond:
+            while True:
+                job = self._pop_eligible()
+                if job is not None:
+                    self._running[job.service] += 1
+                    self._in_flight[job.alert_id] = job
+                    return job
+                if self._closed and not self._heap:
+                    return None
+                await self._cond.wait()
+
+    async def _worker(self, number: int) -> None:
+        while True:
+            job = await self._next_job()
+            if job is None:
+                return
+            try:
+                result = await self.handler(job.payload)
+                self.completed += 1
+                if not job.future.done():
+                    job.future.set_result(result)
+            except asyncio.CancelledError:
+                if not job.future.done():
+                    job.future.cancel()
+                raise
+            except Exception as e:
+                self.failed += 1
+                self.logger.error(f"{self.name} worker {number} failed on {job.alert_id}: {e}", exc_info=True)
+                if not job.future.done():
+                    job.future.set_exception(e)
+            finally:
+                self._running[job.service] -= 1
+                if self._running[job.service] <= 0:
+                    del self._running[job.service]
+                self._in_flight.pop(job.alert_id, None)
+                async with self._cond:
+                    # A slot for this service opened up; skipped alerts may now run
+                    self._cond.notify_all()
@@ -1,10 +1,86 @@
 """API dependencies for dependency injection."""
 
+import time
+from typing import Any
+
 import asyncpg
+from fastapi import HTTPException
+
+from src.oncall_agent.config import get_config
+from src.oncall_agent.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Application-scoped pool, created in the API server lifespan
+_db_pool: asyncpg.Pool | None = None
+
+# Counters reported alongside the live pool figures by get_db_pool_stats()
+_pool_counters: dict[str, float] = {
+    "connections_opened": 0,
+    "acquisitions": 0,
+    "acquire_wait_seconds_total": 0.0,
+}
+
+
+def get_database_url() -> str | None:
+    """Return the configured Postgres URL in a form asyncpg accepts."""
+    config = get_config()
+    url = config.database_url or config.postgres_url or config.neon_database_url
+    if not url:
+        return None
+
+    # Remove channel_binding parameter which asyncpg doesn't support
+    if "&channel_binding=require" in url:
+        url = url.replace("&channel_binding=require", "")
+    elif "?channel_binding=require" in url:
+        url = url.replace("?channel_binding=require", "")
+    return url
+
+
+async def _on_connection_opened(conn: asyncpg.Connection) -> None:
+    _pool_counters["connections_opened"] += 1
+
+
+async def _on_connection_acquired(conn: asyncpg.Connection) -> None:
+    _pool_counters["acquisitions"] += 1
+
+
+async def init_db_pool() -> asyncpg.Pool | None:
+    """Create the shared connection pool if a database is configured."""
+    global _db_pool
+    if _db_pool is not None:
+        return _db_pool
+
+    url = get_database_url()
+    if not url:
+        logger.info("No database URL configured, shared database pool disabled")
+        return None
 
-# Placeholder for database pool
-# In production, this would be initialized properly
-_db_pool = None
+    config = get_config()
+    _db_pool = await asyncpg.create_pool(
+        url,
+        min_size=config.db_pool_min_size,
+        max_size=config.db_pool_max_size,
+        statement_cache_size=config.db_statement_cache_size,
+        max_inactive_connection_lifetime=config.db_max_inactive_connection_lifetime,
+        command_timeout=config.db_command_timeout,
+        init=_on_connection_opened,
+        setup=_on_connection_acquired,
+    )
+    logger.info(
+        f"Database pool ready (min={config.db_pool_min_size}, max={config.db_pool_max_size}, "
+        f"statement_cache={config.db_statement_cache_size})"
+    )
+    return _db_pool
+
+
+async def close_db_pool() -> None:
+    """Close the shared connection pool."""
+    global _db_pool
+    pool, _db_pool = _db_pool, None
+    if pool is not None:
+        await pool.close()
+        logger.info("Database pool closed")
 
 
 async def get_db_pool() -> asyncpg.Pool | None:
@@ -12,7 +88,60 @@ async def get_db_pool() -> asyncpg.Pool | None:
     return _db_pool
 
 
+async def require_db_pool() -> asyncpg.Pool:
+    """Get the database connection pool, failing the request if there is none."""
+    if _db_pool is None:
+        raise HTTPException(status_code=503, detail="Database is not configured")
+    return _db_pool
+
+
 def set_db_pool(pool: asyncpg.Pool) -> None:
     """Set database connection pool."""
     global _db_pool
     _db_pool = pool
+
+
+async def acquire_db_connection() -> asyncpg.Connection:
+    """Check a connection out of the shared pool.
+
+    Falls back to a dedicated connection when the pool is not initialized
+    (scripts, tests). Always hand the connection back with release_db_connection().
+    """
+    if _db_pool is None:
+        url = get_database_url()
+        if not url:
+            raise RuntimeError("Database URL not configured")
+        return await asyncpg.connect(url, statement_cache_size=get_config().db_statement_cache_size)
+
+    start = time.perf_counter()
+    conn = await _db_pool.acquire()
+    _pool_counters["acquire_wait_seconds_total"] += time.perf_counter() - start
+    return conn
+
+
+async def release_db_connection(conn: asyncpg.Connection) -> None:
+    """Return a connection from acquire_db_connection()."""
+    if isinstance(conn, asyncpg.pool.PoolConnectionProxy) and _db_pool is not None:
+        await _db_pool.release(conn)
+    else:
+        await conn.close()
+
+
+def get_db_pool_stats() -> dict[str, Any]:
+    """Snapshot of pool utilisation for health checks and monitoring."""
+    if _db_pool is None:
+        return {"enabled": False}
+
+    size = _db_pool.get_size()
+    idle = _db_pool.get_idle_size()
+    return {
+        "enabled": True,
+        "size": size,
+        "idle": idle,
+        "in_use": size - idle,
+        "min_size": _db_pool.get_min_size(),
+        "max_size": _db_pool.get_max_size(),
+        "connections_opened": int(_pool_counters["connections_opened"]),
+        "acquisitions": int(_pool_counters["acquisitions"]),
+        "acquire_wait_seconds_total": round(_pool_counters["acquire_wait_seconds_total"], 3),
+    }
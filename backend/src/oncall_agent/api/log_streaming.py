@@ -2,11 +2,12 @@
 Real-time log streaming infrastructure for AI agent logs.
 """
 import asyncio
+import itertools
 import json
 import logging
 from collections import deque
 from collections.abc import AsyncGenerator
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Any
@@ -36,6 +37,7 @@ class AgentLogEntry:
     metadata: dict[str, Any] | None = None
     progress: float | None = None  # 0.0 to 1.0
     stage: str | None = None  # "webhook_received", "gathering_context", "claude_analysis", etc.
+    seq: int | None = None  # Assigned on publish, sent as the SSE event id
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -44,58 +46,234 @@ class AgentLogEntry:
         return data
 
 
+# Filterable entry fields, most selective first; a subscription is indexed
+# under the first of these it filters on
+FILTER_FIELDS = ("incident_id", "integration", "stage", "level")
+
+
+@dataclass(frozen=True)
+class LogFilter:
+    """Server-side subscription filter; each field is a set of accepted values."""
+    criteria: dict[str, frozenset[str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_params(cls, **params: str | None) -> "LogFilter":
+        """Build a filter from comma-separated query parameter values."""
+        criteria = {}
+        for name in FILTER_FIELDS:
+            raw = params.get(name)
+            values = frozenset(v.strip() for v in raw.split(",") if v.strip()) if raw else frozenset()
+            if values:
+                criteria[name] = frozenset(v.upper() for v in values) if name == "level" else values
+        return cls(criteria)
+
+    @property
+    def index_field(self) -> str | None:
+        """Field this filter is indexed under, or None for the unfiltered stream."""
+        return next((name for name in FILTER_FIELDS if name in self.criteria), None)
+
+    def matches(self, entry: "AgentLogEntry") -> bool:
+        return all(_entry_value(entry, name) in values for name, values in self.criteria.items())
+
+
+def _entry_value(entry: "AgentLogEntry", name: str) -> str | None:
+    value = getattr(entry, name)
+    return value.value if isinstance(value, Enum) else value
+
+
+class LogSubscription:
+    """Per-client delivery queue.
+
+    Publishing never waits on a client: when a client falls behind, its oldest
+    queued entries are dropped and counted so the stream can report the gap.
+    """
+
+    def __init__(self, client_id: str, maxsize: int = 100, filters: LogFilter | None = None):
+        self.client_id = client_id
+        self.filters = filters or LogFilter()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.replay: deque[tuple[int, str]] = deque()
+        self.dropped = 0
+
+    def push(self, seq: int, payload: str) -> None:
+        """Queue a serialized entry, evicting the oldest one if the queue is full."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait((seq, payload))
+
+    async def next(self, timeout: float) -> tuple[int, str]:
+        """Next (seq, payload), replayed entries first.
+
+        Raises:
+            TimeoutError: If nothing arrives within ``timeout`` seconds
+        """
+        if self.replay:
+            return self.replay.popleft()
+        return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+
+
 class LogStreamManager:
     """Manages log streaming for connected clients."""
 
-    def __init__(self, max_buffer_size: int = 1000):
-        self.buffer: deque = deque(maxlen=max_buffer_size)
-        self.clients: dict[str, asyncio.Queue] = {}
-        self.lock = asyncio.Lock()
+    def __init__(self, max_buffer_size: int = 1000, client_queue_size: int = 100,
+                 max_replay: int = 100):
+        # (seq, entry, serialized payload); seqs in the buffer are contiguous
+        self.buffer: deque[tuple[int, AgentLogEntry, str]] = deque(maxlen=max_buffer_size)
+        self.clients: dict[str, LogSubscription] = {}
+        self.client_queue_size = client_queue_size
+        self.max_replay = max_replay
+        self._seq = itertools.count(1)
+        # Unfiltered subscribers, and filtered ones by (index field -> value)
+        self._unfiltered: set[LogSubscription] = set()
+        self._index: dict[str, dict[str, set[LogSubscription]]] = {name: {} for name in FILTER_FIELDS}
         self.logger = logging.getLogger(__name__)
 
+    def publish(self, log_entry: AgentLogEntry) -> int:
+        """Buffer an entry and hand it to matching clients without awaiting.
+
+        The entry is serialized once and shared by all clients, so a slow or
+        stalled SSE connection can never hold up the agent. Only unfiltered
+        subscribers and those indexed under one of the entry's values are
+        visited.
+        """
+        seq = next(self._seq)
+        log_entry.seq = seq
+        payload = json.dumps({"data": log_entry.to_dict()})
+        self.buffer.append((seq, log_entry, payload))
+
+        for subscription in self._unfiltered:
+            subscription.push(seq, payload)
+        for name, buckets in self._index.items():
+            value = _entry_value(log_entry, name)
+            if value is None or value not in buckets:
+                continue
+            for subscription in buckets[value]:
+                if subscription.filters.matches(log_entry):
+                    subscription.push(seq, payload)
+        return seq
+
     async def add_log(self, log_entry: AgentLogEntry):
         """Add a log entry and notify all connected clients."""
-        async with self.lock:
-            # Add to buffer for replay to new clients
-            self.buffer.append(log_entry)
-
-            # Send to all connected clients
-            disconnected_clients = []
-            for client_id, queue in self.clients.items():
-                try:
-                    # Non-blocking put with timeout
-                    await asyncio.wait_for(
-                        queue.put(log_entry.to_dict()),
-                        timeout=0.5
-                    )
-                except (TimeoutError, asyncio.QueueFull):
-                    # Mark client for disconnection if queue is full
-                    disconnected_clients.append(client_id)
-
-            # Remove disconnected clients
-            for client_id in disconnected_clients:
-                del self.clients[client_id]
-                self.logger.info(f"Removed disconnected client: {client_id}")
-
-    async def subscribe(self, client_id: str) -> asyncio.Queue:
-        """Subscribe a client to log updates."""
-        async with self.lock:
-            queue = asyncio.Queue(maxsize=100)
-            self.clients[client_id] = queue
-
-            # Send buffered logs to new client
-            for log_entry in self.buffer:
-                await queue.put(log_entry.to_dict())
-
-            self.logger.info(f"New client subscribed: {client_id}")
-            return queue
-
-    async def unsubscribe(self, client_id: str):
-        """Unsubscribe a client from log updates."""
-        async with self.lock:
-            if client_id in self.clients:
-                del self.clients[client_id]
-                self.logger.info(f"Client unsubscribed: {client_id}")
+        self.publish(log_entry)
+
+    def subscribe(
+        self,
+        client_id: str,
+        last_event_id: int | None = None,
+        filters: LogFilter | None = None,
+        replay_limit: int | None = None
+    ) -> LogSubscription:
+        """Subscribe a client to log updates.
+
+        Up to ``replay_limit`` (default ``max_replay``) of the newest buffered
+        entries matching ``filters`` and newer than ``last_event_id`` are
+        replayed before live entries; older ones are available from history().
+        When resuming, entries the client can no longer get are reported
+        through ``dropped``.
+        """
+        subscription = LogSubscription(client_id, maxsize=self.client_queue_size, filters=filters)
+        limit = min(self.max_replay if replay_limit is None else replay_limit, self.max_replay)
+
+        if self.buffer:
+            after = 0 if last_event_id is None else last_event_id
+            replay, missed = self._newest_matching(subscription.filters, after, limit)
+            subscription.replay.extend(replay)
+            if last_event_id is not None:
+                evicted = max(0, self.buffer[0][0] - last_event_id - 1)
+                subscription.dropped = missed + (evicted if not subscription.filters.criteria else 0)
+
+        # Registered in the same step as the snapshot, so nothing is missed or duplicated
+        self.unsubscribe(client_id)
+        self.clients[client_id] = subscription
+        self._add_to_index(subscription)
+        self.logger.info(f"New client subscribed: {client_id} (replaying {len(subscription.replay)} entries)")
+        return subscription
+
+    def unsubscribe(self, client_id: str, subscription: LogSubscription | None = None):
+        """Unsubscribe a client from log updates.
+
+        When ``subscription`` is given, only that subscription is removed, so a
+        reconnect that reused the client id is left alone.
+        """
+        current = self.clients.get(client_id)
+        if current is not None and (subscription is None or current is subscription):
+            del self.clients[client_id]
+            self._remove_from_index(current)
+            self.logger.info(f"Client unsubscribed: {client_id}")
+
+    def history(
+        self,
+        filters: LogFilter | None = None,
+        before_seq: int | None = None,
+        limit: int = 100
+    ) -> tuple[list[dict[str, Any]], int | None]:
+        """Page backwards through buffered entries matching ``filters``.
+
+        Returns:
+            Entries oldest first, and the ``before_seq`` for the next older page
+            (None when there is nothing older)
+        """
+        filters = filters or LogFilter()
+        if not self.buffer:
+            return [], None
+
+        oldest = self.buffer[0][0]
+        end = len(self.buffer) if before_seq is None else max(0, min(len(self.buffer), before_seq - oldest))
+        entries: list[AgentLogEntry] = []
+        position = end - 1
+        while position >= 0:
+            _, entry, _ = self.buffer[position]
+            position -= 1
+            if filters.matches(entry):
+                if len(entries) == limit:
+                    return [e.to_dict() for e in reversed(entries)], entries[-1].seq
+                entries.append(entry)
+        return [e.to_dict() for e in reversed(entries)], None
+
+    def _newest_matching(
+        self, filters: LogFilter, after_seq: int, limit: int
+    ) -> tuple[list[tuple[int, str]], int]:
+        """Newest ``limit`` buffered entries after ``after_seq`` matching ``filters``.
+
+        Returns the entries oldest first and how many older matches were left out.
+        """
+        selected: list[tuple[int, str]] = []
+        skipped = 0
+        for seq, entry, payload in reversed(self.buffer):
+            if seq <= after_seq:
+                break
+            if filters.matches(entry):
+                if len(selected) < limit:
+                    selected.append((seq, payload))
+                else:
+                    skipped += 1
+        selected.reverse()
+        return selected, skipped
+
+    def _add_to_index(self, subscription: LogSubscription) -> None:
+        name = subscription.filters.index_field
+        if name is None:
+            self._unfiltered.add(subscription)
+            return
+        # Multi-value filters are indexed under each value; an entry has one value
+        # per field, so it still reaches the subscription at most once
+        buckets = self._index[name]
+        for value in subscription.filters.criteria[name]:
+            buckets.setdefault(value, set()).add(subscription)
+
+    def _remove_from_index(self, subscription: LogSubscription) -> None:
+        name = subscription.filters.index_field
+        if name is None:
+            self._unfiltered.discard(subscription)
+            return
+        buckets = self._index[name]
+        for value in subscription.filters.criteria[name]:
+            bucket = buckets.get(value)
+            if bucket is not None:
+                bucket.discard(subscription)
+                if not bucket:
+                    del buckets[value]
 
     def create_log_entry(
         self,
@@ -152,9 +330,15 @@ class LogStreamManager:
 log_stream_manager = LogStreamManager()
 
 
-async def agent_log_generator(request: Request, client_id: str) -> AsyncGenerator[str, None]:
+async def agent_log_generator(
+    request: Request,
+    client_id: str,
+    last_event_id: int | None = None,
+    filters: LogFilter | None = None,
+    replay_limit: int | None = None
+) -> AsyncGenerator[str | dict, None]:
     """Generate Server-Sent Events for agent logs."""
-    queue = await log_stream_manager.subscribe(client_id)
+    subscription = log_stream_manager.subscribe(client_id, last_event_id, filters, replay_limit)
 
     try:
         while True:
@@ -162,25 +346,49 @@ async def agent_log_generator(request: Request, client_id: str) -> AsyncGenerato
             if await request.is_disconnected():
                 break
 
+            if subscription.dropped:
+                yield json.dumps({"type": "dropped", "count": subscription.dropped})
+                subscription.dropped = 0
+
             try:
                 # Wait for new log entries with timeout
-                log_data = await asyncio.wait_for(queue.get(), timeout=30.0)
-                yield json.dumps({"data": log_data})
+                seq, payload = await subscription.next(timeout=30.0)
+                yield {"id": str(seq), "data": payload}
             except TimeoutError:
                 # Send heartbeat to keep connection alive
                 yield json.dumps({"type": "heartbeat", "timestamp": datetime.utcnow().isoformat() + "Z"})
 
     finally:
-        await log_stream_manager.unsubscribe(client_id)
+        log_stream_manager.unsubscribe(client_id, subscription)
 
 
-def create_sse_response(request: Request, client_id: str) -> EventSourceResponse:
-    """Create an SSE response for streaming agent logs."""
+def _parse_last_event_id(value: str | None) -> int | None:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+def create_sse_response(
+    request: Request,
+    client_id: str,
+    last_event_id: int | None = None,
+    filters: LogFilter | None = None,
+    replay_limit: int | None = None
+) -> EventSourceResponse:
+    """Create an SSE response for streaming agent logs.
+
+    Resumes after ``last_event_id``, or after the Last-Event-ID header that
+    browsers send when an EventSource reconnects.
+    """
     # Get origin from request headers for CORS
     origin = request.headers.get("origin", "http://localhost:3000")
 
+    if last_event_id is None:
+        last_event_id = _parse_last_event_id(request.headers.get("last-event-id"))
+
     return EventSourceResponse(
-        agent_log_generator(request, client_id),
+        agent_log_generator(request, client_id, last_event_id, filters, replay_limit),
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
@@ -1,18 +1,46 @@
 """Bridge between PagerDuty alerts and the oncall agent."""
 
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import re
 from datetime import datetime
 from typing import Any
 
-from src.oncall_agent.agent import OncallAgent, PagerAlert
+from src.oncall_agent.agent import OncallAgent
 from src.oncall_agent.agent_enhanced import EnhancedOncallAgent
+from src.oncall_agent.api.alert_coalescer import (
+    AlertCoalescer,
+    CoalescedGroup,
+    alert_fingerprint,
+)
 from src.oncall_agent.api.alert_context_parser import ContextExtractor
+from src.oncall_agent.api.alert_scheduler import AlertScheduler, QueueFullError
 from src.oncall_agent.api.log_streaming import log_stream_manager
 from src.oncall_agent.api.models import PagerDutyIncidentData
 from src.oncall_agent.config import get_config
+from src.oncall_agent.services.incident_store import get_incident_repository
+from src.oncall_agent.services.metrics import (
+    ALERT_QUEUE_CAPACITY,
+    ALERT_QUEUE_DEPTH,
+    ALERT_STAGE_SECONDS,
+    ALERTS_HANDLED,
+    ALERTS_RUNNING,
+    REGISTRY,
+)
 from src.oncall_agent.utils import get_logger
 
+# Scheduler priority for PagerDuty urgency when the incident has no P1-P5 priority
+URGENCY_PRIORITY = {"high": 1, "medium": 2, "low": 3}
+
+
+def alert_priority(incident: PagerDutyIncidentData) -> int:
+    """Scheduling priority for an incident, 0 (P1) being the most urgent."""
+    priority = incident.priority or {}
+    label = str(priority.get("summary") or priority.get("name") or "")
+    match = re.match(r"P(\d)", label.upper())
+    if match:
+        return max(0, int(match.group(1)) - 1)
+    return URGENCY_PRIORITY.get((incident.urgency or "").lower(), 2)
+
 
 class OncallAgentTrigger:
     """Manages triggering the oncall agent from external sources."""
@@ -24,11 +52,17 @@ class OncallAgentTrigger:
         self.use_enhanced = use_enhanced
         self.context_extractor = ContextExtractor()
 
-        # Thread pool for async execution
-        self.executor = ThreadPoolExecutor(max_workers=5)
-
-        # Queue for managing concurrent alerts
-        self.alert_queue = asyncio.Queue(maxsize=100)
+        # Priority worker pool that runs queued alerts through trigger_oncall_agent
+        self.scheduler = AlertScheduler(
+            self._run_scheduled_alert,
+            workers=self.config.alert_workers,
+            max_queue=self.config.alert_queue_size,
+            per_service_limit=self.config.alert_per_service_concurrency,
+            name="alert"
+        )
+        self.queued_alerts: set[str] = set()
+        # Alerts for the same failure within the window share one analysis
+        self.coalescer = AlertCoalescer(window=self.config.alert_coalesce_window)
         self.processing_alerts = {}
 
         # Prompt templates
@@ -82,6 +116,116 @@ Please provide brief analysis and recommendations."""
 
             await self.agent.connect_integrations()
 
+        self.scheduler.start()
+        REGISTRY.add_collector("alert_queue", self._collect_metrics)
+
+    def _collect_metrics(self) -> None:
+        ALERT_QUEUE_DEPTH.set(self.scheduler.queue_size)
+        ALERT_QUEUE_CAPACITY.set(self.scheduler.max_queue)
+        ALERTS_RUNNING.set(self.scheduler.running)
+
+    async def process_incident_async(self, pagerduty_incident: PagerDutyIncidentData,
+                                     context: dict[str, Any] | None = None) -> dict[str, Any]:
+        """
+        Queue an incident for the agent and return without waiting for analysis.
+
+        Returns:
+            Dict with status "queued", "coalesced", "duplicate" or "rejected";
+            "rejected" carries retry_after so the webhook can ask the sender
+            to back off, "coalesced" names the incident it was attached to
+        """
+        incident_id = pagerduty_incident.id
+        if incident_id in self.queued_alerts or incident_id in self.processing_alerts:
+            return {
+                "status": "duplicate",
+                "message": "Alert already queued or being processed",
+                "alert_id": incident_id
+            }
+
+        namespace, deployment = self.context_extractor.extract_k8s_target(pagerduty_incident)
+        fingerprint = alert_fingerprint(pagerduty_incident, namespace, deployment)
+        group, opened = self.coalescer.admit(fingerprint, incident_id)
+        if not opened:
+            return await self._attach_to_group(pagerduty_incident, group)
+
+        priority = alert_priority(pagerduty_incident)
+        service = pagerduty_incident.service.name if pagerduty_incident.service else "unknown"
+        try:
+            job = await self.scheduler.submit(incident_id, service, priority, (pagerduty_incident, context))
+        except QueueFullError as e:
+            self.logger.warning(f"Rejecting alert {incident_id}: {e}")
+            if group:
+                # Let the sender's retry open the window again
+                self.coalescer.discard(group)
+            return {
+                "status": "rejected",
+                "message": str(e),
+                "alert_id": incident_id,
+                "retry_after": e.retry_after
+            }
+
+        self.queued_alerts.add(incident_id)
+        await log_stream_manager.log_info(
+            f"📥 Alert queued for analysis (priority P{priority + 1})",
+            incident_id=incident_id,
+            stage="queued",
+            progress=0.05,
+            metadata={"service": service, "queue_position": self.scheduler.position(job)}
+        )
+        return {
+            "status": "queued",
+            "message": "Alert queued for processing",
+            "alert_id": incident_id,
+            "priority": priority,
+            "queue_size": self.scheduler.queue_size
+        }
+
+    async def _attach_to_group(self, pagerduty_incident: PagerDutyIncidentData,
+                               group: CoalescedGroup) -> dict[str, Any]:
+        """Record a follow-up alert on the incident whose analysis covers it."""
+        incident_id = pagerduty_incident.id
+        self.logger.info(f"Coalescing alert {incident_id} into {group.primary_id} ({group.size} alerts)")
+
+        repository = get_incident_repository()
+        primary = await repository.get(group.primary_id)
+        if primary:
+            primary.metadata.setdefault("coalesced_alerts", []).append(incident_id)
+            primary.timeline.append({
+                "timestamp": datetime.now().isoformat(),
+                "event": "alert_coalesced",
+                "description": f"Follow-up alert {incident_id}: {pagerduty_incident.title}",
+                "alert_id": incident_id
+            })
+            await repository.save(primary)
+        follow_up = await repository.get(incident_id)
+        if follow_up:
+            follow_up.metadata["coalesced_into"] = group.primary_id
+            await repository.save(follow_up)
+
+        await log_stream_manager.log_info(
+            f"🔗 Follow-up alert attached ({group.size} alerts in this incident)",
+            incident_id=group.primary_id,
+            stage="coalesced",
+            metadata={"alert_id": incident_id, "fingerprint": group.fingerprint}
+        )
+        return {
+            "status": "coalesced",
+            "message": "Alert attached to an incident already being analyzed",
+            "alert_id": incident_id,
+            "incident_id": group.primary_id,
+            "coalesced_count": group.size
+        }
+
+    async def _run_scheduled_alert(self, payload: tuple[PagerDutyIncidentData, dict[str, Any] | None]) -> dict[str, Any]:
+        """Scheduler handler: run one queued incident through the agent."""
+        pagerduty_incident, context = payload
+        self.queued_alerts.discard(pagerduty_incident.id)
+        group = self.coalescer.group_for(pagerduty_incident.id)
+        if group and group.followers:
+            # Tell the analysis how many alerts it speaks for
+            context = {**(context or {}), "coalesced_alerts": list(group.followers)}
+        return await self.trigger_oncall_agent(pagerduty_incident, context)
+
     async def trigger_oncall_agent(self, pagerduty_incident: PagerDutyIncidentData,
                                   context: dict[str, Any] | None = None) -> dict[str, Any]:
         """
@@ -94,6 +238,7 @@ Please provide brief analysis and recommendations."""
         Returns:
             Dict containing agent response and metadata
         """
+        counted = False
         try:
             # Extract alert and context
             pager_alert, extracted_context = self.context_extractor.extract_from_incident(pagerduty_incident)
@@ -150,16 +295,6 @@ Please provide brief analysis and recommendations."""
                 progress=0.2
             )
 
-            # Run in background if queue is getting full
-            if self.alert_queue.qsize() > 10:
-                asyncio.create_task(self._process_alert_async(pager_alert))
-                return {
-                    "status": "queued",
-                    "message": "Alert queued for processing",
-                    "alert_id": pager_alert.alert_id,
-                    "queue_size": self.alert_queue.qsize()
-                }
-
             # Process immediately
             if not self.agent:
                 await self.initialize()
@@ -170,6 +305,9 @@ Please provide brief analysis and recommendations."""
             start_time = datetime.now()
             result = await self.agent.handle_pager_alert(pager_alert)
             processing_time = (datetime.now() - start_time).total_seconds()
+            ALERT_STAGE_SECONDS.labels(stage="total").observe(processing_time)
+            ALERTS_HANDLED.labels(status=result.get("status", "unknown")).inc()
+            counted = True
 
             self.logger.info("✅ Agent processing complete")
             self.logger.info(f"📋 Agent Response Summary: {result.get('status', 'unknown')}")
@@ -206,6 +344,8 @@ Please provide brief analysis and recommendations."""
 
         except TimeoutError:
             self.logger.error(f"Timeout processing alert {pagerduty_incident.id}")
+            if not counted:
+                ALERTS_HANDLED.labels(status="timeout").inc()
             return {
                 "status": "timeout",
                 "message": "Agent processing timed out",
@@ -213,6 +353,8 @@ Please provide brief analysis and recommendations."""
             }
         except Exception as e:
             self.logger.error(f"Error triggering oncall agent: {e}", exc_info=True)
+            if not counted:
+                ALERTS_HANDLED.labels(status="error").inc()
             return {
                 "status": "error",
                 "message": str(e),
@@ -223,42 +365,19 @@ Please provide brief analysis and recommendations."""
             if pagerduty_incident.id in self.processing_alerts:
                 del self.processing_alerts[pagerduty_incident.id]
 
-    async def _process_alert_async(self, incident: PagerDutyIncidentData):
-        """Process alert asynchronously in the background."""
-        try:
-            # Convert PagerDutyIncidentData to PagerAlert
-            pager_alert = PagerAlert(
-                alert_id=incident.id,
-                service_name=incident.service.name if incident.service else "Unknown Service",
-                severity=incident.urgency or "medium",
-                description=incident.description or incident.title,
-                metadata={
-                    "incident_number": incident.incident_number,
-                    "status": incident.status,
-                    "created_at": incident.created_at,
-                    "service_id": incident.service.id if incident.service else None
-                },
-                timestamp=datetime.now().isoformat()
-            )
-
-            await self.alert_queue.put(pager_alert)
-            if not self.agent:
-                await self.initialize()
-            assert self.agent is not None
-            result = await self.agent.handle_pager_alert(pager_alert)
-            self.logger.info(f"Background processing complete for alert {pager_alert.alert_id}")
-            return result
-        except Exception as e:
-            self.logger.error(f"Error in background processing: {e}", exc_info=True)
-
     async def process_batch_alerts(self, incidents: list[PagerDutyIncidentData]) -> dict[str, Any]:
-        """Process multiple alerts concurrently."""
-        tasks = []
+        """Process multiple alerts through the scheduler and wait for all of them."""
+        futures = []
+        results: list[Any] = []
         for incident in incidents:
-            task = asyncio.create_task(self.trigger_oncall_agent(incident))
-            tasks.append(task)
+            service = incident.service.name if incident.service else "unknown"
+            try:
+                job = await self.scheduler.submit(incident.id, service, alert_priority(incident), (incident, None))
+                futures.append(job.future)
+            except QueueFullError as e:
+                results.append({"status": "error", "message": str(e), "alert_id": incident.id})
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        results.extend(await asyncio.gather(*futures, return_exceptions=True))
 
         return {
             "total": len(incidents),
@@ -270,20 +389,20 @@ Please provide brief analysis and recommendations."""
     def get_queue_status(self) -> dict[str, Any]:
         """Get current queue and processing status."""
         return {
-            "queue_size": self.alert_queue.qsize(),
+            "queue_size": self.scheduler.queue_size,
             "processing_count": len(self.processing_alerts),
             "processing_alerts": list(self.processing_alerts.keys()),
-            "queue_capacity": self.alert_queue.maxsize
+            "queue_capacity": self.scheduler.max_queue,
+            "scheduler": self.scheduler.get_status(),
+            "coalescing": self.coalescer.get_status()
         }
 
     async def shutdown(self):
         """Gracefully shutdown the trigger."""
         self.logger.info("Shutting down OncallAgentTrigger")
+        REGISTRY.remove_collector("alert_queue")
 
-        # Wait for queue to empty
-        if not self.alert_queue.empty():
-            self.logger.info(f"Waiting for {self.alert_queue.qsize()} alerts to process")
-            await self.alert_queue.join()
-
-        # Shutdown executor
-        self.executor.shutdown(wait=True)
+        # Stop accepting alerts and let queued ones finish
+        if self.scheduler.queue_size or self.scheduler.running:
+            self.logger.info(f"Draining {self.scheduler.queue_size} queued and {self.scheduler.running} running alerts")
+        await self.scheduler.drain(timeout=self.config.alert_drain_timeout)
@@ -31,6 +31,9 @@ from src.oncall_agent.api.schemas import (
     SuccessResponse,
 )
 from src.oncall_agent.approval_manager import approval_manager
+from src.oncall_agent.mcp_integrations.incident_cache import get_read_cache_stats
+from src.oncall_agent.services.analysis_cache import get_analysis_cache
+from src.oncall_agent.services.audit_store import get_audit_store
 from src.oncall_agent.utils import get_logger
 
 logger = get_logger(__name__)
@@ -613,6 +616,35 @@ async def get_learning_metrics() -> JSONResponse:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/analysis-cache")
+async def get_analysis_cache_stats() -> JSONResponse:
+    """Hit/miss statistics of the LLM analysis cache."""
+    cache = get_analysis_cache()
+    if cache is None:
+        return JSONResponse(content={"enabled": False})
+    return JSONResponse(content={"enabled": True, **cache.get_stats()})
+
+
+@router.delete("/analysis-cache", response_model=SuccessResponse)
+async def clear_analysis_cache() -> SuccessResponse:
+    """Drop every cached analysis so the next alerts are analysed afresh."""
+    cache = get_analysis_cache()
+    if cache is None:
+        return SuccessResponse(success=True, message="Analysis cache is disabled")
+    cleared = len(cache)
+    cache.clear()
+    await cache.save()
+    return SuccessResponse(success=True, message=f"Cleared {cleared} cached analyses")
+
+
+@router.get("/mcp-read-cache")
+async def get_mcp_read_cache_stats(
+    limit: int = Query(20, ge=1, le=100, description="Number of recent incidents")
+) -> JSONResponse:
+    """Per-incident hit counts of the MCP read cache, newest first."""
+    return JSONResponse(content={"incidents": get_read_cache_stats()[:limit]})
+
+
 @router.post("/feedback")
 async def submit_feedback(
     incident_id: str = Query(..., description="Incident ID"),
@@ -996,9 +1028,7 @@ async def get_execution_history(limit: int = 50) -> list[dict]:
         global enhanced_agent_instance
 
         if enhanced_agent_instance and enhanced_agent_instance.agent_executor:
-            history = enhanced_agent_instance.agent_executor.get_execution_history()
-            # Return most recent entries
-            return history[-limit:]
+            return await enhanced_agent_instance.agent_executor.get_execution_history(limit=limit)
         else:
             return []
 
@@ -1014,12 +1044,30 @@ async def get_k8s_audit_log(limit: int = 100) -> list[dict]:
         global enhanced_agent_instance
 
         if enhanced_agent_instance and enhanced_agent_instance.k8s_mcp:
-            audit_log = enhanced_agent_instance.k8s_mcp.get_audit_log()
-            # Return most recent entries
-            return audit_log[-limit:]
+            return await enhanced_agent_instance.k8s_mcp.get_audit_log(limit=limit)
         else:
             return []
 
     except Exception as e:
         logger.error(f"Error getting K8s audit log: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/audit-log", response_model=list[dict])
+async def query_audit_log(
+    category: str | None = Query(None, description="mcp_tool, execution, resolution or integration"),
+    incident_id: str | None = Query(None, description="Only records of this incident"),
+    tool: str | None = Query(None, description="MCP tool or action name"),
+    since: datetime | None = Query(None, description="Earliest record time"),
+    until: datetime | None = Query(None, description="Latest record time"),
+    limit: int = Query(100, ge=1, le=1000)
+) -> list[dict]:
+    """Query the audit trail by incident, tool and time range."""
+    return await get_audit_store().aquery(
+        category=category,
+        tool=tool,
+        incident_id=incident_id,
+        since=since.timestamp() if since else None,
+        until=until.timestamp() if until else None,
+        limit=limit
+    )
@@ -5,7 +5,7 @@ import uuid
 
 from fastapi import APIRouter, Query, Request
 
-from ..log_streaming import create_sse_response, log_stream_manager
+from ..log_streaming import LogFilter, create_sse_response, log_stream_manager
 
 router = APIRouter(
     prefix="/agent-logs",
@@ -17,8 +17,13 @@ router = APIRouter(
 @router.get("/stream")
 async def stream_agent_logs(
     request: Request,
-    incident_id: str | None = Query(None, description="Filter logs by incident ID"),
-    client_id: str | None = Query(None, description="Client ID for the connection")
+    incident_id: str | None = Query(None, description="Filter logs by incident ID (comma-separated)"),
+    stage: str | None = Query(None, description="Filter logs by stage (comma-separated)"),
+    level: str | None = Query(None, description="Filter logs by level (comma-separated)"),
+    integration: str | None = Query(None, description="Filter logs by integration (comma-separated)"),
+    client_id: str | None = Query(None, description="Client ID for the connection"),
+    last_event_id: int | None = Query(None, description="Resume after this event id (overrides the Last-Event-ID header)"),
+    replay: int | None = Query(None, ge=0, le=100, description="Number of recent matching entries to replay")
 ):
     """
     Stream real-time AI agent logs via Server-Sent Events (SSE).
@@ -41,9 +46,39 @@ async def stream_agent_logs(
     if not client_id:
         client_id = str(uuid.uuid4())
 
-    # TODO: Add filtering by incident_id if provided
+    filters = LogFilter.from_params(
+        incident_id=incident_id,
+        stage=stage,
+        level=level,
+        integration=integration
+    )
+
+    return create_sse_response(request, client_id, last_event_id, filters, replay)
+
+
+@router.get("/history")
+async def get_agent_log_history(
+    incident_id: str | None = Query(None, description="Filter logs by incident ID (comma-separated)"),
+    stage: str | None = Query(None, description="Filter logs by stage (comma-separated)"),
+    level: str | None = Query(None, description="Filter logs by level (comma-separated)"),
+    integration: str | None = Query(None, description="Filter logs by integration (comma-separated)"),
+    before_seq: int | None = Query(None, description="Return entries older than this sequence number"),
+    limit: int = Query(100, ge=1, le=500)
+):
+    """
+    Page backwards through buffered agent logs.
 
-    return create_sse_response(request, client_id)
+    The stream only replays the most recent entries; older ones are fetched
+    here by passing the returned ``next_before_seq`` as ``before_seq``.
+    """
+    filters = LogFilter.from_params(
+        incident_id=incident_id,
+        stage=stage,
+        level=level,
+        integration=integration
+    )
+    logs, next_before_seq = log_stream_manager.history(filters, before_seq, limit)
+    return {"logs": logs, "next_before_seq": next_before_seq}
 
 
 @router.post("/test")
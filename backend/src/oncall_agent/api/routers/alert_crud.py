@@ -278,11 +278,9 @@ async def delete_all_alerts(
 async def reset_alert_usage(user_id: str):
     """Reset alert usage count for a user (testing only)"""
     try:
-        from .alert_tracking import USER_DATA
+        from ...services.quota_service import get_quota_service
 
-        if user_id in USER_DATA:
-            USER_DATA[user_id]["alerts_used"] = 0
-            USER_DATA[user_id]["incidents_processed"] = set()
+        if await get_quota_service().reset(user_id):
             logger.info(f"Reset alert usage for user {user_id}")
 
             return {
@@ -1,12 +1,14 @@
 """Authentication and setup flow API endpoints."""
 
-import os
 from datetime import datetime
 
-import asyncpg
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.oncall_agent.api.dependencies import (
+    acquire_db_connection,
+    release_db_connection,
+)
 from src.oncall_agent.api.models.auth import (
     CompleteSetupRequest,
     CompleteSetupResponse,
@@ -27,19 +29,10 @@ from src.oncall_agent.services.llm_validator import LLMValidator
 from src.oncall_agent.services.user_config import UserConfigService
 from src.oncall_agent.utils.logger import get_logger
 
-# Database connection
-DATABASE_URL = os.getenv("DATABASE_URL", os.getenv("POSTGRES_URL", ""))
 
 async def get_db_connection():
-    """Get database connection."""
-    # Remove channel_binding parameter which asyncpg doesn't support
-    clean_url = DATABASE_URL
-    if "&channel_binding=require" in clean_url:
-        clean_url = clean_url.replace("&channel_binding=require", "")
-    elif "?channel_binding=require" in clean_url:
-        clean_url = clean_url.replace("?channel_binding=require", "")
-
-    return await asyncpg.connect(clean_url)
+    """Get a database connection from the shared pool."""
+    return await acquire_db_connection()
 
 # This would normally come from your auth system
 async def get_current_user(firebase_user: FirebaseUser = Depends(get_current_firebase_user)) -> dict:
@@ -69,7 +62,7 @@ async def get_current_user(firebase_user: FirebaseUser = Depends(get_current_fir
             "role": user['role']
         }
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 # This would normally come from your database dependency
 async def get_db() -> AsyncSession:
@@ -8,6 +8,10 @@ import asyncpg
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, EmailStr
 
+from src.oncall_agent.api.dependencies import (
+    acquire_db_connection,
+    release_db_connection,
+)
 from src.oncall_agent.utils.logger import get_logger
 
 try:
@@ -24,8 +28,6 @@ except Exception as e:
 logger = get_logger(__name__)
 router = APIRouter(prefix="/api/v1/auth", tags=["firebase-authentication"])
 
-# Database connection
-DATABASE_URL = os.getenv("DATABASE_URL", os.getenv("POSTGRES_URL", ""))
 
 
 @router.get("/firebase-status")
@@ -50,24 +52,24 @@ async def test_database_connection():
     """Test database connection and list users."""
     try:
         conn = await get_db()
-
-        # Test connection
-        version = await conn.fetchval("SELECT version()")
-
-        # Count users
-        user_count = await conn.fetchval("SELECT COUNT(*) FROM users")
-
-        # Get all users with their setup status
-        users = await conn.fetch("""
-            SELECT u.id, u.firebase_uid, u.email, u.created_at,
-                   COUNT(usr.id) as setup_requirements_count
-            FROM users u
-            LEFT JOIN user_setup_requirements usr ON u.id = usr.user_id
-            GROUP BY u.id, u.firebase_uid, u.email, u.created_at
-            ORDER BY u.created_at DESC
-        """)
-
-        await conn.close()
+        try:
+            # Test connection
+            version = await conn.fetchval("SELECT version()")
+
+            # Count users
+            user_count = await conn.fetchval("SELECT COUNT(*) FROM users")
+
+            # Get all users with their setup status
+            users = await conn.fetch("""
+                SELECT u.id, u.firebase_uid, u.email, u.created_at,
+                       COUNT(usr.id) as setup_requirements_count
+                FROM users u
+                LEFT JOIN user_setup_requirements usr ON u.id = usr.user_id
+                GROUP BY u.id, u.firebase_uid, u.email, u.created_at
+                ORDER BY u.created_at DESC
+            """)
+        finally:
+            await release_db_connection(conn)
 
         return {
             "status": "connected",
@@ -115,16 +117,8 @@ class SetupStatusResponse(BaseModel):
 
 
 async def get_db():
-    """Get database connection."""
-    # Remove channel_binding parameter which asyncpg doesn't support
-    clean_url = DATABASE_URL
-    if "&channel_binding=require" in clean_url:
-        clean_url = clean_url.replace("&channel_binding=require", "")
-    elif "?channel_binding=require" in clean_url:
-        clean_url = clean_url.replace("?channel_binding=require", "")
-
-    logger.debug("Connecting to database...")
-    return await asyncpg.connect(clean_url)
+    """Get a database connection from the shared pool."""
+    return await acquire_db_connection()
 
 
 @router.post("/firebase-signin", response_model=AuthResponse)
@@ -226,7 +220,7 @@ async def firebase_sign_in(
         logger.error(f"Firebase sign in error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 
 @router.post("/firebase-signup", response_model=AuthResponse)
@@ -336,7 +330,6 @@ async def firebase_sign_up(
                 datetime.utcnow(),
                 existing['id']
             )
-            await conn.close()
             return AuthResponse(
                 success=True,
                 message="User updated with Firebase UID",
@@ -348,7 +341,7 @@ async def firebase_sign_up(
         logger.error(f"Firebase sign up error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 
 @router.get("/me", response_model=UserResponse)
@@ -387,7 +380,7 @@ async def get_current_user(
         logger.error(f"Get current user error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 
 @router.get("/setup-status", response_model=SetupStatusResponse)
@@ -492,7 +485,7 @@ async def get_setup_status(
         logger.error(f"Get setup status error: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
     finally:
-        await conn.close()
+        await release_db_connection(conn)
 
 
 
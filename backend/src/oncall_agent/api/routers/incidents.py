@@ -17,14 +17,23 @@ from src.oncall_agent.api.schemas import (
     Severity,
     SuccessResponse,
 )
+from src.oncall_agent.services.incident_store import (
+    IncidentFilter,
+    InMemoryIncidentRepository,
+    get_incident_repository,
+)
 from src.oncall_agent.utils import get_logger
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/incidents", tags=["incidents"])
 
-# In-memory storage for demo - replace with database
-INCIDENTS_DB: dict[str, Incident] = {}
-ANALYSIS_DB: dict[str, dict] = {}  # Store full AI analysis
+
+async def get_incident_or_404(incident_id: str) -> Incident:
+    """Load an incident from the store or raise 404."""
+    incident = await get_incident_repository().get(incident_id)
+    if incident is None:
+        raise HTTPException(status_code=404, detail="Incident not found")
+    return incident
 
 
 def create_mock_incident(data: IncidentCreate) -> Incident:
@@ -84,7 +93,7 @@ async def create_incident(
     try:
         # Create incident
         incident = create_mock_incident(incident_data)
-        INCIDENTS_DB[incident.id] = incident
+        await get_incident_repository().save(incident)
 
         logger.info(f"Created incident {incident.id}: {incident.title}")
 
@@ -115,52 +124,33 @@ async def list_incidents(
     severity: Severity | None = None,
     service: str | None = None,
     sort_by: str = Query("created_at", regex="^(created_at|updated_at|severity)$"),
-    sort_order: str = Query("desc", regex="^(asc|desc)$")
+    sort_order: str = Query("desc", regex="^(asc|desc)$"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page; overrides page")
 ) -> IncidentList:
     """List incidents with filtering and pagination."""
     try:
-        # Filter incidents
-        filtered_incidents = list(INCIDENTS_DB.values())
-
-        if status:
-            filtered_incidents = [i for i in filtered_incidents if i.status == status]
-        if severity:
-            filtered_incidents = [i for i in filtered_incidents if i.severity == severity]
-        if service:
-            filtered_incidents = [i for i in filtered_incidents if i.service_name == service]
-
-        # Sort incidents
-        reverse = sort_order == "desc"
-        if sort_by == "created_at":
-            filtered_incidents.sort(key=lambda x: x.created_at, reverse=reverse)
-        elif sort_by == "severity":
-            severity_order = {
-                Severity.CRITICAL: 0,
-                Severity.HIGH: 1,
-                Severity.MEDIUM: 2,
-                Severity.LOW: 3,
-                Severity.INFO: 4
-            }
-            filtered_incidents.sort(
-                key=lambda x: severity_order[x.severity],
-                reverse=not reverse  # Reverse logic for severity
-            )
-
-        # Paginate
-        total = len(filtered_incidents)
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-
-        incidents = filtered_incidents[start_idx:end_idx]
-        has_next = end_idx < total
+        repository = get_incident_repository()
+        filters = IncidentFilter(status=status, severity=severity, service_name=service)
+
+        result = await repository.list_page(
+            filters,
+            sort_by=sort_by,
+            descending=sort_order == "desc",
+            limit=page_size,
+            cursor=cursor,
+            offset=(page - 1) * page_size
+        )
 
         return IncidentList(
-            incidents=incidents,
-            total=total,
+            incidents=result.incidents,
+            total=await repository.count(filters),
             page=page,
             page_size=page_size,
-            has_next=has_next
+            has_next=result.has_next,
+            next_cursor=result.next_cursor
         )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing incidents: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -171,10 +161,7 @@ async def get_incident(
     incident_id: str = Path(..., description="Incident ID")
 ) -> Incident:
     """Get incident details."""
-    if incident_id not in INCIDENTS_DB:
-        raise HTTPException(status_code=404, detail="Incident not found")
-
-    return INCIDENTS_DB[incident_id]
+    return await get_incident_or_404(incident_id)
 
 
 @router.patch("/{incident_id}", response_model=Incident)
@@ -183,10 +170,7 @@ async def update_incident(
     update_data: IncidentUpdate = ...
 ) -> Incident:
     """Update incident details."""
-    if incident_id not in INCIDENTS_DB:
-        raise HTTPException(status_code=404, detail="Incident not found")
-
-    incident = INCIDENTS_DB[incident_id]
+    incident = await get_incident_or_404(incident_id)
     now = datetime.now(UTC)
 
     # Update fields
@@ -223,6 +207,7 @@ async def update_incident(
         incident.resolution = update_data.resolution
 
     incident.updated_at = now
+    await get_incident_repository().save(incident)
 
     logger.info(f"Updated incident {incident_id}")
     return incident
@@ -235,10 +220,7 @@ async def execute_action(
     background_tasks: BackgroundTasks = ...
 ) -> SuccessResponse:
     """Execute an action on an incident."""
-    if incident_id not in INCIDENTS_DB:
-        raise HTTPException(status_code=404, detail="Incident not found")
-
-    incident = INCIDENTS_DB[incident_id]
+    incident = await get_incident_or_404(incident_id)
 
     # Add action to incident
     incident.actions_taken.append(action)
@@ -249,6 +231,8 @@ async def execute_action(
         "automated": action.automated,
         "user": action.user or "system"
     })
+    incident.updated_at = datetime.now(UTC)
+    await get_incident_repository().save(incident)
 
     # Mock action execution
     background_tasks.add_task(
@@ -277,10 +261,7 @@ async def get_incident_timeline(
     incident_id: str = Path(..., description="Incident ID")
 ) -> JSONResponse:
     """Get incident timeline."""
-    if incident_id not in INCIDENTS_DB:
-        raise HTTPException(status_code=404, detail="Incident not found")
-
-    incident = INCIDENTS_DB[incident_id]
+    incident = await get_incident_or_404(incident_id)
 
     return JSONResponse(content={
         "incident_id": incident_id,
@@ -294,25 +275,19 @@ async def get_related_incidents(
     limit: int = Query(5, ge=1, le=20)
 ) -> JSONResponse:
     """Get related incidents."""
-    if incident_id not in INCIDENTS_DB:
-        raise HTTPException(status_code=404, detail="Incident not found")
-
-    incident = INCIDENTS_DB[incident_id]
+    incident = await get_incident_or_404(incident_id)
 
     # Mock related incidents
     related = []
-    for i, inc in enumerate(INCIDENTS_DB.values()):
-        if inc.id != incident_id and inc.service_name == incident.service_name:
-            related.append({
-                "id": inc.id,
-                "title": inc.title,
-                "severity": inc.severity,
-                "status": inc.status,
-                "created_at": inc.created_at.isoformat(),
-                "similarity_score": 0.85 - (i * 0.1)  # Mock similarity
-            })
-            if len(related) >= limit:
-                break
+    for i, inc in enumerate(await get_incident_repository().related(incident, limit)):
+        related.append({
+            "id": inc.id,
+            "title": inc.title,
+            "severity": inc.severity,
+            "status": inc.status,
+            "created_at": inc.created_at.isoformat(),
+            "similarity_score": 0.85 - (i * 0.1)  # Mock similarity
+        })
 
     return JSONResponse(content={
         "incident_id": incident_id,
@@ -325,12 +300,12 @@ async def get_incident_analysis(
     incident_id: str = Path(..., description="Incident ID")
 ) -> JSONResponse:
     """Get detailed AI analysis for an incident."""
-    if incident_id not in INCIDENTS_DB:
-        raise HTTPException(status_code=404, detail="Incident not found")
+    await get_incident_or_404(incident_id)
 
     # Check if we have analysis data
-    if incident_id in ANALYSIS_DB:
-        return JSONResponse(content=ANALYSIS_DB[incident_id])
+    analysis = await get_incident_repository().get_analysis(incident_id)
+    if analysis is not None:
+        return JSONResponse(content=analysis)
 
     # Return placeholder if no analysis yet
     return JSONResponse(content={
@@ -346,10 +321,7 @@ async def acknowledge_incident(
     user: str = Query(..., description="User acknowledging the incident")
 ) -> SuccessResponse:
     """Acknowledge an incident."""
-    if incident_id not in INCIDENTS_DB:
-        raise HTTPException(status_code=404, detail="Incident not found")
-
-    incident = INCIDENTS_DB[incident_id]
+    incident = await get_incident_or_404(incident_id)
 
     if incident.status != IncidentStatus.TRIGGERED:
         raise HTTPException(
@@ -357,14 +329,17 @@ async def acknowledge_incident(
             detail=f"Cannot acknowledge incident in {incident.status} status"
         )
 
+    now = datetime.now(UTC)
     incident.status = IncidentStatus.ACKNOWLEDGED
     incident.assignee = user
+    incident.updated_at = now
     incident.timeline.append({
-        "timestamp": datetime.now(UTC).isoformat(),
+        "timestamp": now.isoformat(),
         "event": "acknowledged",
         "description": f"Incident acknowledged by {user}",
         "user": user
     })
+    await get_incident_repository().save(incident)
 
     logger.info(f"Incident {incident_id} acknowledged by {user}")
 
@@ -381,10 +356,7 @@ async def resolve_incident(
     user: str = Query(..., description="User resolving the incident")
 ) -> SuccessResponse:
     """Resolve an incident."""
-    if incident_id not in INCIDENTS_DB:
-        raise HTTPException(status_code=404, detail="Incident not found")
-
-    incident = INCIDENTS_DB[incident_id]
+    incident = await get_incident_or_404(incident_id)
 
     if incident.status == IncidentStatus.RESOLVED:
         raise HTTPException(
@@ -396,12 +368,14 @@ async def resolve_incident(
     incident.status = IncidentStatus.RESOLVED
     incident.resolution = resolution
     incident.resolved_at = now
+    incident.updated_at = now
     incident.timeline.append({
         "timestamp": now.isoformat(),
         "event": "resolved",
         "description": f"Incident resolved: {resolution}",
         "user": user
     })
+    await get_incident_repository().save(incident)
 
     logger.info(f"Incident {incident_id} resolved by {user}")
 
@@ -414,6 +388,10 @@ async def resolve_incident(
 # Initialize with some mock data
 def init_mock_data():
     """Initialize some mock incidents."""
+    repository = get_incident_repository()
+    if not isinstance(repository, InMemoryIncidentRepository):
+        return
+
     mock_incidents = [
         IncidentCreate(
             title="API Gateway High Error Rate",
@@ -439,8 +417,7 @@ def init_mock_data():
     ]
 
     for incident_data in mock_incidents:
-        incident = create_mock_incident(incident_data)
-        INCIDENTS_DB[incident.id] = incident
+        repository.put(create_mock_incident(incident_data))
 
 
 # Initialize mock data on module load
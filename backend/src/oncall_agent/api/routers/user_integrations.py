@@ -11,6 +11,7 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
 from src.oncall_agent.config import get_config
+from src.oncall_agent.services.audit_store import get_audit_store
 from src.oncall_agent.utils import get_logger
 
 from .auth_setup import get_current_user
@@ -27,7 +28,6 @@ fernet = Fernet(ENCRYPTION_KEY)
 
 # Mock database storage (replace with actual database in production)
 USER_INTEGRATIONS_DB: dict[int, list[dict[str, Any]]] = {}
-INTEGRATION_AUDIT_LOGS_DB: list[dict[str, Any]] = []
 
 
 def encrypt_config(config: dict[str, Any]) -> str:
@@ -146,16 +146,14 @@ async def create_user_integration(
 
         # Create audit log
         audit_log = {
-            "id": len(INTEGRATION_AUDIT_LOGS_DB) + 1,
             "user_id": current_user_id,
             "integration_id": integration_id,
             "action": "created",
             "performed_by": current_user_id,
             "new_config": encrypt_config(integration.config),
-            "result": "success",
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "result": "success"
         }
-        INTEGRATION_AUDIT_LOGS_DB.append(audit_log)
+        get_audit_store().append("integration", tool=audit_log["action"], **audit_log)
 
         # Return created integration (without encrypted config)
         response_integration = new_integration.copy()
@@ -210,17 +208,15 @@ async def update_user_integration(
 
         # Create audit log
         audit_log = {
-            "id": len(INTEGRATION_AUDIT_LOGS_DB) + 1,
             "user_id": current_user_id,
             "integration_id": integration_id,
             "action": "disabled" if update.is_enabled is False else "updated",
             "performed_by": current_user_id,
             "previous_config": encrypt_config(previous_config),
             "new_config": integration['config_encrypted'] if update.config else None,
-            "result": "success",
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "result": "success"
         }
-        INTEGRATION_AUDIT_LOGS_DB.append(audit_log)
+        get_audit_store().append("integration", tool=audit_log["action"], **audit_log)
 
         # Return updated integration
         response_integration = integration.copy()
@@ -261,15 +257,13 @@ async def delete_user_integration(
 
         # Create audit log
         audit_log = {
-            "id": len(INTEGRATION_AUDIT_LOGS_DB) + 1,
             "user_id": current_user_id,
             "integration_id": integration_id,
             "action": "deleted",
             "performed_by": current_user_id,
-            "result": "success",
-            "created_at": datetime.now(timezone.utc).isoformat()
+            "result": "success"
         }
-        INTEGRATION_AUDIT_LOGS_DB.append(audit_log)
+        get_audit_store().append("integration", tool=audit_log["action"], **audit_log)
 
         return JSONResponse(content={
             "success": True,
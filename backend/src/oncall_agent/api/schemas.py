@@ -162,6 +162,7 @@ class IncidentList(BaseModel):
     page: int
     page_size: int
     has_next: bool
+    next_cursor: str | None = None
 
 
 # AI Agent Models
@@ -5,9 +5,9 @@ import hmac
 from datetime import UTC, datetime
 from typing import Any
 
-import httpx
 from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Request
 from fastapi.responses import JSONResponse
+from pydantic import ValidationError
 
 from src.oncall_agent.api.log_streaming import log_stream_manager
 from src.oncall_agent.api.models import (
@@ -16,10 +16,22 @@ from src.oncall_agent.api.models import (
     PagerDutyWebhookPayload,
 )
 from src.oncall_agent.api.oncall_agent_trigger import OncallAgentTrigger
-from src.oncall_agent.api.routers.incidents import INCIDENTS_DB
 from src.oncall_agent.api.schemas import Incident, IncidentStatus, Severity
+from src.oncall_agent.api.webhook_guard import get_webhook_guard
 from src.oncall_agent.config import get_config
-from src.oncall_agent.utils import get_logger
+from src.oncall_agent.services.incident_store import get_incident_repository
+from src.oncall_agent.services.quota_service import (
+    QuotaExceededError,
+    get_quota_service,
+)
+from src.oncall_agent.services.webhook_inbox import (
+    InboxConsumer,
+    InboxMessage,
+    PoisonMessageError,
+    RetryLaterError,
+    WebhookInbox,
+)
+from src.oncall_agent.utils import get_logger, json_codec
 
 router = APIRouter(prefix="/webhook", tags=["webhooks"])
 logger = get_logger(__name__)
@@ -28,6 +40,10 @@ config = get_config()
 # Global trigger instance
 agent_trigger: OncallAgentTrigger | None = None
 
+# Durable inbox and its consumers, when WEBHOOK_INBOX_ENABLED
+webhook_inbox: WebhookInbox | None = None
+inbox_consumer: InboxConsumer | None = None
+
 UTC = UTC
 
 
@@ -40,6 +56,24 @@ async def get_agent_trigger() -> OncallAgentTrigger:
     return agent_trigger
 
 
+def backpressure_response(results: list[dict[str, Any]]) -> JSONResponse | None:
+    """Return a 503 with Retry-After if the agent scheduler rejected any incident."""
+    rejected = [r for r in results if r.get("status") == "rejected"]
+    if not rejected:
+        return None
+    retry_after = max(r.get("retry_after", 30) for r in rejected)
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": str(retry_after)},
+        content={
+            "status": "busy",
+            "message": "Alert queue is full, retry later",
+            "rejected": len(rejected),
+            "results": results
+        }
+    )
+
+
 def verify_pagerduty_signature(payload: bytes, signature: str, secret: str) -> bool:
     """Verify PagerDuty webhook signature."""
     if not secret:
@@ -61,30 +95,60 @@ def verify_pagerduty_signature(payload: bytes, signature: str, secret: str) -> b
 async def record_alert_usage(user_id: str, incident_id: str, alert_type: str = "pagerduty"):
     """Record alert usage for the user."""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "http://localhost:8000/api/v1/alert-tracking/record",
-                json={
-                    "user_id": user_id,
-                    "alert_type": alert_type,
-                    "incident_id": incident_id,
-                    "metadata": {"source": "pagerduty_webhook"}
-                }
-            )
-            if response.status_code == 403:
-                # Alert limit reached
-                logger.warning(f"Alert limit reached for user {user_id}")
-                return False, response.json()
-            elif response.status_code == 200:
-                data = response.json()
-                logger.info(f"Alert recorded: {data['alerts_used']}/{data.get('alerts_remaining', 'unlimited')} used")
-                return True, data
-            else:
-                logger.error(f"Failed to record alert usage: {response.status_code}")
-                return True, None  # Don't block on tracking failures
+        data = await get_quota_service().record(user_id, incident_id)
+    except QuotaExceededError as e:
+        # Alert limit reached
+        logger.warning(f"Alert limit reached for user {user_id}")
+        return False, {"detail": e.detail}
     except Exception as e:
         logger.error(f"Error recording alert usage: {e}")
         return True, None  # Don't block on tracking failures
+    logger.info(f"Alert recorded: {data['alerts_used']}/{data.get('alerts_remaining', 'unlimited')} used")
+    return True, data
+
+
+async def consume_inbox_message(message: InboxMessage) -> None:
+    """Process a webhook stored in the inbox."""
+    try:
+        payload_dict = json_codec.loads(message.body)
+    except ValueError as e:
+        raise PoisonMessageError(f"Invalid JSON body: {e}") from e
+    if message.source != "pagerduty":
+        raise PoisonMessageError(f"Unknown webhook source: {message.source}")
+
+    try:
+        response = await handle_pagerduty_payload(payload_dict, webhook_inbox)
+    except ValidationError as e:
+        raise PoisonMessageError(f"Invalid PagerDuty payload: {e}") from e
+    if response.status_code == 503:
+        # The agent queue is full; try again once it has drained
+        raise RetryLaterError("Alert queue is full", delay=float(response.headers.get("Retry-After", 30)))
+
+
+async def start_webhook_inbox() -> WebhookInbox:
+    """Open the inbox and start draining it in the background."""
+    global webhook_inbox, inbox_consumer
+    inbox = WebhookInbox(
+        config.webhook_inbox_path,
+        lease_seconds=config.webhook_inbox_lease_seconds,
+        max_attempts=config.webhook_inbox_max_attempts
+    )
+    await inbox.initialize()
+    inbox_consumer = InboxConsumer(inbox, consume_inbox_message, workers=config.webhook_inbox_workers)
+    inbox_consumer.start()
+    webhook_inbox = inbox
+    return inbox
+
+
+async def stop_webhook_inbox() -> None:
+    """Stop the consumers; unprocessed webhooks stay in the inbox for the next start."""
+    global webhook_inbox, inbox_consumer
+    if inbox_consumer:
+        await inbox_consumer.stop()
+        inbox_consumer = None
+    if webhook_inbox:
+        await webhook_inbox.close()
+        webhook_inbox = None
 
 
 @router.post("/pagerduty")
@@ -103,7 +167,7 @@ async def pagerduty_webhook(
     logger.info("=" * 80)
 
     try:
-        # Get raw body for signature verification
+        # Read the body once; the same buffer is verified, stored and parsed
         body = await request.body()
 
         # Verify signature if configured
@@ -113,92 +177,231 @@ async def pagerduty_webhook(
                 logger.warning("Invalid PagerDuty webhook signature")
                 raise HTTPException(status_code=401, detail="Invalid signature")
 
+        # Durable fast path: acknowledge once stored, process in the background
+        if webhook_inbox is not None:
+            seq = await webhook_inbox.append("pagerduty", body)
+            logger.info(f"📥 Webhook stored in inbox as #{seq}")
+            return JSONResponse(status_code=202, content={"status": "accepted", "inbox_seq": seq})
+
         # Parse payload
-        payload_dict = await request.json()
-
-        # Log the raw payload for debugging
-        # logger.debug(f"Raw webhook payload: {payload_dict}")
-
-        # Detect if this is a V3 webhook
-        logger.info(f"Webhook payload keys: {list(payload_dict.keys())}")
-        if 'event' in payload_dict and isinstance(payload_dict['event'], dict):
-            # V3 webhook format
-            from src.oncall_agent.api.models import PagerDutyV3WebhookPayload
-            v3_payload = PagerDutyV3WebhookPayload(**payload_dict)
-
-            logger.info(f"Received PagerDuty V3 webhook: {v3_payload.event.event_type}")
-
-            # Get agent trigger
-            trigger = await get_agent_trigger()
-
-            # Process V3 event
-            event_data = v3_payload.event.data
-            results = []
-
-            # Handle incident events
-            if v3_payload.event.event_type.startswith('incident.'):
-                incident_data = event_data.get('incident', event_data)
-
-                # Handle different incident statuses
-                incident_status = incident_data.get('status')
-                incident_id = incident_data.get('id')
-
-                if incident_status == 'resolved':
-                    # Log incident resolution
-                    logger.info(f"Incident {incident_id} resolved")
-
-                    # Update incident status in DB
-                    if incident_id in INCIDENTS_DB:
-                        INCIDENTS_DB[incident_id].status = IncidentStatus.RESOLVED
-                        INCIDENTS_DB[incident_id].resolved_at = datetime.now(UTC)
-
-                    # Send resolution log to frontend
-                    resolved_by = 'System'
-                    if v3_payload.event.agent:
-                        resolved_by = v3_payload.event.agent.summary or v3_payload.event.agent.type or 'Unknown'
-
-                    await log_stream_manager.log_success(
-                        f"✅ Incident resolved: {incident_data.get('title', 'Unknown')}",
-                        incident_id=incident_id,
-                        stage="incident_resolved",
-                        progress=1.0,
-                        metadata={
-                            "event_type": v3_payload.event.event_type,
-                            "resolved_by": resolved_by,
-                            "resolved_at": v3_payload.event.occurred_at.isoformat()
-                        }
-                    )
+        payload_dict = json_codec.loads(body)
+        return await handle_pagerduty_payload(payload_dict)
 
-                    return JSONResponse(
-                        status_code=200,
-                        content={"status": "success", "message": "Incident resolution logged"}
-                    )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error processing webhook: {e}", exc_info=True)
 
-                elif incident_status != 'triggered':
-                    logger.info(f"Skipping incident {incident_id} with status {incident_status}")
-                    return JSONResponse(
-                        status_code=200,
-                        content={"status": "success", "message": "Incident not in triggered state"}
-                    )
+        # Log error to frontend
+        await log_stream_manager.log_error(
+            f"❌ Error processing webhook: {str(e)}",
+            stage="webhook_error",
+            metadata={"error": str(e)}
+        )
+
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def handle_pagerduty_payload(payload_dict: dict[str, Any], inbox: WebhookInbox | None = None) -> JSONResponse:
+    """Process a PagerDuty V3 or legacy webhook payload.
+
+    With ``inbox`` set (redeliverable inbox messages), incidents already
+    handed to the agent are skipped.
+    """
+    # Log the raw payload for debugging
+    # logger.debug(f"Raw webhook payload: {payload_dict}")
+
+    # Detect if this is a V3 webhook
+    logger.info(f"Webhook payload keys: {list(payload_dict.keys())}")
+    if 'event' in payload_dict and isinstance(payload_dict['event'], dict):
+        # V3 webhook format
+        from src.oncall_agent.api.models import PagerDutyV3WebhookPayload
+        v3_payload = PagerDutyV3WebhookPayload.model_validate(payload_dict)
+
+        logger.info(f"Received PagerDuty V3 webhook: {v3_payload.event.event_type}")
+
+        # Get agent trigger
+        trigger = await get_agent_trigger()
+
+        # Process V3 event
+        event_data = v3_payload.event.data
+        results = []
+
+        # Handle incident events
+        if v3_payload.event.event_type.startswith('incident.'):
+            incident_data = event_data.get('incident', event_data)
+
+            # Handle different incident statuses
+            incident_status = incident_data.get('status')
+            incident_id = incident_data.get('id')
+
+            if incident_status == 'resolved':
+                # Log incident resolution
+                logger.info(f"Incident {incident_id} resolved")
+
+                # Update incident status in DB
+                repository = get_incident_repository()
+                stored_incident = await repository.get(incident_id)
+                if stored_incident:
+                    stored_incident.status = IncidentStatus.RESOLVED
+                    stored_incident.resolved_at = datetime.now(UTC)
+                    stored_incident.updated_at = stored_incident.resolved_at
+                    await repository.save(stored_incident)
+
+                # Send resolution log to frontend
+                resolved_by = 'System'
+                if v3_payload.event.agent:
+                    resolved_by = v3_payload.event.agent.summary or v3_payload.event.agent.type or 'Unknown'
+
+                await log_stream_manager.log_success(
+                    f"✅ Incident resolved: {incident_data.get('title', 'Unknown')}",
+                    incident_id=incident_id,
+                    stage="incident_resolved",
+                    progress=1.0,
+                    metadata={
+                        "event_type": v3_payload.event.event_type,
+                        "resolved_by": resolved_by,
+                        "resolved_at": v3_payload.event.occurred_at.isoformat()
+                    }
+                )
 
-                # Convert V3 incident to our format
-                incident = PagerDutyIncidentData(
-                    id=incident_data.get('id'),
-                    incident_number=incident_data.get('incident_number', 0),
-                    title=incident_data.get('title', 'Unknown'),
-                    description=incident_data.get('description'),
-                    created_at=incident_data.get('created_at', v3_payload.event.occurred_at),
-                    status=incident_data.get('status', 'triggered'),
-                    incident_key=incident_data.get('incident_key'),
-                    service=PagerDutyService(
-                        id=incident_data.get('service', {}).get('id', 'unknown'),
-                        name=incident_data.get('service', {}).get('summary', 'Unknown Service')
-                    ) if incident_data.get('service') else None,
-                    urgency=incident_data.get('urgency', 'high'),
-                    html_url=incident_data.get('html_url', '')
+                return JSONResponse(
+                    status_code=200,
+                    content={"status": "success", "message": "Incident resolution logged"}
                 )
 
-                # Check alert usage - using user_id "1" for now (should be from incident context)
+            elif incident_status != 'triggered':
+                logger.info(f"Skipping incident {incident_id} with status {incident_status}")
+                return JSONResponse(
+                    status_code=200,
+                    content={"status": "success", "message": "Incident not in triggered state"}
+                )
+
+            # Convert V3 incident to our format
+            incident = PagerDutyIncidentData(
+                id=incident_data.get('id'),
+                incident_number=incident_data.get('incident_number', 0),
+                title=incident_data.get('title', 'Unknown'),
+                description=incident_data.get('description'),
+                created_at=incident_data.get('created_at', v3_payload.event.occurred_at),
+                status=incident_data.get('status', 'triggered'),
+                incident_key=incident_data.get('incident_key'),
+                service=PagerDutyService(
+                    id=incident_data.get('service', {}).get('id', 'unknown'),
+                    name=incident_data.get('service', {}).get('summary', 'Unknown Service')
+                ) if incident_data.get('service') else None,
+                urgency=incident_data.get('urgency', 'high'),
+                html_url=incident_data.get('html_url', '')
+            )
+
+            if inbox and await inbox.is_processed(incident.id):
+                logger.info(f"Incident {incident.id} already handed to the agent, skipping redelivery")
+                return JSONResponse(
+                    status_code=200,
+                    content={"status": "success", "message": "Incident already processed"}
+                )
+
+            # Check alert usage - using user_id "1" for now (should be from incident context)
+            user_id = "1"  # Default user for webhook incidents
+            allowed, usage_data = await record_alert_usage(user_id, incident.id)
+
+            if not allowed:
+                # Alert limit reached
+                logger.warning(f"Alert limit reached for user {user_id}, incident {incident.id} not processed")
+
+                # Send limit reached notification
+                await log_stream_manager.log_warning(
+                    "⚠️ Alert limit reached for user. Upgrade required.",
+                    incident_id=incident.id,
+                    stage="alert_limit_reached",
+                    metadata={
+                        "alerts_used": usage_data.get("detail", {}).get("alerts_used", 0),
+                        "alerts_limit": usage_data.get("detail", {}).get("alerts_limit", 3),
+                        "account_tier": usage_data.get("detail", {}).get("account_tier", "free")
+                    }
+                )
+
+                return JSONResponse(
+                    status_code=403,
+                    content={
+                        "status": "limit_reached",
+                        "message": "Alert limit reached. Please upgrade your subscription.",
+                        "usage": usage_data.get("detail", {})
+                    }
+                )
+
+            # Process incident
+            await log_stream_manager.log_info(
+                f"🔍 Processing incident: {incident.title}",
+                incident_id=incident.id,
+                stage="webhook_received",
+                metadata={
+                    "service": incident.service.name if incident.service else "Unknown",
+                    "urgency": incident.urgency,
+                    "alerts_used": usage_data.get("alerts_used") if usage_data else None
+                }
+            )
+
+            # Store incident in memory
+            memory_incident = Incident(
+                id=incident.id,
+                title=incident.title,
+                description=incident.description or "",
+                severity=Severity.HIGH if incident.urgency == 'high' else Severity.MEDIUM,
+                status=IncidentStatus.TRIGGERED,
+                service_name=incident.service.name if incident.service else "unknown",
+                alert_source="pagerduty",
+                created_at=datetime.now(UTC),
+                metadata={"source_id": incident.id, "user_id": 1}  # Default user ID
+            )
+            await get_incident_repository().save(memory_incident)
+
+            # Process incident via agent
+            logger.info(f"🤖 Processing incident via agent: {incident.id}")
+            result = await trigger.process_incident_async(incident)
+            results.append(result)
+            if inbox and result.get("status") != "rejected":
+                await inbox.mark_processed(incident.id)
+
+            # Log the result
+            logger.info(f"📊 Agent processing result: {result}")
+
+        busy = backpressure_response(results)
+        if busy:
+            return busy
+
+        return JSONResponse(
+            status_code=200,
+            content={
+                "status": "success",
+                "event_type": v3_payload.event.event_type,
+                "incidents_processed": len(results),
+                "results": results
+            }
+        )
+
+    else:
+        # Legacy webhook format
+        payload = PagerDutyWebhookPayload.model_validate(payload_dict)
+        logger.info(f"Received PagerDuty webhook with {len(payload.messages)} messages")
+
+        # Process each message
+        results = []
+        trigger = await get_agent_trigger()
+
+        for message in payload.messages:
+            event = message.event
+            incident = message.incident
+
+            logger.info(f"Processing event: {event} for incident: {incident.incident_number}")
+
+            # Only process triggered incidents
+            if event == "incident.trigger":
+                if inbox and await inbox.is_processed(incident.id):
+                    logger.info(f"Incident {incident.id} already handed to the agent, skipping redelivery")
+                    continue
+
+                # Check alert usage - using user_id "1" for now
                 user_id = "1"  # Default user for webhook incidents
                 allowed, usage_data = await record_alert_usage(user_id, incident.id)
 
@@ -235,6 +438,7 @@ async def pagerduty_webhook(
                     metadata={
                         "service": incident.service.name if incident.service else "Unknown",
                         "urgency": incident.urgency,
+                        "event": event,
                         "alerts_used": usage_data.get("alerts_used") if usage_data else None
                     }
                 )
@@ -245,146 +449,54 @@ async def pagerduty_webhook(
                     title=incident.title,
                     description=incident.description or "",
                     severity=Severity.HIGH if incident.urgency == 'high' else Severity.MEDIUM,
-                    status=IncidentStatus.OPEN,
-                    source="pagerduty",
-                    source_id=incident.id,
+                    status=IncidentStatus.TRIGGERED,
+                    service_name=incident.service.name if incident.service else "unknown",
+                    alert_source="pagerduty",
                     created_at=datetime.now(UTC),
-                    userId=1  # Default user ID
+                    metadata={"source_id": incident.id, "user_id": 1}  # Default user ID
                 )
-                INCIDENTS_DB[incident.id] = memory_incident
+                await get_incident_repository().save(memory_incident)
 
-                # Process incident via agent
-                logger.info(f"🤖 Processing incident via agent: {incident.id}")
+                # Process with agent
+                logger.info(f"🤖 Triggering DreamOps agent for incident: {incident.id}")
                 result = await trigger.process_incident_async(incident)
                 results.append(result)
+                if inbox and result.get("status") != "rejected":
+                    await inbox.mark_processed(incident.id)
 
-                # Log the result
-                logger.info(f"📊 Agent processing result: {result}")
-
-            return JSONResponse(
-                status_code=200,
-                content={
-                    "status": "success",
-                    "event_type": v3_payload.event.event_type,
-                    "incidents_processed": len(results),
-                    "results": results
-                }
-            )
-
-        else:
-            # Legacy webhook format
-            payload = PagerDutyWebhookPayload(**payload_dict)
-            logger.info(f"Received PagerDuty webhook with {len(payload.messages)} messages")
-
-            # Process each message
-            results = []
-            trigger = await get_agent_trigger()
-
-            for message in payload.messages:
-                event = message.event
-                incident = message.incident
-
-                logger.info(f"Processing event: {event} for incident: {incident.incident_number}")
-
-                # Only process triggered incidents
-                if event == "incident.trigger":
-                    # Check alert usage - using user_id "1" for now
-                    user_id = "1"  # Default user for webhook incidents
-                    allowed, usage_data = await record_alert_usage(user_id, incident.id)
-
-                    if not allowed:
-                        # Alert limit reached
-                        logger.warning(f"Alert limit reached for user {user_id}, incident {incident.id} not processed")
-
-                        # Send limit reached notification
-                        await log_stream_manager.log_warning(
-                            "⚠️ Alert limit reached for user. Upgrade required.",
-                            incident_id=incident.id,
-                            stage="alert_limit_reached",
-                            metadata={
-                                "alerts_used": usage_data.get("detail", {}).get("alerts_used", 0),
-                                "alerts_limit": usage_data.get("detail", {}).get("alerts_limit", 3),
-                                "account_tier": usage_data.get("detail", {}).get("account_tier", "free")
-                            }
-                        )
-
-                        return JSONResponse(
-                            status_code=403,
-                            content={
-                                "status": "limit_reached",
-                                "message": "Alert limit reached. Please upgrade your subscription.",
-                                "usage": usage_data.get("detail", {})
-                            }
-                        )
-
-                    # Process incident
-                    await log_stream_manager.log_info(
-                        f"🔍 Processing incident: {incident.title}",
-                        incident_id=incident.id,
-                        stage="webhook_received",
-                        metadata={
-                            "service": incident.service.name if incident.service else "Unknown",
-                            "urgency": incident.urgency,
-                            "event": event,
-                            "alerts_used": usage_data.get("alerts_used") if usage_data else None
-                        }
-                    )
+                if result.get("status") == "rejected":
+                    logger.warning(f"Agent queue full, rejected incident {incident.id}")
+                    continue
+                if result.get("status") == "coalesced":
+                    logger.info(f"Incident {incident.id} attached to {result['incident_id']}")
+                    continue
 
-                    # Store incident in memory
-                    memory_incident = Incident(
-                        id=incident.id,
-                        title=incident.title,
-                        description=incident.description or "",
-                        severity=Severity.HIGH if incident.urgency == 'high' else Severity.MEDIUM,
-                        status=IncidentStatus.OPEN,
-                        source="pagerduty",
-                        source_id=incident.id,
-                        created_at=datetime.now(UTC),
-                        userId=1  # Default user ID
-                    )
-                    INCIDENTS_DB[incident.id] = memory_incident
-
-                    # Process with agent
-                    logger.info(f"🤖 Triggering DreamOps agent for incident: {incident.id}")
-                    result = await trigger.process_incident_async(incident)
-                    results.append(result)
-
-                    # Log the result
-                    await log_stream_manager.log_success(
-                        "✅ Incident processed successfully",
-                        incident_id=incident.id,
-                        stage="agent_triggered",
-                        progress=0.5,
-                        metadata={"agent_result": result}
-                    )
-
-                    logger.info(f"✅ Agent triggered successfully: {result}")
-                else:
-                    logger.info(f"Skipping event {event} - only processing incident.trigger events")
-
-            return JSONResponse(
-                status_code=200,
-                content={
-                    "status": "success",
-                    "message": f"Processed {len(results)} incidents",
-                    "results": results
-                }
-            )
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error processing webhook: {e}", exc_info=True)
+                # Log the result
+                await log_stream_manager.log_success(
+                    "✅ Incident queued for the agent",
+                    incident_id=incident.id,
+                    stage="agent_triggered",
+                    progress=0.5,
+                    metadata={"agent_result": result}
+                )
 
-        # Log error to frontend
-        await log_stream_manager.log_error(
-            f"❌ Error processing webhook: {str(e)}",
-            stage="webhook_error",
-            metadata={"error": str(e)}
+                logger.info(f"✅ Agent triggered successfully: {result}")
+            else:
+                logger.info(f"Skipping event {event} - only processing incident.trigger events")
+
+        busy = backpressure_response(results)
+        if busy:
+            return busy
+
+        return JSONResponse(
+            status_code=200,
+            content={
+                "status": "success",
+                "message": f"Processed {len(results)} incidents",
+                "results": results
+            }
         )
 
-        raise HTTPException(status_code=500, detail=str(e))
-
 
 @router.get("/pagerduty/status")
 async def webhook_status() -> dict[str, Any]:
@@ -395,6 +507,8 @@ async def webhook_status() -> dict[str, Any]:
         "api_key_configured": bool(getattr(config, 'pagerduty_api_key', None)),
         "user_email_configured": bool(getattr(config, 'pagerduty_user_email', None)),
         "webhook_url": f"{config.api_host}:{config.api_port}/webhook/pagerduty",
+        "inbox": (await webhook_inbox.get_stats()) if webhook_inbox else None,
+        "admission": get_webhook_guard().get_stats(),
         "agent_status": {
             "initialized": agent_trigger is not None,
             "agent_available": agent_trigger is not None
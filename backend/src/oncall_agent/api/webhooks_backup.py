@@ -16,9 +16,9 @@ from src.oncall_agent.api.models import (
     PagerDutyWebhookPayload,
 )
 from src.oncall_agent.api.oncall_agent_trigger import OncallAgentTrigger
-from src.oncall_agent.api.routers.incidents import ANALYSIS_DB, INCIDENTS_DB
 from src.oncall_agent.api.schemas import AIAnalysis, Incident, IncidentStatus, Severity
 from src.oncall_agent.config import get_config
+from src.oncall_agent.services.incident_store import get_incident_repository
 from src.oncall_agent.utils import get_logger
 
 router = APIRouter(prefix="/webhook", tags=["webhooks"])
@@ -148,9 +148,13 @@ async def pagerduty_webhook(
                     logger.info(f"Incident {incident_id} resolved")
 
                     # Update incident status in DB
-                    if incident_id in INCIDENTS_DB:
-                        INCIDENTS_DB[incident_id].status = IncidentStatus.RESOLVED
-                        INCIDENTS_DB[incident_id].resolved_at = datetime.now(UTC)
+                    repository = get_incident_repository()
+                    stored_incident = await repository.get(incident_id)
+                    if stored_incident:
+                        stored_incident.status = IncidentStatus.RESOLVED
+                        stored_incident.resolved_at = datetime.now(UTC)
+                        stored_incident.updated_at = stored_incident.resolved_at
+                        await repository.save(stored_incident)
 
                     # Send resolution log to frontend
                     resolved_by = 'System'
@@ -247,7 +251,7 @@ async def pagerduty_webhook(
                     }]
                 )
 
-                INCIDENTS_DB[incident.id] = inc_record
+                await get_incident_repository().save(inc_record)
 
                 # Record alert usage for this incident
                 team_id = "team_123"  # TODO: Get actual team ID from incident or service
@@ -276,7 +280,7 @@ async def pagerduty_webhook(
                     agent_response = result["agent_response"]
 
                     # Store full analysis data
-                    ANALYSIS_DB[incident.id] = {
+                    await get_incident_repository().save_analysis(incident.id, {
                         "incident_id": incident.id,
                         "status": "analyzed",
                         "analysis": agent_response.get("analysis", ""),
@@ -287,7 +291,7 @@ async def pagerduty_webhook(
                         "full_context": agent_response.get("full_context", {}),
                         "timestamp": datetime.now(UTC).isoformat(),
                         "processing_time": result.get("processing_time", 0)
-                    }
+                    })
 
                     # Update incident with AI analysis
                     inc_record.ai_analysis = AIAnalysis(
@@ -314,6 +318,7 @@ async def pagerduty_webhook(
                         "description": f"AI analysis completed with {agent_response.get('confidence_score', 0.85)*100:.0f}% confidence",
                         "automated": True
                     })
+                    await get_incident_repository().save(inc_record)
 
                     logger.info("\n" + "="*80)
                     logger.info("🤖 AGENT ANALYSIS COMPLETE:")
@@ -12,6 +12,9 @@ class Config(BaseSettings):
     # Anthropic/Claude settings
     anthropic_api_key: str = Field(..., env="ANTHROPIC_API_KEY")
     claude_model: str = Field("claude-3-5-sonnet-20241022", env="CLAUDE_MODEL")
+    llm_streaming_enabled: bool = Field(True, env="LLM_STREAMING_ENABLED")  # stream analysis sections to the dashboard
+    llm_key_requests_per_minute: int = Field(50, env="LLM_KEY_REQUESTS_PER_MINUTE")  # per API key
+    llm_key_tokens_per_minute: int = Field(40000, env="LLM_KEY_TOKENS_PER_MINUTE")  # input tokens per API key
 
     # Agent settings
     agent_name: str = Field("oncall-agent", env="AGENT_NAME")
@@ -23,6 +26,17 @@ class Config(BaseSettings):
     mcp_max_retries: int = Field(3, env="MCP_MAX_RETRIES")
     mcp_retry_delay: float = Field(1.0, env="MCP_RETRY_DELAY")
 
+    # Context gathering settings
+    context_integration_timeout: float = Field(15.0, env="CONTEXT_INTEGRATION_TIMEOUT")  # seconds per integration
+    context_gather_budget: float = Field(25.0, env="CONTEXT_GATHER_BUDGET")  # seconds for all integrations
+
+    # Alert scheduler settings
+    alert_workers: int = Field(4, env="ALERT_WORKERS")
+    alert_queue_size: int = Field(100, env="ALERT_QUEUE_SIZE")
+    alert_per_service_concurrency: int = Field(2, env="ALERT_PER_SERVICE_CONCURRENCY")
+    alert_drain_timeout: float = Field(60.0, env="ALERT_DRAIN_TIMEOUT")  # seconds to finish queued alerts on shutdown
+    alert_coalesce_window: float = Field(300.0, env="ALERT_COALESCE_WINDOW")  # seconds; 0 disables coalescing
+
     # GitHub MCP settings - kept for backward compatibility but not used
     github_token: str | None = Field(None, env="GITHUB_TOKEN")
     github_mcp_server_path: str | None = Field(None, env="GITHUB_MCP_SERVER_PATH")
@@ -55,6 +69,11 @@ class Config(BaseSettings):
     k8s_namespace: str = Field("default", env="K8S_NAMESPACE")
     k8s_mcp_server_url: str = Field("http://localhost:8080", env="K8S_MCP_SERVER_URL")
     k8s_enable_destructive_operations: bool = Field(False, env="K8S_ENABLE_DESTRUCTIVE_OPERATIONS")
+    k8s_direct_max_workers: int = Field(8, env="K8S_DIRECT_MAX_WORKERS")  # threads for blocking kubernetes client calls
+    k8s_list_page_size: int = Field(500, env="K8S_LIST_PAGE_SIZE")
+    k8s_state_cache_enabled: bool = Field(False, env="K8S_STATE_CACHE_ENABLED")  # serve pod/deployment/service/event lists from memory
+    k8s_state_cache_resync_interval: float = Field(30.0, env="K8S_STATE_CACHE_RESYNC_INTERVAL")  # seconds
+    k8s_state_cache_max_staleness: float = Field(60.0, env="K8S_STATE_CACHE_MAX_STALENESS")  # seconds
 
     # K8s MCP Server settings
     k8s_use_mcp_server: bool = Field(False, env="K8S_USE_MCP_SERVER")
@@ -78,13 +97,62 @@ class Config(BaseSettings):
     cors_origins: str = Field("http://localhost:3000", env="CORS_ORIGINS")
 
     # Webhook settings
-    webhook_rate_limit: int = Field(100, env="WEBHOOK_RATE_LIMIT")  # requests per minute
-    webhook_allowed_ips: str | None = Field(None, env="WEBHOOK_ALLOWED_IPS")  # comma-separated
+    webhook_rate_limit: int = Field(100, env="WEBHOOK_RATE_LIMIT")  # requests per minute per source IP
+    webhook_integration_rate_limit: int = Field(1000, env="WEBHOOK_INTEGRATION_RATE_LIMIT")  # requests per minute per integration
+    webhook_allowed_ips: str | None = Field(None, env="WEBHOOK_ALLOWED_IPS")  # comma-separated IPs or CIDRs
+
+    # Durable webhook inbox: acknowledge with 202 once stored, process in the background
+    webhook_inbox_enabled: bool = Field(False, env="WEBHOOK_INBOX_ENABLED")
+    webhook_inbox_path: str = Field("webhook_inbox.db", env="WEBHOOK_INBOX_PATH")
+    webhook_inbox_workers: int = Field(2, env="WEBHOOK_INBOX_WORKERS")
+    webhook_inbox_lease_seconds: float = Field(120.0, env="WEBHOOK_INBOX_LEASE_SECONDS")  # redelivered after this
+    webhook_inbox_max_attempts: int = Field(5, env="WEBHOOK_INBOX_MAX_ATTEMPTS")
 
     # Database settings
     database_url: str | None = Field(None, env="DATABASE_URL")
     postgres_url: str | None = Field(None, env="POSTGRES_URL")
     neon_database_url: str | None = Field(None, env="NEON_DATABASE_URL")
+    db_pool_min_size: int = Field(2, env="DB_POOL_MIN_SIZE")
+    db_pool_max_size: int = Field(10, env="DB_POOL_MAX_SIZE")
+    db_statement_cache_size: int = Field(100, env="DB_STATEMENT_CACHE_SIZE")  # set 0 behind pgbouncer
+    db_command_timeout: float = Field(30.0, env="DB_COMMAND_TIMEOUT")
+    db_max_inactive_connection_lifetime: float = Field(300.0, env="DB_MAX_INACTIVE_CONNECTION_LIFETIME")
+
+    # Incident store settings
+    incident_store_backend: str = Field("memory", env="INCIDENT_STORE_BACKEND")  # memory, postgres or sqlite
+    incident_store_sqlite_path: str = Field("incidents.db", env="INCIDENT_STORE_SQLITE_PATH")
+
+    # Alert quota (usage per billing window) settings
+    quota_store_backend: str = Field("memory", env="QUOTA_STORE_BACKEND")  # memory or sqlite
+    quota_store_sqlite_path: str = Field("alert_usage.db", env="QUOTA_STORE_SQLITE_PATH")
+    quota_idempotency_window: int = Field(1000, env="QUOTA_IDEMPOTENCY_WINDOW")  # recent incident ids per user
+
+    # LLM analysis cache settings
+    analysis_cache_enabled: bool = Field(True, env="ANALYSIS_CACHE_ENABLED")
+    analysis_cache_ttl: float = Field(900.0, env="ANALYSIS_CACHE_TTL")  # seconds
+    analysis_cache_max_entries: int = Field(256, env="ANALYSIS_CACHE_MAX_ENTRIES")
+    analysis_cache_path: str | None = Field(None, env="ANALYSIS_CACHE_PATH")  # JSON file; unset keeps it in memory
+
+    # Audit trail (MCP tool calls, executed actions, integration changes)
+    audit_buffer_size: int = Field(1000, env="AUDIT_BUFFER_SIZE")  # records kept in memory
+    audit_log_dir: str | None = Field(None, env="AUDIT_LOG_DIR")  # segmented JSONL log; unset keeps memory only
+    audit_segment_max_bytes: int = Field(5_000_000, env="AUDIT_SEGMENT_MAX_BYTES")
+    audit_max_segments: int = Field(10, env="AUDIT_MAX_SEGMENTS")
+
+    # Longest wait for a remediated deployment to roll out before verification gives up
+    remediation_rollout_timeout: float = Field(120.0, env="REMEDIATION_ROLLOUT_TIMEOUT")  # seconds
+
+    # Remediation actions on different resources run in parallel, within these caps
+    remediation_max_concurrency: int = Field(4, env="REMEDIATION_MAX_CONCURRENCY")
+    remediation_namespace_concurrency: int = Field(2, env="REMEDIATION_NAMESPACE_CONCURRENCY")
+
+    # Per-incident MCP read cache (repeated reads while handling one alert)
+    mcp_read_cache_enabled: bool = Field(True, env="MCP_READ_CACHE_ENABLED")
+    mcp_read_cache_ttl: float = Field(60.0, env="MCP_READ_CACHE_TTL")  # seconds a read stays fresh without writes
+
+    # Start read-only remediation diagnostics alongside the LLM analysis (YOLO mode)
+    speculative_diagnostics_enabled: bool = Field(True, env="SPECULATIVE_DIAGNOSTICS_ENABLED")
+    speculative_diagnostics_max_age: float = Field(60.0, env="SPECULATIVE_DIAGNOSTICS_MAX_AGE")  # seconds
 
     # Additional settings
     debug: bool = Field(False, env="DEBUG")
@@ -1,5 +1,6 @@
 """Integration module to send incident data to the frontend dashboard."""
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import Any
@@ -9,19 +10,44 @@ import aiohttp
 logger = logging.getLogger(__name__)
 
 class FrontendIntegration:
-    """Handles sending incident data to the frontend dashboard."""
+    """Handles sending incident data to the frontend dashboard.
 
-    def __init__(self, frontend_url: str = "http://localhost:3000"):
+    A single connection-pooled ``aiohttp.ClientSession`` is kept for the
+    lifetime of the instance so repeated notifications reuse keep-alive
+    connections instead of paying TCP/TLS setup on every call.
+    """
+
+    def __init__(self,
+                 frontend_url: str = "http://localhost:3000",
+                 pool_size: int = 20,
+                 timeout: float = 10.0):
         self.frontend_url = frontend_url
+        self.pool_size = pool_size
+        self.timeout = timeout
         self.session: aiohttp.ClientSession | None = None
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        await self.start()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+        await self.close()
+
+    async def start(self) -> aiohttp.ClientSession:
+        """Create the pooled session if it is not already open."""
+        if not self.session or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"x-internal-api-key": "oncall-agent-internal"}
+            )
+        return self.session
+
+    async def close(self) -> None:
+        """Close the pooled session."""
+        if self.session and not self.session.closed:
             await self.session.close()
+        self.session = None
 
     async def create_incident(self,
                             title: str,
@@ -32,8 +58,7 @@ class FrontendIntegration:
                             metadata: dict[str, Any] = None) -> dict[str, Any]:
         """Create an incident in the frontend dashboard."""
         try:
-            if not self.session:
-                self.session = aiohttp.ClientSession()
+            session = await self.start()
 
             incident_data = {
                 "title": title,
@@ -45,9 +70,8 @@ class FrontendIntegration:
             }
 
             url = f"{self.frontend_url}/api/dashboard/internal/incidents"
-            headers = {"x-internal-api-key": "oncall-agent-internal"}
 
-            async with self.session.post(url, json=incident_data, headers=headers) as response:
+            async with session.post(url, json=incident_data) as response:
                 if response.status == 201:
                     result = await response.json()
                     logger.info(f"✅ Created incident in dashboard: {result.get('id')}")
@@ -68,24 +92,24 @@ class FrontendIntegration:
                              status: str = "completed",
                              metadata: dict[str, Any] = None) -> bool:
         """Record an AI action in the frontend dashboard."""
-        try:
-            if not self.session:
-                self.session = aiohttp.ClientSession()
+        return await self.record_ai_actions([
+            self._ai_action_payload(action, description, incident_id, status, metadata)
+        ])
 
-            action_data = {
-                "action": action,
-                "description": description,
-                "incidentId": incident_id,
-                "status": status,
-                "metadata": metadata or {}
-            }
+    async def record_ai_actions(self, actions: list[dict[str, Any]]) -> bool:
+        """Record one or more AI actions in the frontend dashboard with a single request."""
+        if not actions:
+            return True
+
+        try:
+            session = await self.start()
 
             url = f"{self.frontend_url}/api/dashboard/internal/ai-actions"
-            headers = {"x-internal-api-key": "oncall-agent-internal"}
+            body = actions[0] if len(actions) == 1 else {"actions": actions}
 
-            async with self.session.post(url, json=action_data, headers=headers) as response:
+            async with session.post(url, json=body) as response:
                 if response.status == 201:
-                    logger.info(f"✅ Recorded AI action: {action}")
+                    logger.info(f"✅ Recorded AI action(s): {', '.join(a['action'] for a in actions)}")
                     return True
                 else:
                     error_text = await response.text()
@@ -96,6 +120,21 @@ class FrontendIntegration:
             logger.error(f"❌ Error recording AI action: {e}")
             return False
 
+    @staticmethod
+    def _ai_action_payload(action: str,
+                           description: str,
+                           incident_id: int = None,
+                           status: str = "completed",
+                           metadata: dict[str, Any] = None) -> dict[str, Any]:
+        """Build the dashboard payload for a single AI action."""
+        return {
+            "action": action,
+            "description": description,
+            "incidentId": incident_id,
+            "status": status,
+            "metadata": metadata or {}
+        }
+
     def extract_k8s_incident_data(self, alert_data: dict[str, Any]) -> dict[str, str]:
         """Extract incident data from Kubernetes alert."""
         # Extract relevant information from the alert
@@ -123,16 +162,79 @@ class FrontendIntegration:
             "source_id": alert_data.get("resource_id", f"k8s-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
         }
 
-# Global instance for easy access
+
+class AIActionBatcher:
+    """Coalesces bursts of AI actions per incident into single dashboard requests.
+
+    Actions for the same incident that arrive within ``window`` seconds of the
+    first one are sent together, in order; a batch is flushed early once it
+    reaches ``max_batch`` actions.
+    """
+
+    def __init__(self, integration: FrontendIntegration, window: float = 0.25, max_batch: int = 25):
+        self.integration = integration
+        self.window = window
+        self.max_batch = max_batch
+        self._batches: dict[Any, list[dict[str, Any]]] = {}
+        self._timers: dict[Any, asyncio.Task] = {}
+
+    async def add(self,
+                  action: str,
+                  description: str,
+                  incident_id: int = None,
+                  status: str = "completed",
+                  metadata: dict[str, Any] = None) -> bool:
+        """Queue an AI action for the next batch of its incident.
+
+        Returns True once the action is queued; a batch sent later by the
+        timer only logs a failed delivery. When this action fills the batch,
+        the batch is sent now and the result of that request is returned.
+        """
+        batch = self._batches.setdefault(incident_id, [])
+        batch.append(FrontendIntegration._ai_action_payload(action, description, incident_id, status, metadata))
+
+        if len(batch) >= self.max_batch:
+            return await self.flush(incident_id)
+        if incident_id not in self._timers:
+            self._timers[incident_id] = asyncio.create_task(self._flush_later(incident_id))
+        return True
+
+    async def flush(self, incident_id: Any = None) -> bool:
+        """Send the pending batch for one incident immediately."""
+        timer = self._timers.pop(incident_id, None)
+        if timer and timer is not asyncio.current_task():
+            timer.cancel()
+        batch = self._batches.pop(incident_id, [])
+        return await self.integration.record_ai_actions(batch)
+
+    async def flush_all(self) -> None:
+        """Send every pending batch."""
+        for incident_id in list(self._batches):
+            await self.flush(incident_id)
+
+    async def _flush_later(self, incident_id: Any) -> None:
+        await asyncio.sleep(self.window)
+        await self.flush(incident_id)
+
+
+# Global instances for easy access; the API server lifespan owns their lifecycle
 frontend_integration = FrontendIntegration()
+ai_action_batcher = AIActionBatcher(frontend_integration)
 
 async def send_incident_to_dashboard(alert_data: dict[str, Any]) -> dict[str, Any] | None:
     """Convenience function to send incident to dashboard."""
-    async with FrontendIntegration() as integration:
-        incident_data = integration.extract_k8s_incident_data(alert_data)
-        return await integration.create_incident(**incident_data)
+    incident_data = frontend_integration.extract_k8s_incident_data(alert_data)
+    return await frontend_integration.create_incident(**incident_data)
 
 async def send_ai_action_to_dashboard(action: str, description: str, incident_id: int = None) -> bool:
-    """Convenience function to send AI action to dashboard."""
-    async with FrontendIntegration() as integration:
-        return await integration.record_ai_action(action, description, incident_id)
+    """Convenience function to send AI action to dashboard (batched per incident).
+
+    Returns True once the action is queued, not when the dashboard has
+    stored it; see ``AIActionBatcher.add``.
+    """
+    return await ai_action_batcher.add(action, description, incident_id)
+
+async def close_frontend_integration() -> None:
+    """Flush pending AI actions and close the shared dashboard session."""
+    await ai_action_batcher.flush_all()
+    await frontend_integration.close()
@@ -12,6 +12,7 @@ from .agent import OncallAgent, PagerAlert
 from .api.routers.api_keys import router as api_keys_router
 from .api.routers.settings import router as settings_router
 from .config import get_config
+from .frontend_integration import close_frontend_integration
 from .utils import setup_logging
 
 # Setup logging
@@ -76,6 +77,7 @@ async def shutdown_event():
     global agent
     if agent:
         await agent.shutdown()
+    await close_frontend_integration()
     logger.info("Agent shutdown complete")
 
 
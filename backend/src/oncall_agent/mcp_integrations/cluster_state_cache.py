@@ -0,0 +1,284 @@
+"""
+Informer-style cluster state cache for the Kubernetes MCP integration.
+
+The MCP server has no watch tool, so instead of listing pods, deployments,
+services and events on every alert, the cache keeps one snapshot per
+(kind, namespace) warm by resyncing it in the background. Reads are served
+from memory as long as the snapshot is younger than ``max_staleness``.
+Writes made through the integration mark the namespace stale, so the next
+read after a remediation sees the new state.
+
+Pod snapshots are indexed by label, owning deployment, status and restart
+count, so context gathering can answer "which pods of this deployment are
+crash looping" without another round trip.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import yaml
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Lists a kind in a namespace; returns the raw MCP tool result
+# ({"success": bool, "content": [...], "error": str | None})
+ListFetcher = Callable[[str, str], Awaitable[dict[str, Any]]]
+
+
+class ClusterStateUnavailableError(Exception):
+    """Raised when a snapshot could not be fetched from the MCP server."""
+
+
+def parse_objects(content: list[dict[str, Any]] | None) -> list[dict[str, Any]] | None:
+    """Kubernetes objects in MCP tool content (YAML or JSON text).
+
+    Returns None when the content is not a list of objects, e.g. when the
+    server renders a table.
+    """
+    objects: list[dict[str, Any]] = []
+    for part in content or []:
+        text = part.get("text") if isinstance(part, dict) else None
+        if not text:
+            continue
+        try:
+            data = yaml.safe_load(text)
+        except yaml.YAMLError:
+            return None
+        if isinstance(data, dict) and isinstance(data.get("items"), list):
+            data = data["items"]
+        if not isinstance(data, list) or not all(isinstance(obj, dict) and "metadata" in obj for obj in data):
+            return None
+        objects.extend(data)
+    return objects
+
+
+def owner_deployment(obj: dict[str, Any]) -> str | None:
+    """Deployment owning a pod, via its ReplicaSet owner reference."""
+    for owner in obj.get("metadata", {}).get("ownerReferences") or []:
+        if owner.get("kind") == "ReplicaSet" and "-" in owner.get("name", ""):
+            return owner["name"].rsplit("-", 1)[0]
+        if owner.get("kind") == "Deployment":
+            return owner.get("name")
+    return None
+
+
+def pod_summary(obj: dict[str, Any]) -> dict[str, Any]:
+    """Flatten a pod object into the fields context gathering uses."""
+    metadata = obj.get("metadata", {})
+    status = obj.get("status", {})
+    container_statuses = status.get("containerStatuses") or []
+
+    # A waiting/terminated reason (CrashLoopBackOff, OOMKilled, ...) says
+    # more than the phase, which stays "Running" while a container crashes
+    pod_status = status.get("phase", "Unknown")
+    for container in container_statuses:
+        state = container.get("state") or {}
+        reason = (state.get("waiting") or state.get("terminated") or {}).get("reason")
+        if reason and reason != "Completed":
+            pod_status = reason
+            break
+
+    return {
+        "name": metadata.get("name"),
+        "namespace": metadata.get("namespace"),
+        "status": pod_status,
+        "restarts": sum(c.get("restartCount", 0) for c in container_statuses),
+        "labels": metadata.get("labels") or {},
+        "deployment": owner_deployment(obj),
+        "node": obj.get("spec", {}).get("nodeName"),
+    }
+
+
+def _selector_terms(selector: dict[str, str] | str) -> list[str]:
+    if isinstance(selector, str):
+        return [term.strip() for term in selector.split(",") if term.strip()]
+    return [f"{key}={value}" for key, value in selector.items()]
+
+
+@dataclass
+class Snapshot:
+    """One listed kind in one namespace, with pod indexes."""
+    kind: str
+    namespace: str
+    content: list[dict[str, Any]]
+    fetched_at: float
+    objects: list[dict[str, Any]] | None = None
+    pods: dict[str, dict[str, Any]] = field(default_factory=dict)
+    by_label: dict[str, set[str]] = field(default_factory=dict)
+    by_deployment: dict[str, set[str]] = field(default_factory=dict)
+    by_status: dict[str, set[str]] = field(default_factory=dict)
+    # Pod keys ordered by restart count, highest first
+    by_restarts: list[str] = field(default_factory=list)
+
+    @classmethod
+    def build(cls, kind: str, namespace: str, content: list[dict[str, Any]], fetched_at: float) -> "Snapshot":
+        snapshot = cls(kind, namespace, content, fetched_at, objects=parse_objects(content))
+        if kind == "pods" and snapshot.objects is not None:
+            snapshot._index_pods()
+        return snapshot
+
+    def _index_pods(self) -> None:
+        for obj in self.objects or []:
+            pod = pod_summary(obj)
+            # Namespaced key so all-namespace snapshots cannot collide
+            key = f"{pod['namespace']}/{pod['name']}"
+            self.pods[key] = pod
+            for label, value in pod["labels"].items():
+                self.by_label.setdefault(f"{label}={value}", set()).add(key)
+            if pod["deployment"]:
+                self.by_deployment.setdefault(pod["deployment"], set()).add(key)
+            self.by_status.setdefault(pod["status"], set()).add(key)
+        self.by_restarts = sorted(self.pods, key=lambda k: self.pods[k]["restarts"], reverse=True)
+
+    def find_pods(
+        self,
+        selector: dict[str, str] | str | None = None,
+        deployment: str | None = None,
+        status: str | None = None,
+        min_restarts: int = 0
+    ) -> list[dict[str, Any]]:
+        """Pods matching every given filter, most restarts first."""
+        keys: set[str] | None = None
+        candidates = [self.by_label.get(term, set()) for term in _selector_terms(selector or {})]
+        if deployment is not None:
+            candidates.append(self.by_deployment.get(deployment, set()))
+        if status is not None:
+            candidates.append(self.by_status.get(status, set()))
+        for candidate in candidates:
+            keys = candidate if keys is None else keys & candidate
+
+        pods = []
+        for key in self.by_restarts:
+            if self.pods[key]["restarts"] < min_restarts:
+                break
+            if keys is None or key in keys:
+                pods.append(self.pods[key])
+        return pods
+
+
+class ClusterStateCache:
+    """Keeps per-namespace snapshots warm and serves reads from memory."""
+
+    def __init__(
+        self,
+        fetch: ListFetcher,
+        resync_interval: float = 30.0,
+        max_staleness: float = 60.0,
+        idle_timeout: float = 600.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.fetch = fetch
+        self.resync_interval = resync_interval
+        self.max_staleness = max_staleness
+        self.idle_timeout = idle_timeout
+        self._clock = clock
+        self._snapshots: dict[tuple[str, str], Snapshot] = {}
+        self._last_used: dict[tuple[str, str], float] = {}
+        self._locks: dict[tuple[str, str], asyncio.Lock] = {}
+        self._resync_task: asyncio.Task | None = None
+        self.hits = 0
+        self.fetches = 0
+        self.failures = 0
+
+    def _fresh(self, snapshot: Snapshot | None) -> bool:
+        return snapshot is not None and self._clock() - snapshot.fetched_at <= self.max_staleness
+
+    async def get(self, kind: str, namespace: str) -> Snapshot:
+        """Snapshot of ``kind`` in ``namespace``, fetched only when stale.
+
+        Raises:
+            ClusterStateUnavailableError: If the snapshot is stale and refetching fails
+        """
+        key = (kind, namespace)
+        self._last_used[key] = self._clock()
+        snapshot = self._snapshots.get(key)
+        if self._fresh(snapshot):
+            self.hits += 1
+            return snapshot
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another caller may have refreshed it while we waited
+            snapshot = self._snapshots.get(key)
+            if self._fresh(snapshot):
+                self.hits += 1
+                return snapshot
+            return await self._refresh(kind, namespace)
+
+    async def _refresh(self, kind: str, namespace: str) -> Snapshot:
+        self.fetches += 1
+        result = await self.fetch(kind, namespace)
+        if not result.get("success"):
+            self.failures += 1
+            raise ClusterStateUnavailableError(result.get("error") or f"Failed to list {kind}")
+        snapshot = Snapshot.build(kind, namespace, result.get("content") or [], self._clock())
+        self._snapshots[(kind, namespace)] = snapshot
+        return snapshot
+
+    def invalidate(self, namespace: str | None = None, kind: str | None = None) -> None:
+        """Mark snapshots stale after a write; all-namespace ones always are."""
+        for (snap_kind, snap_namespace), snapshot in self._snapshots.items():
+            if kind not in (None, snap_kind):
+                continue
+            if namespace in (None, snap_namespace) or snap_namespace in ("all", "*"):
+                snapshot.fetched_at = float("-inf")
+
+    def start(self) -> None:
+        """Start resyncing recently used snapshots in the background."""
+        if self._resync_task is None or self._resync_task.done():
+            self._resync_task = asyncio.create_task(self._resync_loop())
+
+    async def stop(self) -> None:
+        if self._resync_task:
+            self._resync_task.cancel()
+            await asyncio.gather(self._resync_task, return_exceptions=True)
+            self._resync_task = None
+
+    async def resync(self) -> None:
+        """Refresh every snapshot used within ``idle_timeout``; drop the rest."""
+        now = self._clock()
+        for key in [k for k, used in self._last_used.items() if now - used > self.idle_timeout]:
+            self._last_used.pop(key, None)
+            self._snapshots.pop(key, None)
+            self._locks.pop(key, None)
+
+        due = [
+            key for key in self._last_used
+            if key not in self._snapshots or now - self._snapshots[key].fetched_at >= self.resync_interval
+        ]
+        results = await asyncio.gather(*(self._resync_one(*key) for key in due), return_exceptions=True)
+        for key, result in zip(due, results, strict=True):
+            if isinstance(result, Exception):
+                logger.warning(f"Resync of {key[0]} in {key[1]} failed: {result}")
+
+    async def _resync_one(self, kind: str, namespace: str) -> None:
+        async with self._locks.setdefault((kind, namespace), asyncio.Lock()):
+            await self._refresh(kind, namespace)
+
+    async def _resync_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.resync_interval)
+            try:
+                await self.resync()
+            except Exception as e:
+                logger.error(f"Cluster state resync failed: {e}")
+
+    def get_stats(self) -> dict[str, Any]:
+        now = self._clock()
+        return {
+            "hits": self.hits,
+            "fetches": self.fetches,
+            "failures": self.failures,
+            "snapshots": {
+                f"{kind}/{namespace}": {
+                    "age_seconds": round(now - snapshot.fetched_at, 1) if snapshot.fetched_at > float("-inf") else None,
+                    "objects": len(snapshot.objects) if snapshot.objects is not None else None,
+                }
+                for (kind, namespace), snapshot in self._snapshots.items()
+            },
+        }
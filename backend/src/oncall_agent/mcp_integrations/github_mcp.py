@@ -1,13 +1,12 @@
 """GitHub MCP integration for the oncall agent."""
 
 import asyncio
-import json
 import os
-import subprocess
 from datetime import datetime
 from typing import Any
 
 from .base import MCPIntegration
+from .stdio_transport import StdioJSONRPCTransport
 
 
 class GitHubMCPIntegration(MCPIntegration):
@@ -29,7 +28,7 @@ class GitHubMCPIntegration(MCPIntegration):
         self.mcp_server_path = config.get("mcp_server_path", "../../github-mcp-server/github-mcp-server")
         self.server_host = config.get("server_host", "localhost")
         self.server_port = config.get("server_port", 8081)
-        self.server_process = None
+        self.transport: StdioJSONRPCTransport | None = None
         self.connected = False
 
         # Service to repository mapping
@@ -86,29 +85,28 @@ class GitHubMCPIntegration(MCPIntegration):
 
             # Start the server process
             self.logger.info("📡 Launching GitHub MCP server process...")
-            self.server_process = subprocess.Popen(
+            self.transport = await StdioJSONRPCTransport.spawn(
                 [self.mcp_server_path, "stdio"],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                env=env
+                env=env,
+                name="github",
+                logger=self.logger
             )
-            self.logger.info(f"🔄 GitHub MCP server process launched with PID: {self.server_process.pid}")
+            self.logger.info(f"🔄 GitHub MCP server process launched with PID: {self.transport.pid}")
 
             # Wait for server to start
             self.logger.info("⏳ Waiting for GitHub MCP server to initialize (2 seconds)...")
             await asyncio.sleep(2)
 
             # Check if process is still running
-            if self.server_process.poll() is not None:
-                stdout, stderr = self.server_process.communicate()
-                self.logger.error(f"❌ GitHub MCP server failed to start. Exit code: {self.server_process.returncode}")
+            if not self.transport.is_running:
+                returncode = self.transport.process.returncode
+                stderr = "\n".join(self.transport.stderr_tail)
+                self.logger.error(f"❌ GitHub MCP server failed to start. Exit code: {returncode}")
                 self.logger.error(f"❌ STDERR: {stderr}")
-                raise RuntimeError(f"GitHub MCP server failed to start. Exit code: {self.server_process.returncode}\nSTDERR: {stderr}")
+                raise RuntimeError(f"GitHub MCP server failed to start. Exit code: {returncode}\nSTDERR: {stderr}")
 
-            print(f"✅ GITHUB MCP: GitHub MCP server is running with PID {self.server_process.pid}")
-            self.logger.info(f"✅ GitHub MCP server is running with PID {self.server_process.pid}")
+            print(f"✅ GITHUB MCP: GitHub MCP server is running with PID {self.transport.pid}")
+            self.logger.info(f"✅ GitHub MCP server is running with PID {self.transport.pid}")
 
             # Initialize MCP connection
             print("🤝 GITHUB MCP: Initializing MCP protocol connection...")
@@ -129,27 +127,15 @@ class GitHubMCPIntegration(MCPIntegration):
         """Initialize the MCP protocol connection."""
         try:
             self.logger.info("📨 Sending MCP initialization message...")
-            # Send MCP initialization message
-            init_message = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "initialize",
-                "params": {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {},
-                    "clientInfo": {
-                        "name": "oncall-agent",
-                        "version": "1.0.0"
-                    }
+            # Send MCP initialization message and wait for its response
+            response = await self._send_mcp_request("initialize", {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {},
+                "clientInfo": {
+                    "name": "oncall-agent",
+                    "version": "1.0.0"
                 }
-            }
-
-            await self._send_mcp_message(init_message)
-            self.logger.info("✅ MCP initialization message sent")
-
-            # Wait for initialization response
-            self.logger.info("⏳ Waiting for MCP initialization response...")
-            response = await self._read_mcp_response()
+            })
             if response and "result" in response:
                 self.logger.info("✅ MCP connection initialized successfully")
                 server_info = response['result'].get('serverInfo', {})
@@ -165,69 +151,53 @@ class GitHubMCPIntegration(MCPIntegration):
             self.logger.error(f"❌ MCP initialization failed: {e}")
             raise
 
-    async def _send_mcp_message(self, message: dict[str, Any]) -> None:
-        """Send a message to the MCP server."""
-        if not self.server_process or self.server_process.poll() is not None:
+    async def _send_mcp_request(self, method: str, params: dict[str, Any],
+                                timeout: float = 5.0) -> dict[str, Any] | None:
+        """Send a request to the MCP server and wait for its matching response."""
+        if not self.transport or not self.transport.is_running:
             raise RuntimeError("GitHub MCP server is not running")
 
         try:
-            message_str = json.dumps(message) + "\n"
-            self.server_process.stdin.write(message_str)
-            self.server_process.stdin.flush()
-            self.logger.debug(f"Sent MCP message: {message}")
-        except Exception as e:
-            self.logger.error(f"Failed to send MCP message: {e}")
-            raise
-
-    async def _read_mcp_response(self, timeout: float = 5.0) -> dict[str, Any] | None:
-        """Read a response from the MCP server."""
-        if not self.server_process:
+            response = await self.transport.request(method, params, timeout=timeout)
+            self.logger.debug(f"Received MCP response: {response}")
+            return response
+        except TimeoutError:
+            self.logger.warning("Timeout reading MCP response")
+            return None
+        except ConnectionError as e:
+            self.logger.error(f"Error reading MCP response: {e}")
             return None
 
-        try:
-            # Use asyncio to read with timeout
-            line = await asyncio.wait_for(
-                asyncio.create_task(asyncio.to_thread(self.server_process.stdout.readline)),
-                timeout=timeout
-            )
+    async def _call_mcp_tool(self, tool_name: str, arguments: dict[str, Any],
+                             timeout: float = 10.0) -> dict[str, Any] | None:
+        """Call an MCP tool and return the raw response."""
+        if not self.transport or not self.transport.is_running:
+            raise RuntimeError("GitHub MCP server is not running")
 
-            if line:
-                response = json.loads(line.strip())
-                self.logger.debug(f"Received MCP response: {response}")
-                return response
-            return None
+        try:
+            # call_tool records the call's latency and outcome
+            response = await self.transport.call_tool(tool_name, arguments, timeout=timeout)
+            self.logger.debug(f"Received MCP response: {response}")
+            return response
         except TimeoutError:
-            self.logger.warning("Timeout reading MCP response")
+            self.logger.warning(f"Timeout calling GitHub MCP tool {tool_name}")
             return None
-        except Exception as e:
-            self.logger.error(f"Error reading MCP response: {e}")
+        except ConnectionError as e:
+            self.logger.error(f"Error calling GitHub MCP tool {tool_name}: {e}")
             return None
 
     async def disconnect(self) -> None:
         """Disconnect from the GitHub MCP server."""
-        if self.server_process:
+        if self.transport:
             try:
                 self.logger.info("🛑 Shutting down GitHub MCP server...")
-                # Terminate the process gracefully
-                self.server_process.terminate()
-                self.logger.info("📡 Sent termination signal to GitHub MCP server")
-
-                # Wait for process to terminate
-                try:
-                    self.server_process.wait(timeout=5)
-                    self.logger.info("✅ GitHub MCP server terminated gracefully")
-                except subprocess.TimeoutExpired:
-                    # Force kill if needed
-                    self.logger.warning("⚠️  GitHub MCP server didn't terminate gracefully, force killing...")
-                    self.server_process.kill()
-                    self.server_process.wait()
-                    self.logger.info("🔪 GitHub MCP server force killed")
-
+                # Fails in-flight requests, then terminates (or kills) the process
+                await self.transport.close(timeout=5)
                 self.logger.info("✅ GitHub MCP server stopped successfully")
             except Exception as e:
                 self.logger.error(f"❌ Error stopping GitHub MCP server: {e}")
             finally:
-                self.server_process = None
+                self.transport = None
                 self.connected = False
                 self.logger.info("🔌 GitHub MCP integration disconnected")
 
@@ -262,25 +232,11 @@ class GitHubMCPIntegration(MCPIntegration):
 
     async def _fetch_recent_commits(self, repository: str, since_hours: int) -> dict[str, Any]:
         """Fetch recent commits from a repository."""
-        message_id = self._generate_message_id()
-
-        # Send tool call message
-        tool_message = {
-            "jsonrpc": "2.0",
-            "id": message_id,
-            "method": "tools/call",
-            "params": {
-                "name": "list_commits",
-                "arguments": {
-                    "owner": repository.split("/")[0],
-                    "repo": repository.split("/")[1],
-                    "per_page": 20
-                }
-            }
-        }
-
-        await self._send_mcp_message(tool_message)
-        response = await self._read_mcp_response(timeout=10)
+        response = await self._call_mcp_tool("list_commits", {
+            "owner": repository.split("/")[0],
+            "repo": repository.split("/")[1],
+            "per_page": 20
+        })
 
         if response and "result" in response:
             commits = response["result"].get("content", [])
@@ -295,27 +251,13 @@ class GitHubMCPIntegration(MCPIntegration):
 
     async def _fetch_open_issues(self, repository: str, labels: list[str]) -> dict[str, Any]:
         """Fetch open issues from a repository."""
-        message_id = self._generate_message_id()
-
-        # Send tool call message
-        tool_message = {
-            "jsonrpc": "2.0",
-            "id": message_id,
-            "method": "tools/call",
-            "params": {
-                "name": "list_issues",
-                "arguments": {
-                    "owner": repository.split("/")[0],
-                    "repo": repository.split("/")[1],
-                    "state": "open",
-                    "labels": ",".join(labels) if labels else None,
-                    "per_page": 10
-                }
-            }
-        }
-
-        await self._send_mcp_message(tool_message)
-        response = await self._read_mcp_response(timeout=10)
+        response = await self._call_mcp_tool("list_issues", {
+            "owner": repository.split("/")[0],
+            "repo": repository.split("/")[1],
+            "state": "open",
+            "labels": ",".join(labels) if labels else None,
+            "per_page": 10
+        })
 
         if response and "result" in response:
             issues = response["result"].get("content", [])
@@ -340,26 +282,12 @@ class GitHubMCPIntegration(MCPIntegration):
 
     async def _fetch_pull_requests(self, repository: str, state: str) -> dict[str, Any]:
         """Fetch pull requests from a repository."""
-        message_id = self._generate_message_id()
-
-        # Send tool call message
-        tool_message = {
-            "jsonrpc": "2.0",
-            "id": message_id,
-            "method": "tools/call",
-            "params": {
-                "name": "list_pull_requests",
-                "arguments": {
-                    "owner": repository.split("/")[0],
-                    "repo": repository.split("/")[1],
-                    "state": state,
-                    "per_page": 10
-                }
-            }
-        }
-
-        await self._send_mcp_message(tool_message)
-        response = await self._read_mcp_response(timeout=10)
+        response = await self._call_mcp_tool("list_pull_requests", {
+            "owner": repository.split("/")[0],
+            "repo": repository.split("/")[1],
+            "state": state,
+            "per_page": 10
+        })
 
         if response and "result" in response:
             prs = response["result"].get("content", [])
@@ -399,31 +327,17 @@ class GitHubMCPIntegration(MCPIntegration):
 
     async def _create_issue(self, params: dict[str, Any]) -> dict[str, Any]:
         """Create a GitHub issue."""
-        message_id = self._generate_message_id()
-
         repository = params.get("repository", "")
         if "/" not in repository:
             return {"error": "Invalid repository format. Use owner/repo"}
 
-        # Send tool call message
-        tool_message = {
-            "jsonrpc": "2.0",
-            "id": message_id,
-            "method": "tools/call",
-            "params": {
-                "name": "create_issue",
-                "arguments": {
-                    "owner": repository.split("/")[0],
-                    "repo": repository.split("/")[1],
-                    "title": params.get("title", "Incident Report"),
-                    "body": params.get("body", ""),
-                    "labels": params.get("labels", ["incident", "auto-generated"])
-                }
-            }
-        }
-
-        await self._send_mcp_message(tool_message)
-        response = await self._read_mcp_response(timeout=10)
+        response = await self._call_mcp_tool("create_issue", {
+            "owner": repository.split("/")[0],
+            "repo": repository.split("/")[1],
+            "title": params.get("title", "Incident Report"),
+            "body": params.get("body", ""),
+            "labels": params.get("labels", ["incident", "auto-generated"])
+        })
 
         if response and "result" in response:
             return {
@@ -436,30 +350,16 @@ class GitHubMCPIntegration(MCPIntegration):
 
     async def _add_comment(self, params: dict[str, Any]) -> dict[str, Any]:
         """Add a comment to an issue or PR."""
-        message_id = self._generate_message_id()
-
         repository = params.get("repository", "")
         if "/" not in repository:
             return {"error": "Invalid repository format. Use owner/repo"}
 
-        # Send tool call message
-        tool_message = {
-            "jsonrpc": "2.0",
-            "id": message_id,
-            "method": "tools/call",
-            "params": {
-                "name": "add_issue_comment",
-                "arguments": {
-                    "owner": repository.split("/")[0],
-                    "repo": repository.split("/")[1],
-                    "issue_number": params.get("issue_number"),
-                    "body": params.get("body", "")
-                }
-            }
-        }
-
-        await self._send_mcp_message(tool_message)
-        response = await self._read_mcp_response(timeout=10)
+        response = await self._call_mcp_tool("add_issue_comment", {
+            "owner": repository.split("/")[0],
+            "repo": repository.split("/")[1],
+            "issue_number": params.get("issue_number"),
+            "body": params.get("body", "")
+        })
 
         if response and "result" in response:
             return {
@@ -489,40 +389,22 @@ class GitHubMCPIntegration(MCPIntegration):
 
     async def health_check(self) -> bool:
         """Check if the GitHub MCP integration is healthy."""
-        if not self.connected or not self.server_process:
+        if not self.connected or not self.transport:
             return False
 
         # Check if process is still running
-        if self.server_process.poll() is not None:
+        if not self.transport.is_running:
             self.connected = False
             return False
 
         # Try a simple MCP ping
         try:
-            message_id = self._generate_message_id()
-            ping_message = {
-                "jsonrpc": "2.0",
-                "id": message_id,
-                "method": "ping",
-                "params": {}
-            }
-
-            await self._send_mcp_message(ping_message)
-            response = await self._read_mcp_response(timeout=2)
+            response = await self._send_mcp_request("ping", {}, timeout=2)
 
             return response is not None
         except Exception:
             return False
 
-    def _generate_message_id(self) -> int:
-        """Generate a unique message ID for MCP communication."""
-        # Simple incrementing ID (in production, use UUID or better strategy)
-        if not hasattr(self, '_message_counter'):
-            self._message_counter = 1
-        else:
-            self._message_counter += 1
-        return self._message_counter
-
     def get_repository_for_service(self, service_name: str) -> str | None:
         """Get the GitHub repository for a given service name."""
         return self.service_repo_mapping.get(service_name)
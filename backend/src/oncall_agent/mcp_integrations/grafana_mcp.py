@@ -1,14 +1,13 @@
 """Grafana MCP integration for metrics and dashboards access."""
 
 import asyncio
-import json
-import subprocess
 from datetime import datetime
 from typing import Any
 
 import httpx
 
 from .base import MCPIntegration
+from .stdio_transport import StdioJSONRPCTransport
 
 
 class GrafanaMCPIntegration(MCPIntegration):
@@ -28,7 +27,7 @@ class GrafanaMCPIntegration(MCPIntegration):
                 - server_port: Port for MCP server
         """
         super().__init__("grafana", config)
-        self.process: subprocess.Popen | None = None
+        self.transport: StdioJSONRPCTransport | None = None
         self.client: httpx.AsyncClient | None = None
 
         # Grafana connection details
@@ -69,21 +68,19 @@ class GrafanaMCPIntegration(MCPIntegration):
 
             # Start the Grafana MCP server process
             self.logger.info(f"Starting Grafana MCP server: {self.mcp_server_path}")
-            self.process = subprocess.Popen(
+            self.transport = await StdioJSONRPCTransport.spawn(
                 [self.mcp_server_path, "stdio"],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                env={**env}
+                env=env,
+                name="grafana",
+                logger=self.logger
             )
 
             # Wait for the server to start
             await asyncio.sleep(3)
 
             # Check if process is still running
-            if self.process.poll() is not None:
-                stderr = self.process.stderr.read() if self.process.stderr else ""
+            if not self.transport.is_running:
+                stderr = "\n".join(self.transport.stderr_tail)
                 raise ConnectionError(f"Grafana MCP server failed to start: {stderr}")
 
             # Initialize MCP connection
@@ -132,88 +129,32 @@ class GrafanaMCPIntegration(MCPIntegration):
 
     async def _initialize_mcp_connection(self) -> None:
         """Initialize MCP connection via stdio."""
-        if not self.process or not self.process.stdout or not self.process.stdin:
+        if not self.transport or not self.transport.is_running:
             raise ConnectionError("MCP process not properly initialized")
 
-        # Send initialization message
-        init_message = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "initialize",
-            "params": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {},
-                "clientInfo": {
-                    "name": "oncall-agent",
-                    "version": "1.0.0"
-                }
-            }
-        }
-
         # Send initialization
-        init_json = json.dumps(init_message) + "\n"
-        self.process.stdin.write(init_json.encode())
-        self.process.stdin.flush()
-
-        # Wait for response
-        response = self.process.stdout.readline()
-        if not response:
-            raise ConnectionError("No response from MCP server")
-
-        response_data = json.loads(response.decode().strip())
-        if "error" in response_data:
-            raise ConnectionError(f"MCP initialization failed: {response_data['error']}")
+        response = await self.transport.request("initialize", {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {},
+            "clientInfo": {
+                "name": "oncall-agent",
+                "version": "1.0.0"
+            }
+        }, timeout=10.0)
+        if "error" in response:
+            raise ConnectionError(f"MCP initialization failed: {response['error']}")
 
         # Send initialized notification
-        initialized_message = {
-            "jsonrpc": "2.0",
-            "id": 2,
-            "method": "initialized",
-            "params": {}
-        }
-
-        initialized_json = json.dumps(initialized_message) + "\n"
-        self.process.stdin.write(initialized_json.encode())
-        self.process.stdin.flush()
+        await self.transport.notify("notifications/initialized")
 
         self.logger.info("MCP connection initialized successfully")
 
     async def _call_mcp_tool(self, tool_name: str, arguments: dict[str, Any]) -> dict[str, Any]:
         """Call an MCP tool via stdio communication."""
-        if not self.process or self.process.poll() is not None:
+        if not self._mcp_available():
             raise RuntimeError("MCP server is not running")
 
-        if not self.process.stdin or not self.process.stdout:
-            raise RuntimeError("MCP process streams not available")
-
-        message_id = self._generate_message_id()
-
-        # Create tool call message
-        tool_message = {
-            "jsonrpc": "2.0",
-            "id": message_id,
-            "method": "tools/call",
-            "params": {
-                "name": tool_name,
-                "arguments": arguments
-            }
-        }
-
-        # Send message
-        message_json = json.dumps(tool_message) + "\n"
-        self.process.stdin.write(message_json.encode())
-        self.process.stdin.flush()
-
-        # Read response
-        response_line = await asyncio.wait_for(
-            asyncio.create_task(asyncio.to_thread(self.process.stdout.readline)),
-            timeout=10.0
-        )
-
-        if not response_line:
-            raise RuntimeError(f"No response for tool call: {tool_name}")
-
-        response = json.loads(response_line.decode().strip())
+        response = await self.transport.call_tool(tool_name, arguments, timeout=10.0)
 
         if "error" in response:
             raise RuntimeError(f"MCP tool error: {response['error']}")
@@ -223,20 +164,19 @@ class GrafanaMCPIntegration(MCPIntegration):
 
         raise RuntimeError(f"Invalid response for tool call: {tool_name}")
 
+    def _mcp_available(self) -> bool:
+        """Check whether the MCP server process is up."""
+        return self.transport is not None and self.transport.is_running
+
     async def disconnect(self) -> None:
         """Disconnect from the Grafana MCP server."""
         if self.client:
             await self.client.aclose()
             self.client = None
 
-        if self.process:
-            self.process.terminate()
-            try:
-                self.process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                self.process.kill()
-                self.process.wait()
-            self.process = None
+        if self.transport:
+            await self.transport.close()
+            self.transport = None
 
         self.connected = False
         self.connection_time = None
@@ -340,7 +280,7 @@ class GrafanaMCPIntegration(MCPIntegration):
         """Fetch available dashboards."""
         try:
             # Use MCP if process is running
-            if self.process and self.process.poll() is None:
+            if self._mcp_available():
                 try:
                     result = await self._call_mcp_tool("list_dashboards", {
                         "query": kwargs.get("query", ""),
@@ -385,7 +325,7 @@ class GrafanaMCPIntegration(MCPIntegration):
         """Fetch metrics data."""
         try:
             # Use MCP if process is running
-            if self.process and self.process.poll() is None:
+            if self._mcp_available():
                 try:
                     result = await self._call_mcp_tool("query_metrics", {
                         "query": query,
@@ -431,7 +371,7 @@ class GrafanaMCPIntegration(MCPIntegration):
         """Fetch current alerts."""
         try:
             # Use MCP if process is running
-            if self.process and self.process.poll() is None:
+            if self._mcp_available():
                 try:
                     result = await self._call_mcp_tool("list_alerts", {
                         "state": kwargs.get("state", "")
@@ -603,11 +543,3 @@ class GrafanaMCPIntegration(MCPIntegration):
         except Exception as e:
             self.logger.error(f"Failed to get incident metrics: {e}")
             return {"error": str(e)}
-
-    def _generate_message_id(self) -> int:
-        """Generate a unique message ID for MCP communication."""
-        if not hasattr(self, '_message_counter'):
-            self._message_counter = 2  # Start from 2 since we used 1 and 2 for init
-        else:
-            self._message_counter += 1
-        return self._message_counter
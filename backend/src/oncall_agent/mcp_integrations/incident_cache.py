@@ -0,0 +1,253 @@
+"""
+Incident-scoped read cache for MCP integrations.
+
+While one alert is handled the same pods, events and descriptions are read
+several times: by context gathering, the YOLO executor and the remediation
+pipeline. ``incident_read_cache`` opens a scope for the alert; inside it,
+``scoped(integration)`` returns a proxy that
+
+* serves repeated reads from memory,
+* lets concurrent identical reads share one call (single-flight), and
+* drops the integration's cached reads whenever a write goes through it.
+
+The scope lives in a context variable, so tasks spawned while handling an
+alert share its cache, and concurrent alerts never see each other's reads.
+"""
+
+import asyncio
+import copy
+import inspect
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Method name prefixes of read-only calls
+READ_PREFIXES = ("fetch_", "get_", "list_", "describe_", "top_", "search_")
+# execute_action actions that only read
+READ_ACTIONS = {"check_pod_logs", "describe_resource", "get_logs", "get_events", "get_pods"}
+# kubectl verbs that only read; anything else may change the cluster
+READ_KUBECTL_VERBS = {"get", "describe", "logs", "top", "explain", "api-resources", "api-versions", "version"}
+READ_ROLLOUT_SUBCOMMANDS = {"status", "history"}
+# Calls that are never cached nor treated as writes
+PASSTHROUGH_METHODS = {"connect", "disconnect", "health_check", "get_capabilities",
+                       "get_audit_log", "get_connection_info", "test_connection"}
+
+# How many finished incidents keep their statistics
+STATS_HISTORY = 100
+
+_current_scope: ContextVar["IncidentReadCache | None"] = ContextVar("incident_read_cache", default=None)
+_recent_stats: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+
+def kubectl_is_read(command: Any) -> bool:
+    """Whether a kubectl invocation (list of args or string) is read-only."""
+    args = command.split() if isinstance(command, str) else list(command or [])
+    if args and args[0] in ("kubectl", "k"):
+        args = args[1:]
+    words = [str(arg) for arg in args if not str(arg).startswith("-")]
+    if not words:
+        return False
+    if words[0] == "rollout":
+        return len(words) > 1 and words[1] in READ_ROLLOUT_SUBCOMMANDS
+    return words[0] in READ_KUBECTL_VERBS
+
+
+def classify_call(method: str, args: tuple, kwargs: dict[str, Any]) -> str:
+    """Return "read", "write" or "passthrough" for an integration call."""
+    if method in PASSTHROUGH_METHODS or method.startswith("_"):
+        return "passthrough"
+    if method == "execute_kubectl_command":
+        command = args[0] if args else kwargs.get("command", [])
+        if kubectl_is_read(command):
+            return "read"
+        return "passthrough" if kwargs.get("dry_run") else "write"
+    if method == "execute_action":
+        action = args[0] if args else kwargs.get("action", "")
+        return "read" if action in READ_ACTIONS else "write"
+    if method.startswith(READ_PREFIXES):
+        return "read"
+    return "write"
+
+
+def _call_key(integration: str, method: str, args: tuple, kwargs: dict[str, Any]) -> tuple[str, str]:
+    # auto_approve only matters for writes; reads differing in it are the same
+    kwargs = {k: v for k, v in kwargs.items() if k != "auto_approve"}
+    return integration, json.dumps([method, args, kwargs], sort_keys=True, default=str)
+
+
+def _is_failure(result: Any) -> bool:
+    return isinstance(result, dict) and (result.get("success") is False or bool(result.get("error")))
+
+
+class IncidentReadCache:
+    """Read results and hit counts for the integrations used by one incident."""
+
+    def __init__(self, incident_id: str, ttl: float | None = None):
+        self.incident_id = incident_id
+        self.ttl = ttl
+        self.started_at = time.monotonic()
+        self._entries: dict[tuple[str, str], tuple[float, Any]] = {}
+        self._in_flight: dict[tuple[str, str], asyncio.Future] = {}
+        self._proxies: dict[int, MemoizedIntegration] = {}
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.invalidations = 0
+        self.by_method: dict[str, dict[str, int]] = {}
+
+    def wrap(self, integration: Any) -> "MemoizedIntegration":
+        proxy = self._proxies.get(id(integration))
+        if proxy is None:
+            proxy = self._proxies[id(integration)] = MemoizedIntegration(integration, self)
+        return proxy
+
+    def _count(self, method: str, outcome: str) -> None:
+        counts = self.by_method.setdefault(method, {"hits": 0, "misses": 0, "shared": 0})
+        counts[outcome] += 1
+
+    async def read(self, owner: str, method: str, call, args: tuple, kwargs: dict[str, Any]) -> Any:
+        key = _call_key(owner, method, args, kwargs)
+        entry = self._entries.get(key)
+        if entry is not None and (self.ttl is None or time.monotonic() - entry[0] < self.ttl):
+            self.hits += 1
+            self._count(method, "hits")
+            return copy.deepcopy(entry[1])
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            await asyncio.wait({pending})
+            # If the leading call was cancelled, fall through and read ourselves
+            if not pending.cancelled():
+                self.shared += 1
+                self._count(method, "shared")
+                return copy.deepcopy(pending.result())
+
+        self.misses += 1
+        self._count(method, "misses")
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        generation = self.invalidations
+        try:
+            result = await call(*args, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Callers that joined the read see the error; nobody else has to
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            # A write that finished meanwhile may have made the result stale
+            if generation == self.invalidations and not _is_failure(result):
+                self._entries[key] = (time.monotonic(), copy.deepcopy(result))
+            return result
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def invalidate(self, owner: str | None = None) -> None:
+        """Forget cached reads of ``owner`` (every integration when None)."""
+        # Later reads must neither hit the cache nor join a read started before the write
+        for store in (self._entries, self._in_flight):
+            for key in [k for k in store if owner is None or k[0] == owner]:
+                del store[key]
+        self.invalidations += 1
+
+    def get_stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses + self.shared
+        return {
+            "incident_id": self.incident_id,
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared_in_flight": self.shared,
+            "invalidations": self.invalidations,
+            "cached_entries": len(self._entries),
+            "hit_rate": round((self.hits + self.shared) / lookups, 3) if lookups else 0.0,
+            "by_method": {method: dict(counts) for method, counts in self.by_method.items()},
+        }
+
+
+class MemoizedIntegration:
+    """Proxy that routes an integration's coroutine calls through a cache.
+
+    Non-coroutine attributes are returned unchanged, so the proxy can stand
+    in for any ``MCPIntegration`` (or the richer Kubernetes integrations).
+    """
+
+    def __init__(self, integration: Any, cache: IncidentReadCache):
+        self._integration = integration
+        self._cache = cache
+        self._owner = getattr(integration, "name", None) or type(integration).__name__
+
+    @property
+    def wrapped(self) -> Any:
+        return self._integration
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._integration, name)
+        if not inspect.iscoroutinefunction(attr):
+            return attr
+
+        async def call(*args, **kwargs):
+            kind = classify_call(name, args, kwargs)
+            if kind == "read":
+                return await self._cache.read(self._owner, name, attr, args, kwargs)
+            if kind == "write":
+                try:
+                    return await attr(*args, **kwargs)
+                finally:
+                    self._cache.invalidate(self._owner)
+            return await attr(*args, **kwargs)
+
+        return call
+
+
+@contextmanager
+def incident_read_cache(incident_id: str, enabled: bool = True, ttl: float | None = None) -> Iterator[IncidentReadCache | None]:
+    """Scope MCP read caching to the handling of one incident."""
+    if not enabled:
+        yield None
+        return
+    cache = IncidentReadCache(incident_id, ttl=ttl)
+    token = _current_scope.set(cache)
+    try:
+        yield cache
+    finally:
+        _current_scope.reset(token)
+        stats = cache.get_stats()
+        stats["duration"] = round(time.monotonic() - cache.started_at, 2)
+        _recent_stats[incident_id] = stats
+        _recent_stats.move_to_end(incident_id)
+        while len(_recent_stats) > STATS_HISTORY:
+            _recent_stats.popitem(last=False)
+        logger.info(
+            f"MCP read cache for {incident_id}: {stats['hits']} hits, "
+            f"{stats['shared_in_flight']} shared, {stats['misses']} misses"
+        )
+
+
+def current_read_cache() -> IncidentReadCache | None:
+    return _current_scope.get()
+
+
+def scoped(integration: Any) -> Any:
+    """``integration`` behind the active incident's read cache, if any."""
+    cache = _current_scope.get()
+    if cache is None or integration is None:
+        return integration
+    return cache.wrap(integration)
+
+
+def get_read_cache_stats() -> list[dict[str, Any]]:
+    """Statistics of recently handled incidents, newest first."""
+    return list(reversed(_recent_stats.values()))
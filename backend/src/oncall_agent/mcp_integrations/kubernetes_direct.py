@@ -3,11 +3,22 @@ Direct Kubernetes integration using the official Python client.
 
 This integration provides a more reliable alternative to MCP servers
 by using the kubernetes Python client directly.
+
+The client is synchronous, so every API call runs on a small dedicated
+thread pool instead of the event loop. List calls are paginated with
+``limit``/``continue``, push label and field selectors to the API server
+and read the raw JSON, keeping only the fields we report instead of
+building the client's model objects.
 """
 
+import asyncio
 import base64
+import json
 import tempfile
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
+from functools import partial
 from typing import Any
 
 import yaml
@@ -19,6 +30,61 @@ from src.oncall_agent.mcp_integrations.base import MCPIntegration
 from src.oncall_agent.utils.logger import get_logger
 
 
+def _project_pod(pod: dict[str, Any]) -> dict[str, Any]:
+    metadata, spec, status = pod.get("metadata", {}), pod.get("spec", {}), pod.get("status", {})
+    return {
+        "name": metadata.get("name"),
+        "namespace": metadata.get("namespace"),
+        "status": status.get("phase"),
+        "ready": all(c.get("ready") for c in status.get("containerStatuses") or []),
+        "containers": len(spec.get("containers") or [])
+    }
+
+
+def _project_deployment(deployment: dict[str, Any]) -> dict[str, Any]:
+    metadata, spec, status = deployment.get("metadata", {}), deployment.get("spec", {}), deployment.get("status", {})
+    return {
+        "name": metadata.get("name"),
+        "namespace": metadata.get("namespace"),
+        "replicas": spec.get("replicas"),
+        "ready_replicas": status.get("readyReplicas") or 0,
+        "available": status.get("availableReplicas") == spec.get("replicas")
+    }
+
+
+def _project_service(service: dict[str, Any]) -> dict[str, Any]:
+    metadata, spec = service.get("metadata", {}), service.get("spec", {})
+    return {
+        "name": metadata.get("name"),
+        "namespace": metadata.get("namespace"),
+        "type": spec.get("type"),
+        "cluster_ip": spec.get("clusterIP"),
+        "ports": [{"port": p.get("port"), "protocol": p.get("protocol")} for p in spec.get("ports") or []]
+    }
+
+
+def _project_event(event: dict[str, Any]) -> dict[str, Any]:
+    metadata, involved = event.get("metadata", {}), event.get("involvedObject", {})
+    return {
+        "namespace": metadata.get("namespace"),
+        "name": metadata.get("name"),
+        "reason": event.get("reason"),
+        "message": event.get("message"),
+        "type": event.get("type"),
+        "object": f"{involved.get('kind')}/{involved.get('name')}",
+        "timestamp": event.get("firstTimestamp")
+    }
+
+
+def _project_namespace(namespace: dict[str, Any]) -> dict[str, Any]:
+    metadata = namespace.get("metadata", {})
+    return {
+        "name": metadata.get("name"),
+        "status": namespace.get("status", {}).get("phase"),
+        "labels": metadata.get("labels") or {}
+    }
+
+
 class KubernetesDirectIntegration(MCPIntegration):
     """Direct Kubernetes integration using Python client."""
 
@@ -46,6 +112,59 @@ class KubernetesDirectIntegration(MCPIntegration):
         self.connection_time = None
         self._kubeconfig_file = None
 
+        # Blocking client calls run here, never on the event loop
+        self.max_workers = self.config.k8s_direct_max_workers
+        self.page_size = self.config.k8s_list_page_size
+        self._executor: ThreadPoolExecutor | None = None
+
+    async def _run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a blocking kubernetes client call on the integration's thread pool."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="k8s-direct")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    async def _list(self, list_fn: Callable, *args,
+                    project: Callable[[dict[str, Any]], dict[str, Any]],
+                    label_selector: str | None = None,
+                    field_selector: str | None = None,
+                    max_items: int | None = None) -> list[dict[str, Any]]:
+        """Page through a list call and project each raw JSON item.
+
+        Selectors are evaluated by the API server. Pages are fetched one at a
+        time so a cancelled caller stops the listing between pages.
+        """
+        items: list[dict[str, Any]] = []
+        token = None
+        while True:
+            limit = self.page_size if max_items is None else min(self.page_size, max_items - len(items))
+            kwargs: dict[str, Any] = {"limit": limit, "_preload_content": False}
+            if token:
+                kwargs["_continue"] = token
+            if label_selector:
+                kwargs["label_selector"] = label_selector
+            if field_selector:
+                kwargs["field_selector"] = field_selector
+
+            response = await self._run(list_fn, *args, **kwargs)
+            page = json.loads(response.data)
+            items.extend(project(item) for item in page.get("items", []))
+
+            token = page.get("metadata", {}).get("continue")
+            if not token or (max_items is not None and len(items) >= max_items):
+                return items
+
+    async def _probe(self) -> None:
+        """Cheapest authenticated API call, used to check the connection."""
+        def probe():
+            response = self.core_v1.list_namespace(limit=1, _preload_content=False)
+            try:
+                response.read()
+            finally:
+                # An unreleased raw response keeps its pooled connection checked out
+                response.release_conn()
+
+        await self._run(probe)
+
     async def connect(self) -> bool:
         """Connect to Kubernetes cluster."""
         try:
@@ -64,21 +183,22 @@ class KubernetesDirectIntegration(MCPIntegration):
                     self._kubeconfig_file = f.name
 
                 self.logger.info(f"Loading kubeconfig from temporary file with context: '{self.context}'")
-                config.load_kube_config(
+                await self._run(
+                    config.load_kube_config,
                     config_file=self._kubeconfig_file,
                     context=self.context
                 )
             else:
                 # Use default kubeconfig
                 self.logger.info(f"Loading default kubeconfig with context: '{self.context}'")
-                config.load_kube_config(context=self.context)
+                await self._run(config.load_kube_config, context=self.context)
 
             # Initialize clients
             self.core_v1 = client.CoreV1Api()
             self.apps_v1 = client.AppsV1Api()
 
             # Test connection
-            self.core_v1.list_namespace(limit=1)
+            await self._probe()
 
             self._connected = True
             self.connected = True
@@ -100,6 +220,10 @@ class KubernetesDirectIntegration(MCPIntegration):
         self.core_v1 = None
         self.apps_v1 = None
 
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
         # Clean up temp kubeconfig
         if self._kubeconfig_file:
             import os
@@ -118,67 +242,38 @@ class KubernetesDirectIntegration(MCPIntegration):
 
         context_type = params.get("type", "pods")
         namespace = params.get("namespace", self.namespace)
+        # Filters are applied by the API server, e.g. "app=api" or "status.phase!=Running"
+        selectors = {
+            "label_selector": params.get("label_selector"),
+            "field_selector": params.get("field_selector"),
+            "max_items": params.get("max_items")
+        }
 
         try:
             if context_type == "pods":
-                pods = self.core_v1.list_namespaced_pod(namespace)
-                return {
-                    "pods": [{
-                        "name": pod.metadata.name,
-                        "namespace": pod.metadata.namespace,
-                        "status": pod.status.phase,
-                        "ready": all(c.ready for c in pod.status.container_statuses or []),
-                        "containers": len(pod.spec.containers)
-                    } for pod in pods.items]
-                }
+                pods = await self._list(self.core_v1.list_namespaced_pod, namespace, project=_project_pod, **selectors)
+                return {"pods": pods}
 
             elif context_type == "deployments":
-                deployments = self.apps_v1.list_namespaced_deployment(namespace)
-                return {
-                    "deployments": [{
-                        "name": d.metadata.name,
-                        "namespace": d.metadata.namespace,
-                        "replicas": d.spec.replicas,
-                        "ready_replicas": d.status.ready_replicas or 0,
-                        "available": d.status.available_replicas == d.spec.replicas
-                    } for d in deployments.items]
-                }
+                deployments = await self._list(
+                    self.apps_v1.list_namespaced_deployment, namespace, project=_project_deployment, **selectors
+                )
+                return {"deployments": deployments}
 
             elif context_type == "services":
-                services = self.core_v1.list_namespaced_service(namespace)
-                return {
-                    "services": [{
-                        "name": s.metadata.name,
-                        "namespace": s.metadata.namespace,
-                        "type": s.spec.type,
-                        "cluster_ip": s.spec.cluster_ip,
-                        "ports": [{"port": p.port, "protocol": p.protocol} for p in s.spec.ports or []]
-                    } for s in services.items]
-                }
+                services = await self._list(
+                    self.core_v1.list_namespaced_service, namespace, project=_project_service, **selectors
+                )
+                return {"services": services}
 
             elif context_type == "events":
-                events = self.core_v1.list_event_for_all_namespaces(limit=100)
-                return {
-                    "events": [{
-                        "namespace": e.namespace,
-                        "name": e.metadata.name,
-                        "reason": e.reason,
-                        "message": e.message,
-                        "type": e.type,
-                        "object": f"{e.involved_object.kind}/{e.involved_object.name}",
-                        "timestamp": e.first_timestamp.isoformat() if e.first_timestamp else None
-                    } for e in events.items]
-                }
+                selectors["max_items"] = selectors["max_items"] or 100
+                events = await self._list(self.core_v1.list_event_for_all_namespaces, project=_project_event, **selectors)
+                return {"events": events}
 
             elif context_type == "namespaces":
-                namespaces = self.core_v1.list_namespace()
-                return {
-                    "namespaces": [{
-                        "name": ns.metadata.name,
-                        "status": ns.status.phase,
-                        "labels": ns.metadata.labels or {}
-                    } for ns in namespaces.items]
-                }
+                namespaces = await self._list(self.core_v1.list_namespace, project=_project_namespace, **selectors)
+                return {"namespaces": namespaces}
 
             else:
                 return {"error": f"Unknown context type: {context_type}"}
@@ -207,7 +302,8 @@ class KubernetesDirectIntegration(MCPIntegration):
                 namespace = params.get("namespace", self.namespace)
 
                 # Delete pod to force restart
-                self.core_v1.delete_namespaced_pod(
+                await self._run(
+                    self.core_v1.delete_namespaced_pod,
                     name=pod_name,
                     namespace=namespace,
                     grace_period_seconds=30
@@ -226,7 +322,8 @@ class KubernetesDirectIntegration(MCPIntegration):
                 tail_lines = params.get("tail_lines", 100)
                 container = params.get("container")
 
-                logs = self.core_v1.read_namespaced_pod_log(
+                logs = await self._run(
+                    self.core_v1.read_namespaced_pod_log,
                     name=pod_name,
                     namespace=namespace,
                     container=container,
@@ -245,20 +342,12 @@ class KubernetesDirectIntegration(MCPIntegration):
                 replicas = params.get("replicas")
                 namespace = params.get("namespace", self.namespace)
 
-                # Get current deployment
-                deployment = self.apps_v1.read_namespaced_deployment(
-                    name=deployment_name,
-                    namespace=namespace
-                )
-
-                # Update replicas
-                deployment.spec.replicas = replicas
-
-                # Apply update
-                self.apps_v1.patch_namespaced_deployment(
+                # Patch only the replica count instead of round-tripping the whole object
+                await self._run(
+                    self.apps_v1.patch_namespaced_deployment_scale,
                     name=deployment_name,
                     namespace=namespace,
-                    body=deployment
+                    body={"spec": {"replicas": replicas}}
                 )
 
                 return {
@@ -274,11 +363,11 @@ class KubernetesDirectIntegration(MCPIntegration):
                 namespace = params.get("namespace", self.namespace)
 
                 if kind == "pod":
-                    resource = self.core_v1.read_namespaced_pod(name, namespace)
+                    resource = await self._run(self.core_v1.read_namespaced_pod, name, namespace)
                 elif kind == "deployment":
-                    resource = self.apps_v1.read_namespaced_deployment(name, namespace)
+                    resource = await self._run(self.apps_v1.read_namespaced_deployment, name, namespace)
                 elif kind == "service":
-                    resource = self.core_v1.read_namespaced_service(name, namespace)
+                    resource = await self._run(self.core_v1.read_namespaced_service, name, namespace)
                 else:
                     return {"success": False, "error": f"Unsupported resource kind: {kind}"}
 
@@ -337,7 +426,7 @@ class KubernetesDirectIntegration(MCPIntegration):
             return False
 
         try:
-            self.core_v1.list_namespace(limit=1)
+            await self._probe()
             return True
         except:
             return False
@@ -358,22 +447,25 @@ class KubernetesDirectIntegration(MCPIntegration):
                     }
 
             # Get cluster info
-            version = self.core_v1.get_api_resources().group_version
+            version = (await self._run(self.core_v1.get_api_resources)).group_version
 
             # Count namespaces
-            namespaces = self.core_v1.list_namespace()
+            namespaces = await self._list(self.core_v1.list_namespace, project=_project_namespace)
 
             # Get nodes
-            nodes = self.core_v1.list_node()
+            nodes = await self._list(
+                self.core_v1.list_node,
+                project=lambda n: {"name": n["metadata"]["name"], "status": n.get("status", {}).get("phase")}
+            )
 
             return {
                 "connected": True,
                 "context": self.context or "current",
                 "namespace": self.namespace,
                 "api_version": version,
-                "namespaces_count": len(namespaces.items),
-                "nodes_count": len(nodes.items),
-                "nodes": [{"name": n.metadata.name, "status": n.status.phase} for n in nodes.items]
+                "namespaces_count": len(namespaces),
+                "nodes_count": len(nodes),
+                "nodes": nodes
             }
 
         except Exception as e:
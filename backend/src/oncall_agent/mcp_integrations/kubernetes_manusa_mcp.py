@@ -6,29 +6,24 @@ by manusa, mapping its MCP tools to our agent's operations.
 """
 
 import json
-from dataclasses import asdict, dataclass
+import time
 from datetime import datetime
 from typing import Any
 
 from src.oncall_agent.config import get_config
 from src.oncall_agent.mcp import MCPClient
 from src.oncall_agent.mcp_integrations.base import MCPIntegration
+from src.oncall_agent.mcp_integrations.cluster_state_cache import (
+    ClusterStateCache,
+    ClusterStateUnavailableError,
+    Snapshot,
+)
+from src.oncall_agent.mcp_integrations.incident_cache import current_read_cache
+from src.oncall_agent.services.audit_store import get_audit_store
+from src.oncall_agent.services.metrics import observe_mcp_call
 from src.oncall_agent.utils.logger import get_logger
 
 
-@dataclass
-class MCPToolCall:
-    """Represents an MCP tool call"""
-    tool: str
-    params: dict[str, Any]
-    timestamp: datetime
-
-    def to_dict(self) -> dict[str, Any]:
-        data = asdict(self)
-        data['timestamp'] = self.timestamp.isoformat()
-        return data
-
-
 class KubernetesManusaMCPIntegration(MCPIntegration):
     """Kubernetes integration for manusa/kubernetes-mcp-server."""
 
@@ -50,7 +45,16 @@ class KubernetesManusaMCPIntegration(MCPIntegration):
         self.connected = False  # Public attribute for API compatibility
         self.connection_time = None
         self._available_tools: set[str] = set()
-        self._audit_log: list[MCPToolCall] = []
+        self._audit_store = get_audit_store()
+
+        # Optional in-memory cluster state, resynced in the background
+        self.state_cache: ClusterStateCache | None = None
+        if self.config.k8s_state_cache_enabled:
+            self.state_cache = ClusterStateCache(
+                self._list_resources,
+                resync_interval=self.config.k8s_state_cache_resync_interval,
+                max_staleness=self.config.k8s_state_cache_max_staleness
+            )
 
         # Tool mapping from our actions to manusa MCP tools
         self.tool_mapping = {
@@ -108,6 +112,8 @@ class KubernetesManusaMCPIntegration(MCPIntegration):
             self._connected = True
             self.connected = True
             self.connection_time = datetime.utcnow()
+            if self.state_cache:
+                self.state_cache.start()
             return True
 
         except Exception as e:
@@ -119,6 +125,9 @@ class KubernetesManusaMCPIntegration(MCPIntegration):
     async def disconnect(self) -> None:
         """Disconnect from the MCP server."""
         try:
+            if self.state_cache:
+                await self.state_cache.stop()
+
             if self.mcp_client:
                 await self.mcp_client.disconnect()
                 self.mcp_client = None
@@ -218,6 +227,42 @@ class KubernetesManusaMCPIntegration(MCPIntegration):
         """Check if the MCP server connection is healthy."""
         return self._connected
 
+    async def list_pods(self, namespace: str | None = None) -> dict[str, Any]:
+        """List pods as flat summaries (name, status, restarts, labels, deployment)."""
+        snapshot = await self._pod_snapshot(namespace or self.namespace)
+        if isinstance(snapshot, dict):
+            return snapshot
+        return {"success": True, "pods": snapshot.find_pods()}
+
+    async def find_pods(self, namespace: str | None = None,
+                        selector: dict[str, str] | str | None = None,
+                        deployment: str | None = None,
+                        status: str | None = None,
+                        min_restarts: int = 0) -> dict[str, Any]:
+        """Pods matching a label selector, owning deployment, status and/or restart count."""
+        snapshot = await self._pod_snapshot(namespace or self.namespace)
+        if isinstance(snapshot, dict):
+            return snapshot
+        pods = snapshot.find_pods(selector=selector, deployment=deployment, status=status, min_restarts=min_restarts)
+        return {"success": True, "pods": pods}
+
+    async def _pod_snapshot(self, namespace: str) -> Snapshot | dict[str, Any]:
+        """Indexed pods of a namespace, or an error result."""
+        if self.state_cache:
+            try:
+                snapshot = await self.state_cache.get("pods", namespace)
+            except ClusterStateUnavailableError as e:
+                return {"success": False, "error": str(e)}
+        else:
+            result = await self._list_resources("pods", namespace)
+            if not result.get('success'):
+                return {"success": False, "error": result.get('error', 'Failed to get pods')}
+            snapshot = Snapshot.build("pods", namespace, result.get('content') or [], time.monotonic())
+
+        if snapshot.objects is None:
+            return {"success": False, "error": "Pod list returned by the MCP server could not be parsed"}
+        return snapshot
+
     # Private methods for MCP operations
 
     async def _call_mcp_tool(self, tool: str, params: dict[str, Any]) -> dict[str, Any]:
@@ -235,18 +280,30 @@ class KubernetesManusaMCPIntegration(MCPIntegration):
                 "error": f"Destructive operation '{tool}' not enabled"
             }
 
-        # Log the tool call
-        tool_call = MCPToolCall(
+        # Log the tool call, tied to the incident being handled if any
+        read_cache = current_read_cache()
+        self._audit_store.append(
+            "mcp_tool",
             tool=tool,
+            incident_id=read_cache.incident_id if read_cache else None,
             params=params,
-            timestamp=datetime.utcnow()
+            integration=self.name
         )
-        self._audit_log.append(tool_call)
 
         try:
             # Make the actual MCP call
             self.logger.info(f"MCP tool call: {tool} with params: {params}")
-            result = await self.mcp_client.call_tool(tool, params)
+            started = time.monotonic()
+            try:
+                result = await self.mcp_client.call_tool(tool, params)
+            except Exception:
+                observe_mcp_call(self.name, tool, time.monotonic() - started, success=False)
+                raise
+            observe_mcp_call(self.name, tool, time.monotonic() - started, success=result.success)
+
+            if self.state_cache and tool in self.destructive_tools:
+                # The cluster changed; the next read must not see the old state
+                self.state_cache.invalidate(params.get('namespace'))
 
             return {
                 "success": result.success,
@@ -263,17 +320,44 @@ class KubernetesManusaMCPIntegration(MCPIntegration):
 
     # Kubernetes operations via MCP
 
-    async def _get_pods(self, namespace: str) -> dict[str, Any]:
-        """Get pods in a namespace."""
-        if namespace == "all" or namespace == "*":
-            # List pods from all namespaces
-            result = await self._call_mcp_tool('pods_list', {})
-        else:
+    async def _list_resources(self, kind: str, namespace: str) -> dict[str, Any]:
+        """List one resource kind straight from the MCP server."""
+        all_namespaces = namespace == "all" or namespace == "*"
+
+        if kind == "pods":
+            if all_namespaces:
+                # List pods from all namespaces
+                return await self._call_mcp_tool('pods_list', {})
             # List pods in specific namespace
-            result = await self._call_mcp_tool('pods_list_in_namespace', {
+            return await self._call_mcp_tool('pods_list_in_namespace', {
                 'namespace': namespace
             })
 
+        if kind == "events":
+            return await self._call_mcp_tool('events_list', {})
+
+        params = {
+            'apiVersion': 'apps/v1' if kind == "deployments" else 'v1',
+            'kind': 'Deployment' if kind == "deployments" else 'Service'
+        }
+        if not all_namespaces:
+            params['namespace'] = namespace
+        return await self._call_mcp_tool('resources_list', params)
+
+    async def _list(self, kind: str, namespace: str) -> dict[str, Any]:
+        """List a resource kind, from the state cache when it is enabled."""
+        if not self.state_cache:
+            return await self._list_resources(kind, namespace)
+        try:
+            snapshot = await self.state_cache.get(kind, namespace)
+        except ClusterStateUnavailableError as e:
+            return {"success": False, "error": str(e)}
+        return {"success": True, "content": snapshot.content}
+
+    async def _get_pods(self, namespace: str) -> dict[str, Any]:
+        """Get pods in a namespace."""
+        result = await self._list("pods", namespace)
+
         if result.get('success'):
             return {"pods": result.get('content', [])}
         else:
@@ -281,14 +365,7 @@ class KubernetesManusaMCPIntegration(MCPIntegration):
 
     async def _get_deployments(self, namespace: str) -> dict[str, Any]:
         """Get deployments in a namespace."""
-        params = {
-            'apiVersion': 'apps/v1',
-            'kind': 'Deployment'
-        }
-        if namespace != "all" and namespace != "*":
-            params['namespace'] = namespace
-
-        result = await self._call_mcp_tool('resources_list', params)
+        result = await self._list("deployments", namespace)
 
         if result.get('success'):
             return {"deployments": result.get('content', [])}
@@ -297,14 +374,7 @@ class KubernetesManusaMCPIntegration(MCPIntegration):
 
     async def _get_services(self, namespace: str) -> dict[str, Any]:
         """Get services in a namespace."""
-        params = {
-            'apiVersion': 'v1',
-            'kind': 'Service'
-        }
-        if namespace != "all" and namespace != "*":
-            params['namespace'] = namespace
-
-        result = await self._call_mcp_tool('resources_list', params)
+        result = await self._list("services", namespace)
 
         if result.get('success'):
             return {"services": result.get('content', [])}
@@ -313,7 +383,7 @@ class KubernetesManusaMCPIntegration(MCPIntegration):
 
     async def _get_events(self) -> dict[str, Any]:
         """Get events from all namespaces."""
-        result = await self._call_mcp_tool('events_list', {})
+        result = await self._list("events", "all")
 
         if result.get('success'):
             return {"events": result.get('content', [])}
@@ -596,9 +666,12 @@ class KubernetesManusaMCPIntegration(MCPIntegration):
         """Log an action attempt."""
         self.logger.info(f"Executing action: {action} with params: {params}")
 
-    def get_audit_log(self) -> list[dict[str, Any]]:
-        """Get the audit log of all MCP tool calls."""
-        return [call.to_dict() for call in self._audit_log]
+    async def get_audit_log(self, limit: int = 100, incident_id: str | None = None, tool: str | None = None,
+                            since: float | None = None, until: float | None = None) -> list[dict[str, Any]]:
+        """Get the most recent MCP tool calls, optionally filtered."""
+        return await self._audit_store.aquery(
+            category="mcp_tool", tool=tool, incident_id=incident_id, since=since, until=until, limit=limit
+        )
 
     def get_connection_info(self) -> dict[str, Any]:
         """Get connection information for health check."""
@@ -608,7 +681,8 @@ class KubernetesManusaMCPIntegration(MCPIntegration):
             "mcp_mode": True,
             "mcp_server": "kubernetes-mcp-server (manusa)",
             "available_tools": len(self._available_tools),
-            "tools": list(self._available_tools)
+            "tools": list(self._available_tools),
+            "state_cache": self.state_cache.get_stats() if self.state_cache else None
         }
 
     # Compatibility methods for the old interface
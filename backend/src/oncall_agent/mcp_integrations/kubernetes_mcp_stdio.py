@@ -9,12 +9,15 @@ for the manusa kubernetes-mcp-server.
 import asyncio
 import json
 import os
+import time
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Any
 
 from src.oncall_agent.config import get_config
 from src.oncall_agent.mcp_integrations.base import MCPIntegration
+from src.oncall_agent.mcp_integrations.stdio_transport import StdioJSONRPCTransport
+from src.oncall_agent.services.metrics import observe_mcp_call
 from src.oncall_agent.utils.logger import get_logger
 
 
@@ -44,13 +47,11 @@ class KubernetesMCPStdioIntegration(MCPIntegration):
         self.context = context
         self.enable_destructive_operations = enable_destructive_operations
 
-        # MCP server process
-        self.process: asyncio.subprocess.Process | None = None
+        # MCP server process and the JSON-RPC transport multiplexed over it
+        self.transport: StdioJSONRPCTransport | None = None
         self._connected = False
         self.connected = False
         self.connection_time = None
-        self._message_id = 0
-        self._pending_responses = {}
 
         # Available tools from kubernetes-mcp-server
         self._available_tools = [
@@ -70,12 +71,11 @@ class KubernetesMCPStdioIntegration(MCPIntegration):
             self.logger.info(f"Starting kubernetes-mcp-server: {' '.join(cmd)}")
 
             # Start the MCP server process
-            self.process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env=self._get_server_env()
+            self.transport = await StdioJSONRPCTransport.spawn(
+                cmd,
+                env=self._get_server_env(),
+                name="kubernetes",
+                logger=self.logger
             )
 
             # Test connection by listing namespaces
@@ -99,16 +99,12 @@ class KubernetesMCPStdioIntegration(MCPIntegration):
     async def disconnect(self) -> None:
         """Disconnect from the MCP server."""
         try:
-            if self.process:
-                self.process.terminate()
-                await asyncio.wait_for(self.process.wait(), timeout=5.0)
-        except TimeoutError:
-            if self.process:
-                self.process.kill()
+            if self.transport:
+                await self.transport.close(timeout=5.0)
         except Exception as e:
             self.logger.error(f"Error during disconnect: {e}")
         finally:
-            self.process = None
+            self.transport = None
             self._connected = False
             self.connected = False
             self.logger.info("Disconnected from kubernetes-mcp-server")
@@ -145,45 +141,30 @@ class KubernetesMCPStdioIntegration(MCPIntegration):
 
         return env
 
-    async def _send_request(self, method: str, params: dict[str, Any]) -> dict[str, Any] | None:
-        """Send a request to the MCP server and wait for response."""
-        if not self.process or not self.process.stdin:
-            return None
-
-        # Create request message
-        self._message_id += 1
-        request = {
-            "jsonrpc": "2.0",
-            "id": self._message_id,
-            "method": method,
-            "params": params
-        }
-
-        try:
-            # Send request
-            request_str = json.dumps(request) + "\n"
-            self.process.stdin.write(request_str.encode())
-            await self.process.stdin.drain()
-
-            # Read response
-            response_line = await asyncio.wait_for(
-                self.process.stdout.readline(),
-                timeout=30.0
-            )
-
-            if response_line:
-                response = json.loads(response_line.decode())
-                if response.get("id") == self._message_id:
-                    return response
+    async def _send_request(self, method: str, params: dict[str, Any],
+                            timeout: float = 30.0) -> dict[str, Any] | None:
+        """Send a request to the MCP server and wait for its matching response.
 
+        This server exposes its tools as JSON-RPC methods, so every request
+        is recorded as a call of the ``method`` tool.
+        """
+        transport = self.transport
+        if not transport or not transport.is_running:
             return None
 
+        started = time.monotonic()
+        try:
+            response = await transport.request(method, params, timeout=timeout)
         except TimeoutError:
+            observe_mcp_call(transport.name, method, time.monotonic() - started, success=False)
             self.logger.error(f"Timeout waiting for response to {method}")
             return None
         except Exception as e:
+            observe_mcp_call(transport.name, method, time.monotonic() - started, success=False)
             self.logger.error(f"Error sending request: {e}")
             return None
+        observe_mcp_call(transport.name, method, time.monotonic() - started, success="error" not in response)
+        return response
 
     async def fetch_context(self, params: dict[str, Any]) -> dict[str, Any]:
         """Fetch Kubernetes context information."""
@@ -307,7 +288,7 @@ class KubernetesMCPStdioIntegration(MCPIntegration):
 
     async def health_check(self) -> bool:
         """Check if the MCP server connection is healthy."""
-        if not self._connected or not self.process:
+        if not self._connected or not self.transport:
             return False
 
         # Test with a simple request
@@ -397,5 +378,6 @@ class KubernetesMCPStdioIntegration(MCPIntegration):
             "destructive_operations_enabled": self.enable_destructive_operations,
             "mcp_server": "kubernetes-mcp-server",
             "connected": self._connected,
-            "process_running": self.process is not None and self.process.returncode is None
+            "process_running": self.transport is not None and self.transport.is_running,
+            "requests_in_flight": self.transport.in_flight if self.transport else 0
         }
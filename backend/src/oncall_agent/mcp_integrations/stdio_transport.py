@@ -0,0 +1,215 @@
+"""Multiplexed JSON-RPC transport for MCP servers running over stdio.
+
+MCP servers started as subprocesses speak newline-delimited JSON-RPC 2.0 on
+stdin/stdout. This transport owns the subprocess and a background reader task
+that routes every response to the request with the matching ``id``, so any
+number of calls can be in flight over one process at the same time and a late
+reply can never be mistaken for the answer to a later call.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import time
+from collections import deque
+from typing import Any
+
+from src.oncall_agent.services.metrics import observe_mcp_call
+
+# MCP tool results (pod lists, logs) routinely exceed asyncio's 64 KiB default
+STREAM_LIMIT = 16 * 1024 * 1024
+
+
+class StdioJSONRPCTransport:
+    """JSON-RPC 2.0 client multiplexed over a subprocess' stdin/stdout."""
+
+    def __init__(self, process: asyncio.subprocess.Process, name: str = "mcp",
+                 logger: logging.Logger | None = None):
+        """Wrap an already started subprocess and start reading its output.
+
+        Args:
+            process: Subprocess created with stdin/stdout (and optionally stderr) pipes
+            name: Name used in log messages
+            logger: Logger to use, defaults to this module's logger
+        """
+        self.process = process
+        self.name = name
+        self.logger = logger or logging.getLogger(f"{__name__}.{name}")
+        self.stderr_tail: deque[str] = deque(maxlen=50)
+
+        self._ids = itertools.count(1)
+        self._pending: dict[int, asyncio.Future] = {}
+        self._write_lock = asyncio.Lock()
+        self._closed = False
+        # Set when stdout can no longer be read; nothing could answer a request
+        self._reader_stopped = False
+        self._reader_task = asyncio.create_task(self._read_stdout())
+        self._stderr_task = (
+            asyncio.create_task(self._read_stderr()) if process.stderr else None
+        )
+
+    @classmethod
+    async def spawn(cls, cmd: list[str], env: dict[str, str] | None = None,
+                    name: str = "mcp", logger: logging.Logger | None = None) -> "StdioJSONRPCTransport":
+        """Start ``cmd`` as a subprocess and return a transport bound to it."""
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env,
+            limit=STREAM_LIMIT
+        )
+        return cls(process, name=name, logger=logger)
+
+    @property
+    def pid(self) -> int:
+        """PID of the server process."""
+        return self.process.pid
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the server process is alive and the transport is usable."""
+        return not self._closed and not self._reader_stopped and self.process.returncode is None
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently awaiting a response."""
+        return len(self._pending)
+
+    async def request(self, method: str, params: dict[str, Any] | None = None,
+                      timeout: float | None = 30.0) -> dict[str, Any]:
+        """Send a request and wait for the response with the same id.
+
+        Returns:
+            The full JSON-RPC response message (containing ``result`` or ``error``)
+
+        Raises:
+            TimeoutError: If no response arrives within ``timeout`` seconds
+            ConnectionError: If the server is not running or exits before replying
+        """
+        if not self.is_running:
+            raise ConnectionError(f"{self.name} MCP server is not running")
+
+        message_id = next(self._ids)
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        try:
+            await self._write({
+                "jsonrpc": "2.0",
+                "id": message_id,
+                "method": method,
+                "params": params or {}
+            })
+            return await asyncio.wait_for(future, timeout=timeout)
+        except TimeoutError:
+            self.logger.warning(f"Timeout waiting for {self.name} MCP response to {method} (id={message_id})")
+            raise
+        finally:
+            # Covers timeouts and caller cancellation; a late reply is then dropped
+            self._pending.pop(message_id, None)
+
+    async def call_tool(self, tool_name: str, arguments: dict[str, Any],
+                        timeout: float | None = 30.0) -> dict[str, Any]:
+        """Invoke an MCP tool via ``tools/call``."""
+        started = time.monotonic()
+        try:
+            response = await self.request(
+                "tools/call",
+                {"name": tool_name, "arguments": arguments},
+                timeout=timeout
+            )
+        except Exception:
+            observe_mcp_call(self.name, tool_name, time.monotonic() - started, success=False)
+            raise
+        observe_mcp_call(self.name, tool_name, time.monotonic() - started, success="error" not in response)
+        return response
+
+    async def notify(self, method: str, params: dict[str, Any] | None = None) -> None:
+        """Send a notification (a request without an id, which gets no response)."""
+        if not self.is_running:
+            raise ConnectionError(f"{self.name} MCP server is not running")
+        await self._write({"jsonrpc": "2.0", "method": method, "params": params or {}})
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Fail pending requests, stop the reader tasks and terminate the server."""
+        if self._closed:
+            return
+        self._closed = True
+        self._fail_pending(ConnectionError(f"{self.name} MCP transport closed"))
+
+        if self.process.returncode is None:
+            try:
+                self.process.terminate()
+                await asyncio.wait_for(self.process.wait(), timeout=timeout)
+            except TimeoutError:
+                self.logger.warning(f"{self.name} MCP server did not terminate, killing it")
+                self.process.kill()
+                await self.process.wait()
+            except ProcessLookupError:
+                pass
+
+        for task in (self._reader_task, self._stderr_task):
+            if task and not task.done():
+                task.cancel()
+        await asyncio.gather(
+            *(t for t in (self._reader_task, self._stderr_task) if t),
+            return_exceptions=True
+        )
+
+    async def _write(self, message: dict[str, Any]) -> None:
+        """Write one newline-delimited JSON message to the server."""
+        data = (json.dumps(message) + "\n").encode()
+        async with self._write_lock:
+            self.process.stdin.write(data)
+            await self.process.stdin.drain()
+        self.logger.debug(f"Sent MCP message: {message.get('method')} (id={message.get('id')})")
+
+    async def _read_stdout(self) -> None:
+        """Route responses from stdout to their pending futures until EOF."""
+        try:
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    self.logger.debug(f"Ignoring non-JSON output from {self.name}: {line[:200]!r}")
+                    continue
+
+                message_id = message.get("id") if isinstance(message, dict) else None
+                future = self._pending.get(message_id) if message_id is not None else None
+                if future is None:
+                    # Notifications, server-initiated requests and late replies
+                    self.logger.debug(f"Unmatched MCP message from {self.name}: {str(message)[:200]}")
+                elif not future.done():
+                    future.set_result(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # e.g. ValueError for a line longer than STREAM_LIMIT
+            self.logger.error(f"{self.name} MCP reader failed: {e}")
+        finally:
+            # Callers see the transport as down instead of waiting out their timeouts;
+            # close() still terminates the process
+            self._reader_stopped = True
+            self._fail_pending(ConnectionError(f"{self.name} MCP server closed its output"))
+
+    async def _read_stderr(self) -> None:
+        """Drain stderr so the server never blocks on a full pipe."""
+        while True:
+            line = await self.process.stderr.readline()
+            if not line:
+                return
+            text = line.decode(errors="replace").rstrip()
+            self.stderr_tail.append(text)
+            self.logger.debug(f"[{self.name} stderr] {text}")
+
+    def _fail_pending(self, error: Exception) -> None:
+        """Fail every request that is still waiting for a response."""
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
@@ -11,9 +11,15 @@ This module implements a command pipeline that:
 import asyncio
 import json
 import re
+import time
+from collections.abc import Awaitable, Callable
 from datetime import datetime
+from functools import partial
 from typing import Any
 
+from .config import get_config
+from .remediation_scheduler import FAILED, RemediationScheduler
+from .rollout_waiter import RolloutWaiter
 from .utils import get_logger
 
 
@@ -215,13 +221,108 @@ class DiagnosticParser:
         return pod_name
 
 
+def diagnostic_commands(alert_type: str, context: dict[str, Any]) -> dict[str, list[str]]:
+    """Read-only kubectl commands diagnosing an alert type, keyed by result name."""
+    if alert_type == 'oom_kill':
+        return {
+            # Memory usage of all pods
+            'memory_usage': ["top", "pods", "--all-namespaces", "--sort-by=memory"],
+            'oom_events': ["get", "events", "--all-namespaces",
+                           "--field-selector", "reason=OOMKilling", "-o", "json"],
+        }
+    if alert_type == 'pod_crash':
+        # Pods with errors
+        return {'pod_status': ["get", "pods", "-n", context.get('namespace', 'default')]}
+    return {}
+
+
+async def run_diagnostics(k8s_integration, commands: dict[str, list[str]]) -> dict[str, Any]:
+    """Run diagnostic commands concurrently; results are keyed like ``commands``."""
+    outputs = await asyncio.gather(*(
+        k8s_integration.execute_kubectl_command(command, auto_approve=True)
+        for command in commands.values()
+    ))
+    return dict(zip(commands, outputs, strict=True))
+
+
+class SpeculativeDiagnostics:
+    """Diagnostics started as soon as an alert is classified.
+
+    They run while context is gathered and the LLM analyses the incident;
+    the pipeline uses their results if it later runs the same commands.
+    """
+
+    def __init__(self, k8s_integration, alert_type: str, context: dict[str, Any],
+                 clock: Callable[[], float] = time.monotonic):
+        self.alert_type = alert_type
+        self.commands = diagnostic_commands(alert_type, context)
+        self._clock = clock
+        self.logger = get_logger(__name__)
+        self.started_at = clock()
+        self.task = asyncio.create_task(run_diagnostics(k8s_integration, self.commands))
+        # Retrieve a failure even if the pipeline never awaits the task
+        self.task.add_done_callback(self._log_failure)
+
+    def _log_failure(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.warning(f"Speculative {self.alert_type} diagnostics failed: {task.exception()}")
+
+    def age(self) -> float:
+        return self._clock() - self.started_at
+
+    def matches(self, alert_type: str, commands: dict[str, list[str]]) -> bool:
+        return alert_type == self.alert_type and commands == self.commands and not self.task.cancelled()
+
+    def cancel(self) -> None:
+        """Stop the diagnostics if nothing consumed them."""
+        if not self.task.done():
+            self.task.cancel()
+
+
 class RemediationActions:
     """Concrete remediation actions for different incident types."""
 
-    def __init__(self, k8s_integration):
+    def __init__(self, k8s_integration, rollout_waiter: RolloutWaiter | None = None,
+                 rollout_timeout: float = 120.0, max_concurrency: int = 4,
+                 namespace_concurrency: int = 2):
         self.k8s_integration = k8s_integration
+        self.rollout_waiter = rollout_waiter or RolloutWaiter(k8s_integration)
+        self.rollout_timeout = rollout_timeout
+        self.max_concurrency = max_concurrency
+        self.namespace_concurrency = namespace_concurrency
         self.logger = get_logger(__name__)
 
+    async def _fix_each(self, targets: list[dict[str, Any]],
+                        fix_one: Callable[[dict[str, Any]], Awaitable[dict[str, Any] | None]],
+                        action: str) -> list[dict[str, Any]]:
+        """Run ``fix_one`` for every target, in parallel across deployments.
+
+        Targets on the same deployment are fixed one after another. Results
+        keep the order of ``targets``; a target whose fix returns None is
+        left out.
+        """
+        scheduler = RemediationScheduler(self.max_concurrency, self.namespace_concurrency, max_failures=None)
+        for index, target in enumerate(targets):
+            namespace = target.get('namespace', 'default')
+            scheduler.add(
+                str(index), partial(fix_one, target),
+                resource=f"{namespace}/deployment/{target['deployment_name']}", namespace=namespace
+            )
+
+        results = []
+        for step, target in zip(await scheduler.run(), targets, strict=True):
+            if step.status == FAILED:
+                results.append({
+                    'deployment': target['deployment_name'],
+                    'namespace': target.get('namespace', 'default'),
+                    'action': action,
+                    'status': 'failed',
+                    'error': step.error
+                })
+            elif step.result is not None:
+                results.append(step.result)
+        return results
+
     async def fix_oom_kills(self, affected_deployments: list[dict[str, Any]],
                            increase_percentage: float = 50.0) -> list[dict[str, Any]]:
         """Fix OOM kills by increasing memory limits.
@@ -233,9 +334,7 @@ class RemediationActions:
         Returns:
             List of execution results
         """
-        results = []
-
-        for deployment in affected_deployments:
+        async def fix_one(deployment: dict[str, Any]) -> dict[str, Any]:
             deployment_name = deployment['deployment_name']
             namespace = deployment.get('namespace', 'default')
 
@@ -292,7 +391,7 @@ class RemediationActions:
 
                 if patch_result.get('success'):
                     self.logger.info(f"✅ Successfully patched {deployment_name} with new memory limit")
-                    results.append({
+                    return {
                         'deployment': deployment_name,
                         'namespace': namespace,
                         'action': 'memory_increase',
@@ -300,33 +399,35 @@ class RemediationActions:
                         'new_limit': f"{new_limit}Mi",
                         'status': 'success',
                         'output': patch_result.get('output', '')
-                    })
+                    }
                 else:
                     self.logger.error(f"❌ Failed to patch {deployment_name}: {patch_result.get('error')}")
-                    results.append({
+                    return {
                         'deployment': deployment_name,
                         'namespace': namespace,
                         'action': 'memory_increase',
                         'status': 'failed',
                         'error': patch_result.get('error', 'Unknown error')
-                    })
+                    }
             else:
                 self.logger.error(f"❌ Failed to describe deployment {deployment_name}")
-                results.append({
+                return {
                     'deployment': deployment_name,
                     'namespace': namespace,
                     'action': 'memory_increase',
                     'status': 'failed',
                     'error': 'Could not get current configuration'
-                })
+                }
 
-        return results
+        return await self._fix_each(affected_deployments, fix_one, 'memory_increase')
 
     async def fix_crashloop_backoff(self, affected_deployments: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        """Fix CrashLoopBackOff by rolling restart of deployments."""
-        results = []
+        """Fix CrashLoopBackOff by rolling restart of deployments.
 
-        for deployment in affected_deployments:
+        All deployments are restarted in parallel first, then their rollouts
+        are awaited together.
+        """
+        async def restart_one(deployment: dict[str, Any]) -> dict[str, Any]:
             deployment_name = deployment['deployment_name']
             namespace = deployment.get('namespace', 'default')
 
@@ -341,42 +442,38 @@ class RemediationActions:
 
             if restart_result.get('success'):
                 self.logger.info(f"✅ Successfully restarted {deployment_name}")
-
-                # Wait a bit for rollout to start
-                await asyncio.sleep(2)
-
-                # Check rollout status
-                status_cmd = ["rollout", "status", "deployment", deployment_name,
-                             "-n", namespace, "--timeout=60s"]
-
-                status_result = await self.k8s_integration.execute_kubectl_command(
-                    status_cmd, auto_approve=True
-                )
-
-                results.append({
+                return {
                     'deployment': deployment_name,
                     'namespace': namespace,
                     'action': 'rollout_restart',
-                    'status': 'success' if status_result.get('success') else 'in_progress',
+                    'status': 'in_progress',
                     'output': restart_result.get('output', '')
-                })
-            else:
-                self.logger.error(f"❌ Failed to restart {deployment_name}: {restart_result.get('error')}")
-                results.append({
-                    'deployment': deployment_name,
-                    'namespace': namespace,
-                    'action': 'rollout_restart',
-                    'status': 'failed',
-                    'error': restart_result.get('error', 'Unknown error')
-                })
+                }
+            self.logger.error(f"❌ Failed to restart {deployment_name}: {restart_result.get('error')}")
+            return {
+                'deployment': deployment_name,
+                'namespace': namespace,
+                'action': 'rollout_restart',
+                'status': 'failed',
+                'error': restart_result.get('error', 'Unknown error')
+            }
+
+        results = await self._fix_each(affected_deployments, restart_one, 'rollout_restart')
+        restarted = [r for r in results if r['status'] == 'in_progress']
+        if restarted:
+            rollouts = await self.rollout_waiter.wait_for_deployments(
+                [(r['deployment'], r['namespace']) for r in restarted],
+                timeout=self.rollout_timeout
+            )
+            for result, rollout in zip(restarted, rollouts, strict=True):
+                result['status'] = 'success' if rollout.ready else 'in_progress'
+                result['rollout'] = rollout.to_dict()
 
         return results
 
     async def fix_image_pull_errors(self, affected_pods: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """Fix image pull errors by updating image or checking registry credentials."""
-        results = []
-
-        for pod in affected_pods:
+        async def fix_one(pod: dict[str, Any]) -> dict[str, Any] | None:
             deployment_name = pod['deployment_name']
             namespace = pod.get('namespace', 'default')
 
@@ -406,25 +503,26 @@ class RemediationActions:
                             restart_cmd, auto_approve=True
                         )
 
-                        results.append({
+                        return {
                             'deployment': deployment_name,
                             'namespace': namespace,
                             'action': 'fix_image_pull',
                             'current_image': current_image,
                             'status': 'success' if restart_result.get('success') else 'failed',
                             'output': restart_result.get('output', '')
-                        })
+                        }
                 except Exception as e:
                     self.logger.error(f"Error parsing deployment data: {e}")
-                    results.append({
+                    return {
                         'deployment': deployment_name,
                         'namespace': namespace,
                         'action': 'fix_image_pull',
                         'status': 'failed',
                         'error': str(e)
-                    })
+                    }
+            return None
 
-        return results
+        return await self._fix_each(affected_pods, fix_one, 'fix_image_pull')
 
     def _extract_memory_limit(self, describe_output: str) -> int:
         """Extract current memory limit from deployment description."""
@@ -446,17 +544,27 @@ class RemediationPipeline:
         self.pagerduty_client = pagerduty_client
         self.logger = get_logger(__name__)
         self.parser = DiagnosticParser()
-        self.remediation = RemediationActions(k8s_integration)
+        config = get_config()
+        self.rollout_timeout = config.remediation_rollout_timeout
+        self.rollout_waiter = RolloutWaiter(k8s_integration)
+        self.remediation = RemediationActions(
+            k8s_integration, self.rollout_waiter, self.rollout_timeout,
+            max_concurrency=config.remediation_max_concurrency,
+            namespace_concurrency=config.remediation_namespace_concurrency
+        )
+        self.speculative_max_age = config.speculative_diagnostics_max_age
         self.execution_log = []
 
     async def execute_pipeline(self, alert_type: str, context: dict[str, Any],
-                             commands_from_claude: list[str]) -> dict[str, Any]:
+                             commands_from_claude: list[str],
+                             speculative: SpeculativeDiagnostics | None = None) -> dict[str, Any]:
         """Execute the full remediation pipeline.
         
         Args:
             alert_type: Type of alert (e.g., 'oom_kill', 'pod_crash')
             context: Context gathered from K8s
             commands_from_claude: Commands suggested by Claude
+            speculative: Diagnostics already started for this alert, if any
         
         Returns:
             Pipeline execution results
@@ -464,7 +572,7 @@ class RemediationPipeline:
         self.logger.info(f"🚀 Starting remediation pipeline for {alert_type}")
 
         # Step 1: Execute diagnostic commands and capture output
-        diagnostic_results = await self._execute_diagnostics(alert_type, context)
+        diagnostic_results = await self._execute_diagnostics(alert_type, context, speculative)
 
         # Step 2: Parse diagnostic output to identify problematic resources
         problems = self._parse_diagnostic_output(alert_type, diagnostic_results)
@@ -499,40 +607,35 @@ class RemediationPipeline:
             'execution_log': self.execution_log
         }
 
-    async def _execute_diagnostics(self, alert_type: str, context: dict[str, Any]) -> dict[str, Any]:
-        """Execute diagnostic commands based on alert type."""
-        self.logger.info("📊 Executing diagnostic commands...")
-        results = {}
+    async def _execute_diagnostics(self, alert_type: str, context: dict[str, Any],
+                                   speculative: SpeculativeDiagnostics | None = None) -> dict[str, Any]:
+        """Execute diagnostic commands based on alert type.
 
-        if alert_type == 'oom_kill':
-            # Get memory usage of all pods
-            self._log_execution("DIAGNOSTIC", "kubectl top pods --all-namespaces --sort-by=memory")
-            top_result = await self.k8s_integration.execute_kubectl_command(
-                ["top", "pods", "--all-namespaces", "--sort-by=memory"],
-                auto_approve=True
-            )
-            results['memory_usage'] = top_result
-
-            # Get OOM events
-            self._log_execution("DIAGNOSTIC", "kubectl get events --all-namespaces --field-selector reason=OOMKilling")
-            events_result = await self.k8s_integration.execute_kubectl_command(
-                ["get", "events", "--all-namespaces",
-                 "--field-selector", "reason=OOMKilling", "-o", "json"],
-                auto_approve=True
-            )
-            results['oom_events'] = events_result
+        Results of matching speculative diagnostics are used instead of
+        running the commands again, unless they are older than
+        ``speculative_max_age`` or failed.
+        """
+        self.logger.info("📊 Executing diagnostic commands...")
+        commands = diagnostic_commands(alert_type, context)
+        for command in commands.values():
+            self._log_execution("DIAGNOSTIC", f"kubectl {' '.join(command)}")
 
-        elif alert_type == 'pod_crash':
-            # Get pods with errors
-            namespace = context.get('namespace', 'default')
-            self._log_execution("DIAGNOSTIC", f"kubectl get pods -n {namespace}")
-            pods_result = await self.k8s_integration.execute_kubectl_command(
-                ["get", "pods", "-n", namespace],
-                auto_approve=True
-            )
-            results['pod_status'] = pods_result
+        if speculative and speculative.matches(alert_type, commands):
+            if speculative.age() <= self.speculative_max_age:
+                try:
+                    results = await speculative.task
+                except Exception as e:
+                    self.logger.warning(f"Speculative diagnostics failed, running them again: {e}")
+                else:
+                    failed = [name for name, result in results.items() if not result.get('success')]
+                    if not failed:
+                        self.logger.info(f"♻️ Using diagnostics started {speculative.age():.1f}s ago")
+                        return results
+                    self.logger.warning(f"Speculative diagnostics {', '.join(failed)} failed, running them again")
+            else:
+                speculative.cancel()
 
-        return results
+        return await run_diagnostics(self.k8s_integration, commands)
 
     def _parse_diagnostic_output(self, alert_type: str,
                                 diagnostic_results: dict[str, Any]) -> dict[str, Any]:
@@ -703,10 +806,17 @@ class RemediationPipeline:
             'remediation_attempted': len(remediation_results) > 0
         }
 
-        # Wait a bit for changes to take effect
-        await asyncio.sleep(5)
-
         if alert_type == 'oom_kill':
+            # Let the patched deployments roll out before looking for new OOM events
+            patched = [
+                (r['deployment'], r.get('namespace', 'default')) for r in remediation_results
+                if r.get('action') == 'memory_increase' and r.get('status') == 'success'
+            ]
+            if patched:
+                self._log_execution("VERIFICATION", f"Waiting for {len(patched)} patched deployments to roll out")
+                rollouts = await self.rollout_waiter.wait_for_deployments(patched, timeout=self.rollout_timeout)
+                verification['rollouts'] = [r.to_dict() for r in rollouts]
+
             # Check if OOM events have stopped
             self._log_execution("VERIFICATION", "Checking for new OOM events")
 
@@ -741,35 +851,25 @@ class RemediationPipeline:
                     self.logger.error(f"Error parsing verification: {e}")
 
         elif alert_type == 'pod_crash':
-            # Check pod status
-            affected_deployments = set()
-            for pod in problems.get('error_pods', []):
-                affected_deployments.add(pod['deployment_name'])
+            # Wait for every affected deployment to become healthy (or the deadline)
+            affected_deployments = {
+                (pod['deployment_name'], pod.get('namespace', 'default'))
+                for pod in problems.get('error_pods', [])
+            }
 
             if affected_deployments:
-                self._log_execution("VERIFICATION", f"Checking status of {len(affected_deployments)} deployments")
-
-                all_healthy = True
-                for deployment in affected_deployments:
-                    status_result = await self.k8s_integration.execute_kubectl_command(
-                        ["get", "deployment", deployment, "-o", "json"],
-                        auto_approve=True
-                    )
+                self._log_execution("VERIFICATION", f"Waiting for {len(affected_deployments)} deployments to become healthy")
 
-                    if status_result.get('success'):
-                        try:
-                            dep_data = json.loads(status_result.get('output', '{}'))
-                            ready = dep_data.get('status', {}).get('readyReplicas', 0)
-                            desired = dep_data.get('spec', {}).get('replicas', 1)
-
-                            if ready < desired:
-                                all_healthy = False
-                                verification['details'].append(f"{deployment}: {ready}/{desired} ready")
-                        except:
-                            all_healthy = False
+                rollouts = await self.rollout_waiter.wait_for_deployments(
+                    sorted(affected_deployments), timeout=self.rollout_timeout
+                )
+                for rollout in rollouts:
+                    if not rollout.ready:
+                        verification['details'].append(f"{rollout.deployment}: {rollout.reason}")
 
+                verification['rollouts'] = [r.to_dict() for r in rollouts]
                 verification['checked'] = True
-                verification['fixed'] = all_healthy
+                verification['fixed'] = all(r.ready for r in rollouts)
 
         return verification
 
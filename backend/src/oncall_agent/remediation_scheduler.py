@@ -0,0 +1,161 @@
+"""Dependency-aware, concurrent execution of remediation steps.
+
+Remediation steps are added as nodes of a DAG:
+
+* steps touching different resources run in parallel,
+* steps on the same resource run one after another, in the order added,
+* a step can depend on others (e.g. verify after its fix) and is skipped
+  when one of them did not succeed.
+
+A global cap and a per-namespace cap bound how much runs at once, and once
+``max_failures`` steps have failed no new step is started.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from .utils import get_logger
+
+logger = get_logger(__name__)
+
+PENDING = "pending"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+# A remediation plan stops starting new actions after this many failures
+MAX_PLAN_FAILURES = 3
+
+
+@dataclass
+class RemediationStep:
+    """One node of the remediation DAG."""
+    key: str
+    run: Callable[[], Awaitable[Any]]
+    resource: str | None = None
+    namespace: str | None = None
+    after: list["RemediationStep"] = field(default_factory=list)
+    previous: "RemediationStep | None" = None
+    status: str = PENDING
+    result: Any = None
+    error: str | None = None
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class RemediationScheduler:
+    """Runs remediation steps in parallel while respecting their ordering."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        per_namespace: int = 2,
+        max_failures: int | None = 3,
+        is_failure: Callable[[Any], bool] | None = None
+    ):
+        self.max_concurrency = max_concurrency
+        self.per_namespace = per_namespace
+        self.max_failures = max_failures
+        self.is_failure = is_failure or (lambda result: False)
+        self.steps: dict[str, RemediationStep] = {}
+        self._last_on_resource: dict[str, RemediationStep] = {}
+        self._namespace_slots: dict[str, asyncio.Semaphore] = {}
+        self.failures = 0
+
+    @property
+    def stopped(self) -> bool:
+        return self.max_failures is not None and self.failures >= self.max_failures
+
+    def add(
+        self,
+        key: str,
+        run: Callable[[], Awaitable[Any]],
+        resource: str | None = None,
+        namespace: str | None = None,
+        after: list[str] | tuple[str, ...] = ()
+    ) -> RemediationStep:
+        """Add a step; ``after`` names steps that must succeed first.
+
+        Raises:
+            ValueError: If ``key`` is already used or ``after`` names an
+                unknown step (dependencies must be added first, which keeps
+                the graph acyclic)
+        """
+        if key in self.steps:
+            raise ValueError(f"Duplicate remediation step: {key}")
+        unknown = [dep for dep in after if dep not in self.steps]
+        if unknown:
+            raise ValueError(f"Step {key} depends on unknown steps: {', '.join(unknown)}")
+
+        step = RemediationStep(
+            key=key,
+            run=run,
+            resource=resource,
+            namespace=namespace,
+            after=[self.steps[dep] for dep in after],
+            previous=self._last_on_resource.get(resource) if resource else None
+        )
+        if resource:
+            self._last_on_resource[resource] = step
+        self.steps[key] = step
+        return step
+
+    async def run(self) -> list[RemediationStep]:
+        """Run every step; returns them in the order they were added."""
+        global_slots = asyncio.Semaphore(self.max_concurrency)
+        await asyncio.gather(*(self._run_step(step, global_slots) for step in self.steps.values()))
+        return list(self.steps.values())
+
+    async def _run_step(self, step: RemediationStep, global_slots: asyncio.Semaphore) -> None:
+        try:
+            for dependency in step.after:
+                await dependency.done.wait()
+            if step.previous:
+                await step.previous.done.wait()
+
+            failed_dependency = next((d.key for d in step.after if d.status != SUCCEEDED), None)
+            if failed_dependency:
+                step.status, step.error = SKIPPED, f"dependency {failed_dependency} did not succeed"
+                return
+
+            namespace_slots = self._namespace_slots.setdefault(
+                step.namespace or "", asyncio.Semaphore(self.per_namespace)
+            )
+            # Namespace slot first, so a step waiting on its namespace does
+            # not hold one of the global slots
+            async with namespace_slots, global_slots:
+                if self.stopped:
+                    step.status, step.error = SKIPPED, f"stopped after {self.failures} failures"
+                    return
+                try:
+                    step.result = await step.run()
+                except Exception as e:
+                    logger.error(f"Remediation step {step.key} failed: {e}")
+                    step.status, step.error = FAILED, str(e)
+                else:
+                    step.status = FAILED if self.is_failure(step.result) else SUCCEEDED
+                if step.status == FAILED:
+                    self.failures += 1
+        finally:
+            step.done.set()
+
+
+def action_resource(params: dict[str, Any]) -> tuple[str, str]:
+    """Resource key and namespace of a remediation action's parameters.
+
+    Actions naming a deployment, pod or service are keyed by that object;
+    the rest are namespace-wide and serialize with each other.
+    """
+    namespace = params.get("namespace") or "default"
+    for kind, key in (("deployment", "deployment_name"), ("pod", "pod_name"), ("service", "service_name")):
+        if params.get(key):
+            return f"{namespace}/{kind}/{params[key]}", namespace
+    return f"{namespace}/*", namespace
+
+
+def action_failed(execution_context: dict[str, Any]) -> bool:
+    """Whether an executor's action context records a failure."""
+    if "error" in execution_context:
+        return True
+    return bool(execution_context.get("executed")) and not execution_context["result"].get("success")
@@ -0,0 +1,138 @@
+"""Wait for deployment rollouts to become healthy instead of sleeping.
+
+The waiter polls a deployment through the Kubernetes integration with
+exponential backoff. It returns as soon as the rollout is complete, the
+rollout has failed (progress deadline exceeded) or the deadline passes.
+Several deployments are waited on concurrently.
+"""
+
+import asyncio
+import json
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from .utils import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class RolloutStatus:
+    """Outcome of waiting for one deployment."""
+    deployment: str
+    namespace: str
+    ready: bool
+    reason: str
+    desired: int = 0
+    updated: int = 0
+    available: int = 0
+    elapsed: float = 0.0
+    polls: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def evaluate_rollout(deployment: dict[str, Any]) -> tuple[bool | None, str]:
+    """Rollout state of a deployment object.
+
+    Returns (True, reason) when complete, (False, reason) when it has failed
+    for good, and (None, reason) while it is still progressing. Mirrors the
+    checks behind ``kubectl rollout status``.
+    """
+    metadata = deployment.get("metadata", {})
+    spec = deployment.get("spec", {})
+    status = deployment.get("status", {})
+
+    if status.get("observedGeneration", 0) < metadata.get("generation", 0):
+        return None, "waiting for the controller to observe the new spec"
+
+    for condition in status.get("conditions") or []:
+        if condition.get("type") == "Progressing" and condition.get("reason") == "ProgressDeadlineExceeded":
+            return False, f"progress deadline exceeded: {condition.get('message', '')}".strip()
+
+    desired = spec.get("replicas", 1)
+    updated = status.get("updatedReplicas", 0)
+    total = status.get("replicas", 0)
+    available = status.get("availableReplicas", 0)
+    if updated < desired:
+        return None, f"{updated} of {desired} replicas updated"
+    if total > updated:
+        return None, f"{total - updated} old replicas pending termination"
+    if available < updated:
+        return None, f"{available} of {updated} updated replicas available"
+    return True, f"{available}/{desired} replicas available"
+
+
+class RolloutWaiter:
+    """Polls deployments with exponential backoff until they are healthy."""
+
+    def __init__(
+        self,
+        k8s_integration,
+        initial_delay: float = 0.5,
+        max_delay: float = 8.0,
+        backoff: float = 2.0,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        # Polls must see the live cluster, not the incident's read cache
+        self.k8s_integration = getattr(k8s_integration, "wrapped", k8s_integration)
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self._sleep = sleep
+        self._clock = clock
+
+    async def _fetch(self, name: str, namespace: str) -> dict[str, Any] | None:
+        result = await self.k8s_integration.execute_kubectl_command(
+            ["get", "deployment", name, "-n", namespace, "-o", "json"],
+            auto_approve=True
+        )
+        if not result.get("success"):
+            return None
+        try:
+            return json.loads(result.get("output") or "{}")
+        except ValueError:
+            return None
+
+    async def wait_for_deployment(self, name: str, namespace: str = "default", timeout: float = 120.0) -> RolloutStatus:
+        """Wait until ``name`` is rolled out, has failed, or ``timeout`` passes."""
+        started = self._clock()
+        deadline = started + timeout
+        delay = self.initial_delay
+        status = RolloutStatus(name, namespace, ready=False, reason="not checked yet")
+
+        while True:
+            status.polls += 1
+            deployment = await self._fetch(name, namespace)
+            if deployment is None:
+                status.reason = "could not read deployment status"
+            else:
+                state, status.reason = evaluate_rollout(deployment)
+                status.desired = deployment.get("spec", {}).get("replicas", 1)
+                status.updated = deployment.get("status", {}).get("updatedReplicas", 0)
+                status.available = deployment.get("status", {}).get("availableReplicas", 0)
+                if state is not None:
+                    status.ready = state
+                    break
+
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                status.reason = f"timed out after {timeout:.0f}s: {status.reason}"
+                break
+            await self._sleep(min(delay, remaining))
+            delay = min(delay * self.backoff, self.max_delay)
+
+        status.elapsed = round(self._clock() - started, 2)
+        logger.info(f"Rollout of {namespace}/{name}: {'ready' if status.ready else 'not ready'} "
+                    f"after {status.elapsed}s ({status.reason})")
+        return status
+
+    async def wait_for_deployments(self, deployments: list[tuple[str, str]], timeout: float = 120.0) -> list[RolloutStatus]:
+        """Wait for several (name, namespace) deployments concurrently."""
+        return list(await asyncio.gather(
+            *(self.wait_for_deployment(name, namespace, timeout) for name, namespace in deployments)
+        ))
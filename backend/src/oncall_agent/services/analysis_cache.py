@@ -0,0 +1,204 @@
+"""
+Analysis Cache
+
+Content-addressed cache of LLM incident analyses. Prompts are normalized
+before hashing: alert ids, timestamps, pod hashes and other values that
+change on every firing of the same alert are replaced with placeholders,
+so a recurring flap with the same service, alert type and context shape
+maps to the same key. Entries expire after a TTL, the least recently used
+entry is evicted when the cache is full, and the cache can be persisted to
+a JSON file so it survives restarts.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from src.oncall_agent.config import get_config
+from src.oncall_agent.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Applied in order; earlier patterns must not be broken up by later ones
+VOLATILE_PATTERNS = [
+    # ISO-8601 timestamps and bare dates/times
+    (re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?"), "<ts>"),
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}\b"), "<date>"),
+    (re.compile(r"\b\d{2}:\d{2}:\d{2}\b"), "<time>"),
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.I), "<uuid>"),
+    # ReplicaSet pod suffixes (Kubernetes' vowel-free alphabet): api-7d9f8b6c5d-x2k4p -> api-<pod>
+    (re.compile(r"-[bcdfghjklmnpqrstvwxz2456789]{6,10}-[bcdfghjklmnpqrstvwxz2456789]{5}\b"), "-<pod>"),
+    (re.compile(r"\b[0-9a-f]{12,}\b", re.I), "<hex>"),
+    # PagerDuty style ids mixing upper-case letters and digits (Q1ABC2DEF3)
+    (re.compile(r"\b(?=[A-Z0-9]*\d)(?=[A-Z0-9]*[A-Z])[A-Z0-9]{7,}\b"), "<id>"),
+    (re.compile(r"(['\"]?incident_number['\"]?\s*[:=]\s*)\d+"), r"\1<n>"),
+    (re.compile(r"\b\d{9,}\b"), "<epoch>"),
+]
+
+
+def normalize_prompt(prompt: str, volatile: Iterable[str] = ()) -> str:
+    """Strip per-firing values from a prompt so recurring alerts compare equal.
+
+    Args:
+        prompt: The prompt that would be sent to the LLM
+        volatile: Exact values to blank out first (e.g. the alert id)
+    """
+    for value in sorted((v for v in volatile if v), key=len, reverse=True):
+        prompt = prompt.replace(value, "<volatile>")
+    for pattern, replacement in VOLATILE_PATTERNS:
+        prompt = pattern.sub(replacement, prompt)
+    return " ".join(prompt.split())
+
+
+def prompt_fingerprint(prompt: str, model: str, volatile: Iterable[str] = ()) -> str:
+    """Cache key for ``prompt`` sent to ``model``."""
+    normalized = normalize_prompt(prompt, volatile)
+    return hashlib.sha256(f"{model}\n{normalized}".encode()).hexdigest()
+
+
+@dataclass
+class CachedAnalysis:
+    """An LLM analysis and its parsed sections."""
+    analysis: str
+    parsed_analysis: dict[str, Any]
+    model: str
+    created_at: float
+    hits: int = 0
+
+
+class AnalysisCache:
+    """TTL + LRU cache of analyses keyed by prompt fingerprint."""
+
+    def __init__(self, max_entries: int = 256, ttl: float = 900.0, path: str | None = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self._entries: OrderedDict[str, CachedAnalysis] = OrderedDict()
+        self._write_lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        if path:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> CachedAnalysis | None:
+        """Return a copy of the cached analysis, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None and time.time() - entry.created_at >= self.ttl:
+            del self._entries[key]
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        entry.hits += 1
+        self.hits += 1
+        # Callers add to parsed_analysis; keep the cached copy pristine
+        return CachedAnalysis(
+            analysis=entry.analysis,
+            parsed_analysis=copy.deepcopy(entry.parsed_analysis),
+            model=entry.model,
+            created_at=entry.created_at,
+            hits=entry.hits
+        )
+
+    async def put(self, key: str, analysis: str, parsed_analysis: dict[str, Any], model: str) -> None:
+        """Store an analysis, evicting the least recently used entry if full."""
+        self._entries[key] = CachedAnalysis(
+            analysis=analysis,
+            parsed_analysis=copy.deepcopy(parsed_analysis),
+            model=model,
+            created_at=time.time()
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        if self.path:
+            await self.save()
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "persistent": bool(self.path),
+        }
+
+    async def save(self) -> None:
+        """Write the cache to ``path`` atomically, off the event loop."""
+        if not self.path:
+            return
+        snapshot = {key: asdict(entry) for key, entry in self._entries.items()}
+        async with self._write_lock:
+            try:
+                await asyncio.to_thread(self._write, snapshot)
+            except OSError as e:
+                logger.warning(f"Failed to persist analysis cache to {self.path}: {e}")
+
+    def _write(self, snapshot: dict[str, Any]) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> None:
+        try:
+            with open(self.path) as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable analysis cache {self.path}: {e}")
+            return
+
+        now = time.time()
+        # Oldest first so the LRU order survives the round trip
+        for key, data in snapshot.items():
+            entry = CachedAnalysis(**data)
+            if now - entry.created_at < self.ttl:
+                self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        logger.info(f"Loaded {len(self._entries)} cached analyses from {self.path}")
+
+
+_cache: AnalysisCache | None = None
+
+
+def get_analysis_cache() -> AnalysisCache | None:
+    """Shared analysis cache, or None when ANALYSIS_CACHE_ENABLED is off."""
+    global _cache
+    config = get_config()
+    if not config.analysis_cache_enabled:
+        return None
+    if _cache is None:
+        _cache = AnalysisCache(
+            max_entries=config.analysis_cache_max_entries,
+            ttl=config.analysis_cache_ttl,
+            path=config.analysis_cache_path
+        )
+    return _cache
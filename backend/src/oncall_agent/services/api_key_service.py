@@ -1,10 +1,21 @@
 """API Key management service."""
 
+import asyncio
+import atexit
 import json
 import os
+import tempfile
+import threading
+import weakref
+from contextlib import contextmanager
 from datetime import datetime
 from uuid import uuid4
 
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process file lock
+    fcntl = None
+
 from ..models.api_key import (
     APIKey,
     APIKeyCreate,
@@ -17,19 +28,52 @@ from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Per-call bookkeeping that is written behind instead of on every LLM call.
+# ``status`` is merged too, but only for keys whose status changed here, so a
+# stale copy never overwrites another worker's change.
+USAGE_FIELDS = ('last_used_at', 'error_count', 'last_error')
+
+# Services with usage that may still need writing at exit. Held weakly so
+# registering for the exit flush does not keep a service alive.
+_services: "weakref.WeakSet[APIKeyService]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_services():
+    for service in list(_services):
+        service.flush()
+
 
 class APIKeyService:
-    """Service for managing API keys."""
+    """Service for managing API keys.
+
+    Key management (create/update/delete) is saved immediately. Usage
+    recorded on every LLM call is kept in memory and written behind: after
+    ``flush_every`` records or ``flush_interval`` seconds, whichever comes
+    first, off the event loop. Writes go to a temp file that is renamed into
+    place, under an exclusive file lock, so a crash never leaves a truncated
+    file and workers sharing the file do not overwrite each other's usage.
+    """
 
-    def __init__(self, storage_path: str = None):
+    def __init__(self, storage_path: str = None, flush_interval: float = 5.0, flush_every: int = 20):
         """Initialize the API key service."""
         self.storage_path = storage_path or os.path.join(
             os.path.expanduser("~"), ".dreamops", "api_keys.json"
         )
+        self.flush_interval = flush_interval
+        self.flush_every = flush_every
         self._ensure_storage_dir()
         self._keys: dict[str, dict] = self._load_keys()
         self._settings: APIKeySettings = self._load_settings()
 
+        # Usage ledger: keys whose usage fields changed since the last flush
+        self._lock = threading.Lock()
+        self._dirty: set[str] = set()
+        self._status_changed: set[str] = set()
+        self._pending = 0
+        self._flush_handle: asyncio.TimerHandle | None = None
+        _services.add(self)
+
     def _ensure_storage_dir(self):
         """Ensure storage directory exists."""
         os.makedirs(os.path.dirname(self.storage_path), exist_ok=True)
@@ -63,19 +107,117 @@ class APIKeyService:
 
         return None
 
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock shared by every process using this storage file."""
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.storage_path}.lock", 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write_atomic(self, data: dict):
+        """Write ``data`` to a temp file and rename it over the storage file."""
+        directory = os.path.dirname(self.storage_path)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".api_keys.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, default=str)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.storage_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
     def _save(self):
         """Save keys and settings to storage."""
-        data = {
-            'keys': self._keys,
-            'settings': self._settings.model_dump() if self._settings else None
-        }
+        with self._lock:
+            data = {
+                'keys': self._keys,
+                'settings': self._settings.model_dump() if self._settings else None
+            }
+            # The full state includes any usage waiting to be written
+            self._dirty.clear()
+            self._status_changed.clear()
+            self._pending = 0
+
+            try:
+                with self._file_lock():
+                    self._write_atomic(data)
+            except Exception as e:
+                logger.error(f"Failed to save API keys: {e}")
+                raise
+
+    def flush(self):
+        """Write pending usage to storage now.
+
+        Only the usage fields of changed keys are merged into the file as it
+        is on disk, so keys and settings written by other workers survive.
+        A key's status is merged only if it changed in this process.
+        """
+        with self._lock:
+            usage = {
+                key_id: {field: self._keys[key_id].get(field) for field in USAGE_FIELDS}
+                for key_id in self._dirty
+                if key_id in self._keys
+            }
+            status_changed = self._status_changed & usage.keys()
+            for key_id in status_changed:
+                usage[key_id]['status'] = self._keys[key_id]['status']
+            self._dirty.clear()
+            self._status_changed.clear()
+            self._pending = 0
+        if not usage:
+            return
 
         try:
-            with open(self.storage_path, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            with self._file_lock():
+                try:
+                    with open(self.storage_path) as f:
+                        data = json.load(f)
+                except (FileNotFoundError, ValueError):
+                    data = {'keys': {}, 'settings': self._settings.model_dump() if self._settings else None}
+                for key_id, fields in usage.items():
+                    if key_id in data.get('keys', {}):
+                        data['keys'][key_id].update(fields)
+                self._write_atomic(data)
         except Exception as e:
-            logger.error(f"Failed to save API keys: {e}")
-            raise
+            logger.error(f"Failed to flush API key usage: {e}")
+            # Keep the changes so the next flush retries them
+            with self._lock:
+                self._dirty.update(usage)
+                self._status_changed.update(status_changed)
+
+    def _request_flush(self, immediate: bool = False):
+        """Schedule a write-behind flush of the usage ledger."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (scripts, threads): writing inline cannot stall anything
+            self.flush()
+            return
+
+        if immediate or self._pending >= self.flush_every:
+            self._flush_in_background(loop)
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.flush_interval, self._flush_in_background, loop)
+
+    def _flush_in_background(self, loop: asyncio.AbstractEventLoop):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        with self._lock:
+            # Count from zero again so one batch triggers one flush
+            self._pending = 0
+        loop.run_in_executor(None, self.flush)
 
     def _mask_api_key(self, api_key: str) -> str:
         """Mask API key showing only last 4 characters."""
@@ -215,28 +357,47 @@ class APIKeyService:
             key_data['provider']
         )
 
+    def get_usable_keys(self) -> list[tuple[str, str, LLMProvider]]:
+        """All active keys (id, key, provider), the primary key first."""
+        active_id = self._settings.active_key_id if self._settings else None
+        usable = [
+            (key_data['id'], key_data['api_key'], key_data['provider'])
+            for key_data in self._keys.values()
+            if key_data['status'] == APIKeyStatus.ACTIVE
+        ]
+        return sorted(usable, key=lambda key: key[0] != active_id)
+
     def record_key_usage(self, key_id: str, success: bool = True, error: str = None):
         """Record API key usage."""
         if key_id not in self._keys:
             return
 
-        key_data = self._keys[key_id]
-        key_data['last_used_at'] = datetime.utcnow().isoformat()
-
-        if not success:
-            key_data['error_count'] += 1
-            key_data['last_error'] = error
-
-            # Check if we should mark as exhausted
-            if "rate limit" in (error or "").lower() or "quota" in (error or "").lower():
-                key_data['status'] = APIKeyStatus.EXHAUSTED
-            elif key_data['error_count'] > 5:
-                key_data['status'] = APIKeyStatus.INVALID
-        else:
-            # Reset error count on success
-            key_data['error_count'] = 0
-
-        self._save()
+        with self._lock:
+            key_data = self._keys[key_id]
+            previous_status = key_data['status']
+            key_data['last_used_at'] = datetime.utcnow().isoformat()
+
+            if not success:
+                key_data['error_count'] += 1
+                key_data['last_error'] = error
+
+                # Check if we should mark as exhausted
+                if "rate limit" in (error or "").lower() or "quota" in (error or "").lower():
+                    key_data['status'] = APIKeyStatus.EXHAUSTED
+                elif key_data['error_count'] > 5:
+                    key_data['status'] = APIKeyStatus.INVALID
+            else:
+                # Reset error count on success
+                key_data['error_count'] = 0
+
+            status_changed = key_data['status'] != previous_status
+            if status_changed:
+                self._status_changed.add(key_id)
+            self._dirty.add(key_id)
+            self._pending += 1
+
+        # A key leaving rotation should reach the other workers promptly
+        self._request_flush(immediate=status_changed)
 
     def get_next_fallback_key(self) -> tuple[str, str, LLMProvider] | None:
         """Get the next available fallback key."""
@@ -0,0 +1,335 @@
+"""
+Audit Store
+
+One bounded home for the agent's audit trails: MCP tool calls, executed
+remediation actions, resolution attempts and integration changes. Recent
+records live in a fixed-size ring buffer, indexed by incident and tool.
+With a directory configured, every record is also appended to a segmented
+JSON-lines log that rotates at a size limit and keeps only the newest
+segments. Queries that reach past the ring buffer read just the segments
+whose time range, categories, incidents and tools can match. Log writes
+run on a single background thread and ``aquery`` reads segments in a
+worker thread, so neither blocks the event loop on disk I/O.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from src.oncall_agent.config import get_config
+from src.oncall_agent.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SEGMENT_PREFIX = "audit-"
+SEGMENT_SUFFIX = ".jsonl"
+
+
+@dataclass
+class AuditRecord:
+    """One audited event."""
+    seq: int
+    category: str
+    tool: str | None
+    incident_id: str | None
+    ts: float
+    data: dict[str, Any]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **self.data,
+            "seq": self.seq,
+            "category": self.category,
+            "tool": self.tool,
+            "incident_id": self.incident_id,
+            "timestamp": datetime.fromtimestamp(self.ts, UTC).isoformat(),
+        }
+
+    def matches(self, category: str | None, tool: str | None, incident_id: str | None,
+                since: float | None, until: float | None) -> bool:
+        return (
+            (category is None or self.category == category)
+            and (tool is None or self.tool == tool)
+            and (incident_id is None or self.incident_id == incident_id)
+            and (since is None or self.ts >= since)
+            and (until is None or self.ts <= until)
+        )
+
+
+@dataclass
+class SegmentIndex:
+    """What a segment file contains, so queries can skip it unread."""
+    path: Path
+    first_seq: int = 0
+    min_ts: float = float("inf")
+    max_ts: float = float("-inf")
+    size: int = 0
+    categories: set[str] = field(default_factory=set)
+    incidents: set[str] = field(default_factory=set)
+    tools: set[str] = field(default_factory=set)
+
+    def add(self, record: AuditRecord, size: int) -> None:
+        if not self.first_seq:
+            self.first_seq = record.seq
+        self.min_ts = min(self.min_ts, record.ts)
+        self.max_ts = max(self.max_ts, record.ts)
+        self.size += size
+        self.categories.add(record.category)
+        if record.incident_id:
+            self.incidents.add(record.incident_id)
+        if record.tool:
+            self.tools.add(record.tool)
+
+    def may_contain(self, category: str | None, tool: str | None, incident_id: str | None,
+                    since: float | None, until: float | None) -> bool:
+        return (
+            (category is None or category in self.categories)
+            and (tool is None or tool in self.tools)
+            and (incident_id is None or incident_id in self.incidents)
+            and (since is None or self.max_ts >= since)
+            and (until is None or self.min_ts <= until)
+        )
+
+
+class AuditStore:
+    """Ring buffer of recent audit records with an optional segmented log."""
+
+    def __init__(
+        self,
+        capacity: int = 1000,
+        directory: str | None = None,
+        segment_max_bytes: int = 5_000_000,
+        max_segments: int = 10
+    ):
+        self.capacity = capacity
+        self.directory = Path(directory) if directory else None
+        self.segment_max_bytes = segment_max_bytes
+        self.max_segments = max_segments
+        self._lock = threading.Lock()
+        # Guards the segment list, which the writer thread appends to
+        self._segments_lock = threading.Lock()
+        self._records: deque[AuditRecord] = deque()
+        self._by_incident: dict[str, deque[AuditRecord]] = {}
+        self._by_tool: dict[str, deque[AuditRecord]] = {}
+        self._segments: list[SegmentIndex] = []
+        self._file = None
+        self._writer: ThreadPoolExecutor | None = None
+        self._seq = 0
+        if self.directory:
+            self._open_log()
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audit-log")
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def append(self, category: str, tool: str | None = None, incident_id: str | None = None,
+               **data: Any) -> AuditRecord:
+        """Record an event; the oldest in-memory record is evicted when full."""
+        with self._lock:
+            self._seq += 1
+            record = AuditRecord(self._seq, category, tool, incident_id, time.time(), data)
+            self._records.append(record)
+            if incident_id:
+                self._by_incident.setdefault(incident_id, deque()).append(record)
+            if tool:
+                self._by_tool.setdefault(tool, deque()).append(record)
+            while len(self._records) > self.capacity:
+                self._evict(self._records.popleft())
+            if self._writer:
+                # Submitted under the lock so records reach the log in seq order
+                self._writer.submit(self._write, record)
+        return record
+
+    def _evict(self, record: AuditRecord) -> None:
+        # The evicted record is the oldest overall, so it heads its index queues
+        for index, key in ((self._by_incident, record.incident_id), (self._by_tool, record.tool)):
+            if key and index.get(key) and index[key][0] is record:
+                index[key].popleft()
+                if not index[key]:
+                    del index[key]
+
+    def query(
+        self,
+        category: str | None = None,
+        tool: str | None = None,
+        incident_id: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        limit: int = 100
+    ) -> list[dict[str, Any]]:
+        """Newest ``limit`` matching records, oldest first.
+
+        ``since``/``until`` are Unix timestamps. The ring buffer is searched
+        first; older records are read from the on-disk log. From async code
+        use ``aquery``, which reads the log off the event loop.
+        """
+        found, oldest_seq = self._query_memory(category, tool, incident_id, since, until, limit)
+        if len(found) < limit and self.directory:
+            found.extend(self._query_log(category, tool, incident_id, since, until, limit - len(found), oldest_seq))
+        return [record.to_dict() for record in reversed(found)]
+
+    async def aquery(
+        self,
+        category: str | None = None,
+        tool: str | None = None,
+        incident_id: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        limit: int = 100
+    ) -> list[dict[str, Any]]:
+        """``query`` for async callers: log segments are scanned in a worker thread."""
+        found, oldest_seq = self._query_memory(category, tool, incident_id, since, until, limit)
+        if len(found) < limit and self.directory:
+            found.extend(await asyncio.to_thread(
+                self._query_log, category, tool, incident_id, since, until, limit - len(found), oldest_seq
+            ))
+        return [record.to_dict() for record in reversed(found)]
+
+    def _query_memory(self, category, tool, incident_id, since, until, limit: int) -> tuple[list[AuditRecord], int]:
+        """Newest matches in the ring buffer, newest first, and the oldest seq it holds."""
+        with self._lock:
+            if incident_id is not None:
+                candidates: Iterable[AuditRecord] = self._by_incident.get(incident_id, ())
+            elif tool is not None:
+                candidates = self._by_tool.get(tool, ())
+            else:
+                candidates = self._records
+            found = []
+            for record in reversed(candidates):
+                if until is not None and record.ts > until:
+                    continue
+                if since is not None and record.ts < since:
+                    break
+                if record.matches(category, tool, incident_id, since, until):
+                    found.append(record)
+                    if len(found) >= limit:
+                        break
+            oldest_seq = self._records[0].seq if self._records else self._seq + 1
+        return found, oldest_seq
+
+    # On-disk segmented log
+
+    def _open_log(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path in sorted(self.directory.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")):
+            segment = SegmentIndex(path)
+            for record in self._read_segment(path):
+                segment.add(record, 0)
+                self._seq = max(self._seq, record.seq)
+            segment.size = path.stat().st_size
+            self._segments.append(segment)
+        if not self._segments or self._segments[-1].size >= self.segment_max_bytes:
+            self._start_segment(self._seq + 1)
+        else:
+            self._file = open(self._segments[-1].path, "a", encoding="utf-8")
+
+    def _start_segment(self, next_seq: int) -> None:
+        if self._file:
+            self._file.close()
+        path = self.directory / f"{SEGMENT_PREFIX}{next_seq:012d}{SEGMENT_SUFFIX}"
+        with self._segments_lock:
+            self._segments.append(SegmentIndex(path))
+        self._file = open(path, "a", encoding="utf-8")
+        while len(self._segments) > self.max_segments:
+            with self._segments_lock:
+                oldest = self._segments.pop(0)
+            try:
+                os.unlink(oldest.path)
+            except OSError as e:
+                logger.warning(f"Could not remove audit segment {oldest.path}: {e}")
+
+    def _write(self, record: AuditRecord) -> None:
+        # Runs on the writer thread only
+        line = json.dumps(asdict(record), default=str) + "\n"
+        try:
+            self._file.write(line)
+            self._file.flush()
+        except OSError as e:
+            logger.error(f"Failed to append audit record: {e}")
+            return
+        with self._segments_lock:
+            segment = self._segments[-1]
+            segment.add(record, len(line.encode()))
+        if segment.size >= self.segment_max_bytes:
+            self._start_segment(record.seq + 1)
+
+    def flush(self) -> None:
+        """Wait until every appended record has been written to the log."""
+        if self._writer:
+            self._writer.submit(lambda: None).result()
+
+    @staticmethod
+    def _read_segment(path: Path) -> Iterator[AuditRecord]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield AuditRecord(**json.loads(line))
+                    except (ValueError, TypeError):
+                        # A torn last line from a crash; skip it
+                        continue
+        except OSError:
+            return
+
+    def _query_log(self, category, tool, incident_id, since, until, limit: int, before_seq: int) -> list[AuditRecord]:
+        # Records evicted from memory may still be queued for the writer
+        self.flush()
+        with self._segments_lock:
+            segments = [
+                s for s in self._segments
+                if s.first_seq and s.first_seq < before_seq and s.may_contain(category, tool, incident_id, since, until)
+            ]
+        found: list[AuditRecord] = []
+        for segment in reversed(segments):
+            matches = [
+                r for r in self._read_segment(segment.path)
+                if r.seq < before_seq and r.matches(category, tool, incident_id, since, until)
+            ]
+            found.extend(reversed(matches[-(limit - len(found)):]))
+            if len(found) >= limit:
+                break
+        return found
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "records_in_memory": len(self._records),
+            "capacity": self.capacity,
+            "last_seq": self._seq,
+            "segments": len(self._segments),
+            "segment_bytes": sum(s.size for s in self._segments),
+        }
+
+    def close(self) -> None:
+        if self._writer:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+
+_audit_store: AuditStore | None = None
+
+
+def get_audit_store() -> AuditStore:
+    """Process-wide audit store configured from settings."""
+    global _audit_store
+    if _audit_store is None:
+        config = get_config()
+        _audit_store = AuditStore(
+            capacity=config.audit_buffer_size,
+            directory=config.audit_log_dir,
+            segment_max_bytes=config.audit_segment_max_bytes,
+            max_segments=config.audit_max_segments
+        )
+    return _audit_store
@@ -0,0 +1,541 @@
+"""
+Incident Store
+
+Pluggable storage for incidents and their AI analyses. The in-memory
+repository keeps secondary indexes on status, severity and service; the SQL
+repositories (Postgres through the shared asyncpg pool, or a SQLite file)
+persist incidents across restarts and share them between workers. Every
+backend pages with keyset cursors, so listing stays O(page) as the incident
+history grows.
+"""
+
+import asyncio
+import base64
+import bisect
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+import asyncpg
+
+from src.oncall_agent.api.schemas import Incident, IncidentStatus, Severity
+from src.oncall_agent.config import get_config
+from src.oncall_agent.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SORT_FIELDS = ("created_at", "updated_at", "severity")
+FILTER_FIELDS = ("status", "severity", "service_name")
+
+# Higher weight sorts first in descending order (critical first)
+SEVERITY_WEIGHT = {
+    Severity.CRITICAL: 4,
+    Severity.HIGH: 3,
+    Severity.MEDIUM: 2,
+    Severity.LOW: 1,
+    Severity.INFO: 0,
+}
+
+
+def _timestamp(value: datetime | None) -> float:
+    """Epoch seconds, treating naive datetimes as UTC."""
+    if value is None:
+        return 0.0
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.timestamp()
+
+
+def sort_key(incident: Incident, sort_by: str) -> tuple:
+    """Unique, totally ordered key for ``incident`` under ``sort_by``."""
+    created = _timestamp(incident.created_at)
+    if sort_by == "created_at":
+        return (created, incident.id)
+    if sort_by == "updated_at":
+        return (_timestamp(incident.updated_at) or created, incident.id)
+    if sort_by == "severity":
+        return (SEVERITY_WEIGHT[incident.severity], created, incident.id)
+    raise ValueError(f"Unsupported sort field: {sort_by}")
+
+
+def encode_cursor(key: tuple) -> str:
+    """Encode a sort key as an opaque pagination cursor."""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode()
+
+
+def decode_cursor(cursor: str, sort_by: str) -> tuple:
+    """Decode a cursor produced by encode_cursor() for the same ``sort_by``."""
+    try:
+        key = tuple(json.loads(base64.urlsafe_b64decode(cursor.encode())))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+    expected = 3 if sort_by == "severity" else 2
+    if len(key) != expected or not isinstance(key[-1], str):
+        raise ValueError("Pagination cursor does not match the requested sort order")
+    return key
+
+
+def _field_value(value: Any) -> Any:
+    return value.value if hasattr(value, "value") else value
+
+
+@dataclass
+class IncidentFilter:
+    """Equality filters on the indexed incident fields."""
+    status: IncidentStatus | None = None
+    severity: Severity | None = None
+    service_name: str | None = None
+
+    def active(self) -> dict[str, Any]:
+        """Filters that are set, keyed by field name with plain values."""
+        return {
+            field: _field_value(getattr(self, field))
+            for field in FILTER_FIELDS
+            if getattr(self, field) is not None
+        }
+
+    def matches(self, incident: Incident) -> bool:
+        return all(
+            _field_value(getattr(incident, field)) == value
+            for field, value in self.active().items()
+        )
+
+
+@dataclass
+class IncidentPage:
+    """One page of incidents and the cursor for the next page."""
+    incidents: list[Incident]
+    next_cursor: str | None = None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+
+class IncidentRepository(ABC):
+    """Storage interface for incidents and their AI analyses."""
+
+    async def initialize(self) -> None:
+        """Prepare the backing store (create tables, open files)."""
+
+    async def close(self) -> None:
+        """Release resources held by the repository."""
+
+    @abstractmethod
+    async def get(self, incident_id: str) -> Incident | None:
+        """Fetch one incident, or None if it does not exist."""
+
+    @abstractmethod
+    async def save(self, incident: Incident) -> None:
+        """Insert or replace an incident and refresh its index entries."""
+
+    @abstractmethod
+    async def list_page(
+        self,
+        filters: IncidentFilter,
+        sort_by: str = "created_at",
+        descending: bool = True,
+        limit: int = 20,
+        cursor: str | None = None,
+        offset: int = 0
+    ) -> IncidentPage:
+        """List incidents in ``sort_by`` order.
+
+        Pass the previous page's ``next_cursor`` as ``cursor`` to continue;
+        ``offset`` is only honoured without a cursor, for page-number clients.
+        """
+
+    @abstractmethod
+    async def count(self, filters: IncidentFilter) -> int:
+        """Number of incidents matching ``filters``."""
+
+    @abstractmethod
+    async def get_analysis(self, incident_id: str) -> dict[str, Any] | None:
+        """Full AI analysis stored for an incident."""
+
+    @abstractmethod
+    async def save_analysis(self, incident_id: str, analysis: dict[str, Any]) -> None:
+        """Store the full AI analysis for an incident."""
+
+    async def related(self, incident: Incident, limit: int = 5) -> list[Incident]:
+        """Most recent other incidents for the same service."""
+        page = await self.list_page(
+            IncidentFilter(service_name=incident.service_name),
+            limit=limit + 1
+        )
+        return [i for i in page.incidents if i.id != incident.id][:limit]
+
+
+class InMemoryIncidentRepository(IncidentRepository):
+    """Process-local repository with sorted secondary indexes.
+
+    Every (field, value) bucket, plus the unfiltered bucket, keeps one sorted
+    list of keys per sort field. Listing walks the smallest bucket matching
+    the filters from the cursor position instead of sorting everything.
+    """
+
+    def __init__(self):
+        self._incidents: dict[str, Incident] = {}
+        self._analyses: dict[str, dict[str, Any]] = {}
+        self._indexes: dict[tuple[str | None, Any], dict[str, list[tuple]]] = {}
+        self._indexed: dict[str, tuple[list[tuple[str | None, Any]], dict[str, tuple]]] = {}
+
+    def put(self, incident: Incident) -> None:
+        """Synchronous save, used for seeding."""
+        self._unindex(incident.id)
+        self._incidents[incident.id] = incident
+
+        buckets = [(None, None)] + [
+            (field, _field_value(getattr(incident, field))) for field in FILTER_FIELDS
+        ]
+        keys = {sort_by: sort_key(incident, sort_by) for sort_by in SORT_FIELDS}
+        for bucket in buckets:
+            lists = self._indexes.setdefault(bucket, {sort_by: [] for sort_by in SORT_FIELDS})
+            for sort_by, key in keys.items():
+                bisect.insort(lists[sort_by], key)
+        self._indexed[incident.id] = (buckets, keys)
+
+    def _unindex(self, incident_id: str) -> None:
+        entry = self._indexed.pop(incident_id, None)
+        if entry is None:
+            return
+        buckets, keys = entry
+        for bucket in buckets:
+            lists = self._indexes[bucket]
+            for sort_by, key in keys.items():
+                keys_list = lists[sort_by]
+                position = bisect.bisect_left(keys_list, key)
+                if position < len(keys_list) and keys_list[position] == key:
+                    del keys_list[position]
+
+    def _bucket_keys(self, filters: IncidentFilter, sort_by: str) -> list[tuple]:
+        """Sorted keys of the smallest index bucket covering ``filters``."""
+        active = filters.active()
+        if not active:
+            return self._indexes.get((None, None), {}).get(sort_by, [])
+
+        candidates = [self._indexes.get(bucket) for bucket in active.items()]
+        if any(c is None for c in candidates):
+            return []
+        return min((c[sort_by] for c in candidates), key=len)
+
+    async def get(self, incident_id: str) -> Incident | None:
+        return self._incidents.get(incident_id)
+
+    async def save(self, incident: Incident) -> None:
+        self.put(incident)
+
+    async def list_page(
+        self,
+        filters: IncidentFilter,
+        sort_by: str = "created_at",
+        descending: bool = True,
+        limit: int = 20,
+        cursor: str | None = None,
+        offset: int = 0
+    ) -> IncidentPage:
+        keys = self._bucket_keys(filters, sort_by)
+        exact = len(filters.active()) <= 1
+
+        if cursor:
+            after = decode_cursor(cursor, sort_by)
+            try:
+                start = (bisect.bisect_left(keys, after) - 1) if descending else bisect.bisect_right(keys, after)
+            except TypeError as e:
+                raise ValueError("Pagination cursor does not match the requested sort order") from e
+            offset = 0
+        else:
+            start = len(keys) - 1 if descending else 0
+
+        step = -1 if descending else 1
+        if exact:
+            # Every key in a single-filter bucket matches, so skip the offset directly
+            start += step * offset
+            offset = 0
+
+        incidents: list[Incident] = []
+        last_key = None
+        position = start
+        while 0 <= position < len(keys):
+            key = keys[position]
+            position += step
+            incident = self._incidents[key[-1]]
+            if not exact and not filters.matches(incident):
+                continue
+            if offset:
+                offset -= 1
+                continue
+            if len(incidents) == limit:
+                return IncidentPage(incidents=incidents, next_cursor=encode_cursor(last_key))
+            incidents.append(incident)
+            last_key = key
+
+        return IncidentPage(incidents=incidents)
+
+    async def count(self, filters: IncidentFilter) -> int:
+        keys = self._bucket_keys(filters, "created_at")
+        if len(filters.active()) <= 1:
+            return len(keys)
+        return sum(1 for key in keys if filters.matches(self._incidents[key[-1]]))
+
+    async def get_analysis(self, incident_id: str) -> dict[str, Any] | None:
+        return self._analyses.get(incident_id)
+
+    async def save_analysis(self, incident_id: str, analysis: dict[str, Any]) -> None:
+        self._analyses[incident_id] = analysis
+
+
+class SQLIncidentRepository(IncidentRepository):
+    """Shared SQL implementation; subclasses supply the driver calls.
+
+    Incidents are stored as JSON alongside the indexed columns, with a
+    composite index per sort order and per filter so that keyset pages are
+    served straight from an index range scan.
+    """
+
+    TABLE = "agent_incidents"
+    ANALYSIS_TABLE = "agent_incident_analyses"
+    FLOAT_TYPE = "DOUBLE PRECISION"
+
+    SORT_COLUMNS = {
+        "created_at": ("created_ts", "id"),
+        "updated_at": ("updated_ts", "id"),
+        "severity": ("severity_weight", "created_ts", "id"),
+    }
+
+    def _schema(self) -> list[str]:
+        t = self.TABLE
+        return [
+            f"""CREATE TABLE IF NOT EXISTS {t} (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                severity TEXT NOT NULL,
+                service_name TEXT NOT NULL,
+                severity_weight INTEGER NOT NULL,
+                created_ts {self.FLOAT_TYPE} NOT NULL,
+                updated_ts {self.FLOAT_TYPE} NOT NULL,
+                data TEXT NOT NULL
+            )""",
+            f"CREATE INDEX IF NOT EXISTS idx_{t}_created ON {t} (created_ts, id)",
+            f"CREATE INDEX IF NOT EXISTS idx_{t}_updated ON {t} (updated_ts, id)",
+            f"CREATE INDEX IF NOT EXISTS idx_{t}_severity_rank ON {t} (severity_weight, created_ts, id)",
+            f"CREATE INDEX IF NOT EXISTS idx_{t}_status ON {t} (status, created_ts, id)",
+            f"CREATE INDEX IF NOT EXISTS idx_{t}_severity ON {t} (severity, created_ts, id)",
+            f"CREATE INDEX IF NOT EXISTS idx_{t}_service ON {t} (service_name, created_ts, id)",
+            f"""CREATE TABLE IF NOT EXISTS {self.ANALYSIS_TABLE} (
+                incident_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL
+            )""",
+        ]
+
+    @abstractmethod
+    def _param(self, index: int) -> str:
+        """Placeholder for the 1-based parameter ``index``."""
+
+    @abstractmethod
+    async def _execute(self, sql: str, args: list[Any]) -> None:
+        """Run a statement that returns no rows."""
+
+    @abstractmethod
+    async def _fetch(self, sql: str, args: list[Any]) -> list[tuple]:
+        """Run a query and return its rows as tuples."""
+
+    async def initialize(self) -> None:
+        for statement in self._schema():
+            await self._execute(statement, [])
+
+    def _where(self, filters: IncidentFilter, args: list[Any]) -> list[str]:
+        clauses = []
+        for field, value in filters.active().items():
+            args.append(value)
+            clauses.append(f"{field} = {self._param(len(args))}")
+        return clauses
+
+    async def get(self, incident_id: str) -> Incident | None:
+        rows = await self._fetch(f"SELECT data FROM {self.TABLE} WHERE id = {self._param(1)}", [incident_id])
+        return Incident.model_validate_json(rows[0][0]) if rows else None
+
+    async def save(self, incident: Incident) -> None:
+        args = [
+            incident.id,
+            _field_value(incident.status),
+            _field_value(incident.severity),
+            incident.service_name,
+            SEVERITY_WEIGHT[incident.severity],
+            _timestamp(incident.created_at),
+            _timestamp(incident.updated_at) or _timestamp(incident.created_at),
+            incident.model_dump_json(),
+        ]
+        p = [self._param(i) for i in range(1, len(args) + 1)]
+        await self._execute(
+            f"""INSERT INTO {self.TABLE}
+                (id, status, severity, service_name, severity_weight, created_ts, updated_ts, data)
+                VALUES ({", ".join(p)})
+                ON CONFLICT (id) DO UPDATE SET
+                    status = excluded.status,
+                    severity = excluded.severity,
+                    service_name = excluded.service_name,
+                    severity_weight = excluded.severity_weight,
+                    created_ts = excluded.created_ts,
+                    updated_ts = excluded.updated_ts,
+                    data = excluded.data""",
+            args
+        )
+
+    async def list_page(
+        self,
+        filters: IncidentFilter,
+        sort_by: str = "created_at",
+        descending: bool = True,
+        limit: int = 20,
+        cursor: str | None = None,
+        offset: int = 0
+    ) -> IncidentPage:
+        columns = self.SORT_COLUMNS[sort_by]
+        args: list[Any] = []
+        clauses = self._where(filters, args)
+
+        if cursor:
+            after = decode_cursor(cursor, sort_by)
+            placeholders = []
+            for value in after:
+                args.append(value)
+                placeholders.append(self._param(len(args)))
+            operator = "<" if descending else ">"
+            clauses.append(f"({', '.join(columns)}) {operator} ({', '.join(placeholders)})")
+            offset = 0
+
+        direction = "DESC" if descending else "ASC"
+        sql = f"SELECT data, {', '.join(columns)} FROM {self.TABLE}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY " + ", ".join(f"{c} {direction}" for c in columns)
+        args.append(limit + 1)
+        sql += f" LIMIT {self._param(len(args))}"
+        if offset:
+            args.append(offset)
+            sql += f" OFFSET {self._param(len(args))}"
+
+        rows = await self._fetch(sql, args)
+        next_cursor = encode_cursor(tuple(rows[limit - 1][1:])) if len(rows) > limit else None
+        return IncidentPage(
+            incidents=[Incident.model_validate_json(row[0]) for row in rows[:limit]],
+            next_cursor=next_cursor
+        )
+
+    async def count(self, filters: IncidentFilter) -> int:
+        args: list[Any] = []
+        clauses = self._where(filters, args)
+        sql = f"SELECT COUNT(*) FROM {self.TABLE}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        rows = await self._fetch(sql, args)
+        return rows[0][0]
+
+    async def get_analysis(self, incident_id: str) -> dict[str, Any] | None:
+        rows = await self._fetch(
+            f"SELECT data FROM {self.ANALYSIS_TABLE} WHERE incident_id = {self._param(1)}",
+            [incident_id]
+        )
+        return json.loads(rows[0][0]) if rows else None
+
+    async def save_analysis(self, incident_id: str, analysis: dict[str, Any]) -> None:
+        await self._execute(
+            f"""INSERT INTO {self.ANALYSIS_TABLE} (incident_id, data)
+                VALUES ({self._param(1)}, {self._param(2)})
+                ON CONFLICT (incident_id) DO UPDATE SET data = excluded.data""",
+            [incident_id, json.dumps(analysis, default=str)]
+        )
+
+
+class PostgresIncidentRepository(SQLIncidentRepository):
+    """Incident repository on the shared asyncpg pool."""
+
+    def __init__(self, pool: asyncpg.Pool):
+        self.pool = pool
+
+    def _param(self, index: int) -> str:
+        return f"${index}"
+
+    async def _execute(self, sql: str, args: list[Any]) -> None:
+        async with self.pool.acquire() as conn:
+            await conn.execute(sql, *args)
+
+    async def _fetch(self, sql: str, args: list[Any]) -> list[tuple]:
+        async with self.pool.acquire() as conn:
+            return [tuple(row) for row in await conn.fetch(sql, *args)]
+
+
+class SQLiteIncidentRepository(SQLIncidentRepository):
+    """Incident repository in a SQLite file, queried from a worker thread."""
+
+    FLOAT_TYPE = "REAL"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = asyncio.Lock()
+
+    def _param(self, index: int) -> str:
+        return "?"
+
+    async def initialize(self) -> None:
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        # WAL lets several uvicorn workers read while one writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        await super().initialize()
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def _execute(self, sql: str, args: list[Any]) -> None:
+        async with self._lock:
+            await asyncio.to_thread(self._conn.execute, sql, args)
+
+    async def _fetch(self, sql: str, args: list[Any]) -> list[tuple]:
+        async with self._lock:
+            return await asyncio.to_thread(lambda: self._conn.execute(sql, args).fetchall())
+
+
+_repository: IncidentRepository = InMemoryIncidentRepository()
+
+
+def get_incident_repository() -> IncidentRepository:
+    """Get the active incident repository."""
+    return _repository
+
+
+async def init_incident_repository(pool: asyncpg.Pool | None = None) -> IncidentRepository:
+    """Switch to the backend selected by INCIDENT_STORE_BACKEND.
+
+    Falls back to the in-memory repository when Postgres is selected but no
+    database pool is available.
+    """
+    global _repository
+    config = get_config()
+    backend = config.incident_store_backend.lower()
+
+    if backend == "postgres" and pool is not None:
+        repository: IncidentRepository = PostgresIncidentRepository(pool)
+    elif backend == "sqlite":
+        repository = SQLiteIncidentRepository(config.incident_store_sqlite_path)
+    else:
+        if backend != "memory":
+            logger.warning(f"Incident store backend '{backend}' unavailable, keeping incidents in memory")
+        return _repository
+
+    await repository.initialize()
+    _repository = repository
+    logger.info(f"Incident store using {backend} backend")
+    return repository
+
+
+async def close_incident_repository() -> None:
+    """Close the active incident repository."""
+    await _repository.close()
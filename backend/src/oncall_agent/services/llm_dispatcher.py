@@ -0,0 +1,224 @@
+"""
+LLM Dispatcher
+
+Spreads LLM calls across every healthy API key instead of pinning them to
+the single active key. Each key gets one cached ``AsyncAnthropic`` client
+(and therefore one HTTP connection pool) and two token buckets, for
+requests and input tokens per minute. A call is sent on the key with the
+most headroom. The rate-limit headers of every response bring the buckets
+in line with what the server reports, and a 429 takes the key out of
+rotation until its ``retry-after`` has passed.
+"""
+
+import asyncio
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from anthropic import AsyncAnthropic, RateLimitError
+
+from ..models.api_key import LLMProvider
+from ..utils.logger import get_logger
+from ..utils.token_bucket import TokenBucket
+from .api_key_service import APIKeyService
+
+logger = get_logger(__name__)
+
+# Longest single sleep while waiting for capacity, so new keys are noticed
+MAX_WAIT_SLICE = 5.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough input token count (about four characters per token)."""
+    return max(1, len(text) // 4)
+
+
+@dataclass
+class KeyState:
+    """Client and rate accounting for one API key."""
+    key_id: str
+    api_key: str
+    provider: LLMProvider
+    client: AsyncAnthropic
+    requests: TokenBucket
+    tokens: TokenBucket
+    in_flight: int = 0
+    cooldown_until: float = 0.0
+    dispatched: int = 0
+    rate_limited: int = 0
+
+    def wait_time(self, tokens: int, now: float) -> float:
+        return max(
+            self.cooldown_until - now,
+            self.requests.wait_time(1),
+            self.tokens.wait_time(tokens),
+        )
+
+
+@dataclass
+class Lease:
+    """A reserved slot on one key for a single LLM call."""
+    key_id: str
+    provider: LLMProvider
+    client: AsyncAnthropic
+    estimated_tokens: int
+    started_at: float = field(default_factory=time.monotonic)
+
+
+class LLMDispatcher:
+    """Load-balances LLM calls over all active keys of an APIKeyService."""
+
+    def __init__(
+        self,
+        key_service: APIKeyService,
+        requests_per_minute: int = 50,
+        tokens_per_minute: int = 40000,
+        max_wait: float = 60.0
+    ):
+        self.key_service = key_service
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_wait = max_wait
+        self._keys: dict[str, KeyState] = {}
+        self._closing: set[asyncio.Task] = set()
+
+    def client_for(self, key_id: str, api_key: str, provider: LLMProvider = LLMProvider.ANTHROPIC) -> AsyncAnthropic:
+        """Cached client for ``key_id``; rebuilt if the key value changed."""
+        return self._state(key_id, api_key, provider).client
+
+    def _state(self, key_id: str, api_key: str, provider: LLMProvider) -> KeyState:
+        state = self._keys.get(key_id)
+        if state is None or state.api_key != api_key:
+            if state is not None:
+                self._retire(state)
+            if provider != LLMProvider.ANTHROPIC:
+                raise NotImplementedError(f"Provider {provider} not implemented")
+            state = KeyState(
+                key_id=key_id,
+                api_key=api_key,
+                provider=provider,
+                client=AsyncAnthropic(api_key=api_key),
+                requests=TokenBucket.per_minute(self.requests_per_minute),
+                tokens=TokenBucket.per_minute(self.tokens_per_minute),
+            )
+            self._keys[key_id] = state
+        return state
+
+    def _healthy_states(self) -> list[KeyState]:
+        usable = self.key_service.get_usable_keys()
+        live_ids = {key_id for key_id, _, _ in usable}
+        # Drop clients for keys that were deleted or disabled
+        for key_id in [k for k in self._keys if k not in live_ids]:
+            self._retire(self._keys.pop(key_id))
+        return [self._state(*key) for key in usable]
+
+    async def acquire(self, estimated_tokens: int) -> Lease:
+        """Reserve capacity on the key with the most headroom.
+
+        Waits (up to ``max_wait`` seconds) when every key is saturated.
+
+        Raises:
+            ValueError: If no active API key is configured
+            TimeoutError: If no key frees up within ``max_wait``
+        """
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            states = self._healthy_states()
+            if not states:
+                raise ValueError("No active API key available")
+
+            now = time.monotonic()
+            # Least wait first, then fewest in-flight calls, then most spare tokens
+            best = min(states, key=lambda s: (s.wait_time(estimated_tokens, now), s.in_flight, -s.tokens.tokens))
+            wait = best.wait_time(estimated_tokens, now)
+            if wait <= 0:
+                best.requests.consume(1)
+                best.tokens.consume(estimated_tokens)
+                best.in_flight += 1
+                best.dispatched += 1
+                return Lease(best.key_id, best.provider, best.client, estimated_tokens)
+
+            if now + wait > deadline:
+                raise TimeoutError(f"All {len(states)} API keys are rate limited for another {wait:.1f}s")
+            logger.info(f"All API keys saturated, waiting {wait:.1f}s for capacity")
+            await asyncio.sleep(min(wait, MAX_WAIT_SLICE))
+
+    def release(
+        self,
+        lease: Lease,
+        headers: Mapping[str, str] | None = None,
+        input_tokens: int | None = None,
+        error: Exception | None = None
+    ) -> None:
+        """Return a lease, feeding back actual usage, headers and 429s."""
+        state = self._keys.get(lease.key_id)
+        if state is None:
+            return
+        state.in_flight = max(0, state.in_flight - 1)
+
+        if input_tokens is not None:
+            # Settle the difference between the estimate and real usage
+            state.tokens.consume(input_tokens - lease.estimated_tokens)
+
+        if isinstance(error, RateLimitError):
+            headers = error.response.headers
+            retry_after = _parse_float(headers.get("retry-after")) or 30.0
+            state.cooldown_until = time.monotonic() + retry_after
+            state.rate_limited += 1
+            logger.warning(f"API key {lease.key_id} rate limited, resting it for {retry_after:.0f}s")
+
+        if headers:
+            self.update_from_headers(state, headers)
+
+    def update_from_headers(self, state: KeyState, headers: Mapping[str, str]) -> None:
+        """Clamp the buckets to the server-reported remaining allowance."""
+        remaining_requests = _parse_float(headers.get("anthropic-ratelimit-requests-remaining"))
+        if remaining_requests is not None:
+            state.requests.sync(remaining_requests)
+
+        remaining_tokens = _parse_float(
+            headers.get("anthropic-ratelimit-input-tokens-remaining")
+            or headers.get("anthropic-ratelimit-tokens-remaining")
+        )
+        if remaining_tokens is not None:
+            state.tokens.sync(remaining_tokens)
+
+    def get_stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "keys": {
+                key_id: {
+                    "in_flight": state.in_flight,
+                    "dispatched": state.dispatched,
+                    "rate_limited": state.rate_limited,
+                    "requests_available": round(state.requests.tokens, 1),
+                    "tokens_available": round(state.tokens.tokens),
+                    "cooldown_seconds": round(max(0.0, state.cooldown_until - now), 1),
+                }
+                for key_id, state in self._keys.items()
+            }
+        }
+
+    async def close(self) -> None:
+        """Close every pooled client."""
+        for state in self._keys.values():
+            await state.client.close()
+        self._keys.clear()
+
+    def _retire(self, state: KeyState) -> None:
+        try:
+            task = asyncio.get_running_loop().create_task(state.client.close())
+        except RuntimeError:
+            return
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+
+def _parse_float(value: str | None) -> float | None:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
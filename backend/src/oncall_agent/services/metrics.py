@@ -0,0 +1,301 @@
+"""
+Metrics
+
+Process-wide counters, gauges and histograms exported at ``/metrics`` in
+the Prometheus text exposition format. Metrics are declared once at module
+level and updated from the code they measure; values that already live
+elsewhere (queue depths) are read by collectors just before each scrape.
+"""
+
+import math
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; alert stages range from millisecond parses to minute-long LLM calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+INF_BUCKET = 'le="+Inf"'
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: dict[tuple[str, ...], object] = {}
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, **labels: object):
+        """Child metric for one combination of label values."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = self._new_child()
+        return child
+
+    def _default(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} has labels {self.labelnames}; use .labels()")
+        return self.labels()
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {_escape(self.documentation)}"
+        yield f"# TYPE {self.name} {self.type_name}"
+        with self._lock:
+            children = sorted(self._children.items())
+        for key, child in children:
+            yield from self._render_child(key, child)
+
+    def _render_child(self, key: tuple[str, ...], child) -> Iterator[str]:
+        yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+
+
+class _Value:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeValue(_Value):
+    def set(self, value: float) -> None:
+        with self._lock:
+            self.value = float(value)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+    type_name = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+    type_name = "gauge"
+
+    def _new_child(self) -> _GaugeValue:
+        return _GaugeValue()
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+
+class _HistogramValue:
+    def __init__(self, buckets: tuple[float, ...]):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.sum += value
+            self.count += 1
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+                    break
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the duration of the ``with`` block, even if it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets."""
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+    def _render_child(self, key: tuple[str, ...], child: _HistogramValue) -> Iterator[str]:
+        with child._lock:
+            counts, total, count = list(child.counts), child.sum, child.count
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts, strict=True):
+            cumulative += bucket_count
+            le = f'le="{_format_value(bound)}"'
+            yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+        yield f"{self.name}_bucket{_format_labels(self.labelnames, key, INF_BUCKET)} {count}"
+        yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}"
+        yield f"{self.name}_count{_format_labels(self.labelnames, key)} {count}"
+
+
+class MetricsRegistry:
+    """Set of metrics rendered together, plus collectors run before each render."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: dict[str, Callable[[], None]] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, key: str, collect: Callable[[], None]) -> None:
+        """Run ``collect`` before each render (replacing any collector under ``key``)."""
+        with self._lock:
+            self._collectors[key] = collect
+
+    def remove_collector(self, key: str) -> None:
+        with self._lock:
+            self._collectors.pop(key, None)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            collectors = list(self._collectors.values())
+            metrics = list(self._metrics.values())
+        for collect in collectors:
+            collect()
+        lines = [line for metric in metrics for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+ALERT_STAGE_SECONDS = REGISTRY.histogram(
+    "oncall_alert_stage_duration_seconds",
+    "Time spent in each stage of handling a pager alert",
+    ["stage"]
+)
+ALERT_STAGE_ERRORS = REGISTRY.counter(
+    "oncall_alert_stage_errors_total",
+    "Alert handling stages that raised",
+    ["stage"]
+)
+ALERTS_HANDLED = REGISTRY.counter(
+    "oncall_alerts_handled_total",
+    "Pager alerts handled by the agent, by outcome",
+    ["status"]
+)
+CONTEXT_FETCH_SECONDS = REGISTRY.histogram(
+    "oncall_context_fetch_duration_seconds",
+    "Time to fetch alert context from each integration",
+    ["integration", "outcome"]
+)
+MCP_TOOL_SECONDS = REGISTRY.histogram(
+    "oncall_mcp_tool_duration_seconds",
+    "MCP tool call latency",
+    ["integration", "tool"]
+)
+MCP_TOOL_CALLS = REGISTRY.counter(
+    "oncall_mcp_tool_calls_total",
+    "MCP tool calls, by outcome",
+    ["integration", "tool", "outcome"]
+)
+LLM_REQUESTS = REGISTRY.counter(
+    "oncall_llm_requests_total",
+    "LLM API requests, by outcome",
+    ["model", "outcome"]
+)
+LLM_TOKENS = REGISTRY.counter(
+    "oncall_llm_tokens_total",
+    "LLM tokens used",
+    ["model", "direction"]
+)
+ALERT_QUEUE_DEPTH = REGISTRY.gauge(
+    "oncall_alert_queue_depth",
+    "Alerts waiting for an agent worker",
+)
+ALERT_QUEUE_CAPACITY = REGISTRY.gauge(
+    "oncall_alert_queue_capacity",
+    "Maximum number of queued alerts",
+)
+ALERTS_RUNNING = REGISTRY.gauge(
+    "oncall_alerts_running",
+    "Alerts being handled by agent workers",
+)
+
+
+@contextmanager
+def track_stage(stage: str) -> Iterator[None]:
+    """Time one alert-handling stage, counting it as an error if it raises."""
+    try:
+        with ALERT_STAGE_SECONDS.labels(stage=stage).time():
+            yield
+    except Exception:
+        ALERT_STAGE_ERRORS.labels(stage=stage).inc()
+        raise
+
+
+def observe_mcp_call(integration: str, tool: str, seconds: float, success: bool) -> None:
+    MCP_TOOL_SECONDS.labels(integration=integration, tool=tool).observe(seconds)
+    MCP_TOOL_CALLS.labels(integration=integration, tool=tool, outcome="success" if success else "error").inc()
+
+
+def observe_llm_usage(model: str, usage) -> None:
+    """Count one successful LLM request and its tokens (an Anthropic ``Usage``)."""
+    LLM_REQUESTS.labels(model=model, outcome="success").inc()
+    if usage is not None:
+        LLM_TOKENS.labels(model=model, direction="input").inc(usage.input_tokens)
+        LLM_TOKENS.labels(model=model, direction="output").inc(usage.output_tokens)
@@ -0,0 +1,387 @@
+"""
+Quota Service
+
+In-process alert quotas per user. The webhook and the alert-tracking router
+call it directly instead of going through HTTP. Each user's counter rolls
+over at the end of every 30-day billing window and remembers a bounded
+window of recently counted incident ids, so a redelivered alert is not
+charged twice. Accounts live in a pluggable store, in memory by default or
+in a SQLite file shared by every worker; each change is one atomic
+read-modify-write in that store, so workers never overwrite each other.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, TypeVar
+
+from src.oncall_agent.config import get_config
+from src.oncall_agent.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+BILLING_PERIOD = timedelta(days=30)
+
+T = TypeVar("T")
+
+SUBSCRIPTION_PLANS = {
+    "free": {"name": "Free", "alerts_limit": 3, "price": 0},
+    "starter": {"name": "Starter", "alerts_limit": 50, "price": 999},
+    "pro": {"name": "Professional", "alerts_limit": 200, "price": 2999},
+    "enterprise": {"name": "Enterprise", "alerts_limit": -1, "price": 9999},
+}
+
+
+def is_dev_mode() -> bool:
+    return (
+        os.getenv("NEXT_PUBLIC_DEV_MODE", "false").lower() == "true"
+        or os.getenv("NODE_ENV", "") == "development"
+    )
+
+
+class QuotaExceededError(Exception):
+    """Raised when a user has used every alert of their billing window."""
+
+    def __init__(self, account: "UsageAccount"):
+        super().__init__(f"Alert limit reached for user {account.user_id}")
+        self.detail = {
+            "error": "Alert limit reached",
+            "message": "You have reached your monthly alert limit. Please upgrade your subscription to continue.",
+            "alerts_used": account.alerts_used,
+            "alerts_limit": account.alerts_limit,
+            "account_tier": account.account_tier,
+        }
+
+
+class RecentKeys:
+    """Insertion-ordered set that forgets its oldest keys beyond ``capacity``."""
+
+    def __init__(self, capacity: int, keys: Iterable[str] = ()):
+        self.capacity = capacity
+        self._keys: OrderedDict[str, None] = OrderedDict()
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def add(self, key: str) -> None:
+        self._keys[key] = None
+        self._keys.move_to_end(key)
+        while len(self._keys) > self.capacity:
+            self._keys.popitem(last=False)
+
+    def clear(self) -> None:
+        self._keys.clear()
+
+
+@dataclass
+class UsageAccount:
+    """One user's plan and usage in the current billing window."""
+    user_id: str
+    account_tier: str
+    alerts_limit: int
+    billing_cycle_start: datetime
+    alerts_used: int = 0
+    recent_incidents: RecentKeys = field(default_factory=lambda: RecentKeys(1000))
+    last_payment_at: datetime | None = None
+    transaction_id: str | None = None
+
+    @property
+    def unlimited(self) -> bool:
+        return self.alerts_limit == -1
+
+    @property
+    def alerts_remaining(self) -> int:
+        return -1 if self.unlimited else max(0, self.alerts_limit - self.alerts_used)
+
+    @property
+    def is_limit_reached(self) -> bool:
+        return not self.unlimited and self.alerts_used >= self.alerts_limit
+
+    @property
+    def billing_cycle_end(self) -> datetime:
+        return self.billing_cycle_start + BILLING_PERIOD
+
+    def roll_over(self, now: datetime) -> bool:
+        """Start the billing window containing ``now``; True if usage was reset."""
+        if now < self.billing_cycle_end:
+            return False
+        periods = (now - self.billing_cycle_start) // BILLING_PERIOD
+        self.billing_cycle_start += periods * BILLING_PERIOD
+        self.alerts_used = 0
+        self.recent_incidents.clear()
+        return True
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "user_id": self.user_id,
+            "account_tier": self.account_tier,
+            "alerts_limit": self.alerts_limit,
+            "billing_cycle_start": self.billing_cycle_start.isoformat(),
+            "alerts_used": self.alerts_used,
+            "recent_incidents": list(self.recent_incidents),
+            "last_payment_at": self.last_payment_at.isoformat() if self.last_payment_at else None,
+            "transaction_id": self.transaction_id,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], idempotency_window: int) -> "UsageAccount":
+        return cls(
+            user_id=data["user_id"],
+            account_tier=data["account_tier"],
+            alerts_limit=data["alerts_limit"],
+            billing_cycle_start=datetime.fromisoformat(data["billing_cycle_start"]),
+            alerts_used=data.get("alerts_used", 0),
+            recent_incidents=RecentKeys(idempotency_window, data.get("recent_incidents", ())),
+            last_payment_at=datetime.fromisoformat(data["last_payment_at"]) if data.get("last_payment_at") else None,
+            transaction_id=data.get("transaction_id"),
+        )
+
+
+class UsageStore(ABC):
+    """Persistence for usage accounts.
+
+    The store is the source of truth: every change is a read-modify-write
+    of one account done atomically by ``update``, so services in several
+    processes sharing a store never overwrite each other's changes.
+    """
+
+    async def initialize(self) -> None:
+        """Prepare the backing storage (tables, files)."""
+
+    async def close(self) -> None:
+        """Release the backing storage."""
+
+    @abstractmethod
+    async def update(self, user_id: str, mutate: Callable[[dict[str, Any] | None], tuple[dict[str, Any] | None, T]]) -> T:
+        """Atomically apply ``mutate`` to the stored account of ``user_id``.
+
+        ``mutate`` receives the stored account (None if there is none) and
+        returns the account to write, or None to leave it as is, together
+        with the result to return. If it raises, nothing is written.
+        """
+
+
+class InMemoryUsageStore(UsageStore):
+    """Accounts in a dict of this process; usage resets on restart."""
+
+    def __init__(self):
+        self._accounts: dict[str, dict[str, Any]] = {}
+
+    async def update(self, user_id: str, mutate: Callable[[dict[str, Any] | None], tuple[dict[str, Any] | None, T]]) -> T:
+        # No await between the read and the write, so the event loop keeps it atomic
+        data, result = mutate(self._accounts.get(user_id))
+        if data is not None:
+            self._accounts[user_id] = data
+        return result
+
+
+class SQLiteUsageStore(UsageStore):
+    """Usage accounts in a SQLite file, queried from a worker thread."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = asyncio.Lock()
+
+    async def initialize(self) -> None:
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        # WAL lets several uvicorn workers share the file
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS alert_usage (user_id TEXT PRIMARY KEY, data TEXT NOT NULL)")
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def update(self, user_id: str, mutate: Callable[[dict[str, Any] | None], tuple[dict[str, Any] | None, T]]) -> T:
+        async with self._lock:
+            return await asyncio.to_thread(self._update, user_id, mutate)
+
+    def _update(self, user_id: str, mutate: Callable[[dict[str, Any] | None], tuple[dict[str, Any] | None, T]]) -> T:
+        # IMMEDIATE takes the write lock before reading, so another process
+        # cannot change the account between our read and our write
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._conn.execute("SELECT data FROM alert_usage WHERE user_id = ?", (user_id,)).fetchone()
+            data, result = mutate(json.loads(row[0]) if row else None)
+            if data is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO alert_usage (user_id, data) VALUES (?, ?)",
+                    (user_id, json.dumps(data))
+                )
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+        return result
+
+
+class QuotaService:
+    """Per-user alert counters with billing windows and idempotent recording."""
+
+    def __init__(
+        self,
+        store: UsageStore | None = None,
+        idempotency_window: int = 1000,
+        default_tier: Callable[[], str] = lambda: "pro" if is_dev_mode() else "free",
+        clock: Callable[[], datetime] = datetime.now
+    ):
+        self.store = store or InMemoryUsageStore()
+        self.idempotency_window = idempotency_window
+        self.default_tier = default_tier
+        self._clock = clock
+
+    def _new_account(self, user_id: str, tier: str) -> UsageAccount:
+        return UsageAccount(
+            user_id=user_id,
+            account_tier=tier,
+            alerts_limit=SUBSCRIPTION_PLANS[tier]["alerts_limit"],
+            billing_cycle_start=self._clock().replace(day=1, hour=0, minute=0, second=0, microsecond=0),
+            recent_incidents=RecentKeys(self.idempotency_window)
+        )
+
+    async def _update(
+        self,
+        user_id: str,
+        change: Callable[[UsageAccount], bool] | None = None,
+        new_tier: str | None = None
+    ) -> UsageAccount | None:
+        """Apply ``change`` to the stored account in one store transaction.
+
+        A missing account is created on ``new_tier``, or left missing (and
+        None returned) without one. ``change`` returns whether it modified
+        the account; the account is written if it did, if it was created or
+        if its billing window rolled over.
+        """
+        def mutate(data: dict[str, Any] | None) -> tuple[dict[str, Any] | None, UsageAccount | None]:
+            if data is not None:
+                account = UsageAccount.from_dict(data, self.idempotency_window)
+                dirty = False
+            elif new_tier is not None:
+                account = self._new_account(user_id, new_tier)
+                dirty = True
+            else:
+                return None, None
+            dirty = account.roll_over(self._clock()) or dirty
+            if change is not None:
+                dirty = change(account) or dirty
+            return (account.to_dict() if dirty else None), account
+
+        return await self.store.update(user_id, mutate)
+
+    async def get_account(self, user_id: str) -> UsageAccount:
+        """Account of ``user_id``, created on the default plan if new."""
+        return await self._update(user_id, new_tier=self.default_tier())
+
+    async def get_tier(self, user_id: str) -> str | None:
+        """Plan of a known user, None if the user has no account yet."""
+        account = await self._update(user_id)
+        return account.account_tier if account else None
+
+    async def record(self, user_id: str, incident_id: str | None = None) -> dict[str, Any]:
+        """Count one alert against the user's quota.
+
+        An incident counted within the idempotency window is not charged
+        again.
+
+        Raises:
+            QuotaExceededError: If the user has no alerts left this window
+        """
+        already_processed = False
+
+        def count(account: UsageAccount) -> bool:
+            nonlocal already_processed
+            if incident_id and incident_id in account.recent_incidents:
+                already_processed = True
+                return False
+            if account.is_limit_reached:
+                raise QuotaExceededError(account)
+            account.alerts_used += 1
+            if incident_id:
+                account.recent_incidents.add(incident_id)
+            return True
+
+        account = await self._update(user_id, count, new_tier=self.default_tier())
+        if already_processed:
+            logger.info(f"Incident {incident_id} already counted for user {user_id}, skipping")
+            return {
+                "success": True,
+                "alerts_used": account.alerts_used,
+                "alerts_remaining": account.alerts_remaining,
+                "already_processed": True
+            }
+        return {
+            "success": True,
+            "alerts_used": account.alerts_used,
+            "alerts_remaining": account.alerts_remaining,
+            "is_limit_reached": account.is_limit_reached
+        }
+
+    async def set_plan(self, user_id: str, plan_id: str, transaction_id: str | None = None) -> UsageAccount:
+        """Move a user to ``plan_id``; new users start from the free plan."""
+        def change_plan(account: UsageAccount) -> bool:
+            account.account_tier = plan_id
+            account.alerts_limit = SUBSCRIPTION_PLANS[plan_id]["alerts_limit"]
+            account.last_payment_at = self._clock()
+            account.transaction_id = transaction_id
+            return True
+
+        return await self._update(user_id, change_plan, new_tier="free")
+
+    async def reset(self, user_id: str) -> bool:
+        """Clear a user's usage; False if the user has no account."""
+        def clear(account: UsageAccount) -> bool:
+            account.alerts_used = 0
+            account.recent_incidents.clear()
+            return True
+
+        return await self._update(user_id, clear) is not None
+
+
+_quota_service: QuotaService | None = None
+
+
+def get_quota_service() -> QuotaService:
+    """Process-wide quota service."""
+    global _quota_service
+    if _quota_service is None:
+        _quota_service = QuotaService(idempotency_window=get_config().quota_idempotency_window)
+    return _quota_service
+
+
+async def init_quota_service() -> QuotaService:
+    """Switch to the store selected by QUOTA_STORE_BACKEND."""
+    global _quota_service
+    config = get_config()
+    backend = config.quota_store_backend.lower()
+    if backend == "sqlite":
+        store: UsageStore = SQLiteUsageStore(config.quota_store_sqlite_path)
+    else:
+        if backend != "memory":
+            logger.warning(f"Quota store backend '{backend}' unavailable, keeping usage in memory")
+        return get_quota_service()
+
+    await store.initialize()
+    _quota_service = QuotaService(store, idempotency_window=config.quota_idempotency_window)
+    logger.info(f"Quota service using {backend} store")
+    return _quota_service
+
+
+async def close_quota_service() -> None:
+    if _quota_service is not None:
+        await _quota_service.store.close()
@@ -0,0 +1,303 @@
+"""
+Webhook Inbox
+
+Durable hand-off between the webhook endpoints and the agent. A webhook is
+acknowledged as soon as its raw body is appended to a SQLite (WAL) inbox;
+background consumers drain the inbox afterwards. Messages are leased while
+being processed and redelivered if a consumer fails or dies before
+acknowledging them (at-least-once). Handlers dedupe redeliveries with the
+processed-key table, keyed on the incident id.
+"""
+
+import asyncio
+import sqlite3
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from src.oncall_agent.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS webhook_inbox (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        source TEXT NOT NULL,
+        body BLOB NOT NULL,
+        received_at REAL NOT NULL,
+        available_at REAL NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        last_error TEXT,
+        dead INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS webhook_inbox_ready ON webhook_inbox (dead, available_at, seq)",
+    """
+    CREATE TABLE IF NOT EXISTS webhook_processed (
+        key TEXT PRIMARY KEY,
+        processed_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS webhook_processed_at ON webhook_processed (processed_at)",
+)
+
+
+class RetryLaterError(Exception):
+    """Raised by a handler to have its message redelivered after ``delay`` seconds.
+
+    Meant for backpressure (the agent queue is full): the delivery does not
+    count toward ``max_attempts``, so a long backlog never dead-letters
+    valid webhooks.
+    """
+
+    def __init__(self, message: str, delay: float | None = None):
+        super().__init__(message)
+        self.delay = delay
+
+
+class PoisonMessageError(Exception):
+    """Raised by a handler for a message that can never be processed."""
+
+
+@dataclass
+class InboxMessage:
+    """One received webhook waiting to be processed."""
+    seq: int
+    source: str
+    body: bytes
+    received_at: float
+    attempts: int
+
+
+class WebhookInbox:
+    """Append-only webhook inbox in a SQLite file, queried from a worker thread."""
+
+    def __init__(
+        self,
+        path: str,
+        lease_seconds: float = 120.0,
+        retry_delay: float = 5.0,
+        max_attempts: int = 5,
+        processed_ttl: float = 86400.0,
+        clock: Callable[[], float] = time.time
+    ):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.retry_delay = retry_delay
+        self.max_attempts = max_attempts
+        self.processed_ttl = processed_ttl
+        self._clock = clock
+        self._conn: sqlite3.Connection | None = None
+        self._lock = asyncio.Lock()
+        # Set on append so idle consumers wake up without waiting for a poll
+        self.available = asyncio.Event()
+
+    async def initialize(self) -> None:
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        # WAL lets several uvicorn workers append and claim concurrently;
+        # FULL sync makes an acknowledged webhook survive a power loss
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        for statement in SCHEMA:
+            self._conn.execute(statement)
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def _run(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        async with self._lock:
+            return await asyncio.to_thread(fn, self._conn)
+
+    @staticmethod
+    def _transaction(conn: sqlite3.Connection, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        # IMMEDIATE takes the write lock up front, so two processes cannot
+        # claim the same message
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = fn(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return result
+
+    async def append(self, source: str, body: bytes) -> int:
+        """Durably store a webhook body; returns its sequence number."""
+        now = self._clock()
+        seq = await self._run(lambda conn: conn.execute(
+            "INSERT INTO webhook_inbox (source, body, received_at, available_at) VALUES (?, ?, ?, ?)",
+            (source, body, now, now)
+        ).lastrowid)
+        self.available.set()
+        return seq
+
+    async def claim(self, limit: int = 1) -> list[InboxMessage]:
+        """Lease up to ``limit`` ready messages, oldest first."""
+        now = self._clock()
+
+        def claim(conn: sqlite3.Connection) -> list[InboxMessage]:
+            rows = conn.execute(
+                "SELECT seq, source, body, received_at, attempts FROM webhook_inbox "
+                "WHERE dead = 0 AND available_at <= ? ORDER BY seq LIMIT ?",
+                (now, limit)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE webhook_inbox SET available_at = ?, attempts = attempts + 1 WHERE seq = ?",
+                [(now + self.lease_seconds, row[0]) for row in rows]
+            )
+            return [
+                InboxMessage(seq, source, bytes(body), received_at, attempts + 1)
+                for seq, source, body, received_at, attempts in rows
+            ]
+
+        return await self._run(lambda conn: self._transaction(conn, claim))
+
+    async def ack(self, seq: int) -> None:
+        """Remove a processed message."""
+        await self._run(lambda conn: conn.execute("DELETE FROM webhook_inbox WHERE seq = ?", (seq,)))
+
+    async def nack(self, message: InboxMessage, error: str, delay: float | None = None,
+                   dead: bool = False, count_attempt: bool = True) -> bool:
+        """Release a message for redelivery after ``delay`` seconds.
+
+        After ``max_attempts`` deliveries, or with ``dead``, the message is
+        dead-lettered instead. Without ``count_attempt`` the delivery is
+        given back, so it neither counts toward ``max_attempts`` nor
+        dead-letters the message. Returns True if it will be redelivered.
+        """
+        if count_attempt:
+            dead = dead or message.attempts >= self.max_attempts
+        if delay is None:
+            # Linear backoff keeps a failing dependency from being hammered
+            delay = self.retry_delay * message.attempts
+        available_at = self._clock() + delay
+        given_back = 0 if count_attempt else 1
+        await self._run(lambda conn: conn.execute(
+            "UPDATE webhook_inbox SET available_at = ?, last_error = ?, dead = ?, "
+            "attempts = MAX(attempts - ?, 0) WHERE seq = ?",
+            (available_at, error[:1000], int(dead), given_back, message.seq)
+        ))
+        return not dead
+
+    async def is_processed(self, key: str) -> bool:
+        row = await self._run(lambda conn: conn.execute(
+            "SELECT 1 FROM webhook_processed WHERE key = ?", (key,)
+        ).fetchone())
+        return row is not None
+
+    async def mark_processed(self, key: str) -> None:
+        """Remember ``key`` so a redelivered message skips it; old keys expire."""
+        now = self._clock()
+
+        def mark(conn: sqlite3.Connection) -> None:
+            conn.execute("INSERT OR REPLACE INTO webhook_processed (key, processed_at) VALUES (?, ?)", (key, now))
+            conn.execute("DELETE FROM webhook_processed WHERE processed_at < ?", (now - self.processed_ttl,))
+
+        await self._run(lambda conn: self._transaction(conn, mark))
+
+    async def get_stats(self) -> dict[str, Any]:
+        now = self._clock()
+
+        def stats(conn: sqlite3.Connection) -> dict[str, Any]:
+            ready, leased, dead, oldest = conn.execute(
+                "SELECT "
+                "COALESCE(SUM(dead = 0 AND available_at <= ?), 0), "
+                "COALESCE(SUM(dead = 0 AND available_at > ?), 0), "
+                "COALESCE(SUM(dead), 0), "
+                "MIN(CASE WHEN dead = 0 THEN received_at END) "
+                "FROM webhook_inbox",
+                (now, now)
+            ).fetchone()
+            return {
+                "ready": ready,
+                "leased_or_delayed": leased,
+                "dead": dead,
+                "oldest_pending_age": round(now - oldest, 1) if oldest is not None else None,
+            }
+
+        return await self._run(stats)
+
+
+class InboxConsumer:
+    """Background workers that drain a webhook inbox through a handler."""
+
+    def __init__(
+        self,
+        inbox: WebhookInbox,
+        handler: Callable[[InboxMessage], Awaitable[None]],
+        workers: int = 2,
+        poll_interval: float = 1.0
+    ):
+        self.inbox = inbox
+        self.handler = handler
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._tasks: list[asyncio.Task] = []
+        self.processed = 0
+        self.retried = 0
+        self.dead_lettered = 0
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"webhook-inbox-{n}")
+            for n in range(self.workers)
+        ]
+        logger.info(f"Started {self.workers} webhook inbox consumers")
+
+    async def stop(self) -> None:
+        """Stop the workers; a message being handled is redelivered after its lease."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self) -> None:
+        while True:
+            # Cleared before claiming, so an append during the claim is not missed
+            self.inbox.available.clear()
+            try:
+                messages = await self.inbox.claim()
+            except Exception as e:
+                logger.error(f"Failed to claim webhook inbox messages: {e}")
+                messages = []
+            if not messages:
+                try:
+                    # Also poll, for redeliveries and other processes' appends
+                    await asyncio.wait_for(self.inbox.available.wait(), self.poll_interval)
+                except TimeoutError:
+                    pass
+                continue
+            for message in messages:
+                await self.process(message)
+
+    async def process(self, message: InboxMessage) -> None:
+        """Handle one message and acknowledge, retry or dead-letter it."""
+        try:
+            await self.handler(message)
+        except RetryLaterError as e:
+            # Backpressure, not a failure of this message
+            await self.inbox.nack(message, str(e), e.delay, count_attempt=False)
+            self.retried += 1
+        except PoisonMessageError as e:
+            logger.error(f"Dead-lettering webhook {message.seq}: {e}")
+            await self.inbox.nack(message, str(e), dead=True)
+            self.dead_lettered += 1
+        except Exception as e:
+            logger.error(f"Webhook {message.seq} failed on attempt {message.attempts}: {e}", exc_info=True)
+            await self._retry(message, str(e))
+        else:
+            await self.inbox.ack(message.seq)
+            self.processed += 1
+
+    async def _retry(self, message: InboxMessage, error: str) -> None:
+        if await self.inbox.nack(message, error):
+            self.retried += 1
+        else:
+            logger.error(f"Webhook {message.seq} dead-lettered after {message.attempts} attempts: {error}")
+            self.dead_lettered += 1
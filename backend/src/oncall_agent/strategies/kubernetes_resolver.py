@@ -2,12 +2,12 @@
 
 import logging
 from dataclasses import dataclass
-from datetime import datetime
 from typing import Any
 
 from src.oncall_agent.mcp_integrations.kubernetes_manusa_mcp import (
     KubernetesManusaMCPIntegration as KubernetesMCPIntegration,
 )
+from src.oncall_agent.services.audit_store import get_audit_store
 
 
 @dataclass
@@ -43,7 +43,7 @@ class KubernetesResolver:
         """Initialize the resolver with a Kubernetes integration."""
         self.k8s = k8s_integration
         self.logger = logging.getLogger(__name__)
-        self.resolution_history = []
+        self.audit_store = get_audit_store()
 
     async def resolve_pod_crash(self, pod_name: str, namespace: str, context: dict[str, Any]) -> list[ResolutionAction]:
         """Generate resolution actions for a crashing pod."""
@@ -441,19 +441,20 @@ class KubernetesResolver:
 
     def _log_resolution(self, action: ResolutionAction, success: bool, message: str) -> None:
         """Log a resolution attempt for audit trail."""
-        self.resolution_history.append({
-            "timestamp": datetime.utcnow().isoformat(),
-            "action": action.action_type,
-            "params": action.params,
-            "success": success,
-            "message": message,
-            "confidence": action.confidence,
-            "risk_level": action.risk_level
-        })
-
-    def get_resolution_history(self) -> list[dict[str, Any]]:
-        """Get the history of resolution attempts."""
-        return self.resolution_history
+        self.audit_store.append(
+            "resolution",
+            tool=action.action_type,
+            action=action.action_type,
+            params=action.params,
+            success=success,
+            message=message,
+            confidence=action.confidence,
+            risk_level=action.risk_level
+        )
+
+    async def get_resolution_history(self, limit: int = 100) -> list[dict[str, Any]]:
+        """Get the most recent resolution attempts, oldest first."""
+        return await self.audit_store.aquery(category="resolution", limit=limit)
 
     async def resolve_generic_pod_errors(self, namespace: str, context: dict[str, Any]) -> list[ResolutionAction]:
         """Generate resolution actions for generic pod errors."""
@@ -0,0 +1,25 @@
+"""JSON decoding for hot request paths, using orjson when it is installed."""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional: pip install "oncall_agent[speedups]"
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:
+    """Decode JSON straight from the received bytes.
+
+    Raises:
+        ValueError: If ``data`` is not valid JSON (both backends' decode
+            errors subclass it)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
@@ -0,0 +1,65 @@
+"""Token bucket for client-side rate accounting."""
+
+import time
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``rate`` tokens per second.
+
+    ``consume`` may take the bucket negative (e.g. when a request used more
+    tokens than estimated); the debt is paid back by the refill before more
+    capacity becomes available.
+    """
+
+    def __init__(self, capacity: float, rate: float, clock=time.monotonic):
+        self.capacity = float(capacity)
+        self.rate = float(rate)
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+
+    @classmethod
+    def per_minute(cls, amount: float, clock=time.monotonic) -> "TokenBucket":
+        """Bucket allowing ``amount`` per minute with a full minute of burst."""
+        return cls(capacity=amount, rate=amount / 60.0, clock=clock)
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float = 1.0) -> float:
+        """Seconds until ``amount`` tokens are available (0 if they are now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self._tokens >= amount:
+            return 0.0
+        if self.rate <= 0:
+            return float("inf")
+        return (amount - self._tokens) / self.rate
+
+    def try_consume(self, amount: float = 1.0) -> bool:
+        """Take ``amount`` tokens if available."""
+        if self.wait_time(amount) > 0:
+            return False
+        self._tokens -= amount
+        return True
+
+    def consume(self, amount: float) -> None:
+        """Take ``amount`` tokens unconditionally (may go negative)."""
+        self._refill()
+        self._tokens -= amount
+
+    def sync(self, remaining: float) -> None:
+        """Align the bucket with a server-reported remaining allowance.
+
+        The server sees usage this process cannot (other workers sharing the
+        key), so the bucket never claims more than ``remaining``.
+        """
+        self._refill()
+        self._tokens = min(self._tokens, float(remaining))
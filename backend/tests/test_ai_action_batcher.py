@@ -0,0 +1,58 @@
+"""Tests for per-incident AI action batching."""
+
+import asyncio
+
+from src.oncall_agent.frontend_integration import AIActionBatcher
+
+
+class RecordingIntegration:
+    def __init__(self):
+        self.requests = []
+
+    async def record_ai_actions(self, actions):
+        self.requests.append([a["action"] for a in actions])
+        return True
+
+
+async def test_actions_within_the_window_are_sent_together_per_incident():
+    integration = RecordingIntegration()
+    batcher = AIActionBatcher(integration, window=0.05)
+
+    assert await batcher.add("analyze", "Analyzing alert", incident_id=1)
+    assert await batcher.add("other", "Other incident", incident_id=2)
+    assert await batcher.add("remediate", "Restarting pod", incident_id=1)
+    assert integration.requests == []
+
+    await asyncio.sleep(0.1)
+    assert sorted(integration.requests) == [["analyze", "remediate"], ["other"]]
+
+    await batcher.add("verify", "Checking pod", incident_id=1)
+    await asyncio.sleep(0.1)
+    assert integration.requests[-1] == ["verify"]
+
+
+async def test_full_batch_is_sent_early():
+    integration = RecordingIntegration()
+    batcher = AIActionBatcher(integration, window=60, max_batch=3)
+
+    for n in range(4):
+        await batcher.add(f"step-{n}", "Step", incident_id=1)
+
+    assert integration.requests == [["step-0", "step-1", "step-2"]]
+    await batcher.flush_all()
+    assert integration.requests[-1] == ["step-3"]
+
+
+async def test_flush_all_sends_pending_batches_and_cancels_timers():
+    integration = RecordingIntegration()
+    batcher = AIActionBatcher(integration, window=60)
+    await batcher.add("analyze", "Analyzing alert", incident_id=1)
+    await batcher.add("notify", "Notifying", incident_id=None)
+    timers = list(batcher._timers.values())
+
+    await batcher.flush_all()
+    await asyncio.sleep(0)
+
+    assert sorted(integration.requests) == [["analyze"], ["notify"]]
+    assert all(timer.cancelled() for timer in timers)
+    assert batcher._batches == {} and batcher._timers == {}
@@ -0,0 +1,113 @@
+"""Tests for alert storm coalescing."""
+
+from datetime import UTC, datetime
+
+import pytest
+
+from src.oncall_agent.api.alert_coalescer import AlertCoalescer, alert_fingerprint
+from src.oncall_agent.api.alert_context_parser import ContextExtractor
+from src.oncall_agent.api.models import PagerDutyIncidentData, PagerDutyService
+from src.oncall_agent.api.schemas import Incident, IncidentStatus, Severity
+from src.oncall_agent.services import incident_store
+from src.oncall_agent.services.incident_store import InMemoryIncidentRepository
+
+
+def make_alert(alert_id: str, pod: str, service: str = "checkout") -> PagerDutyIncidentData:
+    return PagerDutyIncidentData(
+        id=alert_id,
+        incident_number=1,
+        title=f"Pod {pod} is in CrashLoopBackOff",
+        description=f"pod/{pod} restarting in namespace: prod",
+        created_at=datetime.now(UTC),
+        status="triggered",
+        service=PagerDutyService(id="svc", name=service),
+        html_url="https://example.pagerduty.com",
+    )
+
+
+def fingerprint(alert: PagerDutyIncidentData) -> str:
+    return alert_fingerprint(alert, *ContextExtractor().extract_k8s_target(alert))
+
+
+def test_pods_of_one_deployment_share_a_fingerprint():
+    first = fingerprint(make_alert("a", "api-7d9f8b6c5d-x2k4p"))
+    second = fingerprint(make_alert("b", "api-7d9f8b6c5d-q9zzt"))
+    other_deployment = fingerprint(make_alert("c", "worker-5f6d7c8b9b-bcdfg"))
+    other_service = fingerprint(make_alert("d", "api-7d9f8b6c5d-x2k4p", service="payments"))
+
+    assert first == second == "checkout|pod_crash|prod|api"
+    assert len({first, other_deployment, other_service}) == 3
+
+
+def test_window_expires_and_can_be_disabled(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("src.oncall_agent.api.alert_coalescer.time.monotonic", lambda: now[0])
+    coalescer = AlertCoalescer(window=60)
+
+    group, opened = coalescer.admit("fp", "a")
+    assert opened
+    assert coalescer.admit("fp", "b") == (group, False)
+    now[0] += 61
+    assert coalescer.admit("fp", "c")[1]
+    assert coalescer.group_for("a") is None
+
+    assert AlertCoalescer(window=0).admit("fp", "a") == (None, True)
+
+
+@pytest.fixture
+def repository(monkeypatch):
+    repo = InMemoryIncidentRepository()
+    monkeypatch.setattr(incident_store, "_repository", repo)
+    return repo
+
+
+async def test_trigger_folds_storm_into_first_incident(repository):
+    from src.oncall_agent.api.oncall_agent_trigger import OncallAgentTrigger
+
+    trigger = OncallAgentTrigger()
+    analysed = []
+
+    async def fake_trigger(incident, context=None):
+        analysed.append((incident.id, (context or {}).get("coalesced_alerts")))
+        return {"status": "success"}
+
+    trigger.trigger_oncall_agent = fake_trigger
+    alerts = [make_alert(f"inc-{n}", f"api-7d9f8b6c5d-x2k4{'bcdfg'[n]}") for n in range(5)]
+    for alert in alerts:
+        await repository.save(Incident(
+            id=alert.id, title=alert.title, description="", severity=Severity.HIGH,
+            status=IncidentStatus.TRIGGERED, service_name="checkout", alert_source="pagerduty",
+        ))
+
+    results = [await trigger.process_incident_async(alert) for alert in alerts]
+    await trigger.shutdown()
+
+    assert [r["status"] for r in results] == ["queued"] + ["coalesced"] * 4
+    assert analysed == [("inc-0", ["inc-1", "inc-2", "inc-3", "inc-4"])]
+    primary = await repository.get("inc-0")
+    assert primary.metadata["coalesced_alerts"] == ["inc-1", "inc-2", "inc-3", "inc-4"]
+    assert (await repository.get("inc-3")).metadata["coalesced_into"] == "inc-0"
+
+
+async def test_unrelated_alerts_without_k8s_target_are_each_analysed(repository):
+    from src.oncall_agent.api.oncall_agent_trigger import OncallAgentTrigger
+
+    trigger = OncallAgentTrigger()
+    analysed = []
+
+    async def fake_trigger(incident, context=None):
+        analysed.append(incident.id)
+        return {"status": "success"}
+
+    trigger.trigger_oncall_agent = fake_trigger
+    alerts = [make_alert("db", "unused"), make_alert("disk", "unused"), make_alert("db-again", "unused")]
+    alerts[0].title = alerts[2].title = "Database connection timeout after 30s"
+    alerts[1].title = "Disk usage at 91% on /var/lib/postgresql"
+    for alert in alerts:
+        alert.description = None
+
+    results = [await trigger.process_incident_async(alert) for alert in alerts]
+    await trigger.shutdown()
+
+    assert [r["status"] for r in results] == ["queued", "queued", "coalesced"]
+    assert sorted(analysed) == ["db", "disk"]
@@ -0,0 +1,76 @@
+"""Tests for the bounded alert worker pool."""
+
+import asyncio
+
+import pytest
+
+from src.oncall_agent.api.alert_scheduler import AlertScheduler, QueueFullError
+
+
+async def test_higher_priority_runs_first():
+    order = []
+    gate = asyncio.Event()
+
+    async def handler(payload):
+        await gate.wait()
+        order.append(payload)
+        return payload
+
+    scheduler = AlertScheduler(handler, workers=1, max_queue=10)
+    # The first job occupies the only worker while the rest are queued
+    first = await scheduler.submit("a", "svc", 2, "a")
+    await asyncio.sleep(0)
+    for alert_id, priority in [("low", 3), ("p1", 0), ("mid", 2), ("p1-late", 0)]:
+        await scheduler.submit(alert_id, "svc-" + alert_id, priority, alert_id)
+
+    gate.set()
+    await scheduler.drain(timeout=1)
+    assert await first.future == "a"
+    assert order == ["a", "p1", "p1-late", "mid", "low"]
+
+
+async def test_noisy_service_does_not_block_others():
+    running = {"noisy": 0, "quiet": 0}
+    peak = {"noisy": 0, "quiet": 0}
+    release = asyncio.Event()
+
+    async def handler(service):
+        running[service] += 1
+        peak[service] = max(peak[service], running[service])
+        await release.wait()
+        running[service] -= 1
+
+    scheduler = AlertScheduler(handler, workers=3, per_service_limit=1)
+    for n in range(5):
+        await scheduler.submit(f"noisy-{n}", "noisy", 0, "noisy")
+    await scheduler.submit("quiet-0", "quiet", 1, "quiet")
+    await asyncio.sleep(0.01)
+
+    assert running == {"noisy": 1, "quiet": 1}
+    release.set()
+    await scheduler.drain(timeout=1)
+    assert peak["noisy"] == 1
+    assert scheduler.completed == 6
+
+
+async def test_full_queue_rejects_and_drain_finishes_queued():
+    gate = asyncio.Event()
+
+    async def handler(payload):
+        await gate.wait()
+        return payload
+
+    scheduler = AlertScheduler(handler, workers=1, max_queue=2)
+    jobs = [await scheduler.submit("running", "svc", 0, 0)]
+    await asyncio.sleep(0)
+    jobs += [await scheduler.submit(f"q{n}", "svc", 0, n + 1) for n in range(2)]
+
+    with pytest.raises(QueueFullError):
+        await scheduler.submit("overflow", "svc", 0, 99)
+    assert scheduler.rejected == 1
+
+    gate.set()
+    await scheduler.drain(timeout=1)
+    assert [await job.future for job in jobs] == [0, 1, 2]
+    with pytest.raises(QueueFullError):
+        await scheduler.submit("late", "svc", 0, 100)
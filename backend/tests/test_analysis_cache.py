@@ -0,0 +1,61 @@
+"""Tests for the LLM analysis cache."""
+
+from src.oncall_agent.services.analysis_cache import (
+    AnalysisCache,
+    normalize_prompt,
+    prompt_fingerprint,
+)
+
+PROMPT = """
+- Alert ID: {alert_id}
+- Service: checkout
+- Description: Pod {pod} is in CrashLoopBackOff
+- Timestamp: {ts}
+- Metadata: {{'incident_number': {number}, 'html_url': 'https://x.pagerduty.com/incidents/{alert_id}'}}
+"""
+
+
+def render(alert_id, pod, ts, number):
+    return PROMPT.format(alert_id=alert_id, pod=pod, ts=ts, number=number)
+
+
+def test_recurring_alerts_share_a_fingerprint():
+    first = render("Q1ABC2DEF3", "api-7d9f8b6c5d-x2k4p", "2025-01-01T10:00:00Z", 41)
+    second = render("Q9XYZ8WVU7", "api-6c8b7f9d4b-q9zzt", "2025-01-02T11:30:15.123+00:00", 42)
+    other_service = second.replace("checkout", "payments")
+
+    assert prompt_fingerprint(first, "m") == prompt_fingerprint(second, "m")
+    assert prompt_fingerprint(first, "m") != prompt_fingerprint(other_service, "m")
+    assert prompt_fingerprint(first, "m") != prompt_fingerprint(first, "other-model")
+    assert "checkout" in normalize_prompt(first)
+
+
+async def test_ttl_lru_and_stats(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("src.oncall_agent.services.analysis_cache.time.time", lambda: now[0])
+    cache = AnalysisCache(max_entries=2, ttl=60)
+
+    await cache.put("a", "analysis a", {"commands": []}, "m")
+    await cache.put("b", "analysis b", {}, "m")
+    # Mutating a hit must not change the cached entry
+    cache.get("a").parsed_analysis["commands"].append("mutated")
+    await cache.put("c", "analysis c", {}, "m")
+
+    assert cache.get("b") is None  # least recently used
+    assert cache.get("a").parsed_analysis == {"commands": []}
+    now[0] += 61
+    assert cache.get("c") is None
+
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["expirations"]) == (2, 2, 1, 1)
+
+
+async def test_persists_across_instances(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = AnalysisCache(path=path)
+    await cache.put("key", "analysis", {"risk_level": "low"}, "m")
+
+    reloaded = AnalysisCache(path=path)
+    entry = reloaded.get("key")
+    assert entry.analysis == "analysis"
+    assert entry.parsed_analysis == {"risk_level": "low"}
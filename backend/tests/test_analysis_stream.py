@@ -0,0 +1,73 @@
+"""Tests for incremental analysis streaming."""
+
+from src.oncall_agent.analysis_stream import AnalysisStreamer, match_section_header
+
+ANALYSIS = """Here is my analysis.
+
+## 1. 🎯 IMMEDIATE ACTIONS
+- Roll back the api deployment
+- `kubectl rollout undo deployment/api`
+
+## 2. 🔍 ROOT CAUSE ANALYSIS
+Impact is limited to checkout.
+- Monitoring shows OOM kills after the last release
+
+**3. 💥 Impact Assessment**
+All checkout requests fail.
+"""
+
+
+class RecordingLogManager:
+    def __init__(self):
+        self.entries = []
+
+    async def log_info(self, message, **kwargs):
+        self.entries.append((kwargs["stage"], kwargs.get("metadata", {})))
+
+    async def log_warning(self, message, **kwargs):
+        self.entries.append(("warning", kwargs.get("metadata", {})))
+
+
+def test_header_detection_ignores_body_text():
+    assert match_section_header("## 1. 🎯 IMMEDIATE ACTIONS") == "immediate_actions"
+    assert match_section_header("**3. 💥 Impact Assessment**") == "impact"
+    assert match_section_header("5. MONITORING (What metrics to watch)") == "monitoring"
+    assert match_section_header("Impact is limited to checkout.") is None
+    assert match_section_header("- Monitoring shows OOM kills") is None
+
+
+async def test_sections_are_published_before_the_answer_ends():
+    log_manager = RecordingLogManager()
+    seen = []
+
+    async def on_section(section, items):
+        seen.append((section, items, len(streamer.text)))
+
+    streamer = AnalysisStreamer("inc-1", log_manager=log_manager, on_section=on_section, flush_interval=0)
+    # Deltas split lines and headings at arbitrary points
+    for start in range(0, len(ANALYSIS), 7):
+        await streamer.feed(ANALYSIS[start:start + 7])
+    text = await streamer.finish()
+
+    assert text == ANALYSIS
+    assert [s for s, _, _ in seen] == ["immediate_actions", "root_cause", "impact"]
+    section, items, chars_when_ready = seen[0]
+    assert items == ["Roll back the api deployment", "`kubectl rollout undo deployment/api`"]
+    # Ready once the next heading line is complete, long before the answer ends
+    assert chars_when_ready < ANALYSIS.index("- Monitoring shows")
+    assert streamer.sections["root_cause"][1] == "Monitoring shows OOM kills after the last release"
+
+    deltas = "".join(m["delta"] for stage, m in log_manager.entries if stage == "claude_streaming")
+    assert deltas == ANALYSIS
+    assert [m["section"] for stage, m in log_manager.entries if stage == "analysis_section"] == [s for s, _, _ in seen]
+
+
+async def test_reset_discards_partial_output():
+    log_manager = RecordingLogManager()
+    streamer = AnalysisStreamer("inc-1", log_manager=log_manager)
+    await streamer.feed("## IMMEDIATE ACTIONS\n- restart")
+    await streamer.reset()
+
+    assert streamer.text == ""
+    assert log_manager.entries[-1] == ("warning", {"discarded_chars": 30})
+    assert await streamer.finish() == ""
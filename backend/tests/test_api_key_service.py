@@ -0,0 +1,120 @@
+"""Tests for write-behind API key usage tracking."""
+
+import asyncio
+import gc
+import json
+
+from src.oncall_agent.models.api_key import APIKeyCreate, APIKeyStatus, LLMProvider
+from src.oncall_agent.services import api_key_service
+from src.oncall_agent.services.api_key_service import APIKeyService
+
+
+def on_disk(path):
+    with open(path) as f:
+        return json.load(f)['keys']
+
+
+def new_key(service):
+    return service.create_key(APIKeyCreate(provider=LLMProvider.ANTHROPIC, api_key="sk-ant-test-key")).id
+
+
+def count_flushes(service):
+    calls = []
+    flush = service.flush
+
+    def counting_flush():
+        flush()
+        calls.append(1)
+
+    service.flush = counting_flush
+    return calls
+
+
+async def wait_for(condition, timeout=2.0):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met in time")
+
+
+async def test_usage_is_flushed_per_batch_or_after_the_interval(tmp_path):
+    path = tmp_path / "api_keys.json"
+    service = APIKeyService(str(path), flush_interval=0.2, flush_every=3)
+    key_id = new_key(service)
+    flushes = count_flushes(service)
+
+    service.record_key_usage(key_id)
+    service.record_key_usage(key_id)
+    await asyncio.sleep(0.05)
+    assert flushes == []
+    assert on_disk(path)[key_id]['last_used_at'] is None
+
+    service.record_key_usage(key_id)
+    await wait_for(lambda: len(flushes) == 1)
+    assert on_disk(path)[key_id]['last_used_at'] is not None
+
+    service.record_key_usage(key_id, success=False, error="timeout")
+    await asyncio.sleep(0.05)
+    assert len(flushes) == 1
+    await wait_for(lambda: len(flushes) == 2)
+    assert on_disk(path)[key_id]['last_error'] == "timeout"
+
+
+async def test_status_change_is_flushed_immediately(tmp_path):
+    path = tmp_path / "api_keys.json"
+    service = APIKeyService(str(path), flush_interval=60, flush_every=100)
+    key_id = new_key(service)
+
+    service.record_key_usage(key_id, success=False, error="Rate limit exceeded")
+
+    await wait_for(lambda: on_disk(path)[key_id]['status'] == APIKeyStatus.EXHAUSTED)
+
+
+def test_flush_keeps_other_writers_keys_and_status(tmp_path):
+    path = tmp_path / "api_keys.json"
+    first = APIKeyService(str(path))
+    key_id = new_key(first)
+    second = APIKeyService(str(path))
+    other_key_id = new_key(second)
+
+    # The second worker takes the key out of rotation...
+    second.record_key_usage(key_id, success=False, error="quota exceeded")
+    # ...and the first, still holding it as active, must not put it back
+    first.record_key_usage(key_id)
+
+    keys = on_disk(path)
+    assert other_key_id in keys
+    assert keys[key_id]['status'] == APIKeyStatus.EXHAUSTED
+    assert keys[key_id]['error_count'] == 0
+
+
+def test_failed_flush_requeues_its_keys(tmp_path, monkeypatch):
+    path = tmp_path / "api_keys.json"
+    service = APIKeyService(str(path))
+    key_id = new_key(service)
+    write_atomic = service._write_atomic
+
+    def failing_write(data):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(service, "_write_atomic", failing_write)
+    service.record_key_usage(key_id, success=False, error="rate limit")
+    assert on_disk(path)[key_id]['status'] == APIKeyStatus.ACTIVE
+
+    monkeypatch.setattr(service, "_write_atomic", write_atomic)
+    service.flush()
+
+    keys = on_disk(path)
+    assert keys[key_id]['status'] == APIKeyStatus.EXHAUSTED
+    assert keys[key_id]['last_error'] == "rate limit"
+
+
+def test_exit_flush_does_not_keep_services_alive(tmp_path):
+    service = APIKeyService(str(tmp_path / "api_keys.json"))
+    assert service in api_key_service._services
+
+    del service
+    gc.collect()
+
+    assert not any(s.storage_path.startswith(str(tmp_path)) for s in api_key_service._services)
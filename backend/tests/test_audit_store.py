@@ -0,0 +1,90 @@
+"""Tests for the bounded audit store."""
+
+import threading
+import time
+
+from src.oncall_agent.services.audit_store import AuditStore
+
+
+def test_ring_buffer_evicts_oldest_and_keeps_indexes_in_step():
+    store = AuditStore(capacity=3)
+    for i in range(5):
+        store.append("mcp_tool", tool="pods_list" if i % 2 else "pods_log", incident_id=f"inc-{i % 2}", n=i)
+
+    assert len(store) == 3
+    assert [r["n"] for r in store.query()] == [2, 3, 4]
+    assert [r["n"] for r in store.query(incident_id="inc-1")] == [3]
+    assert [r["n"] for r in store.query(tool="pods_log", limit=1)] == [4]
+    assert store.query(incident_id="inc-1")[0]["category"] == "mcp_tool"
+
+
+def test_time_range_and_category_filters():
+    store = AuditStore()
+    store.append("execution", tool="restart_pod", incident_id="inc-1")
+    cutoff = time.time()
+    store.append("resolution", tool="restart_pod", incident_id="inc-1")
+
+    assert [r["category"] for r in store.query(tool="restart_pod", since=cutoff)] == ["resolution"]
+    assert [r["category"] for r in store.query(until=cutoff)] == ["execution"]
+    assert [r["category"] for r in store.query(category="execution")] == ["execution"]
+
+
+def test_segmented_log_rotates_and_serves_evicted_records(tmp_path):
+    store = AuditStore(capacity=2, directory=str(tmp_path), segment_max_bytes=300, max_segments=3)
+    for i in range(20):
+        store.append("mcp_tool", tool="pods_list", incident_id=f"inc-{i}", n=i)
+    store.flush()
+
+    segments = sorted(tmp_path.glob("audit-*.jsonl"))
+    assert len(segments) == 3
+    # Evicted from memory, still on disk
+    assert [r["n"] for r in store.query(incident_id="inc-17")] == [17]
+    recent = store.query(limit=5)
+    assert [r["n"] for r in recent] == [15, 16, 17, 18, 19]
+    # Rotated away entirely
+    assert store.query(incident_id="inc-0") == []
+    store.close()
+
+    reopened = AuditStore(capacity=2, directory=str(tmp_path), segment_max_bytes=300, max_segments=3)
+    assert reopened.append("mcp_tool", tool="pods_list").seq == 21
+    assert [r["n"] for r in reopened.query(incident_id="inc-19")] == [19]
+    reopened.close()
+
+
+async def test_aquery_reads_the_log_off_the_event_loop(tmp_path, monkeypatch):
+    store = AuditStore(capacity=2, directory=str(tmp_path))
+    for i in range(5):
+        store.append("mcp_tool", tool="pods_list", incident_id=f"inc-{i}", n=i)
+    main_thread = threading.get_ident()
+    read_from = []
+    read_segment = AuditStore._read_segment
+
+    def recording_read(path):
+        read_from.append(threading.get_ident())
+        return read_segment(path)
+
+    monkeypatch.setattr(store, "_read_segment", recording_read)
+
+    assert [r["n"] for r in await store.aquery(limit=4)] == [1, 2, 3, 4]
+    assert read_from and main_thread not in read_from
+    store.close()
+
+
+async def test_segments_without_the_category_are_not_read(tmp_path, monkeypatch):
+    store = AuditStore(capacity=1, directory=str(tmp_path), segment_max_bytes=200)
+    store.append("execution", tool="restart_pod", n=0)
+    for i in range(1, 10):
+        store.append("mcp_tool", tool="pods_list", n=i)
+    store.flush()
+    read = []
+    read_segment = AuditStore._read_segment
+
+    def recording_read(path):
+        read.append(path)
+        return read_segment(path)
+
+    monkeypatch.setattr(store, "_read_segment", recording_read)
+
+    assert [r["n"] for r in await store.aquery(category="execution")] == [0]
+    assert len(read) == 1 < len(list(tmp_path.glob("audit-*.jsonl")))
+    store.close()
@@ -0,0 +1,101 @@
+"""Tests for the Kubernetes cluster state cache."""
+
+import json
+
+import pytest
+
+from src.oncall_agent.mcp_integrations.cluster_state_cache import (
+    ClusterStateCache,
+    ClusterStateUnavailableError,
+    Snapshot,
+)
+
+
+def pod(name, app, status="Running", restarts=0, reason=None):
+    state = {"waiting": {"reason": reason}} if reason else {"running": {}}
+    return {
+        "metadata": {
+            "name": name,
+            "namespace": "prod",
+            "labels": {"app": app, "tier": "web"},
+            "ownerReferences": [{"kind": "ReplicaSet", "name": f"{app}-7d9f8b6c4"}],
+        },
+        "status": {
+            "phase": status,
+            "containerStatuses": [{"restartCount": restarts, "state": state}],
+        },
+    }
+
+
+PODS = [
+    pod("api-7d9f8b6c4-x2k9p", "api", restarts=7, reason="CrashLoopBackOff"),
+    pod("api-7d9f8b6c4-b5m2q", "api"),
+    pod("web-5c8d7f9b2-q8w4z", "web", restarts=2),
+]
+
+
+class FakeServer:
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+
+    async def list(self, kind, namespace):
+        self.calls += 1
+        if self.fail:
+            return {"success": False, "error": "mcp down"}
+        # The MCP server may answer with JSON or YAML text
+        return {"success": True, "content": [{"text": json.dumps({"items": PODS})}]}
+
+
+def test_pod_indexes():
+    snapshot = Snapshot.build("pods", "prod", [{"text": json.dumps(PODS)}], 0.0)
+
+    crashing = snapshot.find_pods(deployment="api", status="CrashLoopBackOff")
+    assert [p["name"] for p in crashing] == ["api-7d9f8b6c4-x2k9p"]
+    assert crashing[0]["restarts"] == 7
+    assert [p["name"] for p in snapshot.find_pods(selector="app=api,tier=web")] == [
+        "api-7d9f8b6c4-x2k9p", "api-7d9f8b6c4-b5m2q"]
+    assert [p["name"] for p in snapshot.find_pods(min_restarts=1)] == [
+        "api-7d9f8b6c4-x2k9p", "web-5c8d7f9b2-q8w4z"]
+    assert snapshot.find_pods(selector={"app": "missing"}) == []
+    assert Snapshot.build("pods", "prod", [{"text": "NAME READY\napi 1/1"}], 0.0).objects is None
+
+
+async def test_reads_are_served_from_memory_until_stale_or_invalidated():
+    now = [0.0]
+    server = FakeServer()
+    cache = ClusterStateCache(server.list, resync_interval=10, max_staleness=30, clock=lambda: now[0])
+
+    first = await cache.get("pods", "prod")
+    assert (await cache.get("pods", "prod")) is first
+    assert server.calls == 1
+
+    now[0] += 31
+    await cache.get("pods", "prod")
+    assert server.calls == 2
+
+    cache.invalidate("prod")
+    await cache.get("pods", "prod")
+    assert server.calls == 3
+
+    server.fail = True
+    now[0] += 31
+    with pytest.raises(ClusterStateUnavailableError):
+        await cache.get("pods", "prod")
+
+
+async def test_resync_refreshes_used_snapshots_and_drops_idle_ones():
+    now = [0.0]
+    server = FakeServer()
+    cache = ClusterStateCache(server.list, resync_interval=10, idle_timeout=100, clock=lambda: now[0])
+    await cache.get("pods", "prod")
+
+    now[0] += 11
+    await cache.resync()
+    assert server.calls == 2
+    assert (await cache.get("pods", "prod")).fetched_at == 11
+
+    now[0] += 200
+    await cache.resync()
+    assert server.calls == 2
+    assert cache.get_stats()["snapshots"] == {}
@@ -0,0 +1,73 @@
+"""Tests for gathering alert context from integrations concurrently."""
+
+import asyncio
+import logging
+from types import SimpleNamespace
+
+from src.oncall_agent.agent import OncallAgent, PagerAlert
+
+ALERT = PagerAlert(
+    alert_id="A1", severity="high", service_name="api", timestamp="2024-01-01T00:00:00Z",
+    description="Pod api-7d9f8b6c5d-x2k4p is in CrashLoopBackOff"
+)
+
+
+def agent_stub(gatherers, integration_timeout=1.0, budget=2.0):
+    running = []
+    peak = [0]
+
+    async def gather_integration_context(name, alert, k8s_alert_type):
+        running.append(name)
+        peak[0] = max(peak[0], len(running))
+        try:
+            return await gatherers[name]()
+        finally:
+            running.remove(name)
+
+    agent = SimpleNamespace(
+        CONTEXT_GATHERERS=OncallAgent.CONTEXT_GATHERERS,
+        mcp_integrations=dict.fromkeys(gatherers),
+        config=SimpleNamespace(context_integration_timeout=integration_timeout, context_gather_budget=budget),
+        logger=logging.getLogger("test"),
+        _gather_integration_context=gather_integration_context,
+    )
+    return agent, peak
+
+
+def slow(result, seconds=0.2):
+    async def gather():
+        await asyncio.sleep(seconds)
+        return result
+    return gather
+
+
+async def test_integrations_are_queried_concurrently():
+    agent, peak = agent_stub({
+        "github": slow({"commits": 3}),
+        "kubernetes": slow({"pods": 1}),
+        "grafana": slow({"panels": 2}),
+    })
+
+    results = await OncallAgent._gather_all_context(agent, ALERT, None)
+
+    assert peak[0] == 3
+    assert results == {"github": {"commits": 3}, "kubernetes": {"pods": 1}, "grafana": {"panels": 2}}
+
+
+async def test_a_failing_integration_does_not_drop_the_others():
+    async def broken():
+        raise RuntimeError("grafana unreachable")
+
+    agent, _ = agent_stub({
+        "github": slow({"commits": 3}),
+        "grafana": broken,
+        "notion": slow({"pages": 1}, seconds=5),
+        "kubernetes": slow({"pods": 1}),
+    }, integration_timeout=0.5)
+
+    results = await OncallAgent._gather_all_context(agent, ALERT, None)
+
+    assert results["github"] == {"commits": 3}
+    assert results["kubernetes"] == {"pods": 1}
+    assert results["grafana"] == {"error": "grafana unreachable"}
+    assert "Timed out" in results["notion"]["error"]
@@ -0,0 +1,78 @@
+"""Tests for the incident-scoped MCP read cache."""
+
+import asyncio
+
+from src.oncall_agent.mcp_integrations.incident_cache import (
+    classify_call,
+    get_read_cache_stats,
+    incident_read_cache,
+    scoped,
+)
+
+
+class FakeK8s:
+    name = "kubernetes"
+
+    def __init__(self):
+        self.calls = []
+        self.pods = ["api-1"]
+
+    async def list_pods(self, namespace):
+        self.calls.append(("list_pods", namespace))
+        await asyncio.sleep(0.01)
+        return {"pods": list(self.pods)}
+
+    async def execute_kubectl_command(self, command, dry_run=False, auto_approve=False):
+        self.calls.append(("kubectl", tuple(command)))
+        if command[0] == "delete":
+            self.pods.clear()
+        return {"success": True, "output": ",".join(self.pods)}
+
+    async def get_pod_logs(self, pod, namespace):
+        self.calls.append(("logs", pod))
+        return {"success": False, "error": "not found"}
+
+
+def test_classification():
+    assert classify_call("execute_kubectl_command", (["get", "pods", "-n", "x"],), {}) == "read"
+    assert classify_call("execute_kubectl_command", (["rollout", "status", "deploy/api"],), {}) == "read"
+    assert classify_call("execute_kubectl_command", (["rollout", "restart", "deploy/api"],), {}) == "write"
+    assert classify_call("execute_kubectl_command", (["delete", "pod", "x"],), {"dry_run": True}) == "passthrough"
+    assert classify_call("execute_action", ("check_pod_logs", {}), {}) == "read"
+    assert classify_call("execute_action", ("restart_pod", {}), {}) == "write"
+    assert classify_call("describe_pod", ("api-1", "default"), {}) == "read"
+
+
+async def test_concurrent_reads_share_one_call_and_hits_are_counted():
+    k8s = FakeK8s()
+    with incident_read_cache("inc-1") as cache:
+        proxy = scoped(k8s)
+        results = await asyncio.gather(*(proxy.list_pods("default") for _ in range(3)))
+        again = await proxy.list_pods("default")
+        again["pods"].append("mutated")
+        assert (await proxy.list_pods("default")) == {"pods": ["api-1"]}
+
+    assert all(r == {"pods": ["api-1"]} for r in results)
+    assert k8s.calls == [("list_pods", "default")]
+    stats = cache.get_stats()
+    assert (stats["misses"], stats["shared_in_flight"], stats["hits"]) == (1, 2, 2)
+    assert get_read_cache_stats()[0]["incident_id"] == "inc-1"
+    # Outside the scope the integration is used directly
+    assert scoped(k8s) is k8s
+
+
+async def test_writes_invalidate_and_failures_are_not_cached():
+    k8s = FakeK8s()
+    with incident_read_cache("inc-2"):
+        proxy = scoped(k8s)
+        read = ["get", "pods"]
+        assert (await proxy.execute_kubectl_command(read, auto_approve=True))["output"] == "api-1"
+        assert (await proxy.execute_kubectl_command(read))["output"] == "api-1"
+        await proxy.execute_kubectl_command(["delete", "pod", "api-1"], auto_approve=True)
+        assert (await proxy.execute_kubectl_command(read))["output"] == ""
+
+        await proxy.get_pod_logs("api-1", "default")
+        await proxy.get_pod_logs("api-1", "default")
+
+    assert [c for c in k8s.calls if c[0] == "kubectl"].count(("kubectl", ("get", "pods"))) == 2
+    assert k8s.calls.count(("logs", "api-1")) == 2
@@ -0,0 +1,99 @@
+"""Tests for the incident repositories and keyset pagination."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.oncall_agent.api.schemas import Incident, IncidentStatus, Severity
+from src.oncall_agent.services.incident_store import (
+    IncidentFilter,
+    InMemoryIncidentRepository,
+    SQLiteIncidentRepository,
+)
+
+SEVERITIES = [Severity.CRITICAL, Severity.HIGH, Severity.MEDIUM, Severity.LOW]
+BASE_TIME = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def make_incident(n: int) -> Incident:
+    return Incident(
+        id=f"inc-{n:03d}",
+        title=f"Incident {n}",
+        description="test",
+        severity=SEVERITIES[n % len(SEVERITIES)],
+        status=IncidentStatus.TRIGGERED,
+        service_name=f"service-{n % 3}",
+        alert_source="test",
+        # Pairs of incidents share a timestamp so ties are broken by id
+        created_at=BASE_TIME + timedelta(minutes=n // 2),
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+async def repository(request, tmp_path):
+    if request.param == "memory":
+        repo = InMemoryIncidentRepository()
+    else:
+        repo = SQLiteIncidentRepository(str(tmp_path / "incidents.db"))
+    await repo.initialize()
+    for n in range(25):
+        await repo.save(make_incident(n))
+    yield repo
+    await repo.close()
+
+
+async def collect_pages(repo, filters, **kwargs):
+    ids, cursor = [], None
+    while True:
+        page = await repo.list_page(filters, limit=4, cursor=cursor, **kwargs)
+        ids.extend(i.id for i in page.incidents)
+        if not page.has_next:
+            return ids
+        cursor = page.next_cursor
+
+
+async def test_keyset_pages_cover_every_incident_once(repository):
+    ids = await collect_pages(repository, IncidentFilter())
+
+    expected = sorted((make_incident(n) for n in range(25)),
+                      key=lambda i: (i.created_at, i.id), reverse=True)
+    assert ids == [i.id for i in expected]
+
+
+async def test_filters_and_severity_order(repository):
+    filters = IncidentFilter(service_name="service-1", status=IncidentStatus.TRIGGERED)
+    ids = await collect_pages(repository, filters, sort_by="severity")
+
+    incidents = [make_incident(n) for n in range(25) if n % 3 == 1]
+    assert sorted(ids) == sorted(i.id for i in incidents)
+    assert await repository.count(filters) == len(incidents)
+
+    severities = [(await repository.get(i)).severity for i in ids]
+    ranks = [SEVERITIES.index(s) for s in severities]
+    assert ranks == sorted(ranks)
+
+
+async def test_offset_pagination(repository):
+    first = await repository.list_page(IncidentFilter(severity=Severity.HIGH), limit=3)
+    second = await repository.list_page(IncidentFilter(severity=Severity.HIGH), limit=3, offset=3)
+
+    assert len(first.incidents) == 3
+    assert not {i.id for i in first.incidents} & {i.id for i in second.incidents}
+
+
+async def test_save_updates_indexes(repository):
+    incident = await repository.get("inc-004")
+    incident.status = IncidentStatus.RESOLVED
+    await repository.save(incident)
+
+    resolved = await repository.list_page(IncidentFilter(status=IncidentStatus.RESOLVED))
+    triggered = await repository.count(IncidentFilter(status=IncidentStatus.TRIGGERED))
+    assert [i.id for i in resolved.incidents] == ["inc-004"]
+    assert triggered == 24
+
+
+async def test_cursor_for_other_sort_order_is_rejected(repository):
+    page = await repository.list_page(IncidentFilter(), limit=2)
+
+    with pytest.raises(ValueError):
+        await repository.list_page(IncidentFilter(), sort_by="severity", cursor=page.next_cursor)
@@ -0,0 +1,46 @@
+"""Tests for the Kubernetes credential endpoints without a database."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.oncall_agent.api import dependencies
+from src.oncall_agent.api.routers import integrations
+from src.oncall_agent.services.kubernetes_auth import KubernetesAuthService
+
+SERVICE_ACCOUNT = {"cluster_endpoint": "https://k8s.example.com", "service_account_token": "token", "cluster_name": "prod"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(dependencies, "_db_pool", None)
+    app = FastAPI()
+    app.include_router(integrations.router)
+    return TestClient(app)
+
+
+def test_credentials_are_validated_before_the_database_is_needed(client, monkeypatch):
+    async def unreachable(self, credentials):
+        return {"connected": False, "error": "connection refused"}
+
+    monkeypatch.setattr(KubernetesAuthService, "test_connection", unreachable)
+
+    response = client.post("/integrations/kubernetes/auth/service-account", json=SERVICE_ACCOUNT)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "connection refused"
+
+
+def test_saving_valid_credentials_needs_the_database(client, monkeypatch):
+    async def connected(self, credentials):
+        return {"connected": True}
+
+    async def permissions(self, credentials):
+        return {}
+
+    monkeypatch.setattr(KubernetesAuthService, "test_connection", connected)
+    monkeypatch.setattr(KubernetesAuthService, "verify_permissions", permissions)
+
+    response = client.post("/integrations/kubernetes/auth/service-account", json=SERVICE_ACCOUNT)
+
+    assert response.status_code == 503
@@ -0,0 +1,83 @@
+"""Tests for paginated, off-loop listing in the direct Kubernetes integration."""
+
+import json
+import threading
+
+from src.oncall_agent.mcp_integrations.kubernetes_direct import (
+    KubernetesDirectIntegration,
+)
+
+
+class RawResponse:
+    def __init__(self, payload):
+        self.data = json.dumps(payload).encode()
+
+
+class FakeCoreV1:
+    def __init__(self, pods):
+        self.pods = pods
+        self.calls = []
+
+    def list_namespaced_pod(self, namespace, limit, _preload_content, _continue=None, **selectors):
+        assert not _preload_content
+        self.calls.append((threading.current_thread().name, limit, _continue, selectors))
+        start = int(_continue or 0)
+        items = self.pods[start:start + limit]
+        token = str(start + limit) if start + limit < len(self.pods) else None
+        return RawResponse({"metadata": {"continue": token}, "items": items})
+
+
+def make_pod(i):
+    return {
+        "metadata": {"name": f"api-{i}", "namespace": "prod", "labels": {"app": "api"}},
+        "spec": {"containers": [{"name": "api"}]},
+        "status": {"phase": "Running", "containerStatuses": [{"ready": i % 2 == 0}]},
+    }
+
+
+async def test_pods_are_paged_projected_and_listed_off_the_event_loop():
+    k8s = KubernetesDirectIntegration(namespace="prod")
+    k8s.page_size = 2
+    k8s.core_v1 = FakeCoreV1([make_pod(i) for i in range(5)])
+    k8s._connected = True
+
+    result = await k8s.fetch_context({"type": "pods", "label_selector": "app=api"})
+
+    assert [p["name"] for p in result["pods"]] == [f"api-{i}" for i in range(5)]
+    assert result["pods"][1] == {"name": "api-1", "namespace": "prod", "status": "Running",
+                                 "ready": False, "containers": 1}
+    assert [c[2] for c in k8s.core_v1.calls] == [None, "2", "4"]
+    assert all(c[0].startswith("k8s-direct") for c in k8s.core_v1.calls)
+    assert all(c[3] == {"label_selector": "app=api"} for c in k8s.core_v1.calls)
+
+    capped = await k8s.fetch_context({"type": "pods", "max_items": 3})
+    assert len(capped["pods"]) == 3
+    await k8s.disconnect()
+
+
+async def test_health_check_releases_its_connection():
+    class ProbeResponse:
+        read_calls = released = 0
+
+        def read(self):
+            self.read_calls += 1
+            return b"{}"
+
+        def release_conn(self):
+            self.released += 1
+
+    responses = []
+
+    class ProbeCoreV1:
+        def list_namespace(self, limit, _preload_content):
+            responses.append(ProbeResponse())
+            return responses[-1]
+
+    k8s = KubernetesDirectIntegration()
+    k8s.core_v1 = ProbeCoreV1()
+    k8s._connected = True
+
+    assert await k8s.health_check()
+    assert await k8s.health_check()
+    assert [(r.read_calls, r.released) for r in responses] == [(1, 1), (1, 1)]
+    await k8s.disconnect()
@@ -0,0 +1,88 @@
+"""Tests for multi-key LLM dispatch."""
+
+import httpx
+import pytest
+from anthropic import RateLimitError
+
+from src.oncall_agent.models.api_key import LLMProvider
+from src.oncall_agent.services.llm_dispatcher import LLMDispatcher
+from src.oncall_agent.utils.token_bucket import TokenBucket
+
+
+class FakeKeyService:
+    def __init__(self, *key_ids):
+        self.keys = [(key_id, f"sk-{key_id}", LLMProvider.ANTHROPIC) for key_id in key_ids]
+
+    def get_usable_keys(self):
+        return list(self.keys)
+
+
+def rate_limit_error(retry_after: str) -> RateLimitError:
+    response = httpx.Response(
+        429,
+        headers={"retry-after": retry_after},
+        request=httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    )
+    return RateLimitError("rate_limit_error", response=response, body=None)
+
+
+def test_token_bucket_refills_and_syncs():
+    now = [0.0]
+    bucket = TokenBucket.per_minute(60, clock=lambda: now[0])
+
+    assert bucket.try_consume(60)
+    assert not bucket.try_consume(1)
+    assert bucket.wait_time(30) == pytest.approx(30)
+    now[0] += 10
+    assert bucket.tokens == pytest.approx(10)
+    bucket.sync(4)
+    assert bucket.tokens == pytest.approx(4)
+
+
+async def test_concurrent_calls_spread_over_keys_and_reuse_clients():
+    dispatcher = LLMDispatcher(FakeKeyService("a", "b", "c"))
+
+    leases = [await dispatcher.acquire(100) for _ in range(6)]
+    assert sorted(lease.key_id for lease in leases) == ["a", "a", "b", "b", "c", "c"]
+    clients = {lease.key_id: lease.client for lease in leases}
+    assert all(lease.client is clients[lease.key_id] for lease in leases)
+    await dispatcher.close()
+
+
+async def test_rate_limited_key_rests_while_others_serve():
+    dispatcher = LLMDispatcher(FakeKeyService("a", "b"))
+    lease = await dispatcher.acquire(100)
+    dispatcher.release(lease, error=rate_limit_error("20"))
+
+    stats = dispatcher.get_stats()["keys"][lease.key_id]
+    assert stats["rate_limited"] == 1
+    assert stats["cooldown_seconds"] > 19
+
+    others = [await dispatcher.acquire(100) for _ in range(3)]
+    assert {other.key_id for other in others} == {"a", "b"} - {lease.key_id}
+    await dispatcher.close()
+
+
+async def test_headers_clamp_buckets():
+    dispatcher = LLMDispatcher(FakeKeyService("a", "b"), tokens_per_minute=10000)
+    lease = await dispatcher.acquire(100)
+    dispatcher.release(lease, headers={
+        "anthropic-ratelimit-requests-remaining": "0",
+        "anthropic-ratelimit-input-tokens-remaining": "50",
+    }, input_tokens=120)
+
+    # The exhausted key is skipped until it refills
+    assert (await dispatcher.acquire(100)).key_id != lease.key_id
+    assert dispatcher.get_stats()["keys"][lease.key_id]["tokens_available"] <= 50
+    await dispatcher.close()
+
+
+async def test_no_keys_and_saturation_raise():
+    with pytest.raises(ValueError):
+        await LLMDispatcher(FakeKeyService()).acquire(10)
+
+    dispatcher = LLMDispatcher(FakeKeyService("a"), requests_per_minute=1, max_wait=0.1)
+    await dispatcher.acquire(10)
+    with pytest.raises(TimeoutError):
+        await dispatcher.acquire(10)
+    await dispatcher.close()
@@ -0,0 +1,108 @@
+"""Tests for agent log fan-out and replay."""
+
+import json
+
+import pytest
+
+from src.oncall_agent.api.log_streaming import LogFilter, LogStreamManager
+
+
+def seqs(items):
+    return [seq for seq, _ in items]
+
+
+def drain(subscription):
+    items = list(subscription.replay)
+    subscription.replay.clear()
+    while not subscription.queue.empty():
+        items.append(subscription.queue.get_nowait())
+    return items
+
+
+async def test_slow_client_drops_oldest_without_blocking():
+    manager = LogStreamManager(client_queue_size=3)
+    slow = manager.subscribe("slow")
+
+    for i in range(10):
+        await manager.log_info(f"message {i}", incident_id="inc-1")
+
+    assert "slow" in manager.clients
+    assert slow.dropped == 7
+    items = drain(slow)
+    assert seqs(items) == [8, 9, 10]
+    assert json.loads(items[-1][1])["data"]["message"] == "message 9"
+
+
+async def test_resume_from_last_event_id():
+    manager = LogStreamManager(max_buffer_size=5)
+    for i in range(8):
+        await manager.log_info(f"message {i}")
+
+    resumed = manager.subscribe("resumed", last_event_id=6)
+    assert seqs(drain(resumed)) == [7, 8]
+    assert resumed.dropped == 0
+
+    # Entries 2 and 3 already fell out of the buffer
+    behind = manager.subscribe("behind", last_event_id=1)
+    assert seqs(drain(behind)) == [4, 5, 6, 7, 8]
+    assert behind.dropped == 2
+
+
+async def test_replay_then_live_without_duplicates():
+    manager = LogStreamManager()
+    await manager.log_info("before")
+    subscription = manager.subscribe("client")
+    await manager.log_info("after")
+
+    first = await subscription.next(timeout=0.1)
+    second = await subscription.next(timeout=0.1)
+    assert seqs([first, second]) == [1, 2]
+    with pytest.raises(TimeoutError):
+        await subscription.next(timeout=0.01)
+
+
+async def test_unsubscribe_keeps_newer_subscription_with_same_id():
+    manager = LogStreamManager()
+    old = manager.subscribe("tab")
+    new = manager.subscribe("tab")
+
+    manager.unsubscribe("tab", old)
+    assert manager.clients["tab"] is new
+    manager.unsubscribe("tab", new)
+    assert "tab" not in manager.clients
+
+
+async def test_filtered_subscriptions_only_receive_matching_entries():
+    manager = LogStreamManager()
+    incident = manager.subscribe("incident", filters=LogFilter.from_params(incident_id="inc-1"))
+    errors = manager.subscribe("errors", filters=LogFilter.from_params(level="error,warning", integration="github"))
+    everything = manager.subscribe("all")
+
+    await manager.log_info("a", incident_id="inc-1")
+    await manager.log_error("b", incident_id="inc-2", integration="github")
+    await manager.log_warning("c", incident_id="inc-1", integration="kubernetes")
+    await manager.log_info("d", integration="github")
+
+    assert seqs(drain(incident)) == [1, 3]
+    assert seqs(drain(errors)) == [2]
+    assert seqs(drain(everything)) == [1, 2, 3, 4]
+
+    manager.unsubscribe("incident", incident)
+    assert manager._index["incident_id"] == {}
+
+
+async def test_replay_is_bounded_and_history_pages_backwards():
+    manager = LogStreamManager(max_replay=3)
+    for i in range(10):
+        await manager.log_info(f"message {i}", incident_id="inc-1" if i % 2 else "inc-2")
+
+    filters = LogFilter.from_params(incident_id="inc-1")
+    subscription = manager.subscribe("client", filters=filters, replay_limit=50)
+    assert seqs(drain(subscription)) == [6, 8, 10]
+
+    page, before = manager.history(filters, before_seq=6, limit=1)
+    assert [entry["seq"] for entry in page] == [4]
+    assert before == 4
+    page, before = manager.history(filters, before_seq=before, limit=5)
+    assert [entry["seq"] for entry in page] == [2]
+    assert before is None
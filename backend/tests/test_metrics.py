@@ -0,0 +1,90 @@
+"""Tests for the Prometheus metrics registry."""
+
+from datetime import UTC, datetime
+
+import pytest
+
+from src.oncall_agent.api.models import PagerDutyIncidentData, PagerDutyService
+from src.oncall_agent.services import metrics
+from src.oncall_agent.services.metrics import MetricsRegistry
+
+
+def test_counters_and_gauges_render_in_text_format():
+    registry = MetricsRegistry()
+    calls = registry.counter("tool_calls_total", "Tool calls", ["tool", "outcome"])
+    depth = registry.gauge("queue_depth", "Queued alerts")
+    calls.labels(tool="pods_get", outcome="success").inc()
+    calls.labels(tool="pods_get", outcome="success").inc(2)
+    calls.labels(tool='say "hi"\n', outcome="error").inc()
+    registry.add_collector("queue", lambda: depth.set(7))
+
+    text = registry.render()
+
+    assert "# HELP tool_calls_total Tool calls\n# TYPE tool_calls_total counter\n" in text
+    assert 'tool_calls_total{tool="pods_get",outcome="success"} 3\n' in text
+    assert 'tool_calls_total{tool="say \\"hi\\"\\n",outcome="error"} 1\n' in text
+    assert "queue_depth 7\n" in text
+
+    registry.remove_collector("queue")
+    depth.set(1)
+    assert "queue_depth 1\n" in registry.render()
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", ["stage"], buckets=[0.1, 1.0])
+    for value in (0.05, 0.5, 0.7, 3.0):
+        latency.labels(stage="llm").observe(value)
+
+    lines = registry.render().splitlines()
+
+    assert 'latency_seconds_bucket{stage="llm",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{stage="llm",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{stage="llm",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{stage="llm"} 4.25' in lines
+    assert 'latency_seconds_count{stage="llm"} 4' in lines
+
+
+def test_label_and_name_mistakes_are_rejected():
+    registry = MetricsRegistry()
+    calls = registry.counter("calls_total", "Calls", ["tool"])
+    with pytest.raises(ValueError):
+        calls.inc()
+    with pytest.raises(ValueError):
+        calls.labels(integration="k8s")
+    with pytest.raises(ValueError):
+        registry.gauge("calls_total", "Duplicate")
+
+
+def test_track_stage_times_and_counts_failures():
+    count = metrics.ALERT_STAGE_SECONDS.labels(stage="test_stage").count
+
+    with metrics.track_stage("test_stage"):
+        pass
+    with pytest.raises(RuntimeError), metrics.track_stage("test_stage"):
+        raise RuntimeError("notion down")
+
+    assert metrics.ALERT_STAGE_SECONDS.labels(stage="test_stage").count == count + 2
+    assert metrics.ALERT_STAGE_ERRORS.labels(stage="test_stage").value == 1
+    assert 'oncall_alert_stage_errors_total{stage="test_stage"} 1' in metrics.REGISTRY.render()
+
+
+@pytest.mark.parametrize("failure, status", [(TimeoutError, "timeout"), (RuntimeError("boom"), "error")])
+async def test_failed_alerts_are_counted(failure, status):
+    from src.oncall_agent.api.oncall_agent_trigger import OncallAgentTrigger
+
+    class FailingAgent:
+        async def handle_pager_alert(self, alert):
+            raise failure
+
+    incident = PagerDutyIncidentData(
+        id=f"PINC-{status}", incident_number=1, title="Pod api-1 is in CrashLoopBackOff",
+        created_at=datetime.now(UTC), status="triggered",
+        service=PagerDutyService(id="svc", name="checkout"), html_url="https://example.pagerduty.com",
+    )
+    handled = metrics.ALERTS_HANDLED.labels(status=status).value
+
+    result = await OncallAgentTrigger(agent=FailingAgent()).trigger_oncall_agent(incident)
+
+    assert result["status"] == status
+    assert metrics.ALERTS_HANDLED.labels(status=status).value == handled + 1
@@ -0,0 +1,137 @@
+"""Tests for the in-process alert quota service."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.oncall_agent.api import webhooks
+from src.oncall_agent.services import quota_service
+from src.oncall_agent.services.quota_service import (
+    QuotaExceededError,
+    QuotaService,
+    SQLiteUsageStore,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = datetime(2024, 1, 15, 12, 0)
+
+    def __call__(self):
+        return self.now
+
+
+def free_service(**kwargs):
+    return QuotaService(default_tier=lambda: "free", **kwargs)
+
+
+async def test_concurrent_records_never_exceed_the_limit():
+    service = free_service()
+
+    results = await asyncio.gather(
+        *(service.record("user-1", f"PINC{n}") for n in range(10)),
+        return_exceptions=True
+    )
+
+    assert sum(isinstance(r, dict) for r in results) == 3
+    assert sum(isinstance(r, QuotaExceededError) for r in results) == 7
+    account = await service.get_account("user-1")
+    assert (account.alerts_used, account.alerts_remaining, account.is_limit_reached) == (3, 0, True)
+
+
+async def test_redelivered_incidents_are_counted_once_within_the_window():
+    service = free_service(idempotency_window=2)
+
+    assert (await service.record("user-1", "PINC1"))["alerts_used"] == 1
+    assert (await service.record("user-1", "PINC1"))["already_processed"] is True
+    await service.record("user-1", "PINC2")
+    await service.set_plan("user-1", "pro", "txn-1")
+    await service.record("user-1", "PINC3")
+
+    # PINC1 fell out of the bounded window and counts again
+    assert (await service.record("user-1", "PINC1"))["alerts_used"] == 4
+
+
+async def test_billing_window_rolls_over_in_whole_periods():
+    clock = FakeClock()
+    service = free_service(clock=clock)
+    await service.record("user-1", "PINC1")
+    start = (await service.get_account("user-1")).billing_cycle_start
+    assert start == datetime(2024, 1, 1)
+
+    clock.now = start + timedelta(days=65)
+    account = await service.get_account("user-1")
+    assert account.alerts_used == 0
+    assert account.billing_cycle_start == start + timedelta(days=60)
+    assert (await service.record("user-1", "PINC1"))["alerts_used"] == 1
+
+
+async def test_unlimited_plan_and_reset():
+    service = free_service()
+    await service.set_plan("user-1", "enterprise")
+    for n in range(5):
+        result = await service.record("user-1", f"PINC{n}")
+    assert (result["alerts_remaining"], result["is_limit_reached"]) == (-1, False)
+
+    assert await service.reset("user-1")
+    assert (await service.get_account("user-1")).alerts_used == 0
+    assert not await service.reset("unknown")
+    assert await service.get_tier("unknown") is None
+
+
+async def test_sqlite_store_keeps_usage_across_restarts(tmp_path):
+    path = str(tmp_path / "usage.db")
+    store = SQLiteUsageStore(path)
+    await store.initialize()
+    await free_service(store=store).record("user-1", "PINC1")
+    await store.close()
+
+    store = SQLiteUsageStore(path)
+    await store.initialize()
+    service = free_service(store=store)
+    assert (await service.record("user-1", "PINC1"))["already_processed"] is True
+    assert (await service.record("user-1", "PINC2"))["alerts_used"] == 2
+    await store.close()
+
+
+async def test_workers_sharing_a_sqlite_store_do_not_overwrite_each_other(tmp_path):
+    path = str(tmp_path / "usage.db")
+    stores = [SQLiteUsageStore(path), SQLiteUsageStore(path)]
+    for store in stores:
+        await store.initialize()
+    first, second = (free_service(store=store) for store in stores)
+    await first.set_plan("user-1", "starter")
+
+    await asyncio.gather(*(
+        (first if n % 2 else second).record("user-1", f"PINC{n}") for n in range(20)
+    ))
+    await second.set_plan("user-1", "pro", "txn-1")
+    await first.record("user-1", "PINC20")
+
+    account = await second.get_account("user-1")
+    assert (account.alerts_used, account.account_tier, account.alerts_limit) == (21, "pro", 200)
+    for store in stores:
+        await store.close()
+
+
+async def test_webhook_records_usage_in_process(monkeypatch):
+    monkeypatch.setattr(quota_service, "_quota_service", free_service())
+
+    for n in range(3):
+        allowed, data = await webhooks.record_alert_usage("user-1", f"PINC{n}")
+        assert allowed
+    allowed, data = await webhooks.record_alert_usage("user-1", "PINC3")
+
+    assert not allowed
+    assert data["detail"]["alerts_used"] == 3
+
+
+async def test_quota_exceeded_detail():
+    service = free_service()
+    for n in range(3):
+        await service.record("user-1", f"PINC{n}")
+
+    with pytest.raises(QuotaExceededError) as exc_info:
+        await service.record("user-1", "PINC3")
+    assert exc_info.value.detail["account_tier"] == "free"
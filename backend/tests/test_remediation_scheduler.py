@@ -0,0 +1,120 @@
+"""Tests for the dependency-aware remediation scheduler."""
+
+import asyncio
+
+from src.oncall_agent.remediation_pipeline import RemediationActions
+from src.oncall_agent.remediation_scheduler import (
+    FAILED,
+    SKIPPED,
+    SUCCEEDED,
+    RemediationScheduler,
+    action_resource,
+)
+
+
+class Tracker:
+    """Records start/end order and the peak number of concurrent steps."""
+
+    def __init__(self):
+        self.events = []
+        self.running = 0
+        self.peak = 0
+
+    def step(self, name, result=None, fail=False):
+        async def run():
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            self.events.append(f"start:{name}")
+            await asyncio.sleep(0.01)
+            self.running -= 1
+            self.events.append(f"end:{name}")
+            if fail:
+                raise RuntimeError(f"{name} failed")
+            return result
+        return run
+
+
+async def test_independent_resources_run_in_parallel_same_resource_in_order():
+    tracker = Tracker()
+    scheduler = RemediationScheduler(max_concurrency=4, per_namespace=4)
+    scheduler.add("a1", tracker.step("a1"), resource="default/deployment/a", namespace="default")
+    scheduler.add("b1", tracker.step("b1"), resource="default/deployment/b", namespace="default")
+    scheduler.add("a2", tracker.step("a2"), resource="default/deployment/a", namespace="default")
+
+    steps = await scheduler.run()
+
+    assert [s.key for s in steps] == ["a1", "b1", "a2"]
+    assert all(s.status == SUCCEEDED for s in steps)
+    assert tracker.peak == 2
+    assert tracker.events.index("end:a1") < tracker.events.index("start:a2")
+
+
+async def test_concurrency_caps():
+    tracker = Tracker()
+    scheduler = RemediationScheduler(max_concurrency=3, per_namespace=1)
+    for i in range(4):
+        scheduler.add(f"ns1-{i}", tracker.step(i), resource=f"ns1/deployment/{i}", namespace="ns1")
+    await scheduler.run()
+    assert tracker.peak == 1
+
+    tracker = Tracker()
+    scheduler = RemediationScheduler(max_concurrency=2, per_namespace=5)
+    for i in range(4):
+        scheduler.add(str(i), tracker.step(i), resource=f"ns{i}/deployment/x", namespace=f"ns{i}")
+    await scheduler.run()
+    assert tracker.peak == 2
+
+
+async def test_verify_skipped_after_failed_fix_and_stop_after_failures():
+    tracker = Tracker()
+    scheduler = RemediationScheduler(
+        max_concurrency=1, max_failures=2, is_failure=lambda result: result == "bad"
+    )
+    scheduler.add("fix", tracker.step("fix", fail=True), resource="r1")
+    scheduler.add("verify", tracker.step("verify"), resource="r1", after=["fix"])
+    scheduler.add("other", tracker.step("other", result="bad"), resource="r2")
+    scheduler.add("late", tracker.step("late"), resource="r3")
+
+    await scheduler.run()
+    status = {key: step.status for key, step in scheduler.steps.items()}
+
+    assert status == {"fix": FAILED, "verify": SKIPPED, "other": FAILED, "late": SKIPPED}
+    assert "start:late" not in tracker.events
+    assert scheduler.stopped
+
+
+def test_action_resource():
+    assert action_resource({"namespace": "prod", "deployment_name": "api"}) == ("prod/deployment/api", "prod")
+    assert action_resource({"pod_name": "api-1"}) == ("default/pod/api-1", "default")
+    assert action_resource({"namespace": "prod"}) == ("prod/*", "prod")
+
+
+class FakeK8s:
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    async def execute_kubectl_command(self, command, auto_approve=False):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if command[0] == "describe":
+            return {"success": True, "output": "memory: 512Mi"}
+        return {"success": command[2] != "broken", "output": "patched", "error": "denied"}
+
+
+async def test_fix_oom_kills_patches_deployments_in_parallel_keeping_order():
+    k8s = FakeK8s()
+    actions = RemediationActions(k8s, max_concurrency=4, namespace_concurrency=4)
+    results = await actions.fix_oom_kills([
+        {"deployment_name": "api", "namespace": "prod"},
+        {"deployment_name": "broken", "namespace": "prod"},
+        {"deployment_name": "web", "namespace": "default"},
+    ])
+
+    assert [(r["deployment"], r["status"]) for r in results] == [
+        ("api", "success"), ("broken", "failed"), ("web", "success")
+    ]
+    assert results[0]["new_limit"] == "768Mi"
+    assert k8s.peak == 3
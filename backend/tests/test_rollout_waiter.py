@@ -0,0 +1,80 @@
+"""Tests for the deployment rollout waiter."""
+
+import json
+
+from src.oncall_agent.rollout_waiter import RolloutWaiter, evaluate_rollout
+
+
+def deployment(updated, available, total=None, desired=3, generation=2, observed=2, conditions=()):
+    return {
+        "metadata": {"generation": generation},
+        "spec": {"replicas": desired},
+        "status": {
+            "observedGeneration": observed,
+            "updatedReplicas": updated,
+            "availableReplicas": available,
+            "replicas": total if total is not None else updated,
+            "conditions": list(conditions),
+        },
+    }
+
+
+class FakeCluster:
+    """Serves a scripted sequence of deployment states per deployment."""
+
+    def __init__(self, states):
+        self.states = states
+        self.polls = {}
+
+    async def execute_kubectl_command(self, command, auto_approve=False):
+        name = command[2]
+        self.polls[name] = self.polls.get(name, 0) + 1
+        sequence = self.states[name]
+        state = sequence[min(self.polls[name], len(sequence)) - 1]
+        return {"success": True, "output": json.dumps(state)}
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_evaluate_rollout():
+    assert evaluate_rollout(deployment(3, 3))[0] is True
+    assert evaluate_rollout(deployment(3, 3, observed=1))[0] is None
+    assert evaluate_rollout(deployment(2, 2))[0] is None
+    assert evaluate_rollout(deployment(3, 3, total=4))[0] is None
+    failed = {"type": "Progressing", "reason": "ProgressDeadlineExceeded", "message": "timed out"}
+    assert evaluate_rollout(deployment(1, 1, conditions=[failed]))[0] is False
+
+
+async def test_returns_as_soon_as_ready_with_backoff():
+    fake_time = FakeTime()
+    cluster = FakeCluster({"api": [deployment(1, 0), deployment(2, 1), deployment(3, 2), deployment(3, 3)]})
+    waiter = RolloutWaiter(cluster, initial_delay=0.5, max_delay=1.5, sleep=fake_time.sleep, clock=fake_time.clock)
+
+    status = await waiter.wait_for_deployment("api", "prod", timeout=60)
+
+    assert status.ready and status.polls == 4
+    assert fake_time.sleeps == [0.5, 1.0, 1.5]
+    assert status.elapsed == 3.0
+
+
+async def test_concurrent_waits_and_deadline():
+    fake_time = FakeTime()
+    cluster = FakeCluster({"api": [deployment(3, 3)], "worker": [deployment(0, 0)]})
+    waiter = RolloutWaiter(cluster, initial_delay=1, max_delay=4, sleep=fake_time.sleep, clock=fake_time.clock)
+
+    api, worker = await waiter.wait_for_deployments([("api", "prod"), ("worker", "prod")], timeout=10)
+
+    assert api.ready and api.polls == 1
+    assert not worker.ready and worker.reason.startswith("timed out after 10s")
+    assert sum(fake_time.sleeps) == 10
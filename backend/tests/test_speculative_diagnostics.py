@@ -0,0 +1,124 @@
+"""Tests for diagnostics started alongside the LLM analysis."""
+
+import asyncio
+import logging
+from types import SimpleNamespace
+
+from src.oncall_agent.agent import OncallAgent, PagerAlert, detect_k8s_alert_type
+from src.oncall_agent.api.routers.agent import AGENT_CONFIG
+from src.oncall_agent.api.schemas import AIMode
+from src.oncall_agent.remediation_pipeline import (
+    RemediationPipeline,
+    SpeculativeDiagnostics,
+    diagnostic_commands,
+)
+
+
+class FakeK8s:
+    def __init__(self):
+        self.calls = []
+
+    async def execute_kubectl_command(self, command, auto_approve=False):
+        self.calls.append(tuple(command))
+        await asyncio.sleep(0.01)
+        return {"success": True, "output": f"output of {command[0]}"}
+
+
+class BrokenK8s:
+    async def execute_kubectl_command(self, command, auto_approve=False):
+        raise RuntimeError("connection refused")
+
+
+def test_diagnostic_commands():
+    assert set(diagnostic_commands("oom_kill", {})) == {"memory_usage", "oom_events"}
+    assert diagnostic_commands("pod_crash", {"namespace": "prod"}) == {"pod_status": ["get", "pods", "-n", "prod"]}
+    assert diagnostic_commands("high_cpu", {}) == {}
+
+
+async def test_pipeline_reuses_matching_speculative_results():
+    k8s = FakeK8s()
+    speculative = SpeculativeDiagnostics(k8s, "oom_kill", {})
+    # Both commands run concurrently while the caller does other work
+    await asyncio.sleep(0.005)
+    assert len(k8s.calls) == 2
+
+    pipeline = RemediationPipeline(k8s)
+    results = await pipeline._execute_diagnostics("oom_kill", {}, speculative)
+
+    assert results["memory_usage"]["output"] == "output of top"
+    assert len(k8s.calls) == 2
+    assert pipeline.execution_log[0]["description"].startswith("kubectl top pods")
+
+
+async def test_pipeline_reruns_mismatched_stale_or_failed_diagnostics():
+    k8s = FakeK8s()
+    pipeline = RemediationPipeline(k8s)
+
+    other_namespace = SpeculativeDiagnostics(k8s, "pod_crash", {"namespace": "prod"})
+    await pipeline._execute_diagnostics("pod_crash", {}, other_namespace)
+    assert k8s.calls.count(("get", "pods", "-n", "default")) == 1
+
+    now = [0.0]
+    stale = SpeculativeDiagnostics(k8s, "pod_crash", {}, clock=lambda: now[0])
+    await stale.task
+    now[0] = pipeline.speculative_max_age + 1
+    await pipeline._execute_diagnostics("pod_crash", {}, stale)
+    assert k8s.calls.count(("get", "pods", "-n", "default")) == 3
+
+    failing = SpeculativeDiagnostics(BrokenK8s(), "pod_crash", {})
+    results = await pipeline._execute_diagnostics("pod_crash", {}, failing)
+    assert results["pod_status"]["success"]
+
+
+class FailingK8s(FakeK8s):
+    async def execute_kubectl_command(self, command, auto_approve=False):
+        result = await super().execute_kubectl_command(command, auto_approve)
+        return {**result, "success": len(self.calls) > 1}
+
+
+async def test_pipeline_reruns_speculative_results_that_reported_failure():
+    k8s = FailingK8s()
+    speculative = SpeculativeDiagnostics(k8s, "pod_crash", {})
+    results = await RemediationPipeline(k8s)._execute_diagnostics("pod_crash", {}, speculative)
+
+    assert results["pod_status"]["success"]
+    assert len(k8s.calls) == 2
+
+
+async def test_unconsumed_failure_is_retrieved(caplog):
+    speculative = SpeculativeDiagnostics(BrokenK8s(), "pod_crash", {})
+    await asyncio.wait([speculative.task])
+    await asyncio.sleep(0)
+
+    assert "Speculative pod_crash diagnostics failed" in caplog.text
+    # Retrieved by the done-callback, so asyncio has nothing to complain about
+    assert not speculative.task._log_traceback
+
+
+def agent_stub(k8s_integration):
+    return SimpleNamespace(
+        config=SimpleNamespace(speculative_diagnostics_enabled=True),
+        k8s_integration=k8s_integration,
+        logger=logging.getLogger("test"),
+        _detect_k8s_alert_type=lambda description: detect_k8s_alert_type(description),
+    )
+
+
+def crash_alert(metadata):
+    return PagerAlert(
+        alert_id="A1", severity="high", service_name="api", timestamp="2024-01-01T00:00:00Z",
+        description="Pod api-7d9f8b6c5d-x2k4p is in CrashLoopBackOff", metadata=metadata
+    )
+
+
+async def test_agent_speculates_in_the_alert_namespace_only_with_kubectl_support(monkeypatch):
+    monkeypatch.setattr(AGENT_CONFIG, "mode", AIMode.YOLO)
+    monkeypatch.setattr(AGENT_CONFIG, "auto_execute_enabled", True)
+    k8s = FakeK8s()
+
+    speculative = OncallAgent._start_speculative_diagnostics(agent_stub(k8s), crash_alert({"namespace": "prod"}))
+    await speculative.task
+    assert k8s.calls == [("get", "pods", "-n", "prod")]
+
+    without_kubectl = SimpleNamespace(list_pods=lambda namespace: None)
+    assert OncallAgent._start_speculative_diagnostics(agent_stub(without_kubectl), crash_alert({})) is None
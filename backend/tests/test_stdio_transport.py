@@ -0,0 +1,113 @@
+"""Tests for the multiplexed JSON-RPC stdio transport."""
+
+import asyncio
+import sys
+
+import pytest
+
+from src.oncall_agent.mcp_integrations.github_mcp import GitHubMCPIntegration
+from src.oncall_agent.mcp_integrations.kubernetes_mcp_stdio import (
+    KubernetesMCPStdioIntegration,
+)
+from src.oncall_agent.mcp_integrations.stdio_transport import StdioJSONRPCTransport
+from src.oncall_agent.services.metrics import MCP_TOOL_CALLS
+
+# Fake MCP server: answers "sleep" requests after params["delay"] seconds, so
+# replies come back out of order, and ignores "hang" requests entirely.
+FAKE_SERVER = r'''
+import json, sys, threading, time
+
+lock = threading.Lock()
+
+def reply(message):
+    time.sleep(message["params"].get("delay", 0))
+    with lock:
+        sys.stdout.write(json.dumps({"jsonrpc": "2.0", "id": message["id"],
+                                     "result": {"echo": message["params"]}}) + "\n")
+        sys.stdout.flush()
+
+for line in sys.stdin:
+    message = json.loads(line)
+    if "id" not in message or message["method"] == "hang":
+        continue
+    if message["method"] == "exit":
+        sys.exit(0)
+    threading.Thread(target=reply, args=(message,)).start()
+'''
+
+
+@pytest.fixture
+async def transport():
+    transport = await StdioJSONRPCTransport.spawn([sys.executable, "-c", FAKE_SERVER], name="fake")
+    yield transport
+    await transport.close()
+
+
+async def test_concurrent_requests_are_matched_by_id(transport):
+    delays = [0.3, 0.1, 0.2, 0.0]
+    responses = await asyncio.gather(*(
+        transport.request("sleep", {"delay": d, "n": i}) for i, d in enumerate(delays)
+    ))
+
+    assert [r["result"]["echo"]["n"] for r in responses] == [0, 1, 2, 3]
+    assert transport.in_flight == 0
+
+
+async def test_timeout_does_not_poison_next_call(transport):
+    with pytest.raises(TimeoutError):
+        await transport.request("sleep", {"delay": 0.3, "n": "late"}, timeout=0.05)
+
+    response = await transport.request("sleep", {"n": "next"})
+    assert response["result"]["echo"]["n"] == "next"
+
+
+async def test_cancelled_request_is_removed(transport):
+    task = asyncio.create_task(transport.request("hang"))
+    await asyncio.sleep(0.05)
+    assert transport.in_flight == 1
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert transport.in_flight == 0
+
+
+async def test_pending_requests_fail_when_server_exits(transport):
+    pending = asyncio.create_task(transport.request("hang"))
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(ConnectionError):
+        await transport.request("exit")
+    with pytest.raises(ConnectionError):
+        await pending
+
+    await transport.process.wait()
+    assert not transport.is_running
+
+
+async def test_reader_failure_marks_transport_down(transport):
+    # One line over the stream limit makes readline() raise ValueError
+    transport.process.stdout._limit = 64
+    with pytest.raises(ConnectionError):
+        await transport.request("sleep", {"padding": "x" * 200})
+
+    assert not transport.is_running
+    with pytest.raises(ConnectionError):
+        await transport.request("sleep", {"n": 1}, timeout=5)
+
+
+async def test_github_and_kubernetes_stdio_calls_are_measured(transport):
+    github = GitHubMCPIntegration({"github_token": "token"})
+    github.transport = transport
+    kubernetes = KubernetesMCPStdioIntegration()
+    kubernetes.transport = transport
+    calls = {
+        tool: MCP_TOOL_CALLS.labels(integration="fake", tool=tool, outcome="success").value
+        for tool in ("list_commits", "pods_list")
+    }
+
+    assert (await github._call_mcp_tool("list_commits", {"repo": "api"}))["result"]
+    assert (await kubernetes._send_request("pods_list", {}))["result"]
+
+    for tool, before in calls.items():
+        assert MCP_TOOL_CALLS.labels(integration="fake", tool=tool, outcome="success").value == before + 1
@@ -0,0 +1,50 @@
+"""Tests for single-parse webhook body decoding."""
+
+import hashlib
+import hmac
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.oncall_agent.api import webhooks
+from src.oncall_agent.utils import json_codec
+
+
+def test_loads_accepts_buffers_and_rejects_invalid_json():
+    assert json_codec.loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+    assert json_codec.loads(memoryview(b'{"a": 1}')) == {"a": 1}
+    with pytest.raises(ValueError):
+        json_codec.loads(b"{not json")
+
+
+def test_inline_webhook_verifies_and_parses_the_same_body(monkeypatch):
+    body = json.dumps({
+        "event": {
+            "id": "evt-1",
+            "event_type": "incident.triggered",
+            "occurred_at": "2024-01-01T00:00:00Z",
+            "data": {"id": "PINC1", "title": "Pod crash", "status": "triggered"},
+        }
+    }).encode()
+    signature = "v1=" + hmac.new(b"secret", body, hashlib.sha256).hexdigest()
+    handled = []
+
+    async def handle_pagerduty_payload(payload_dict, inbox=None):
+        handled.append(payload_dict)
+        return webhooks.JSONResponse(content={"status": "ok"})
+
+    monkeypatch.setattr(webhooks, "handle_pagerduty_payload", handle_pagerduty_payload)
+    monkeypatch.setattr(webhooks, "webhook_inbox", None)
+    monkeypatch.setattr(webhooks.config, "pagerduty_webhook_secret", "secret")
+    app = FastAPI()
+    app.include_router(webhooks.router)
+    client = TestClient(app)
+
+    response = client.post("/webhook/pagerduty", content=body, headers={"X-PagerDuty-Signature": signature})
+    assert response.status_code == 200
+    assert handled[0]["event"]["data"]["id"] == "PINC1"
+
+    response = client.post("/webhook/pagerduty", content=body, headers={"X-PagerDuty-Signature": "v1=bad"})
+    assert response.status_code == 401
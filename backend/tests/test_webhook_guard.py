@@ -0,0 +1,93 @@
+"""Tests for webhook admission control."""
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src.oncall_agent.api.webhook_guard import (
+    IPAllowList,
+    WebhookGuard,
+    WebhookGuardMiddleware,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_allow_list_matches_cidrs_and_addresses():
+    allow_list = IPAllowList.parse("10.0.0.0/8, 192.168.1.7,2001:db8::/32")
+
+    assert "10.20.30.40" in allow_list
+    assert "192.168.1.7" in allow_list
+    assert "192.168.1.8" not in allow_list
+    assert "2001:db8::1" in allow_list
+    assert "::ffff:10.0.0.1" in allow_list
+    assert "not-an-ip" not in allow_list
+    assert IPAllowList.parse("") is None
+    with pytest.raises(ValueError):
+        IPAllowList.parse("10.0.0.0/99")
+
+
+def test_flooding_source_does_not_starve_others():
+    clock = FakeClock()
+    guard = WebhookGuard(per_source_limit=3, per_integration_limit=0, clock=clock)
+
+    assert [guard.check("10.0.0.1", "pagerduty")[0] for _ in range(5)] == [200, 200, 200, 429, 429]
+    assert guard.check("10.0.0.2", "pagerduty")[0] == 200
+    status, retry_after = guard.check("10.0.0.1", "pagerduty")
+    assert status == 429 and retry_after == pytest.approx(20)
+
+    clock.now += 20
+    assert guard.check("10.0.0.1", "pagerduty")[0] == 200
+    assert guard.get_stats()["rate_limited_source"] == 3
+
+
+def test_integration_bucket_caps_total_and_refunds_the_source():
+    guard = WebhookGuard(per_source_limit=2, per_integration_limit=2, clock=FakeClock())
+
+    assert guard.check("10.0.0.1", "pagerduty")[0] == 200
+    assert guard.check("10.0.0.2", "pagerduty")[0] == 200
+    assert guard.check("10.0.0.1", "pagerduty")[0] == 429
+    assert guard.check("10.0.0.1", "datadog")[0] == 200
+    stats = guard.get_stats()
+    assert (stats["admitted"], stats["rate_limited_integration"]) == (3, 1)
+
+
+def test_source_buckets_are_bounded():
+    guard = WebhookGuard(per_source_limit=1, max_sources=2, clock=FakeClock())
+    for n in range(5):
+        guard.check(f"10.0.0.{n}", "pagerduty")
+    assert guard.get_stats()["tracked_sources"] == 2
+
+
+def test_middleware_rejects_before_reading_the_body():
+    guard = WebhookGuard(per_source_limit=1, allow_list=IPAllowList.parse("10.0.0.0/8"), clock=FakeClock())
+    bodies = []
+    app = FastAPI()
+    app.add_middleware(WebhookGuardMiddleware, guard=guard)
+
+    @app.post("/webhook/pagerduty")
+    async def webhook(request: Request):
+        bodies.append(await request.body())
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    client = TestClient(app)
+    # TestClient's host is not an IP address, so it is outside any allow-list
+    assert client.post("/webhook/pagerduty", content=b"{}").status_code == 403
+    assert client.get("/health").status_code == 200
+
+    guard.allow_list = None
+    assert client.post("/webhook/pagerduty", content=b"first").status_code == 200
+    response = client.post("/webhook/pagerduty", content=b"second")
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "60"
+    assert bodies == [b"first"]
@@ -0,0 +1,176 @@
+"""Tests for the durable webhook inbox and its consumers."""
+
+import asyncio
+import json
+
+import pytest
+
+from src.oncall_agent.api import webhooks
+from src.oncall_agent.services.webhook_inbox import (
+    InboxConsumer,
+    PoisonMessageError,
+    RetryLaterError,
+    WebhookInbox,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+async def inbox(tmp_path):
+    clock = FakeClock()
+    inbox = WebhookInbox(str(tmp_path / "inbox.db"), lease_seconds=60, retry_delay=5, max_attempts=2, clock=clock)
+    await inbox.initialize()
+    inbox.clock = clock
+    yield inbox
+    await inbox.close()
+
+
+async def test_claim_leases_messages_and_redelivers_after_lease(inbox):
+    first = await inbox.append("pagerduty", b'{"a": 1}')
+    await inbox.append("pagerduty", b'{"b": 2}')
+
+    claimed = await inbox.claim(limit=1)
+    assert [(m.seq, m.body, m.attempts) for m in claimed] == [(first, b'{"a": 1}', 1)]
+    # Leased messages are not handed out again...
+    assert [m.body for m in await inbox.claim(limit=5)] == [b'{"b": 2}']
+    assert await inbox.claim() == []
+
+    # ...until the lease expires without an ack
+    inbox.clock.now += 61
+    redelivered = await inbox.claim(limit=5)
+    assert [(m.seq, m.attempts) for m in redelivered] == [(first, 2), (first + 1, 2)]
+
+    await inbox.ack(first)
+    inbox.clock.now += 61
+    assert [m.seq for m in await inbox.claim(limit=5)] == [first + 1]
+
+
+async def test_nack_backs_off_then_dead_letters(inbox):
+    await inbox.append("pagerduty", b"{}")
+    message = (await inbox.claim())[0]
+    assert await inbox.nack(message, "boom") is True
+    inbox.clock.now += 4
+    assert await inbox.claim() == []
+    inbox.clock.now += 1
+    message = (await inbox.claim())[0]
+
+    assert await inbox.nack(message, "boom again") is False
+    inbox.clock.now += 1000
+    assert await inbox.claim() == []
+    stats = await inbox.get_stats()
+    assert (stats["ready"], stats["dead"]) == (0, 1)
+
+
+async def test_processed_keys_expire(inbox):
+    inbox.processed_ttl = 100
+    await inbox.mark_processed("PINC1")
+    assert await inbox.is_processed("PINC1")
+    inbox.clock.now += 101
+    await inbox.mark_processed("PINC2")
+    assert not await inbox.is_processed("PINC1")
+
+
+async def test_messages_survive_reopening(tmp_path):
+    path = str(tmp_path / "inbox.db")
+    inbox = WebhookInbox(path)
+    await inbox.initialize()
+    await inbox.append("pagerduty", b"payload")
+    await inbox.close()
+
+    reopened = WebhookInbox(path)
+    await reopened.initialize()
+    assert [m.body for m in await reopened.claim()] == [b"payload"]
+    await reopened.close()
+
+
+async def test_consumer_acks_retries_and_dead_letters(inbox):
+    outcomes = {b"ok": None, b"busy": RetryLaterError("busy", delay=30), b"bad": PoisonMessageError("bad")}
+    handled = []
+
+    async def handler(message):
+        handled.append(message.body)
+        if outcomes[message.body]:
+            raise outcomes[message.body]
+
+    for body in outcomes:
+        await inbox.append("pagerduty", body)
+    consumer = InboxConsumer(inbox, handler, workers=1, poll_interval=0.01)
+    consumer.start()
+    await asyncio.sleep(0.2)
+    await consumer.stop()
+
+    assert handled == [b"ok", b"busy", b"bad"]
+    assert (consumer.processed, consumer.retried, consumer.dead_lettered) == (1, 1, 1)
+    stats = await inbox.get_stats()
+    assert (stats["ready"], stats["leased_or_delayed"], stats["dead"]) == (0, 1, 1)
+
+
+async def test_backpressure_retries_never_dead_letter(inbox):
+    async def handler(message):
+        raise RetryLaterError("Alert queue is full", delay=30)
+
+    await inbox.append("pagerduty", b"{}")
+    consumer = InboxConsumer(inbox, handler)
+    for _ in range(inbox.max_attempts * 5):
+        inbox.clock.now += 30
+        message = (await inbox.claim())[0]
+        assert message.attempts == 1
+        await consumer.process(message)
+
+    stats = await inbox.get_stats()
+    assert (stats["dead"], consumer.dead_lettered) == (0, 0)
+    assert consumer.retried == inbox.max_attempts * 5
+
+
+class FakeTrigger:
+    def __init__(self):
+        self.incidents = []
+
+    async def process_incident_async(self, incident):
+        self.incidents.append(incident.id)
+        return {"status": "queued", "incident_id": incident.id}
+
+
+def v3_payload(incident_id):
+    return json.dumps({
+        "event": {
+            "id": f"evt-{incident_id}",
+            "event_type": "incident.triggered",
+            "occurred_at": "2024-01-01T00:00:00Z",
+            "data": {"id": incident_id, "title": "Pod crash", "status": "triggered"},
+        }
+    }).encode()
+
+
+async def test_redelivered_payload_skips_processed_incidents(inbox, monkeypatch):
+    trigger = FakeTrigger()
+
+    async def get_agent_trigger():
+        return trigger
+
+    async def record_alert_usage(user_id, incident_id):
+        return True, None
+
+    monkeypatch.setattr(webhooks, "get_agent_trigger", get_agent_trigger)
+    monkeypatch.setattr(webhooks, "record_alert_usage", record_alert_usage)
+    monkeypatch.setattr(webhooks, "webhook_inbox", inbox)
+
+    await inbox.append("pagerduty", v3_payload("PINC1"))
+    await webhooks.consume_inbox_message((await inbox.claim())[0])
+    assert await inbox.is_processed("PINC1")
+
+    # At-least-once delivery: the same webhook arriving again is not re-run
+    await inbox.append("pagerduty", v3_payload("PINC1"))
+    await webhooks.consume_inbox_message((await inbox.claim())[0])
+    assert trigger.incidents == ["PINC1"]
+
+    await inbox.append("pagerduty", b"not json")
+    with pytest.raises(PoisonMessageError):
+        await webhooks.consume_inbox_message((await inbox.claim())[0])
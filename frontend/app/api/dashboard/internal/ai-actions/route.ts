@@ -1,5 +1,5 @@
 import { NextRequest, NextResponse } from 'next/server';
-import { recordAiAction } from '@/lib/db/dashboard-queries';
+import { recordAiActions } from '@/lib/db/dashboard-queries';
 
 // Internal API endpoint for backend agent - no auth required
 export async function POST(request: NextRequest) {
@@ -11,32 +11,38 @@ export async function POST(request: NextRequest) {
     }
 
     const body = await request.json();
-    const { userId, action, description, incidentId, status, metadata } = body;
+    // The agent batches bursts of actions for an incident as { actions: [...] }
+    const isBatch = Array.isArray(body.actions);
+    const actions = isBatch ? body.actions : [body];
 
-    if (!userId || !action || !status) {
+    if (actions.some((a: any) => !a.userId || !a.action || !a.status)) {
       return NextResponse.json(
         { error: 'Missing required fields: userId, action, status' },
         { status: 400 }
       );
     }
 
-    const aiAction = await recordAiAction({
-      userId,
-      action,
-      description,
-      incidentId,
-      status,
-      metadata: metadata ? JSON.stringify(metadata) : undefined,
-    });
+    // One statement for the whole batch: a failure records none of it, so the
+    // agent can retry the batch without duplicating actions
+    const recorded = await recordAiActions(
+      actions.map(({ userId, action, description, incidentId, status, metadata }: any) => ({
+        userId,
+        action,
+        description,
+        incidentId,
+        status,
+        metadata: metadata ? JSON.stringify(metadata) : undefined,
+      }))
+    );
 
-    if (!aiAction) {
+    if (!recorded) {
       return NextResponse.json(
         { error: 'Failed to record AI action' },
         { status: 500 }
       );
     }
 
-    return NextResponse.json(aiAction, { status: 201 });
+    return NextResponse.json(isBatch ? recorded : recorded[0], { status: 201 });
   } catch (error) {
     console.error('Error recording AI action from backend:', error);
     return NextResponse.json(
@@ -15,6 +15,8 @@ interface IncidentAIAnalysisProps {
 
 export function IncidentAIAnalysis({ incidentId, className }: IncidentAIAnalysisProps) {
   const [analysisFromLogs, setAnalysisFromLogs] = useState<any>(null)
+  // Partial analysis assembled from streamed deltas and sections
+  const [streamed, setStreamed] = useState<{ analysis: string; parsed_analysis: Record<string, string[]> } | null>(null)
   
   // Fetch analysis from API
   const { data: analysisData, isLoading, error, refetch } = useQuery({
@@ -41,8 +43,32 @@ export function IncidentAIAnalysis({ incidentId, className }: IncidentAIAnalysis
   useEffect(() => {
     // This will be populated by the agent logs when analysis completes
     const handleLogUpdate = (event: CustomEvent) => {
-      if (event.detail?.incident_id === incidentId && event.detail?.stage === 'complete') {
-        const metadata = event.detail.metadata
+      if (event.detail?.incident_id !== incidentId) return
+      const stage = event.detail?.stage
+      const metadata = event.detail?.metadata
+
+      if (stage === 'claude_streaming') {
+        if (metadata?.discarded_chars !== undefined) {
+          // The request was retried; the text starts over
+          setStreamed(null)
+        } else if (metadata?.delta) {
+          setStreamed(prev => ({
+            analysis: (prev?.analysis || '') + metadata.delta,
+            parsed_analysis: prev?.parsed_analysis || {}
+          }))
+        }
+        return
+      }
+
+      if (stage === 'analysis_section' && metadata?.section) {
+        setStreamed(prev => ({
+          analysis: prev?.analysis || '',
+          parsed_analysis: { ...(prev?.parsed_analysis || {}), [metadata.section]: metadata.items || [] }
+        }))
+        return
+      }
+
+      if (stage === 'complete') {
         if (metadata?.analysis && metadata?.parsed_analysis) {
           setAnalysisFromLogs({
             analysis: metadata.analysis,
@@ -60,7 +86,7 @@ export function IncidentAIAnalysis({ incidentId, className }: IncidentAIAnalysis
   }, [incidentId])
   
   // Determine which analysis to show
-  const analysis = analysisFromLogs || analysisData
+  const analysis = analysisFromLogs || streamed || analysisData
   
   if (isLoading) {
     return (
@@ -236,4 +236,29 @@ export async function recordAiAction(actionData: {
     console.error('Error recording AI action:', error);
     return null;
   }
+}
+
+// Records a batch with one multi-row INSERT, so either every action is stored or none is
+export async function recordAiActions(actionsData: {
+  userId: number;
+  action: string;
+  description?: string;
+  incidentId?: number;
+  status?: string;
+  metadata?: string;
+}[]): Promise<AiAction[] | null> {
+  try {
+    const db = await getDb();
+    return await db.insert(aiActions).values(actionsData.map((actionData) => ({
+      userId: actionData.userId,
+      action: actionData.action,
+      description: actionData.description,
+      incidentId: actionData.incidentId,
+      status: actionData.status || 'completed',
+      metadata: actionData.metadata,
+    }))).returning();
+  } catch (error) {
+    console.error('Error recording AI actions:', error);
+    return null;
+  }
 }
\ No newline at end of file
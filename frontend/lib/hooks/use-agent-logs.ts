@@ -12,6 +12,7 @@ export interface AgentLogEntry {
   metadata?: Record<string, any>
   progress?: number
   stage?: string
+  seq?: number
 }
 
 export interface AgentLogStreamState {
@@ -33,6 +34,8 @@ export function useAgentLogs(incidentId?: string) {
 
   const eventSourceRef = useRef<EventSource | null>(null)
   const reconnectTimeoutRef = useRef<NodeJS.Timeout | null>(null)
+  // Last event id seen, per incident filter, so reconnects resume the same stream
+  const lastEventIdRef = useRef<{ incidentId?: string; id: string } | null>(null)
 
   const connect = useCallback(() => {
     // Clean up existing connection
@@ -51,6 +54,10 @@ export function useAgentLogs(incidentId?: string) {
       params.append('incident_id', incidentId)
     }
     params.append('client_id', `web-${Date.now()}`)
+    // Resume after the last entry we saw instead of replaying the whole buffer
+    if (lastEventIdRef.current && lastEventIdRef.current.incidentId === incidentId) {
+      params.append('last_event_id', lastEventIdRef.current.id)
+    }
 
     const url = `${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'}/api/v1/agent-logs/stream?${params}`
 
@@ -71,6 +78,10 @@ export function useAgentLogs(incidentId?: string) {
     }
 
     eventSource.onmessage = (event) => {
+      if (event.lastEventId) {
+        lastEventIdRef.current = { incidentId, id: event.lastEventId }
+      }
+
       try {
         const data = JSON.parse(event.data)
         
@@ -103,6 +114,15 @@ export function useAgentLogs(incidentId?: string) {
                 }
               } else if (logEntry.stage === 'activation') {
                 newActiveIncidents.add(logEntry.incident_id)
+              } else if (logEntry.stage === 'claude_streaming' || logEntry.stage === 'analysis_section') {
+                // Partial analysis while Claude is still writing
+                window.dispatchEvent(new CustomEvent('agent-log-update', {
+                  detail: {
+                    incident_id: logEntry.incident_id,
+                    stage: logEntry.stage,
+                    metadata: logEntry.metadata
+                  }
+                }))
               }
             }
 